@@ -3,10 +3,21 @@ import asyncio
 from fastapi import APIRouter, HTTPException, status
 
 from app.core.session import SingletonAiohttp
-from app.models.router import UploadResponse, UploadSchemaRequest
+from app.models.router import (
+    ProjectSchemaRequest,
+    ReindexResponse,
+    ReindexSchemaRequest,
+    UploadResponse,
+    UploadSchemaRequest,
+)
 from app.services.gopie.dataset_info import get_dataset_info, get_project_info
 from app.services.gopie.generate_schema import generate_summary
+from app.services.qdrant.schema_reindex import (
+    ReindexCheckpoint,
+    SchemaReindexer,
+)
 from app.services.qdrant.schema_vectorization import (
+    delete_project_schemas_from_qdrant,
     delete_schema_from_qdrant,
     store_schema_in_qdrant,
 )
@@ -89,3 +100,77 @@ async def delete_schema(payload: UploadSchemaRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete schema: {e!s}",
         ) from e
+
+
+@dataset_router.delete("/delete_project_schemas", response_model=UploadResponse)
+async def delete_project_schemas(payload: ProjectSchemaRequest):
+    """
+    Deletes all dataset schemas of a project from the vector database.
+
+    - `project_id`: The ID of the project whose schemas should be deleted.
+    """
+    try:
+        success = await delete_project_schemas_from_qdrant(payload.project_id)
+
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Project schemas could not be deleted",
+            )
+
+        return {
+            "success": True,
+            "message": "Project schemas deleted successfully.",
+        }
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete project schemas: {e!s}",
+        ) from e
+
+
+def _to_reindex_response(checkpoint: ReindexCheckpoint) -> ReindexResponse:
+    return ReindexResponse(
+        job_id=checkpoint.job_id,
+        status=checkpoint.status.value,
+        project_id=checkpoint.project_id,
+        embedding_model=checkpoint.embedding_model,
+        processed=checkpoint.processed,
+        error=checkpoint.error,
+    )
+
+
+@dataset_router.post(
+    "/reindex_schemas",
+    response_model=ReindexResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def reindex_schemas(payload: ReindexSchemaRequest):
+    """
+    Starts (or resumes) a background job re-embedding stored schemas with the
+    current `DEFAULT_EMBEDDING_MODEL`.
+
+    A full reindex builds a new collection and switches searches to it once the
+    job completes. A project reindex refreshes the project's schemas in place and
+    requires the collection to have been built with the same model.
+
+    - `project_id`: Optional project to restrict the reindex to.
+    """
+    checkpoint = SchemaReindexer.start(project_id=payload.project_id)
+    return _to_reindex_response(checkpoint)
+
+
+@dataset_router.get("/reindex_schemas/{job_id}", response_model=ReindexResponse)
+async def get_reindex_status(job_id: str):
+    """
+    Returns the progress of a reindex job.
+    """
+    checkpoint = SchemaReindexer.get_status(job_id)
+    if checkpoint is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reindex job not found",
+        )
+    return _to_reindex_response(checkpoint)
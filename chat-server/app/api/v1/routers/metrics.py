@@ -0,0 +1,51 @@
+from fastapi import APIRouter
+
+from app.core.admission import AdmissionController
+from app.utils.chat_history.state_store import ConversationStore
+from app.utils.chat_history.summarizer import ConversationSummaries
+from app.utils.graph_utils.answer_cache import SemanticAnswerCache
+from app.utils.langsmith.prompt_registry import PromptRegistry
+from app.utils.model_registry.client_pool import ClientPool
+from app.utils.model_registry.hedging import LLMHedger
+from app.utils.model_registry.model_router import ModelRouter
+from app.utils.model_registry.prompt_cache_stats import PromptCacheStats
+from app.utils.model_registry.rate_limiter import RateLimiter
+from app.utils.model_registry.response_cache import ResponseCache
+from app.utils.model_registry.token_counter import TokenCounter
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics")
+async def get_metrics():
+    """
+    Returns runtime statistics of the chat server.
+
+    - `client_pool`: Shared LLM / embedding clients and their reuse counts.
+    - `prompt_registry`: Cached LangSmith prompts and refresh state.
+    - `response_cache`: LLM response cache hits and misses per node.
+    - `answer_cache`: Semantic answer cache entries, hits and invalidations.
+    - `admission`: Running and queued requests, queue wait times and rejections.
+    - `rate_limits`: Client-side LLM rate limits per gateway and model, with throttling.
+    - `hedging`: Hedged and fallback LLM requests per node and model, with hedge rates.
+    - `model_routing`: Tiers picked per adaptive node and rolling latency / errors per model.
+    - `prompt_cache`: Provider prompt cache hits, cached tokens and time to first token.
+    - `token_counter`: Tokenizer in use and cached message token counts.
+    - `chat_summaries`: Cached rolling chat history summaries, their use and failures.
+    - `conversation_state`: Per-chat states kept between requests and the messages
+      converted incrementally vs from scratch.
+    """
+    return {
+        "client_pool": ClientPool.get_stats(),
+        "prompt_registry": PromptRegistry.get_stats(),
+        "response_cache": ResponseCache.get_stats(),
+        "answer_cache": SemanticAnswerCache.get_stats(),
+        "admission": AdmissionController.get_stats(),
+        "rate_limits": RateLimiter.get_stats(),
+        "hedging": LLMHedger.get_stats(),
+        "model_routing": ModelRouter.get_stats(),
+        "prompt_cache": PromptCacheStats.get_stats(),
+        "token_counter": TokenCounter.get_stats(),
+        "chat_summaries": ConversationSummaries.get_stats(),
+        "conversation_state": ConversationStore.get_stats(),
+    }
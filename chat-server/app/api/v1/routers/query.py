@@ -1,14 +1,28 @@
 import uuid
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
+from app.core.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    release_when_done,
+)
+from app.core.config import settings
 from app.utils.adapters.openai.input import (
     RequestNonStreaming,
     RequestStreaming,
     from_openai_format,
+    get_chat_id,
 )
 from app.utils.adapters.openai.output import OpenAIOutputAdapter
+from app.utils.chat_history.state_store import ConversationStore
+from app.utils.graph_utils.request_deadline import (
+    RequestDeadline,
+    cancel_on_disconnect,
+)
+from app.workflow.events.coalesce_events import coalesce_event_chunks
 from app.workflow.graph.graph_stream import stream_graph_updates
 
 router = APIRouter()
@@ -22,6 +36,7 @@ async def root():
 @router.post("/chat/completions")
 async def create(
     openai_format_request: RequestNonStreaming | RequestStreaming,
+    http_request: Request,
 ):
     """
     Handle chat completion requests, supporting both streaming and non-streaming responses.
@@ -29,9 +44,17 @@ async def create(
     Accepts a chat completion request in OpenAI-compatible format, validates required identifiers,
     and processes the request using an output adapter. Returns either a streaming response for
     real-time updates or a standard response with the generated chat completion, depending on the request parameters.
-    Returns an error response if neither project nor dataset IDs are provided.
+    Returns an error response if neither project nor dataset IDs are provided, and
+    429 / 503 with Retry-After when the request is not admitted under load.
+
+    With a `chat_id` in the request metadata, the chat's state from its previous
+    request is reused and only the messages added since are processed.
     """
-    request = from_openai_format(openai_format_request)
+    # Validated as a one-shot iterator; the messages are read again for the conversation state.
+    openai_format_request["messages"] = list(openai_format_request.get("messages", []))
+    conversation_state = await ConversationStore.get(get_chat_id(openai_format_request))
+    request = from_openai_format(openai_format_request, conversation_state)
+    tenant = request.user or ",".join(sorted(request.project_ids or request.dataset_ids or []))
     trace_id = request.trace_id or uuid.uuid4().hex
     chat_id = request.chat_id or uuid.uuid4().hex
     user = request.user or "gopie.chat.server"
@@ -43,27 +66,73 @@ async def create(
             content={"error": "At least one dataset or project ID must be provided"},
         )
 
+    try:
+        slot = await AdmissionController.acquire(tenant)
+    except AdmissionRejectedError as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"error": e.message},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    conversation_state = ConversationStore.update(
+        request.chat_id,
+        conversation_state,
+        openai_format_request.get("messages", []),
+        request.messages,
+    )
+
+    # Cancelled when the client disconnects; all in-flight work stops with it.
+    deadline = RequestDeadline.after(settings.REQUEST_DEADLINE_SECONDS)
+
     if openai_format_request.get("stream"):
         return StreamingResponse(
-            adapter.create_chat_completion_stream(
+            release_when_done(
+                adapter.create_chat_completion_stream(
+                    coalesce_event_chunks(
+                        cancel_on_disconnect(
+                            stream_graph_updates(
+                                messages=request.messages,
+                                user=user,
+                                trace_id=trace_id,
+                                chat_id=chat_id,
+                                client_chat_id=request.chat_id,
+                                dataset_ids=request.dataset_ids,
+                                project_ids=request.project_ids,
+                                latency_mode=request.latency_mode,
+                                deadline=deadline,
+                                conversation_state=conversation_state,
+                            ),
+                            http_request.is_disconnected,
+                            deadline,
+                        )
+                    )
+                ),
+                slot,
+            ),
+            media_type="text/event-stream",
+            # Also frees the slot of a stream that was never iterated.
+            background=BackgroundTask(slot.release),
+        )
+    try:
+        return await adapter.create_chat_completion(
+            cancel_on_disconnect(
                 stream_graph_updates(
                     messages=request.messages,
                     user=user,
                     trace_id=trace_id,
                     chat_id=chat_id,
+                    client_chat_id=request.chat_id,
                     dataset_ids=request.dataset_ids,
                     project_ids=request.project_ids,
-                )
-            ),
-            media_type="text/event-stream",
+                    stream_tokens=False,
+                    latency_mode=request.latency_mode,
+                    deadline=deadline,
+                    conversation_state=conversation_state,
+                ),
+                http_request.is_disconnected,
+                deadline,
+            )
         )
-    return await adapter.create_chat_completion(
-        stream_graph_updates(
-            messages=request.messages,
-            user=user,
-            trace_id=trace_id,
-            chat_id=chat_id,
-            dataset_ids=request.dataset_ids,
-            project_ids=request.project_ids,
-        )
-    )
+    finally:
+        slot.release()
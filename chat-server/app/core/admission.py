@@ -0,0 +1,228 @@
+import asyncio
+import math
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, TypeVar
+
+from app.core.config import settings
+from app.core.log import logger
+from app.core.rolling_window import RollingWindow
+
+T = TypeVar("T")
+
+WAIT_TIME_WINDOW = 1000
+
+
+class AdmissionRejectedError(Exception):
+    """
+    A request that could not be admitted; answered with `status_code` and a
+    Retry-After of `retry_after` seconds.
+    """
+
+    def __init__(self, status_code: HTTPStatus, message: str, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdmissionSlot:
+    tenant: str
+    tracked: bool = True
+    admitted_at: float = field(default_factory=time.monotonic)
+    released: bool = False
+
+    def release(self) -> None:
+        """
+        Give the slot back; safe to call more than once.
+        """
+        if self.released:
+            return
+        self.released = True
+        if self.tracked:
+            AdmissionController.release(self)
+
+
+@dataclass
+class _Waiter:
+    tenant: str
+    future: asyncio.Future
+
+
+class AdmissionController:
+    """
+    Process-wide admission control for graph runs.
+
+    At most ADMISSION_MAX_CONCURRENT_REQUESTS requests run at once, and at most
+    ADMISSION_MAX_CONCURRENT_REQUESTS_PER_TENANT per tenant. Others wait in a FIFO
+    queue of ADMISSION_QUEUE_SIZE for up to ADMISSION_QUEUE_TIMEOUT_SECONDS. A
+    waiter blocked only by its own tenant's limit does not hold up other tenants.
+    Requests that cannot be queued or time out are rejected with 429 when their
+    tenant is at its limit and 503 when the server is.
+    """
+
+    active: int = 0
+    active_per_tenant: Counter = Counter()
+    waiters: deque[_Waiter] = deque()
+    counters: Counter = Counter()
+    wait_times: RollingWindow = RollingWindow(WAIT_TIME_WINDOW)
+    max_queue_depth: int = 0
+    # Moving average of how long admitted requests hold their slot.
+    service_seconds: float = 0.0
+
+    @classmethod
+    def _tenant_at_limit(cls, tenant: str) -> bool:
+        return (
+            cls.active_per_tenant[tenant] >= settings.ADMISSION_MAX_CONCURRENT_REQUESTS_PER_TENANT
+        )
+
+    @classmethod
+    def _can_admit(cls, tenant: str) -> bool:
+        if cls.active >= settings.ADMISSION_MAX_CONCURRENT_REQUESTS:
+            return False
+        return not cls._tenant_at_limit(tenant)
+
+    @classmethod
+    def _admit(cls, tenant: str) -> None:
+        cls.active += 1
+        cls.active_per_tenant[tenant] += 1
+        cls.counters["admitted"] += 1
+
+    @classmethod
+    def _admit_waiters(cls) -> None:
+        for waiter in list(cls.waiters):
+            if cls.active >= settings.ADMISSION_MAX_CONCURRENT_REQUESTS:
+                break
+            if waiter.future.done() or not cls._can_admit(waiter.tenant):
+                continue
+            cls.waiters.remove(waiter)
+            cls._admit(waiter.tenant)
+            waiter.future.set_result(None)
+
+    @classmethod
+    def _retry_after(cls) -> int:
+        # Time for the queue ahead to drain at the current service rate.
+        queued = len(cls.waiters) + 1
+        seconds = cls.service_seconds * queued / settings.ADMISSION_MAX_CONCURRENT_REQUESTS
+        return max(1, math.ceil(seconds))
+
+    @classmethod
+    def _reject(cls, tenant: str, reason: str) -> AdmissionRejectedError:
+        if cls._tenant_at_limit(tenant):
+            status_code = HTTPStatus.TOO_MANY_REQUESTS
+            message = "Too many concurrent requests, please retry later"
+        else:
+            status_code = HTTPStatus.SERVICE_UNAVAILABLE
+            message = "Server is busy, please retry later"
+        cls.counters[f"rejected_{reason}"] += 1
+        cls.counters[f"rejected_{status_code.value}"] += 1
+        logger.warning(f"Rejected request for tenant {tenant}: {reason}")
+        return AdmissionRejectedError(status_code, message, cls._retry_after())
+
+    @classmethod
+    async def acquire(cls, tenant: str) -> AdmissionSlot:
+        """
+        Wait for a slot for `tenant`.
+
+        Raises:
+            AdmissionRejectedError: When the queue is full or the wait timed out.
+        """
+        if not settings.ADMISSION_CONTROL_ENABLED:
+            return AdmissionSlot(tenant, tracked=False)
+
+        if cls._can_admit(tenant):
+            cls._admit(tenant)
+            cls.wait_times.append(0.0)
+            return AdmissionSlot(tenant)
+
+        if len(cls.waiters) >= settings.ADMISSION_QUEUE_SIZE:
+            raise cls._reject(tenant, "queue_full")
+
+        start = time.monotonic()
+        waiter = _Waiter(tenant, asyncio.get_running_loop().create_future())
+        cls.waiters.append(waiter)
+        cls.counters["queued"] += 1
+        cls.max_queue_depth = max(cls.max_queue_depth, len(cls.waiters))
+
+        try:
+            await asyncio.wait({waiter.future}, timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            # The caller went away while waiting; hand back a slot it was just given.
+            if waiter.future.done():
+                cls._free(tenant)
+            else:
+                cls.waiters.remove(waiter)
+            raise
+
+        if not waiter.future.done():
+            cls.waiters.remove(waiter)
+            waiter.future.cancel()
+            raise cls._reject(tenant, "timeout")
+
+        cls.wait_times.append(time.monotonic() - start)
+        return AdmissionSlot(tenant)
+
+    @classmethod
+    def _free(cls, tenant: str) -> None:
+        cls.active -= 1
+        cls.active_per_tenant[tenant] -= 1
+        if cls.active_per_tenant[tenant] <= 0:
+            del cls.active_per_tenant[tenant]
+        cls._admit_waiters()
+
+    @classmethod
+    def release(cls, slot: AdmissionSlot) -> None:
+        duration = time.monotonic() - slot.admitted_at
+        cls.service_seconds = (
+            duration if not cls.service_seconds else 0.9 * cls.service_seconds + 0.1 * duration
+        )
+        cls._free(slot.tenant)
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        def percentile(p: float) -> float:
+            return round((cls.wait_times.percentile(p) or 0.0) * 1000, 1)
+
+        return {
+            "enabled": settings.ADMISSION_CONTROL_ENABLED,
+            "max_concurrent_requests": settings.ADMISSION_MAX_CONCURRENT_REQUESTS,
+            "max_concurrent_requests_per_tenant": (
+                settings.ADMISSION_MAX_CONCURRENT_REQUESTS_PER_TENANT
+            ),
+            "active": cls.active,
+            "queue_depth": len(cls.waiters),
+            "max_queue_depth": cls.max_queue_depth,
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p99": percentile(0.99),
+            "service_seconds": round(cls.service_seconds, 3),
+            **cls.counters,
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        for waiter in cls.waiters:
+            waiter.future.cancel()
+        cls.active = 0
+        cls.active_per_tenant = Counter()
+        cls.waiters = deque()
+        cls.counters = Counter()
+        cls.wait_times = RollingWindow(WAIT_TIME_WINDOW)
+        cls.max_queue_depth = 0
+        cls.service_seconds = 0.0
+
+
+async def release_when_done(
+    event_chunks: AsyncIterator[T], slot: AdmissionSlot
+) -> AsyncIterator[T]:
+    """
+    Hold `slot` while a streamed response is produced.
+    """
+    try:
+        async for chunk in event_chunks:
+            yield chunk
+    finally:
+        slot.release()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +10,17 @@ class Settings(BaseSettings):
 
     MAX_TOOL_CALL_LIMIT: int = 3
     MAX_VALIDATION_RETRY_COUNT: int = 2
+    THOROUGH_VALIDATION_RETRY_COUNT: int = 4
+    REQUEST_DEADLINE_SECONDS: float = 300.0
+    REQUEST_DISCONNECT_POLL_SECONDS: float = 0.5
+
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENT_REQUESTS: int = 32
+    ADMISSION_MAX_CONCURRENT_REQUESTS_PER_TENANT: int = 8
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    DEFAULT_LATENCY_MODE: Literal["fast", "balanced", "thorough"] = "balanced"
+    MULTI_DATASET_PARALLEL_SUBQUERIES: bool = True
     MAX_VIZ_TOOL_CALLS: int = 5
 
     CORS_ORIGINS: list[str] = ["*"]
@@ -42,13 +55,84 @@ class Settings(BaseSettings):
     OPENROUTER_API_KEY: str = ""
     OPENROUTER_BASE_URL: str = ""
 
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    # Ask for token usage on streamed responses, for prompt cache instrumentation.
+    LLM_STREAM_USAGE: bool = True
+
+    # Client-side rate limits per (gateway, model); 0 means unlimited.
+    LLM_RATE_LIMIT_RPM: int = 0
+    LLM_RATE_LIMIT_TPM: int = 0
+    # Per-model overrides, e.g. {"gpt-4o": {"rpm": 500, "tpm": 30000}}.
+    LLM_RATE_LIMITS: dict[str, dict[str, int]] = {}
+    LLM_RATE_LIMIT_BURST_SECONDS: float = 10.0
+
+    # Hedged LLM requests: a second request goes to LLM_HEDGE_MODEL (or the same
+    # model) on LLM_HEDGE_GATEWAY_PROVIDER (or the same gateway) when the first
+    # has not responded by the node's latency percentile.
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 0.95
+    # Per-node overrides, e.g. {"plan_query": 0.9}; 0 disables hedging for a node.
+    LLM_HEDGE_PERCENTILES: dict[str, float] = {}
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MODEL: str = ""
+    LLM_HEDGE_GATEWAY_PROVIDER: str = ""
+
+    # Per-call model tier routing for nodes with adaptive=True in NODE_CONFIGS.
+    MODEL_ROUTING_ENABLED: bool = True
+    MODEL_ROUTING_SIMPLE_QUERY_WORDS: int = 20
+    MODEL_ROUTING_SIMPLE_PROMPT_TOKENS: int = 8000
+    MODEL_ROUTING_LATENCY_SLO_SECONDS: float = 20.0
+    # Per-node overrides, e.g. {"process_query": 10.0}.
+    MODEL_ROUTING_LATENCY_SLOS: dict[str, float] = {}
+    MODEL_ROUTING_MAX_ERROR_RATE: float = 0.2
+    MODEL_ROUTING_MIN_SAMPLES: int = 20
+
+    LLM_RESPONSE_CACHE_ENABLED: bool = False
+    LLM_RESPONSE_CACHE_BACKEND: Literal["memory", "disk"] = "memory"
+    LLM_RESPONSE_CACHE_TTL_SECONDS: float = 3600.0
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    LLM_RESPONSE_CACHE_DIR: str = ".llm_response_cache"
+
+    SEMANTIC_ANSWER_CACHE_ENABLED: bool = False
+    SEMANTIC_ANSWER_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_ANSWER_CACHE_TTL_SECONDS: float = 86400.0
+    SEMANTIC_ANSWER_CACHE_MAX_ENTRIES_PER_SCOPE: int = 256
+    SEMANTIC_ANSWER_CACHE_REEXECUTE: bool = True
+
+    SCHEMA_PREFETCH_ENABLED: bool = True
+    SCHEMA_PREFETCH_MIN_SIMILARITY: float = 0.6
+    SCHEMA_PREFETCH_WAIT_SECONDS: float = 1.0
+
+    # plan_query shows wide tables pruned to the columns relevant to the subquery
+    SCHEMA_PRUNING_ENABLED: bool = True
+    SCHEMA_PRUNING_MAX_COLUMNS: int = 30
+    SCHEMA_PRUNING_TOKEN_BUDGET: int = 4000
+
+    PROGRESS_MESSAGE_LLM_ENABLED: bool = False
+    PROGRESS_MESSAGE_LLM_TIMEOUT: float = 2.0
+
+    STREAM_COALESCE_WINDOW_SECONDS: float = 0.02
+    STREAM_COALESCE_MAX_BYTES: int = 1024
+    # Chunks read ahead of a slow client before the graph waits for it
+    STREAM_COALESCE_QUEUE_SIZE: int = 64
+
     LANGSMITH_PROMPT: bool = False
     LANGSMITH_API_KEY: str = ""
+    LANGSMITH_PROMPT_TTL_SECONDS: float = 300.0
+    LANGSMITH_PROMPT_RETRY_SECONDS: float = 30.0
+    LANGSMITH_PROMPT_VERSIONS: dict[str, str] = {}
 
     QDRANT_HOST: str = "host.docker.local"
     QDRANT_COLLECTION: str = "dataset_collection"
+    # Vector size of a new collection; a reindex sizes its collection from the model
+    QDRANT_VECTOR_SIZE: int = 3072
     QDRANT_PORT: int = 6333
     QDRANT_TOP_K: int = 5
+    QDRANT_REINDEX_BATCH_SIZE: int = 256
+    QDRANT_REINDEX_MAX_CONCURRENT_JOBS: int = 1
+    QDRANT_REINDEX_CHECKPOINT_DIR: str = ".reindex_checkpoints"
 
     GOPIE_API_ENDPOINT: str = ""
 
@@ -83,6 +167,23 @@ class Settings(BaseSettings):
     CHAT_HISTORY_MAX_MESSAGES: int = 20
     CHAT_HISTORY_MAX_TOKENS: int = 8000
 
+    # Rolling summary of the history beyond the window, built after the response
+    CHAT_SUMMARY_ENABLED: bool = True
+    CHAT_SUMMARY_MIN_NEW_MESSAGES: int = 6
+    CHAT_SUMMARY_MAX_TOKENS: int = 600
+    CHAT_SUMMARY_MAX_CHATS: int = 1000
+
+    # Per-chat state kept between requests; "file" persists it to CONVERSATION_STATE_DIR
+    CONVERSATION_STATE_ENABLED: bool = True
+    CONVERSATION_STATE_MAX_CHATS: int = 1000
+    CONVERSATION_STATE_BACKEND: str = ""
+    CONVERSATION_STATE_DIR: str = ".conversation_state"
+
+    # "tiktoken" (with TOKENIZER_ENCODING) or "heuristic" character estimates
+    TOKENIZER: str = "tiktoken"
+    TOKENIZER_ENCODING: str = "o200k_base"
+    TOKEN_COUNT_CACHE_SIZE: int = 10000
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore", case_sensitive=True)
 
 
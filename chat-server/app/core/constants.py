@@ -9,3 +9,7 @@ VISUALIZATION_RESULT = "visualization_result"
 SQL_QUERIES_GENERATED_ARG = "queries"
 DATASETS_USED_ARG = "datasets"
 VISUALIZATION_RESULT_ARG = "s3_paths"
+
+
+# Custom event carrying a complete, pre-computed message (see MessageEventData)
+MESSAGE_EVENT = "gopie-message"
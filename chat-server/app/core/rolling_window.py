@@ -0,0 +1,42 @@
+import math
+from collections import deque
+from typing import Hashable
+
+
+class RollingWindow:
+    """
+    The last `size` samples of a measurement, with nearest-rank percentiles.
+    """
+
+    def __init__(self, size: int):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def append(self, sample: float) -> None:
+        self.samples.append(sample)
+
+    def percentile(self, p: float) -> float | None:
+        """
+        Nearest-rank `p` (0-1) percentile of the samples, None while there are none.
+        """
+        if not self.samples:
+            return None
+        samples = sorted(self.samples)
+        index = min(len(samples) - 1, math.ceil(p * len(samples)) - 1)
+        return samples[max(index, 0)]
+
+
+class RollingWindows(dict[Hashable, RollingWindow]):
+    """
+    Rolling windows of `size` samples per key, created on first use.
+    """
+
+    def __init__(self, size: int):
+        super().__init__()
+        self.size = size
+
+    def __missing__(self, key: Hashable) -> RollingWindow:
+        window = self[key] = RollingWindow(self.size)
+        return window
@@ -8,12 +8,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.routers.dataset_upload import (
     dataset_router as schema_upload_router,
 )
+from app.api.v1.routers.metrics import metrics_router
 from app.api.v1.routers.query import router as query_router
 from app.core.config import settings
 from app.core.log import logger, setup_logger
 from app.core.session import SingletonAiohttp
 from app.services.qdrant.qdrant_setup import QdrantSetup
+from app.services.qdrant.schema_reindex import SchemaReindexer
+from app.utils.chat_history.summarizer import ConversationSummaries
+from app.utils.graph_utils.answer_cache import SemanticAnswerCache
 from app.utils.graph_utils.generate_graph import visualize_graph
+from app.utils.langsmith.prompt_registry import PromptRegistry
+from app.utils.model_registry.client_pool import ClientPool
+from app.utils.model_registry.output_specs import warm_up_output_specs
+from app.utils.model_registry.token_counter import TokenCounter
+from app.workflow.prompts.prompt_selector import PromptSelector
 
 
 @asynccontextmanager
@@ -21,13 +30,22 @@ async def lifespan(app: FastAPI):
     SingletonAiohttp.get_aiohttp_client()
     await QdrantSetup.get_async_client()
     QdrantSetup.get_sync_client()
+    warm_up_output_specs()
+    await TokenCounter.warm_up()
+    if settings.LANGSMITH_PROMPT:
+        PromptRegistry.warm_up(PromptSelector().prompt_map)
     try:
         setup_logger()
         visualize_graph()
     except Exception as e:
         logger.error(f"Failed to generate graph visualization: {e}")
     yield
+    await SchemaReindexer.cancel_all()
+    await ConversationSummaries.cancel_all()
+    await SemanticAnswerCache.cancel_all()
+    await PromptRegistry.close()
     await QdrantSetup.close_clients()
+    await ClientPool.close()
     await SingletonAiohttp.close_aiohttp_client()
 
 
@@ -58,6 +76,7 @@ app.add_middleware(
 
 app.include_router(query_router, prefix=settings.API_V1_STR, tags=["query"])
 app.include_router(schema_upload_router, prefix=settings.API_V1_STR, tags=["upload_schema"])
+app.include_router(metrics_router, prefix=settings.API_V1_STR, tags=["metrics"])
 
 
 def start():
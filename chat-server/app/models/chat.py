@@ -15,6 +15,11 @@ class NodeEventConfig(BaseModel):
     progress_message: str = "Processing..."
 
 
+class MessageEventData(BaseModel):
+    role: Role
+    content: str
+
+
 class ExtraData(BaseModel):
     name: str
     args: dict[str, Any]
@@ -148,12 +148,14 @@ class QueryResult:
     def has_subqueries(self) -> bool:
         return len(self.subqueries) > 0
 
-    def add_error_message(self, error_message: str, error_origin_type: str):
-        self.subqueries[-1].add_error_message(error_message, error_origin_type)
+    def add_error_message(
+        self, error_message: str, error_origin_type: str, subquery_index: int = -1
+    ):
+        self.subqueries[subquery_index].add_error_message(error_message, error_origin_type)
 
-    def set_node_message(self, node_name: str, node_message: Any):
+    def set_node_message(self, node_name: str, node_message: Any, subquery_index: int = -1):
         if self.has_subqueries():
-            self.subqueries[-1].node_messages[node_name] = node_message
+            self.subqueries[subquery_index].node_messages[node_name] = node_message
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -1,3 +1,5 @@
+from enum import Enum
+
 from langchain_core.messages import BaseMessage
 from pydantic import BaseModel, Field
 
@@ -12,6 +14,12 @@ class UploadSchemaRequest(BaseModel):
     dataset_id: str
 
 
+class LatencyMode(str, Enum):
+    FAST = "fast"
+    BALANCED = "balanced"
+    THOROUGH = "thorough"
+
+
 class QueryRequest(BaseModel):
     messages: list[BaseMessage]
     project_ids: list[str] | None = None
@@ -20,3 +28,23 @@ class QueryRequest(BaseModel):
     chat_id: str | None = None
     trace_id: str | None = None
     model_id: str | None = None
+    latency_mode: LatencyMode | None = None
+
+
+class ProjectSchemaRequest(BaseModel):
+    project_id: str
+
+
+class ReindexSchemaRequest(BaseModel):
+    project_id: str | None = Field(
+        default=None, description="Project to reindex, all projects when omitted"
+    )
+
+
+class ReindexResponse(BaseModel):
+    job_id: str
+    status: str
+    project_id: str | None = None
+    embedding_model: str
+    processed: int = 0
+    error: str | None = None
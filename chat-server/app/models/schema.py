@@ -12,6 +12,7 @@ class ConfigSchema(TypedDict):
     chat_id: str
     chat_history: list[BaseMessage]
     user: str
+    latency_mode: str
 
 
 PossibleNumberType = Optional[Union[float, int, str]]
@@ -104,8 +105,11 @@ class DatasetSchema(BaseModel):
         self,
         fields_to_exclude: list[Literal["dataset_custom_prompt", "project_custom_prompt"]] = [],
         columns_fields_to_exclude: list[ColumnFieldsToExclude] = [],
+        columns: list[ColumnSchema] | None = None,
     ):
-        columns = self.columns or []
+        total_columns = len(self.columns or [])
+        if columns is None:
+            columns = self.columns or []
         text = f"- Name: {self.name}\n"
         text += f"- Table Name (for SQL): {self.dataset_name}\n"
         text += f"- Description: {self.dataset_description}\n"
@@ -114,7 +118,12 @@ class DatasetSchema(BaseModel):
             custom_instructions += f"{self.dataset_custom_prompt}\n"
         if custom_instructions:
             text += f"- Dataset Specific Instructions:\n{custom_instructions}\n"
-        text += f"COLUMNS ({len(columns)} total):\n"
+        if len(columns) < total_columns:
+            text += (
+                f"COLUMNS ({len(columns)} of {total_columns} shown, most relevant to the query):\n"
+            )
+        else:
+            text += f"COLUMNS ({len(columns)} total):\n"
         for i, column in enumerate(columns, 1):
             text += f"{i}. {column.format_for_prompt(columns_fields_to_exclude)}\n"
         return text
@@ -6,6 +6,7 @@ from langsmith import traceable
 from app.core.config import settings
 from app.core.log import logger
 from app.core.session import SingletonAiohttp
+from app.utils.graph_utils.request_deadline import with_deadline
 from app.utils.graph_utils.result_validation import (
     is_result_too_large,
     truncate_result_for_llm,
@@ -31,13 +32,16 @@ async def execute_sql(query: str) -> SQL_RESPONSE_TYPE:
 
     http_session = SingletonAiohttp.get_aiohttp_client()
 
-    async with http_session.post(SQL_API_ENDPOINT, json=payload) as response:
-        if response.status != HTTPStatus.OK:
-            error_data = await response.json()
-            logger.error(error_data.get("error", "Unknown error"))
-            raise Exception(error_data.get("error", "Unknown error"))
+    async def post_query() -> dict:
+        async with http_session.post(SQL_API_ENDPOINT, json=payload) as response:
+            if response.status != HTTPStatus.OK:
+                error_data = await response.json()
+                logger.error(error_data.get("error", "Unknown error"))
+                raise Exception(error_data.get("error", "Unknown error"))
 
-        result_data = await response.json()
+            return await response.json()
+
+    result_data = await with_deadline(post_query())
 
     result = result_data["data"]
     return result
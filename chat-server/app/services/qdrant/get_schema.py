@@ -8,6 +8,7 @@ from app.core.config import settings
 from app.core.log import logger
 from app.models.schema import DatasetSchema
 from app.services.qdrant.qdrant_setup import QdrantSetup
+from app.utils.graph_utils.request_deadline import with_deadline
 
 
 @traceable(run_type="tool", name="get_schema_from_qdrant")
@@ -34,10 +35,12 @@ async def get_schema_from_qdrant(dataset_id: str) -> Optional[DatasetSchema]:
             )
 
         if filter_conditions:
-            search_result = await client.scroll(
-                collection_name=settings.QDRANT_COLLECTION,
-                scroll_filter=Filter(should=filter_conditions),
-                limit=1,
+            search_result = await with_deadline(
+                client.scroll(
+                    collection_name=settings.QDRANT_COLLECTION,
+                    scroll_filter=Filter(should=filter_conditions),
+                    limit=1,
+                )
             )
 
         if not search_result[0][0]:
@@ -85,10 +88,12 @@ async def get_schema_by_dataset_ids(
                 )
             )
 
-        search_result = await client.scroll(
-            collection_name=settings.QDRANT_COLLECTION,
-            scroll_filter=Filter(should=filter_conditions),
-            limit=len(dataset_ids),
+        search_result = await with_deadline(
+            client.scroll(
+                collection_name=settings.QDRANT_COLLECTION,
+                scroll_filter=Filter(should=filter_conditions),
+                limit=len(dataset_ids),
+            )
         )
 
         schemas = []
@@ -131,10 +136,12 @@ async def get_project_schema(project_id: str) -> Optional[DatasetSchema]:
                 match=MatchValue(value=project_id),
             )
         ]
-        points, _ = await client.scroll(
-            collection_name=settings.QDRANT_COLLECTION,
-            scroll_filter=Filter(should=filter_conditions),
-            limit=1,
+        points, _ = await with_deadline(
+            client.scroll(
+                collection_name=settings.QDRANT_COLLECTION,
+                scroll_filter=Filter(should=filter_conditions),
+                limit=1,
+            )
         )
         for point in points:
             payload = point.payload
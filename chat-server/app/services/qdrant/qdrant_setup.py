@@ -1,15 +1,35 @@
+import re
+import time
 from uuid import UUID, uuid5
 
 from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import QdrantVectorStore
 from qdrant_client import AsyncQdrantClient, QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client.http.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    Distance,
+    VectorParams,
+)
 
 from app.core.config import settings
 
 UUID_NAMESPACE = UUID("3896d314-1e95-4a3a-b45a-945f9f0b541d")
 
 
+def get_collection_prefix(alias_name: str, embedding_model: str) -> str:
+    model = re.sub(r"[^a-z0-9]+", "_", embedding_model.lower()).strip("_")
+    return f"{alias_name}__{model}__"
+
+
+def get_versioned_collection_name(alias_name: str, embedding_model: str) -> str:
+    """
+    Name of a new collection behind the `alias_name` alias for the schemas
+    embedded with `embedding_model`.
+    """
+    return f"{get_collection_prefix(alias_name, embedding_model)}{int(time.time())}"
+
+
 class QdrantSetup:
     async_client: AsyncQdrantClient | None = None
     sync_client: QdrantClient | None = None
@@ -27,9 +47,15 @@ class QdrantSetup:
             )
 
             if not await cls._async_collection_exists(cls.async_client):
+                collection_name = cls._get_initial_collection_name()
                 await cls.async_client.create_collection(
-                    collection_name=settings.QDRANT_COLLECTION,
-                    vectors_config=VectorParams(size=3072, distance=Distance.COSINE),
+                    collection_name=collection_name,
+                    vectors_config=VectorParams(
+                        size=settings.QDRANT_VECTOR_SIZE, distance=Distance.COSINE
+                    ),
+                )
+                await cls.async_client.update_collection_aliases(
+                    change_aliases_operations=cls._create_alias_operations(collection_name)
                 )
         return cls.async_client
 
@@ -41,31 +67,65 @@ class QdrantSetup:
                 check_compatibility=False,
             )
             if not cls._collection_exists(cls.sync_client):
+                collection_name = cls._get_initial_collection_name()
                 cls.sync_client.create_collection(
-                    collection_name=settings.QDRANT_COLLECTION,
-                    vectors_config=VectorParams(size=3072, distance=Distance.COSINE),
+                    collection_name=collection_name,
+                    vectors_config=VectorParams(
+                        size=settings.QDRANT_VECTOR_SIZE, distance=Distance.COSINE
+                    ),
+                )
+                cls.sync_client.update_collection_aliases(
+                    change_aliases_operations=cls._create_alias_operations(collection_name)
                 )
         return cls.sync_client
 
     @classmethod
-    def get_vector_store(cls, embeddings: OpenAIEmbeddings) -> QdrantVectorStore:
+    def get_vector_store(
+        cls,
+        embeddings: OpenAIEmbeddings,
+        collection_name: str = settings.QDRANT_COLLECTION,
+    ) -> QdrantVectorStore:
         client = cls.get_sync_client()
         return QdrantVectorStore(
             client=client,
-            collection_name=settings.QDRANT_COLLECTION,
+            collection_name=collection_name,
             embedding=embeddings,
         )
 
+    @classmethod
+    def _get_initial_collection_name(cls) -> str:
+        # Searches and writes go through the QDRANT_COLLECTION alias, so a full
+        # reindex can swap in a new collection without deleting the live one.
+        return get_versioned_collection_name(
+            settings.QDRANT_COLLECTION, settings.DEFAULT_EMBEDDING_MODEL
+        )
+
+    @classmethod
+    def _create_alias_operations(cls, collection_name: str) -> list[CreateAliasOperation]:
+        return [
+            CreateAliasOperation(
+                create_alias=CreateAlias(
+                    collection_name=collection_name,
+                    alias_name=settings.QDRANT_COLLECTION,
+                )
+            )
+        ]
+
     @classmethod
     def _collection_exists(cls, client: QdrantClient) -> bool:
+        # QDRANT_COLLECTION is an alias, or a plain collection created before aliases.
         collections = client.get_collections().collections
+        aliases = client.get_aliases().aliases
         collection_names = [collection.name for collection in collections]
+        collection_names += [alias.alias_name for alias in aliases]
         return settings.QDRANT_COLLECTION in collection_names
 
     @classmethod
     async def _async_collection_exists(cls, client: AsyncQdrantClient) -> bool:
         collections = (await client.get_collections()).collections
+        aliases = (await client.get_aliases()).aliases
         collection_names = [collection.name for collection in collections]
+        collection_names += [alias.alias_name for alias in aliases]
         return settings.QDRANT_COLLECTION in collection_names
 
     @classmethod
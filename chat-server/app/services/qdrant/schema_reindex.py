@@ -0,0 +1,392 @@
+import asyncio
+import json
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from pathlib import Path
+from uuid import uuid5
+
+from langchain_core.embeddings import Embeddings
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PointStruct,
+    VectorParams,
+)
+
+from app.core.config import settings
+from app.core.log import logger
+from app.services.qdrant.qdrant_setup import (
+    UUID_NAMESPACE,
+    QdrantSetup,
+    get_collection_prefix,
+    get_versioned_collection_name,
+)
+from app.utils.chat_history.state_store import ConversationStore
+from app.utils.graph_utils.answer_cache import SemanticAnswerCache
+from app.utils.model_registry.model_provider import get_model_provider
+
+# Embedded to learn the vector size of the embedding model a full reindex switches to.
+VECTOR_SIZE_PROBE = "dataset schema"
+
+
+class ReindexStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class ReindexCheckpoint:
+    """
+    Progress of a reindex job. Persisted after every batch so that an
+    interrupted job resumes from the last scrolled offset, into the same
+    `target_collection`.
+    """
+
+    job_id: str
+    project_id: str | None
+    embedding_model: str
+    status: ReindexStatus = ReindexStatus.PENDING
+    offset: int | str | None = None
+    processed: int = 0
+    error: str | None = None
+    target_collection: str | None = None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "status": self.status.value}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReindexCheckpoint":
+        return cls(**{**data, "status": ReindexStatus(data["status"])})
+
+
+@dataclass
+class ConcurrentWrites:
+    """
+    Schema writes made by requests while a reindex job runs. The job skips the
+    points they touched, so it never overwrites them with the copy it scrolled
+    earlier. Writes also go to `collection_name` when the job builds a new
+    collection, None when it refreshes the live one in place.
+    """
+
+    collection_name: str | None = None
+    point_ids: set[str] = field(default_factory=set)
+    project_ids: set[str] = field(default_factory=set)
+
+    def touched(self, point) -> bool:
+        metadata = (point.payload or {}).get("metadata") or {}
+        return str(point.id) in self.point_ids or metadata.get("project_id") in self.project_ids
+
+
+def get_reindex_job_id(project_id: str | None, embedding_model: str) -> str:
+    return str(uuid5(UUID_NAMESPACE, f"reindex_{project_id or '*'}_{embedding_model}"))
+
+
+def _checkpoint_path(job_id: str) -> Path:
+    return Path(settings.QDRANT_REINDEX_CHECKPOINT_DIR) / f"{job_id}.json"
+
+
+def load_checkpoint(job_id: str) -> ReindexCheckpoint | None:
+    path = _checkpoint_path(job_id)
+    if not path.exists():
+        return None
+    try:
+        return ReindexCheckpoint.from_dict(json.loads(path.read_text()))
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable reindex checkpoint {path}: {e!s}")
+        return None
+
+
+def save_checkpoint(checkpoint: ReindexCheckpoint) -> None:
+    path = _checkpoint_path(checkpoint.job_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(checkpoint.to_dict()))
+
+
+async def get_live_collection(client: AsyncQdrantClient) -> str | None:
+    """
+    Collection the QDRANT_COLLECTION alias points to, None while QDRANT_COLLECTION
+    is still a plain collection created before aliases.
+    """
+    aliases = (await client.get_aliases()).aliases
+    return next(
+        (
+            alias.collection_name
+            for alias in aliases
+            if alias.alias_name == settings.QDRANT_COLLECTION
+        ),
+        None,
+    )
+
+
+async def swap_collection_alias(client: AsyncQdrantClient, collection_name: str) -> None:
+    """
+    Point the QDRANT_COLLECTION alias at `collection_name` and drop the collection
+    it replaces.
+    """
+    alias_name = settings.QDRANT_COLLECTION
+    previous = await get_live_collection(client)
+
+    operations: list[CreateAliasOperation | DeleteAliasOperation] = []
+    if previous:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias_name)))
+    operations.append(
+        CreateAliasOperation(
+            create_alias=CreateAlias(collection_name=collection_name, alias_name=alias_name)
+        )
+    )
+    # Deleting and creating the alias in one request swaps it atomically.
+    await client.update_collection_aliases(change_aliases_operations=operations)
+
+    if previous and previous != collection_name:
+        await client.delete_collection(previous)
+
+
+async def _get_target_collection(
+    client: AsyncQdrantClient, checkpoint: ReindexCheckpoint, embeddings: Embeddings
+) -> str:
+    """
+    Collection the job writes its vectors to.
+
+    A full reindex builds a new collection sized for the embedding model, so
+    searches keep using the live one until the job completes. A project reindex
+    refreshes the project's points in place, which only keeps a single model in
+    the collection if the live collection was built with the same model.
+    """
+    live_collection = await get_live_collection(client)
+    if live_collection is None:
+        raise ValueError(
+            f"Collection '{settings.QDRANT_COLLECTION}' predates collection aliases and "
+            "cannot be reindexed without deleting it; recreate it to enable reindexing"
+        )
+
+    if checkpoint.project_id:
+        prefix = get_collection_prefix(settings.QDRANT_COLLECTION, checkpoint.embedding_model)
+        if not live_collection.startswith(prefix):
+            raise ValueError(
+                f"Collection '{settings.QDRANT_COLLECTION}' was not built with embedding "
+                f"model '{checkpoint.embedding_model}'; switching models needs a full "
+                "reindex without a project_id"
+            )
+        return settings.QDRANT_COLLECTION
+
+    if checkpoint.target_collection is None:
+        checkpoint.target_collection = get_versioned_collection_name(
+            settings.QDRANT_COLLECTION, checkpoint.embedding_model
+        )
+    elif checkpoint.job_id not in SchemaReindexer.writes:
+        # Writes made while no process tracked the job only reached the live
+        # collection, so the copy starts over.
+        await client.delete_collection(checkpoint.target_collection)
+        checkpoint.offset = None
+        checkpoint.processed = 0
+
+    if not await client.collection_exists(checkpoint.target_collection):
+        vector_size = len(await embeddings.aembed_query(VECTOR_SIZE_PROBE))
+        await client.create_collection(
+            collection_name=checkpoint.target_collection,
+            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+        )
+    return checkpoint.target_collection
+
+
+async def reindex_schemas(
+    checkpoint: ReindexCheckpoint,
+    batch_size: int = settings.QDRANT_REINDEX_BATCH_SIZE,
+) -> ReindexCheckpoint:
+    """
+    Re-embed the page content of stored schemas with the current embedding model.
+
+    Points are streamed out of the live collection with scroll pagination,
+    embedded in batches and upserted into the target collection without waiting
+    for indexing, except for the last batch. Points that requests wrote or
+    deleted since the job started are skipped, as those writes already reached
+    the target collection. The checkpoint is saved after every batch so the job
+    can be resumed from where it stopped. A full reindex then swaps the
+    QDRANT_COLLECTION alias to the new collection.
+
+    Args:
+        checkpoint: The job checkpoint to start (or resume) from.
+        batch_size: Number of points scrolled and embedded per batch.
+
+    Returns:
+        The final checkpoint of the job.
+    """
+    client = await QdrantSetup.get_async_client()
+    embeddings = get_model_provider().get_embeddings_model()
+
+    scroll_filter = None
+    if checkpoint.project_id:
+        scroll_filter = Filter(
+            must=[
+                FieldCondition(
+                    key="metadata.project_id",
+                    match=MatchValue(value=checkpoint.project_id),
+                )
+            ]
+        )
+
+    target_collection = await _get_target_collection(client, checkpoint, embeddings)
+    writes = SchemaReindexer.writes.setdefault(
+        checkpoint.job_id,
+        ConcurrentWrites(None if checkpoint.project_id else target_collection),
+    )
+    checkpoint.status = ReindexStatus.RUNNING
+    save_checkpoint(checkpoint)
+
+    try:
+        while True:
+            points, next_offset = await client.scroll(
+                collection_name=settings.QDRANT_COLLECTION,
+                scroll_filter=scroll_filter,
+                limit=batch_size,
+                offset=checkpoint.offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+
+            points = [point for point in points if (point.payload or {}).get("page_content")]
+            if points:
+                texts = [point.payload["page_content"] for point in points]  # type: ignore
+                vectors = await embeddings.aembed_documents(texts)
+
+                await client.upsert(
+                    collection_name=target_collection,
+                    points=[
+                        PointStruct(id=point.id, vector=vector, payload=point.payload)
+                        for point, vector in zip(points, vectors)
+                        if not writes.touched(point)
+                    ],
+                    # Updates apply in order, so the last one completing means all did.
+                    wait=next_offset is None,
+                )
+                checkpoint.processed += len(points)
+
+            checkpoint.offset = next_offset
+            save_checkpoint(checkpoint)
+
+            if next_offset is None:
+                break
+
+        if not checkpoint.project_id:
+            await swap_collection_alias(client, target_collection)
+            SchemaReindexer.writes.pop(checkpoint.job_id, None)
+    finally:
+        # A failed full job keeps receiving writes, so it can resume into its collection.
+        if checkpoint.project_id:
+            SchemaReindexer.writes.pop(checkpoint.job_id, None)
+
+    checkpoint.status = ReindexStatus.COMPLETED
+    return checkpoint
+
+
+class SchemaReindexer:
+    """
+    Runs reindex jobs as bounded background tasks.
+
+    At most one job runs per (project, embedding model) scope and at most
+    QDRANT_REINDEX_MAX_CONCURRENT_JOBS jobs run at the same time. Jobs are only
+    held in memory while they run; finished ones are read from their checkpoint.
+    """
+
+    jobs: dict[str, ReindexCheckpoint] = {}
+    tasks: dict[str, asyncio.Task] = {}
+    semaphore: asyncio.Semaphore | None = None
+    writes: dict[str, ConcurrentWrites] = {}
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        if cls.semaphore is None:
+            cls.semaphore = asyncio.Semaphore(settings.QDRANT_REINDEX_MAX_CONCURRENT_JOBS)
+        return cls.semaphore
+
+    @classmethod
+    def start(cls, project_id: str | None = None) -> ReindexCheckpoint:
+        embedding_model = settings.DEFAULT_EMBEDDING_MODEL
+        job_id = get_reindex_job_id(project_id, embedding_model)
+
+        task = cls.tasks.get(job_id)
+        if task and not task.done():
+            return cls.jobs[job_id]
+
+        checkpoint = load_checkpoint(job_id)
+        if checkpoint is None or checkpoint.status == ReindexStatus.COMPLETED:
+            checkpoint = ReindexCheckpoint(
+                job_id=job_id,
+                project_id=project_id,
+                embedding_model=embedding_model,
+            )
+        else:
+            logger.info(f"Resuming reindex job {job_id} after {checkpoint.processed} points")
+            checkpoint.status = ReindexStatus.PENDING
+            checkpoint.error = None
+
+        cls.jobs[job_id] = checkpoint
+        task = asyncio.create_task(cls._run(checkpoint))
+        cls.tasks[job_id] = task
+        task.add_done_callback(lambda _: cls._remove(job_id, task))
+        return checkpoint
+
+    @classmethod
+    def _remove(cls, job_id: str, task: asyncio.Task) -> None:
+        if cls.tasks.get(job_id) is task:
+            del cls.tasks[job_id]
+            cls.jobs.pop(job_id, None)
+
+    @classmethod
+    def get_target_collections(cls) -> list[str]:
+        """
+        Collections being built by full reindex jobs, which schema writes must
+        also reach until the alias is swapped to them.
+        """
+        return [writes.collection_name for writes in cls.writes.values() if writes.collection_name]
+
+    @classmethod
+    def record_write(cls, point_id: str | None = None, project_id: str | None = None) -> None:
+        """
+        Record a schema write (or delete) of a point, or of all of a project's
+        points, so running jobs do not overwrite it with an older copy.
+        """
+        for writes in cls.writes.values():
+            if point_id:
+                writes.point_ids.add(point_id)
+            if project_id:
+                writes.project_ids.add(project_id)
+
+    @classmethod
+    def get_status(cls, job_id: str) -> ReindexCheckpoint | None:
+        return cls.jobs.get(job_id) or load_checkpoint(job_id)
+
+    @classmethod
+    async def _run(cls, checkpoint: ReindexCheckpoint) -> None:
+        async with cls._get_semaphore():
+            try:
+                await reindex_schemas(checkpoint)
+                # Kept so the job's status can still be looked up.
+                save_checkpoint(checkpoint)
+                SemanticAnswerCache.invalidate(checkpoint.project_id)
+                ConversationStore.invalidate_schemas(checkpoint.project_id)
+                logger.info(
+                    f"Reindex job {checkpoint.job_id} completed: "
+                    f"{checkpoint.processed} points re-embedded"
+                )
+            except Exception as e:
+                checkpoint.status = ReindexStatus.FAILED
+                checkpoint.error = str(e)
+                save_checkpoint(checkpoint)
+                logger.error(f"Reindex job {checkpoint.job_id} failed: {e!s}")
+
+    @classmethod
+    async def cancel_all(cls) -> None:
+        for task in cls.tasks.values():
+            task.cancel()
+        await asyncio.gather(*cls.tasks.values(), return_exceptions=True)
+        cls.tasks = {}
@@ -1,4 +1,10 @@
 from langchain_core.documents import Document
+from qdrant_client.http.models import (
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    MatchValue,
+)
 
 from app.core.config import settings
 from app.core.log import logger
@@ -10,7 +16,10 @@ from app.services.gopie.dataset_info import (
 )
 from app.services.gopie.sql_executor import SQL_RESPONSE_TYPE
 from app.services.qdrant.qdrant_setup import QdrantSetup
+from app.services.qdrant.schema_reindex import SchemaReindexer
 from app.services.qdrant.vector_store import add_document_to_vector_store
+from app.utils.chat_history.state_store import ConversationStore
+from app.utils.graph_utils.answer_cache import SemanticAnswerCache
 from app.utils.graph_utils.col_description_generator import (
     generate_column_descriptions,
 )
@@ -43,6 +52,8 @@ async def store_schema_in_qdrant(
         )
 
         await add_document_to_vector_store(document=document)
+        SemanticAnswerCache.invalidate(dataset_schema.project_id)
+        ConversationStore.invalidate_schemas(dataset_schema.project_id)
 
         logger.debug("Schema indexing task created successfully")
         return True
@@ -73,10 +84,17 @@ async def delete_schema_from_qdrant(
     try:
         client = await QdrantSetup.get_async_client()
         document_id = QdrantSetup.get_document_id(project_id, dataset_id)
-        await client.delete(
-            collection_name=settings.QDRANT_COLLECTION,
-            points_selector=[document_id],
-        )
+        SchemaReindexer.record_write(point_id=document_id)
+        for collection_name in [
+            settings.QDRANT_COLLECTION,
+            *SchemaReindexer.get_target_collections(),
+        ]:
+            await client.delete(
+                collection_name=collection_name,
+                points_selector=[document_id],
+            )
+        SemanticAnswerCache.invalidate(project_id)
+        ConversationStore.invalidate_schemas(project_id)
 
         logger.debug(
             f"Successfully deleted schema for project_id={project_id}, " f"dataset_id={dataset_id}"
@@ -86,3 +104,44 @@ async def delete_schema_from_qdrant(
     except Exception as e:
         logger.error(f"Error deleting schema from Qdrant: {e!s}")
         return False
+
+
+async def delete_project_schemas_from_qdrant(project_id: str) -> bool:
+    """
+    Delete every schema belonging to a project from Qdrant vector database.
+
+    Args:
+        project_id: The ID of the project whose dataset schemas should be deleted.
+
+    Returns:
+        bool: True if deletion was successful, False otherwise.
+    """
+    try:
+        client = await QdrantSetup.get_async_client()
+        SchemaReindexer.record_write(project_id=project_id)
+        for collection_name in [
+            settings.QDRANT_COLLECTION,
+            *SchemaReindexer.get_target_collections(),
+        ]:
+            await client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(
+                    filter=Filter(
+                        must=[
+                            FieldCondition(
+                                key="metadata.project_id",
+                                match=MatchValue(value=project_id),
+                            )
+                        ]
+                    )
+                ),
+            )
+        SemanticAnswerCache.invalidate(project_id)
+        ConversationStore.invalidate_schemas(project_id)
+
+        logger.debug(f"Successfully deleted all schemas for project_id={project_id}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error deleting project schemas from Qdrant: {e!s}")
+        return False
@@ -4,16 +4,25 @@ from langchain_core.vectorstores.base import VectorStore
 from app.core.config import settings
 from app.core.log import logger
 from app.services.qdrant.qdrant_setup import QdrantSetup
+from app.services.qdrant.schema_reindex import SchemaReindexer
+from app.utils.graph_utils.request_deadline import with_deadline
 from app.utils.model_registry.model_provider import get_model_provider
 
 
 async def add_document_to_vector_store(document: Document):
-    vector_store = QdrantSetup.get_vector_store(get_model_provider().get_embeddings_model())
+    embeddings = get_model_provider().get_embeddings_model()
+    vector_store = QdrantSetup.get_vector_store(embeddings)
     project_id = document.metadata["project_id"]
     dataset_id = document.metadata["dataset_id"]
     document_id = QdrantSetup.get_document_id(project_id, dataset_id)
+    SchemaReindexer.record_write(point_id=document_id)
     await vector_store.aadd_documents(documents=[document], ids=[document_id])
 
+    # Collections being built by a reindex only get the schemas it already copied.
+    for collection_name in SchemaReindexer.get_target_collections():
+        target_store = QdrantSetup.get_vector_store(embeddings, collection_name=collection_name)
+        await target_store.aadd_documents(documents=[document], ids=[document_id])
+
 
 async def perform_similarity_search(
     vector_store: VectorStore,
@@ -33,13 +42,15 @@ async def perform_similarity_search(
     """
 
     try:
-        return await vector_store.asimilarity_search(query, k=top_k, filter=query_filter)
+        return await with_deadline(
+            vector_store.asimilarity_search(query, k=top_k, filter=query_filter)
+        )
     except Exception as e:
         logger.error(
             f"Error performing similarity search: {e!s} | " f"Filter criteria: {query_filter}"
         )
         if query_filter:
             logger.info("Attempting unfiltered search as fallback...")
-            return await vector_store.asimilarity_search(query, k=top_k)
+            return await with_deadline(vector_store.asimilarity_search(query, k=top_k))
         else:
             raise e
@@ -8,6 +8,7 @@ Finally, add the tool to the `ToolNames` enum.
 
 import importlib
 from enum import Enum
+from functools import cache
 from typing import Any
 
 from langchain_core.tools import StructuredTool
@@ -23,6 +24,7 @@ class ToolNames(Enum):
     GET_FEEDBACK_FOR_IMAGE = "get_feedback_for_image"
 
 
+@cache
 def get_tool(
     tool_name: ToolNames,
 ) -> tuple[str, StructuredTool, dict[str, Any]] | tuple[None, None, None]:
@@ -7,6 +7,8 @@ from langchain_core.tools import InjectedToolCallId, tool
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
 
+from app.utils.graph_utils.request_deadline import with_deadline
+
 
 @tool
 async def run_python_code(
@@ -27,7 +29,7 @@ async def run_python_code(
 
     Return the logs and error if any.
     """
-    execution = await sandbox.run_code(code)
+    execution = await with_deadline(sandbox.run_code(code), config)
     state_update = {
         "executed_python_code": code,
         "tool_call_count": tool_call_count + 1,
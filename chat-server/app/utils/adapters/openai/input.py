@@ -6,11 +6,22 @@ from openai.types.chat.completion_create_params import (
     CompletionCreateParamsStreaming as RequestStreaming,
 )
 
-from app.models.router import QueryRequest
+from app.core.log import logger
+from app.models.router import LatencyMode, QueryRequest
+from app.utils.chat_history.state_store import ConversationState
+
+
+def get_chat_id(request: RequestNonStreaming | RequestStreaming) -> str | None:
+    """
+    Chat ID the client sent in the request metadata, if any.
+    """
+    chat_id = (request.get("metadata") or {}).get("chat_id", "")
+    return chat_id.strip() or None
 
 
 def from_openai_format(
     request: RequestNonStreaming | RequestStreaming,
+    conversation_state: ConversationState | None = None,
 ) -> QueryRequest:
     """
     Convert OpenAI API request format to internal QueryRequest format.
@@ -18,14 +29,17 @@ def from_openai_format(
 
     Args:
         request: Either a streaming or non-streaming OpenAI request
+        conversation_state: State of the chat from its previous request; messages
+            it already converted are reused and only the new ones are converted
 
     Returns:
         QueryRequest: Internal request format
     """
 
-    raw_messages = request.get("messages", [])
+    raw_messages = list(request.get("messages", []))
+    prefix = conversation_state.get_matching_prefix(raw_messages) if conversation_state else 0
     messages_dict = []
-    for msg in raw_messages:
+    for msg in raw_messages[prefix:]:
         if isinstance(msg, dict):
             # Convert content to string if it's not already a string
             msg_copy = msg.copy()
@@ -36,9 +50,12 @@ def from_openai_format(
         else:
             messages_dict.append(msg.model_dump() if hasattr(msg, "model_dump") else dict(msg))
     messages = convert_openai_messages(messages_dict)
+    if prefix:
+        messages = conversation_state.messages[:prefix] + messages
 
     project_ids: list[str] = []
     dataset_ids: list[str] = []
+    latency_mode: LatencyMode | None = None
 
     metadata = request.get("metadata")
 
@@ -48,6 +65,11 @@ def from_openai_format(
                 project_ids.extend(value.split(","))
             elif key.startswith("dataset_id"):
                 dataset_ids.extend(value.split(","))
+            elif key == "latency_mode":
+                try:
+                    latency_mode = LatencyMode(value.strip().lower())
+                except ValueError:
+                    logger.warning(f"Ignoring unknown latency_mode: {value}")
     project_ids = [project_id.strip() for project_id in project_ids if project_id.strip()]
     dataset_ids = [dataset_id.strip() for dataset_id in dataset_ids if dataset_id.strip()]
     return QueryRequest(
@@ -56,4 +78,6 @@ def from_openai_format(
         user=request.get("user"),
         dataset_ids=dataset_ids,
         project_ids=project_ids,
+        chat_id=get_chat_id(request),
+        latency_mode=latency_mode,
     )
@@ -4,15 +4,6 @@ from typing import AsyncIterable
 
 from openai.types.chat.chat_completion import ChatCompletion as Response
 from openai.types.chat.chat_completion import Choice
-from openai.types.chat.chat_completion_chunk import (
-    ChatCompletionChunk as ResponseChunk,
-)
-from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
-from openai.types.chat.chat_completion_chunk import (
-    ChoiceDelta,
-    ChoiceDeltaToolCall,
-    ChoiceDeltaToolCallFunction,
-)
 from openai.types.chat.chat_completion_message import ChatCompletionMessage
 from openai.types.chat.chat_completion_message_tool_call import (
     ChatCompletionMessageToolCall,
@@ -21,6 +12,7 @@ from openai.types.chat.chat_completion_message_tool_call import (
 
 from app.core.constants import INTERMEDIATE_MESSAGES
 from app.models.chat import EventChunkData, Role
+from app.utils.adapters.openai.sse import ChatCompletionChunkEncoder
 
 
 class OpenAIOutputAdapter:
@@ -35,140 +27,89 @@ class OpenAIOutputAdapter:
         self.chat_id = chat_id
         self.trace_id = trace_id
         self.created = int(time.time())
-
-    async def _create_chat_completion_stream(
-        self, event_chunks: AsyncIterable[EventChunkData]
-    ) -> AsyncIterable[ResponseChunk]:
-        async for event_chunk in event_chunks:
-            if event_chunk.role:
-                chunk = self.event_to_response(event_chunk)
-                if chunk:
-                    yield chunk
-        yield self.create_final_chunk()
+        self.encoder = ChatCompletionChunkEncoder(trace_id, self.created, self.model)
 
     async def create_chat_completion_stream(
         self, event_chunks: AsyncIterable[EventChunkData]
     ) -> AsyncIterable[str]:
-        async for chunk in self._create_chat_completion_stream(event_chunks):
-            if chunk:
-                yield f"data: {chunk.model_dump_json(exclude_defaults=True)}\n\n"
+        async for event_chunk in event_chunks:
+            if event_chunk.role:
+                frame = self.event_to_sse(event_chunk)
+                if frame:
+                    yield frame
+        yield self.encoder.final()
         yield "data: [DONE]\n\n"
 
-    def create_tool_call_chunk(self, event_chunk: EventChunkData) -> ResponseChunk | None:
-        tool_call_params = None
-        if event_chunk.extra_data:
-            name = event_chunk.extra_data.name
-            arguments = json.dumps(event_chunk.extra_data.args)
-        elif (event_chunk.category) or (event_chunk.role == Role.INTERMEDIATE):
-            if not event_chunk.content:
+    def event_to_sse(self, event_chunk: EventChunkData) -> str | None:
+        """
+        Encode an event as a `chat.completion.chunk` SSE frame, None for an
+        intermediate message without content.
+        """
+        if self.is_tool_call(event_chunk):
+            tool_call_function = self.get_tool_call_function(event_chunk)
+            if not tool_call_function:
                 return None
-            intermediate_message = {
-                "role": event_chunk.role,
-                "content": event_chunk.content,
-            }
-            if event_chunk.category:
-                intermediate_message["category"] = event_chunk.category
-            name = INTERMEDIATE_MESSAGES
-            arguments = json.dumps(intermediate_message)
-        tool_call_params = ChoiceDeltaToolCallFunction(
-            name=name,
-            arguments=arguments,
-        )
-        if tool_call_params:
-            tool_call = ChoiceDeltaToolCall(
-                id=f"call_{self.tool_calls_count}",
-                index=self.tool_calls_count,
-                type="function",
-                function=tool_call_params,
-            )
-            choices = [
-                ChunkChoice(
-                    index=0,
-                    delta=ChoiceDelta(tool_calls=[tool_call]),
-                    finish_reason=None,
-                )
-            ]
+            frame = self.encoder.tool_call(self.tool_calls_count, *tool_call_function)
             self.tool_calls_count += 1
-            return ResponseChunk(
-                id=self.trace_id,
-                object="chat.completion.chunk",
-                created=self.created,
-                model=self.model,
-                choices=choices,
-            )
+            return frame
 
-    def event_to_response(self, event_chunk: EventChunkData) -> ResponseChunk | None:
-        should_be_tool_call = (
+        frame = self.encoder.content(event_chunk.content, first=self.first_chunk)
+        self.first_chunk = False
+        return frame
+
+    def is_tool_call(self, event_chunk: EventChunkData) -> bool:
+        return bool(
             (event_chunk.extra_data)
             or (event_chunk.category)
             or (event_chunk.role == Role.INTERMEDIATE)
         )
-        if should_be_tool_call:
-            tool_call_chunk = self.create_tool_call_chunk(event_chunk)
-            return tool_call_chunk
-        else:
-            choices = [
-                ChunkChoice(
-                    index=0,
-                    delta=ChoiceDelta(content=event_chunk.content),
-                    finish_reason=None,
-                )
-            ]
-            if self.first_chunk:
-                self.first_chunk = False
-                choices[0].delta.role = "assistant"
-        return ResponseChunk(
-            id=self.trace_id,
-            object="chat.completion.chunk",
-            created=self.created,
-            model=self.model,
-            choices=choices,
-        )
 
-    def create_final_chunk(self) -> ResponseChunk:
-        return ResponseChunk(
-            id=self.trace_id,
-            object="chat.completion.chunk",
-            created=self.created,
-            model=self.model,
-            choices=[
-                ChunkChoice(
-                    index=0,
-                    delta=ChoiceDelta(),
-                    finish_reason="stop",
-                )
-            ],
-        )
+    def get_tool_call_function(self, event_chunk: EventChunkData) -> tuple[str, str] | None:
+        if event_chunk.extra_data:
+            return event_chunk.extra_data.name, json.dumps(event_chunk.extra_data.args)
+
+        if not event_chunk.content:
+            return None
+        intermediate_message = {
+            "role": event_chunk.role,
+            "content": event_chunk.content,
+        }
+        if event_chunk.category:
+            intermediate_message["category"] = event_chunk.category
+        return INTERMEDIATE_MESSAGES, json.dumps(intermediate_message)
 
     async def create_chat_completion(self, event_chunks: AsyncIterable[EventChunkData]) -> Response:
-        tool_calls = []
-        content = ""
+        """
+        Aggregate the events into a single ChatCompletion. Content and tool calls are
+        collected as they arrive and the response models are built once at the end.
+        """
+        content_parts: list[str] = []
+        tool_calls: list[ChatCompletionMessageToolCall] = []
+
+        async for event_chunk in event_chunks:
+            if not event_chunk.role:
+                continue
+            if not self.is_tool_call(event_chunk):
+                content_parts.append(event_chunk.content)
+                continue
+
+            tool_call_function = self.get_tool_call_function(event_chunk)
+            if not tool_call_function:
+                continue
+            name, arguments = tool_call_function
+            if name and arguments:
+                tool_calls.append(
+                    ChatCompletionMessageToolCall(
+                        id=f"call_{self.tool_calls_count}",
+                        type="function",
+                        function=Function(name=name, arguments=arguments),
+                    )
+                )
+            self.tool_calls_count += 1
 
-        async for completion_chunk in self._create_chat_completion_stream(event_chunks):
-            if completion_chunk.choices[0].delta.content:
-                content += completion_chunk.choices[0].delta.content
-            if completion_chunk.choices[0].delta.tool_calls:
-                for tool_call in completion_chunk.choices[0].delta.tool_calls:
-                    call_id = tool_call.id
-                    if (
-                        call_id
-                        and tool_call.function
-                        and tool_call.function.name
-                        and tool_call.function.arguments
-                    ):
-                        tool_calls.append(
-                            ChatCompletionMessageToolCall(
-                                id=call_id,
-                                type="function",
-                                function=Function(
-                                    name=tool_call.function.name,
-                                    arguments=tool_call.function.arguments,
-                                ),
-                            )
-                        )
         message = ChatCompletionMessage(
             role="assistant",
-            content=content,
+            content="".join(content_parts),
             tool_calls=tool_calls,
         )
         return Response(
@@ -0,0 +1,33 @@
+from json.encoder import encode_basestring
+
+
+class ChatCompletionChunkEncoder:
+    """
+    Encodes `chat.completion.chunk` SSE frames from pre-serialized templates.
+
+    The id, created and model fields are serialized once per response, so a token
+    costs one string escape and a join. Frames are byte-for-byte what
+    `ChatCompletionChunk.model_dump_json(exclude_defaults=True)` produces.
+    """
+
+    def __init__(self, id: str, created: int, model: str):
+        self.prefix = f'data: {{"id":{encode_basestring(id)},"choices":[{{"delta":'
+        self.suffix = (
+            f',"index":0}}],"created":{created},"model":{encode_basestring(model)},'
+            '"object":"chat.completion.chunk"}\n\n'
+        )
+        self.final_frame = f'{self.prefix}{{}},"finish_reason":"stop"{self.suffix}'
+
+    def content(self, content: str, first: bool = False) -> str:
+        role = ',"role":"assistant"' if first else ""
+        return f'{self.prefix}{{"content":{encode_basestring(content)}{role}}}{self.suffix}'
+
+    def tool_call(self, index: int, name: str, arguments: str) -> str:
+        return (
+            f'{self.prefix}{{"tool_calls":[{{"index":{index},"id":"call_{index}",'
+            f'"function":{{"arguments":{encode_basestring(arguments)},'
+            f'"name":{encode_basestring(name)}}},"type":"function"}}]}}{self.suffix}'
+        )
+
+    def final(self) -> str:
+        return self.final_frame
@@ -14,6 +14,8 @@ from app.core.constants import (
 from app.utils.model_registry.model_selection import get_chat_history
 
 from .sliding_window import apply_sliding_window
+from .state_store import ConversationState, get_conversation_state
+from .summarizer import ConversationSummaries, ConversationSummary
 
 
 class ChatHistoryProcessor:
@@ -21,7 +23,8 @@ class ChatHistoryProcessor:
     Centralized processor for chat history operations.
 
     This class handles all chat history related operations including:
-    - Retrieving and filtering chat history
+    - Retrieving and filtering chat history, with a rolling summary of the
+      messages the window leaves out
     - Extracting context (SQL queries, datasets, visualizations)
     - Formatting history for prompts
     """
@@ -36,6 +39,7 @@ class ChatHistoryProcessor:
         self.config = config
         self._raw_history = None
         self._filtered_history = None
+        self._summary: ConversationSummary | None = None
         self._context_cache = {}
         self.sql_queries_mapping = {}
 
@@ -45,29 +49,87 @@ class ChatHistoryProcessor:
             self._raw_history = get_chat_history(self.config) or []
         return self._raw_history
 
-    @property
-    def filtered_history(self) -> list[BaseMessage]:
-        if self._filtered_history is None:
+    def _apply_window(self) -> None:
+        self._filtered_history = apply_sliding_window(
+            self.raw_history,
+            settings.CHAT_HISTORY_MAX_MESSAGES,
+            settings.CHAT_HISTORY_MAX_TOKENS,
+        )
+        dropped = len(self.raw_history) - len(self._filtered_history)
+        # Only chats the client identifies have summaries from earlier requests.
+        chat_id = self.config.get("configurable", {}).get("client_chat_id")
+        if not dropped or not chat_id or not settings.CHAT_SUMMARY_ENABLED:
+            return
+
+        self._summary = ConversationSummaries.get(chat_id, self.raw_history, dropped)
+        ConversationSummaries.record_use(self._summary is not None)
+        if self._summary:
+            # The summary replaces the oldest messages and takes part of the budget.
             self._filtered_history = apply_sliding_window(
-                self.raw_history,
+                self.raw_history[self._summary.end :],
                 settings.CHAT_HISTORY_MAX_MESSAGES,
-                settings.CHAT_HISTORY_MAX_TOKENS,
+                max(settings.CHAT_HISTORY_MAX_TOKENS - self._summary.tokens, 0),
             )
+
+    @property
+    def conversation_state(self) -> ConversationState | None:
+        """
+        The chat's state kept between requests, when it holds this history.
+        """
+        state = get_conversation_state(self.config)
+        history = self.raw_history
+        if state is None or len(state.messages) < len(history):
+            return None
+        if history and state.messages[len(history) - 1] is not history[-1]:
+            return None
+        return state
+
+    @property
+    def filtered_history(self) -> list[BaseMessage]:
+        if self._filtered_history is None:
+            self._apply_window()
         return self._filtered_history
 
+    @property
+    def summary(self) -> ConversationSummary | None:
+        if self._filtered_history is None:
+            self._apply_window()
+        return self._summary
+
     def get_all_tool_calls(self) -> list[ToolCall]:
         if "tool_calls" not in self._context_cache:
-            tool_calls = []
-            for message in self.filtered_history:
-                if isinstance(message, AIMessage) and message.tool_calls:
-                    tool_calls.extend(message.tool_calls)
-            self._context_cache["tool_calls"] = tool_calls
+            self._context_cache["tool_calls"] = self._get_tool_calls(self.filtered_history)
         return self._context_cache["tool_calls"]
 
+    def get_context_tool_calls(self) -> list[ToolCall]:
+        """
+        Tool calls of the messages in the window and of those covered by the
+        summary, so SQL queries and datasets are not lost to summarization.
+        """
+        if "context_tool_calls" not in self._context_cache:
+            summarized_tool_calls = []
+            state = self.conversation_state
+            if self.summary and state:
+                # Indexed when the messages were added, instead of scanning them again.
+                summarized_tool_calls = state.get_tool_calls(0, self.summary.end)
+            elif self.summary:
+                summarized_tool_calls = self._get_tool_calls(self.raw_history[: self.summary.end])
+            window_tool_calls = self._get_tool_calls(self.filtered_history)
+            self._context_cache["context_tool_calls"] = summarized_tool_calls + window_tool_calls
+        return self._context_cache["context_tool_calls"]
+
+    @staticmethod
+    def _get_tool_calls(messages: list[BaseMessage]) -> list[ToolCall]:
+        tool_calls = []
+        for message in messages:
+            if isinstance(message, AIMessage) and message.tool_calls:
+                tool_calls.extend(message.tool_calls)
+        return tool_calls
+
     def get_sql_queries(self) -> list[str]:
         if "sql_queries" not in self._context_cache:
             sql_queries = []
-            for tool_call in self.get_all_tool_calls():
+            for tool_call in self.get_context_tool_calls():
                 if tool_call.get("name") == SQL_QUERIES_GENERATED:
                     args = tool_call.get("args", {})
                     sql_queries.extend(args.get(SQL_QUERIES_GENERATED_ARG, []))
@@ -77,7 +139,7 @@ class ChatHistoryProcessor:
     def get_datasets_used(self) -> list[str]:
         if "datasets_used" not in self._context_cache:
             datasets_used = []
-            for tool_call in self.get_all_tool_calls():
+            for tool_call in self.get_context_tool_calls():
                 if tool_call.get("name") == DATASETS_USED:
                     args = tool_call.get("args", {})
                     datasets_used.extend(args.get(DATASETS_USED_ARG, []))
@@ -92,6 +154,12 @@ class ChatHistoryProcessor:
                     args = tool_call.get("args", {})
                     vizpaths.extend(args.get(VISUALIZATION_RESULT_ARG, []))
                     break
+            state = self.conversation_state
+            if state and vizpaths:
+                state.result_handles = vizpaths
+            elif state:
+                # The visualization may be older than the window.
+                vizpaths = list(state.result_handles)
             self._context_cache["vizpaths"] = vizpaths
         return self._context_cache["vizpaths"]
 
@@ -126,6 +194,11 @@ class ChatHistoryProcessor:
                         formatted_messages.append(f"Assistant: {message.content}")
 
                 formatted_history = "\n".join(formatted_messages)
+                if self.summary:
+                    formatted_history = (
+                        f"Summary of earlier conversation:\n{self.summary.summary}\n\n"
+                        f"Recent messages:\n{formatted_history}"
+                    )
 
                 sql_queries = self.get_sql_queries()
                 if sql_queries:
@@ -149,6 +222,7 @@ class ChatHistoryProcessor:
             "datasets_used": self.get_datasets_used(),
             "vizpaths": self.get_vizpaths(),
             "message_count": len(self.filtered_history),
+            "summarized_message_count": self.summary.end if self.summary else 0,
             "original_message_count": len(self.raw_history),
         }
 
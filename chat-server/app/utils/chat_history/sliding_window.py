@@ -1,18 +1,11 @@
-from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages import BaseMessage
 
 from app.core.log import logger
+from app.utils.model_registry.token_counter import TokenCounter
 
 
 def estimate_tokens(message: BaseMessage) -> int:
-    content = str(message.content) if message.content else ""
-    base_tokens = len(content) // 4  # ~4 characters per token
-
-    # Add extra tokens for tool calls in AI messages
-    if isinstance(message, AIMessage) and message.tool_calls:
-        tool_tokens = sum(len(str(tool.get("args", {}))) // 4 + 10 for tool in message.tool_calls)
-        return base_tokens + tool_tokens + 10
-
-    return base_tokens + 5  # Base overhead
+    return TokenCounter.count_message(message)
 
 
 def apply_sliding_window(
@@ -43,38 +36,29 @@ def apply_sliding_window(
     if total_messages <= min_messages:
         return chat_history
 
-    total_tokens = sum(estimate_tokens(msg) for msg in chat_history)
-    if total_tokens <= max_tokens:
-        return chat_history
-
-    logger.info(f"Applying token-aware sliding window: {total_messages} messages")
-
-    filtered_messages = []
-    current_tokens = 0
-
+    # Count from the most recent message backwards only as far as the window reaches,
+    # so a long history resent with every request is not counted in full.
     # Step 1: First, secure minimum messages from the most recent ones
-    for i in range(total_messages - 1, max(total_messages - min_messages - 1, -1), -1):
-        message = chat_history[i]
-        msg_tokens = estimate_tokens(message)
-        filtered_messages.insert(0, message)
-        current_tokens += msg_tokens
+    start = total_messages - min_messages
+    current_tokens = sum(estimate_tokens(msg) for msg in chat_history[start:])
 
     # Step 2: If we're within token limit, try to add more older messages
     if current_tokens <= max_tokens:
-        for i in range(total_messages - min_messages - 1, -1, -1):
-            message = chat_history[i]
-            msg_tokens = estimate_tokens(message)
-
-            if current_tokens + msg_tokens <= max_tokens:
-                filtered_messages.insert(0, message)
-                current_tokens += msg_tokens
-            else:
+        while start > 0:
+            msg_tokens = estimate_tokens(chat_history[start - 1])
+            if current_tokens + msg_tokens > max_tokens:
                 break
+            start -= 1
+            current_tokens += msg_tokens
+        if start == 0:
+            return chat_history
     else:
         logger.warning(
             f"Minimum {min_messages} messages ({current_tokens} tokens) exceed limit ({max_tokens})"
         )
 
+    logger.info(f"Applying token-aware sliding window: {total_messages} messages")
+    filtered_messages = chat_history[start:]
     final_count = len(filtered_messages)
     logger.info(
         f"Token-aware filtering: {total_messages} -> {final_count} messages, ~{current_tokens} tokens"
@@ -0,0 +1,285 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    ToolCall,
+    messages_from_dict,
+    messages_to_dict,
+)
+from langchain_core.runnables import RunnableConfig
+
+from app.core.config import settings
+from app.core.log import logger
+from app.models.schema import DatasetSchema
+
+
+def get_raw_message_key(message: Any) -> str:
+    """
+    Fingerprint of an OpenAI format message as sent by the client.
+    """
+    if not isinstance(message, dict):
+        message = message.model_dump() if hasattr(message, "model_dump") else dict(message)
+    return f"{message.get('role')}\0{message.get('content')}"
+
+
+def chain_message_digest(previous: str | None, message: Any) -> str:
+    """
+    Digest of a history ending in `message`, given the digest of the history
+    before it.
+    """
+    return hashlib.sha256(f"{previous or ''}\0{get_raw_message_key(message)}".encode()).hexdigest()
+
+
+@dataclass
+class ConversationState:
+    """
+    Processed state of a chat, kept between its requests so a follow-up only
+    processes the messages added since the previous request.
+
+    Messages and result handles are also written to the persistent backend.
+    Schemas are kept in memory only: they are invalidated when datasets are
+    uploaded, which a stored copy would miss.
+    """
+
+    chat_id: str
+    # Converted chat messages, with a running digest of the raw messages up to and
+    # including each one to recognise the same history when the client resends it.
+    messages: list[BaseMessage] = field(default_factory=list)
+    message_digests: list[str] = field(default_factory=list)
+    # Tool calls of all messages; those of messages[:i] are tool_calls[: tool_call_offsets[i]].
+    tool_calls: list[ToolCall] = field(default_factory=list)
+    tool_call_offsets: list[int] = field(default_factory=lambda: [0])
+    # Fetched dataset / project schemas by dataset or project ID.
+    schemas: dict[str, DatasetSchema] = field(default_factory=dict)
+    # Visualization result paths of the chat, newest last.
+    result_handles: list[str] = field(default_factory=list)
+    updated_at: float = field(default_factory=time.time)
+
+    def get_matching_prefix(self, raw_messages: list) -> int:
+        """
+        Number of leading `raw_messages` already converted in this state, 0 when
+        the client sent a different history.
+        """
+        count = len(self.messages)
+        if not count or len(raw_messages) <= count or len(self.message_digests) != count:
+            return 0
+        digest = None
+        for message in raw_messages[:count]:
+            digest = chain_message_digest(digest, message)
+        return count if digest == self.message_digests[-1] else 0
+
+    def extend(self, raw_messages: list, messages: list[BaseMessage]) -> None:
+        """
+        Add the messages after the ones already in the state.
+        """
+        for message in messages[len(self.messages) :]:
+            self.messages.append(message)
+            if isinstance(message, AIMessage) and message.tool_calls:
+                self.tool_calls.extend(message.tool_calls)
+            self.tool_call_offsets.append(len(self.tool_calls))
+        for message in raw_messages[len(self.message_digests) :]:
+            previous = self.message_digests[-1] if self.message_digests else None
+            self.message_digests.append(chain_message_digest(previous, message))
+        self.updated_at = time.time()
+
+    def get_tool_calls(self, start: int, end: int) -> list[ToolCall]:
+        return self.tool_calls[self.tool_call_offsets[start] : self.tool_call_offsets[end]]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "chat_id": self.chat_id,
+            "messages": messages_to_dict(self.messages),
+            "message_digests": self.message_digests,
+            "result_handles": self.result_handles,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ConversationState":
+        state = cls(chat_id=data["chat_id"], result_handles=data.get("result_handles", []))
+        state.extend([], messages_from_dict(data.get("messages", [])))
+        state.message_digests = data.get("message_digests", [])
+        state.updated_at = data.get("updated_at", state.updated_at)
+        return state
+
+
+class ConversationStateBackend(Protocol):
+    def load(self, chat_id: str) -> ConversationState | None:
+        ...
+
+    def save(self, state: ConversationState) -> None:
+        ...
+
+
+class FileConversationStateBackend:
+    """
+    One JSON file per chat in CONVERSATION_STATE_DIR.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, chat_id: str) -> Path:
+        return self.directory / f"{hashlib.sha256(chat_id.encode()).hexdigest()}.json"
+
+    def load(self, chat_id: str) -> ConversationState | None:
+        path = self._path(chat_id)
+        if not path.exists():
+            return None
+        return ConversationState.from_dict(json.loads(path.read_text()))
+
+    def save(self, state: ConversationState) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(state.chat_id).write_text(json.dumps(state.to_dict()))
+
+
+class ConversationStore:
+    """
+    Conversation states by chat_id: an in-memory LRU of
+    CONVERSATION_STATE_MAX_CHATS chats in front of an optional persistent
+    backend (CONVERSATION_STATE_BACKEND, or one installed with `set_backend`).
+    """
+
+    states: OrderedDict[str, ConversationState] = OrderedDict()
+    backend: ConversationStateBackend | None = None
+    backend_configured: bool = False
+    counters: Counter = Counter()
+
+    @classmethod
+    def get_backend(cls) -> ConversationStateBackend | None:
+        if not cls.backend_configured:
+            if settings.CONVERSATION_STATE_BACKEND == "file":
+                cls.backend = FileConversationStateBackend(settings.CONVERSATION_STATE_DIR)
+            elif settings.CONVERSATION_STATE_BACKEND:
+                logger.warning(
+                    f"Unknown conversation state backend '{settings.CONVERSATION_STATE_BACKEND}', "
+                    "keeping conversation state in memory only"
+                )
+            cls.backend_configured = True
+        return cls.backend
+
+    @classmethod
+    def set_backend(cls, backend: ConversationStateBackend | None) -> None:
+        cls.backend = backend
+        cls.backend_configured = True
+
+    @classmethod
+    def _put(cls, state: ConversationState) -> None:
+        cls.states[state.chat_id] = state
+        cls.states.move_to_end(state.chat_id)
+        while len(cls.states) > settings.CONVERSATION_STATE_MAX_CHATS:
+            cls.states.popitem(last=False)
+
+    @classmethod
+    async def get(cls, chat_id: str | None) -> ConversationState | None:
+        if not chat_id or not settings.CONVERSATION_STATE_ENABLED:
+            return None
+
+        state = cls.states.get(chat_id)
+        if state is not None:
+            cls.counters["hits"] += 1
+            cls.states.move_to_end(chat_id)
+            return state
+
+        backend = cls.get_backend()
+        if backend is not None:
+            try:
+                state = await asyncio.to_thread(backend.load, chat_id)
+            except Exception as e:
+                logger.warning(f"Failed to load conversation state of chat {chat_id}: {e!s}")
+            if state is not None:
+                cls.counters["backend_hits"] += 1
+                cls._put(state)
+                return state
+
+        cls.counters["misses"] += 1
+        return None
+
+    @classmethod
+    def update(
+        cls,
+        chat_id: str | None,
+        state: ConversationState | None,
+        raw_messages: list,
+        messages: list[BaseMessage],
+    ) -> ConversationState | None:
+        """
+        State for a request's converted `messages`: `state` extended with the new
+        messages when they continue its history, a new state otherwise.
+        """
+        if not chat_id or not settings.CONVERSATION_STATE_ENABLED:
+            return None
+
+        reused = bool(
+            state is not None
+            and state.messages
+            and len(messages) > len(state.messages)
+            and messages[len(state.messages) - 1] is state.messages[-1]
+        )
+        if not reused:
+            # Schemas do not depend on the history; result handles of an edited
+            # history may point at visualizations it no longer has.
+            state = ConversationState(chat_id=chat_id, schemas=state.schemas if state else {})
+
+        new_messages = len(messages) - len(state.messages)
+        cls.counters["delta_messages" if reused else "converted_messages"] += new_messages
+        state.extend(raw_messages, messages)
+        cls._put(state)
+        return state
+
+    @classmethod
+    async def save(cls, state: ConversationState | None) -> None:
+        backend = cls.get_backend()
+        if state is None or backend is None:
+            return
+        try:
+            await asyncio.to_thread(backend.save, state)
+        except Exception as e:
+            logger.warning(f"Failed to save conversation state of chat {state.chat_id}: {e!s}")
+
+    @classmethod
+    def invalidate_schemas(cls, project_id: str | None = None) -> None:
+        """
+        Drop cached schemas of a project (all projects when None) after its
+        datasets changed.
+        """
+        for state in cls.states.values():
+            state.schemas = {
+                key: schema
+                for key, schema in state.schemas.items()
+                if project_id is not None and schema.project_id != project_id
+            }
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        backend = cls.get_backend()
+        return {
+            "chats": len(cls.states),
+            "backend": type(backend).__name__ if backend else None,
+            "hits": cls.counters["hits"],
+            "backend_hits": cls.counters["backend_hits"],
+            "misses": cls.counters["misses"],
+            "delta_messages": cls.counters["delta_messages"],
+            "converted_messages": cls.counters["converted_messages"],
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.states = OrderedDict()
+        cls.backend = None
+        cls.backend_configured = False
+        cls.counters = Counter()
+
+
+def get_conversation_state(config: RunnableConfig | None) -> ConversationState | None:
+    if not config:
+        return None
+    return config.get("configurable", {}).get("conversation_state")
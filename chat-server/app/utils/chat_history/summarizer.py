@@ -0,0 +1,212 @@
+import asyncio
+import hashlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+
+from app.core.config import settings
+from app.core.log import logger
+from app.utils.chat_history.sliding_window import apply_sliding_window
+from app.utils.model_registry.model_provider import get_llm_for_other_task
+from app.utils.model_registry.token_counter import TokenCounter
+
+# Summaries kept per chat; the newest one is used, the previous one covers a
+# history the client resent without its latest turns.
+SUMMARIES_PER_CHAT = 2
+
+
+@dataclass
+class ConversationSummary:
+    # Summarizes messages [0, end) of the chat history.
+    end: int
+    digest: str
+    summary: str
+    tokens: int
+
+
+def get_history_digest(messages: list[BaseMessage]) -> str:
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(f"{message.type}:{message.content}\0".encode())
+    return digest.hexdigest()
+
+
+def get_dropped_message_count(chat_history: list[BaseMessage]) -> int:
+    """
+    Number of oldest messages the sliding window leaves out of the prompt.
+    """
+    window = apply_sliding_window(
+        chat_history, settings.CHAT_HISTORY_MAX_MESSAGES, settings.CHAT_HISTORY_MAX_TOKENS
+    )
+    return len(chat_history) - len(window)
+
+
+def format_messages(messages: list[BaseMessage]) -> str:
+    return "\n".join(
+        f"{'User' if message.type == 'human' else 'Assistant'}: {message.content}"
+        for message in messages
+        if message.content
+    )
+
+
+async def summarize_messages(
+    messages: list[BaseMessage], previous_summary: str, config: RunnableConfig
+) -> str:
+    """
+    Fold `messages` into the running summary of a conversation.
+    """
+    llm = get_llm_for_other_task("summarize_chat_history", config)
+    max_words = int(settings.CHAT_SUMMARY_MAX_TOKENS * 0.75)
+
+    messages = [
+        SystemMessage(
+            content=f"""
+You maintain the running summary of a data analysis conversation between a user and an assistant.
+Update the summary with the new messages.
+
+Rules:
+- Keep what later questions may refer back to: the questions asked, the datasets, metrics, filters,
+  time ranges and definitions used, the key numbers and findings, and the user's stated preferences.
+- Drop greetings, progress updates and repeated explanations.
+- Write plain sentences in chronological order, at most {max_words} words.
+- Output only the updated summary.
+"""
+        ),
+        HumanMessage(
+            content=(
+                f"CURRENT SUMMARY:\n{previous_summary or '(none)'}\n\n"
+                f"NEW MESSAGES:\n{format_messages(messages)}"
+            )
+        ),
+    ]
+
+    response = await llm.ainvoke(messages)
+    return str(response.content).strip()
+
+
+class ConversationSummaries:
+    """
+    Rolling summaries of the chat history that no longer fits the sliding window.
+
+    Summaries are cached per chat_id and message range, and validated against a
+    digest of the messages they cover. They are generated in the background after
+    a response has been sent, with the FAST model, by folding the newly dropped
+    messages into the previous summary.
+    """
+
+    summaries: OrderedDict[str, list[ConversationSummary]] = OrderedDict()
+    tasks: dict[str, asyncio.Task] = {}
+    counters: Counter = Counter()
+
+    @classmethod
+    def get(
+        cls, chat_id: str | None, chat_history: list[BaseMessage], max_end: int
+    ) -> ConversationSummary | None:
+        """
+        The newest summary of a prefix of `chat_history` no longer than `max_end`.
+        """
+        if not chat_id or chat_id not in cls.summaries:
+            return None
+
+        cls.summaries.move_to_end(chat_id)
+        for summary in reversed(cls.summaries[chat_id]):
+            if summary.end <= max_end and summary.digest == get_history_digest(
+                chat_history[: summary.end]
+            ):
+                return summary
+        return None
+
+    @classmethod
+    def store(cls, chat_id: str, summary: ConversationSummary) -> None:
+        summaries = cls.summaries.setdefault(chat_id, [])
+        summaries.append(summary)
+        del summaries[:-SUMMARIES_PER_CHAT]
+        cls.summaries.move_to_end(chat_id)
+        while len(cls.summaries) > settings.CHAT_SUMMARY_MAX_CHATS:
+            cls.summaries.popitem(last=False)
+
+    @classmethod
+    def schedule(
+        cls, chat_id: str | None, chat_history: list[BaseMessage], metadata: dict[str, Any]
+    ) -> None:
+        """
+        Summarize the messages the sliding window drops in a background task, once
+        at least CHAT_SUMMARY_MIN_NEW_MESSAGES of them are not yet summarized.
+        """
+        if not settings.CHAT_SUMMARY_ENABLED or not chat_id:
+            return
+
+        task = cls.tasks.get(chat_id)
+        if task and not task.done():
+            return
+
+        end = get_dropped_message_count(chat_history)
+        previous = cls.get(chat_id, chat_history, end)
+        if end - (previous.end if previous else 0) < settings.CHAT_SUMMARY_MIN_NEW_MESSAGES:
+            return
+
+        # A fresh config: the request's deadline is done once the response is sent.
+        config = RunnableConfig(metadata=metadata, configurable={"metadata": metadata})
+        task = asyncio.create_task(cls._summarize(chat_id, chat_history[:end], previous, config))
+        cls.tasks[chat_id] = task
+        task.add_done_callback(lambda _: cls.tasks.pop(chat_id, None))
+
+    @classmethod
+    async def _summarize(
+        cls,
+        chat_id: str,
+        messages: list[BaseMessage],
+        previous: ConversationSummary | None,
+        config: RunnableConfig,
+    ) -> None:
+        start = previous.end if previous else 0
+        try:
+            summary = await summarize_messages(
+                messages[start:], previous.summary if previous else "", config
+            )
+        except Exception as e:
+            cls.counters["failures"] += 1
+            logger.warning(f"Failed to summarize chat {chat_id} history: {e!s}")
+            return
+
+        cls.counters["summaries"] += 1
+        cls.store(
+            chat_id,
+            ConversationSummary(
+                end=len(messages),
+                digest=get_history_digest(messages),
+                summary=summary,
+                tokens=TokenCounter.count_text(summary),
+            ),
+        )
+
+    @classmethod
+    def record_use(cls, used: bool) -> None:
+        cls.counters["hits" if used else "misses"] += 1
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        return {
+            "chats": len(cls.summaries),
+            "running": len(cls.tasks),
+            "summaries": cls.counters["summaries"],
+            "failures": cls.counters["failures"],
+            "hits": cls.counters["hits"],
+            "misses": cls.counters["misses"],
+        }
+
+    @classmethod
+    async def cancel_all(cls) -> None:
+        for task in cls.tasks.values():
+            task.cancel()
+        await asyncio.gather(*cls.tasks.values(), return_exceptions=True)
+        cls.tasks = {}
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.summaries = OrderedDict()
+        cls.tasks = {}
+        cls.counters = Counter()
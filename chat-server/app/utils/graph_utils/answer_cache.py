@@ -0,0 +1,238 @@
+import asyncio
+import copy
+import hashlib
+import math
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+
+from app.core.config import settings
+from app.core.log import logger
+from app.models.query import QueryResult, SqlQueryInfo
+from app.models.schema import DatasetSchema
+from app.utils.model_registry.model_provider import get_model_provider
+
+
+@dataclass
+class CachedAnswer:
+    query: str
+    embedding: list[float]
+    version: str
+    query_result: QueryResult
+    project_ids: set[str] = field(default_factory=set)
+    created_at: float = field(default_factory=time.time)
+
+    def is_expired(self) -> bool:
+        return time.time() - self.created_at > settings.SEMANTIC_ANSWER_CACHE_TTL_SECONDS
+
+
+def get_answer_scope(dataset_ids: list[str] | None, project_ids: list[str] | None) -> str:
+    return f"datasets={','.join(sorted(dataset_ids or []))};projects={','.join(sorted(project_ids or []))}"
+
+
+def get_schema_version(schemas: list[DatasetSchema | None]) -> str:
+    """
+    Fingerprint of the dataset schemas in scope. Schemas are regenerated whenever a
+    dataset is re-uploaded, so a changed fingerprint means the data changed.
+    """
+    dumps = sorted(schema.model_dump_json() for schema in schemas if schema)
+    return hashlib.sha256("\n".join(dumps).encode()).hexdigest()
+
+
+def get_sql_query_infos(query_result: QueryResult) -> list[SqlQueryInfo]:
+    if query_result.single_dataset_query_result:
+        return query_result.single_dataset_query_result.sql_results or []
+    return [info for subquery in query_result.subqueries for info in subquery.sql_queries]
+
+
+def is_cacheable(query_result: QueryResult | None) -> bool:
+    if query_result is None:
+        return False
+    sql_query_infos = get_sql_query_infos(query_result)
+    return bool(sql_query_infos) and all(info.success for info in sql_query_infos)
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _copy_for_cache(query_result: QueryResult) -> QueryResult:
+    query_result = copy.deepcopy(query_result)
+    if settings.SEMANTIC_ANSWER_CACHE_REEXECUTE:
+        # Results are re-fetched on replay, only the SQL needs to be kept.
+        for info in get_sql_query_infos(query_result):
+            info.sql_query_result = None
+            info.full_sql_result = None
+    return query_result
+
+
+def _similarity(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+class SemanticAnswerCache:
+    """
+    Answers of previous questions per (dataset/project scope, schema version),
+    matched by cosine similarity of the enhanced query embedding.
+
+    A hit carries the SQL that answered the earlier question so the agent can
+    replay it instead of planning and validating again.
+    """
+
+    entries: dict[str, list[CachedAnswer]] = {}
+    embeddings: OrderedDict[str, list[float]] = OrderedDict()
+    counters: Counter = Counter()
+    tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    async def embed(cls, query: str, config: RunnableConfig) -> list[float]:
+        """
+        Embed a query, memoized so the lookup and the later store embed it once.
+        """
+        embedding = cls.embeddings.get(query)
+        if embedding is None:
+            embeddings_model = get_model_provider(config).get_embeddings_model()
+            embedding = _normalize(await embeddings_model.aembed_query(query))
+            cls.embeddings[query] = embedding
+            while len(cls.embeddings) > settings.SEMANTIC_ANSWER_CACHE_MAX_ENTRIES_PER_SCOPE:
+                cls.embeddings.popitem(last=False)
+        else:
+            cls.embeddings.move_to_end(query)
+        return embedding
+
+    @classmethod
+    async def lookup(
+        cls, scope: str, version: str, query: str, config: RunnableConfig
+    ) -> CachedAnswer | None:
+        entries = [
+            entry
+            for entry in cls.entries.get(scope, [])
+            if entry.version == version and not entry.is_expired()
+        ]
+        cls.entries[scope] = entries
+        if not entries:
+            cls.counters["misses"] += 1
+            return None
+
+        embedding = await cls.embed(query, config)
+        best = max(entries, key=lambda entry: _similarity(entry.embedding, embedding))
+        score = _similarity(best.embedding, embedding)
+
+        if score < settings.SEMANTIC_ANSWER_CACHE_THRESHOLD:
+            cls.counters["misses"] += 1
+            return None
+
+        cls.counters["hits"] += 1
+        logger.info(f"Semantic answer cache hit ({score:.3f}): '{query}' ~ '{best.query}'")
+        return best
+
+    @classmethod
+    async def store(
+        cls,
+        scope: str,
+        version: str,
+        query: str,
+        query_result: QueryResult,
+        project_ids: set[str],
+        config: RunnableConfig,
+    ) -> None:
+        await cls._add(scope, version, query, _copy_for_cache(query_result), project_ids, config)
+
+    @classmethod
+    def schedule_store(
+        cls,
+        scope: str,
+        version: str,
+        query: str,
+        query_result: QueryResult,
+        project_ids: set[str],
+        config: RunnableConfig,
+    ) -> None:
+        """
+        Store an answer in a background task, keeping the embedding of a query the
+        lookup did not embed (nothing cached in its scope yet) off the response path.
+        """
+        # A fresh config: the request's deadline is done once the response is sent.
+        metadata = config.get("configurable", {}).get("metadata", {})
+        config = RunnableConfig(metadata=metadata, configurable={"metadata": metadata})
+        task = asyncio.create_task(
+            cls._store_in_background(
+                scope, version, query, _copy_for_cache(query_result), project_ids, config
+            )
+        )
+        cls.tasks.add(task)
+        task.add_done_callback(cls.tasks.discard)
+
+    @classmethod
+    async def _store_in_background(
+        cls,
+        scope: str,
+        version: str,
+        query: str,
+        query_result: QueryResult,
+        project_ids: set[str],
+        config: RunnableConfig,
+    ) -> None:
+        try:
+            await cls._add(scope, version, query, query_result, project_ids, config)
+        except Exception as e:
+            cls.counters["store_failures"] += 1
+            logger.warning(f"Failed to store answer in semantic answer cache: {e!s}")
+
+    @classmethod
+    async def _add(
+        cls,
+        scope: str,
+        version: str,
+        query: str,
+        query_result: QueryResult,
+        project_ids: set[str],
+        config: RunnableConfig,
+    ) -> None:
+        entry = CachedAnswer(
+            query=query,
+            embedding=await cls.embed(query, config),
+            version=version,
+            query_result=query_result,
+            project_ids=project_ids,
+        )
+
+        entries = [existing for existing in cls.entries.get(scope, []) if existing.query != query]
+        entries.append(entry)
+        cls.entries[scope] = entries[-settings.SEMANTIC_ANSWER_CACHE_MAX_ENTRIES_PER_SCOPE :]
+        cls.counters["stores"] += 1
+
+    @classmethod
+    def invalidate(cls, project_id: str | None = None) -> None:
+        """
+        Drop cached answers that used a project's datasets, or all answers.
+        """
+        if project_id is None:
+            cls.entries = {}
+        else:
+            cls.entries = {
+                scope: [entry for entry in entries if project_id not in entry.project_ids]
+                for scope, entries in cls.entries.items()
+            }
+        cls.counters["invalidations"] += 1
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        return {
+            "enabled": settings.SEMANTIC_ANSWER_CACHE_ENABLED,
+            "scopes": len(cls.entries),
+            "entries": sum(len(entries) for entries in cls.entries.values()),
+            "storing": len(cls.tasks),
+            **cls.counters,
+        }
+
+    @classmethod
+    async def cancel_all(cls) -> None:
+        for task in cls.tasks:
+            task.cancel()
+        await asyncio.gather(*cls.tasks, return_exceptions=True)
+        cls.tasks = set()
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+from langchain_core.runnables import RunnableConfig
+
+from app.core.config import settings
+from app.models.provider import ModelCategory
+from app.models.router import LatencyMode
+
+
+@dataclass(frozen=True)
+class ExecutionProfile:
+    """
+    How much work a request may spend on accuracy, selected per request with the
+    `latency_mode` metadata key.
+    """
+
+    validate_results: bool
+    max_validation_retries: int
+    break_down_queries: bool
+    # Overrides the model category of every node when set.
+    model_category: ModelCategory | None = None
+
+
+def get_execution_profile_for_mode(latency_mode: LatencyMode) -> ExecutionProfile:
+    match latency_mode:
+        case LatencyMode.FAST:
+            # A single planning call on the FAST model with no validation round trips.
+            return ExecutionProfile(
+                validate_results=False,
+                max_validation_retries=0,
+                break_down_queries=False,
+                model_category=ModelCategory.FAST,
+            )
+        case LatencyMode.THOROUGH:
+            return ExecutionProfile(
+                validate_results=True,
+                max_validation_retries=settings.THOROUGH_VALIDATION_RETRY_COUNT,
+                break_down_queries=True,
+                model_category=ModelCategory.ADVANCED,
+            )
+        case _:
+            return ExecutionProfile(
+                validate_results=True,
+                max_validation_retries=settings.MAX_VALIDATION_RETRY_COUNT,
+                break_down_queries=True,
+            )
+
+
+def get_latency_mode(config: RunnableConfig | None) -> LatencyMode:
+    latency_mode = (config or {}).get("configurable", {}).get("latency_mode")
+    return LatencyMode(latency_mode or settings.DEFAULT_LATENCY_MODE)
+
+
+def get_execution_profile(config: RunnableConfig | None) -> ExecutionProfile:
+    return get_execution_profile_for_mode(get_latency_mode(config))
@@ -0,0 +1,189 @@
+import asyncio
+import contextlib
+import inspect
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ensure_config
+
+from app.core.config import settings
+from app.core.log import logger
+
+T = TypeVar("T")
+
+DEADLINE_EXCEEDED = "Request deadline exceeded"
+CLIENT_DISCONNECTED = "Client disconnected"
+
+
+class RequestCancelledError(Exception):
+    """
+    The request was cancelled by the client or ran past its deadline.
+    """
+
+
+@dataclass
+class RequestDeadline:
+    """
+    Per-request deadline and cancellation token, carried in RunnableConfig's
+    configurable under "deadline".
+    """
+
+    expires_at: float
+    cancelled: asyncio.Event = field(default_factory=asyncio.Event)
+    reason: str | None = None
+
+    @classmethod
+    def after(cls, seconds: float) -> "RequestDeadline":
+        return cls(expires_at=time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def is_cancelled(self) -> bool:
+        return self.cancelled.is_set()
+
+    def is_done(self) -> bool:
+        return self.is_cancelled() or self.remaining() == 0
+
+    def cancel(self, reason: str = CLIENT_DISCONNECTED) -> None:
+        if not self.is_cancelled():
+            self.reason = reason
+            self.cancelled.set()
+
+    def check(self) -> None:
+        if self.is_cancelled():
+            raise RequestCancelledError(self.reason)
+        if self.remaining() == 0:
+            raise RequestCancelledError(DEADLINE_EXCEEDED)
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Await `awaitable`, cancelling it when the request is cancelled or the
+        deadline passes first.
+        """
+        try:
+            self.check()
+        except RequestCancelledError:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+
+        task = asyncio.ensure_future(awaitable)
+        cancelled = asyncio.create_task(self.cancelled.wait())
+        try:
+            await asyncio.wait(
+                {task, cancelled},
+                timeout=self.remaining(),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            cancelled.cancel()
+            if not task.done():
+                task.cancel()
+                # Let the awaitable unwind before returning, like asyncio.wait_for.
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+        if not task.cancelled():
+            return task.result()
+
+        self.check()
+        raise RequestCancelledError(DEADLINE_EXCEEDED)
+
+    async def iterate(self, iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+        """
+        Iterate `iterator` until the request is cancelled or the deadline passes,
+        cancelling the pending step.
+
+        A single watcher task serves the whole iteration, so items cost no task or
+        timer each as they would with `run`. The watcher only interrupts the
+        consuming task while it waits for the next item; a deadline passing while
+        the item is being handled is caught before the next one is requested.
+        """
+        consumer = asyncio.current_task()
+        assert consumer is not None
+        waiting = False
+        interrupted = False
+
+        async def watch() -> None:
+            nonlocal interrupted
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self.cancelled.wait(), self.remaining())
+            if waiting:
+                interrupted = True
+                consumer.cancel()
+
+        watcher = asyncio.create_task(watch())
+        try:
+            while True:
+                self.check()
+                waiting = True
+                try:
+                    item = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+                except asyncio.CancelledError:
+                    if not interrupted:
+                        raise
+                    consumer.uncancel()
+                    self.check()
+                    raise RequestCancelledError(DEADLINE_EXCEEDED)
+                finally:
+                    waiting = False
+                yield item
+        finally:
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+
+
+def get_request_deadline(config: RunnableConfig | None = None) -> RequestDeadline | None:
+    """
+    Deadline of the request being handled. Without an explicit config the config of
+    the current runnable is used, so services called from graph nodes need no
+    extra argument.
+    """
+    config = config or ensure_config()
+    return config.get("configurable", {}).get("deadline")
+
+
+async def with_deadline(awaitable: Awaitable[T], config: RunnableConfig | None = None) -> T:
+    deadline = get_request_deadline(config)
+    if deadline is None:
+        return await awaitable
+    return await deadline.run(awaitable)
+
+
+def get_remaining_timeout(config: RunnableConfig | None = None) -> float | None:
+    deadline = get_request_deadline(config)
+    return deadline.remaining() if deadline else None
+
+
+async def watch_disconnect(
+    is_disconnected: Callable[[], Awaitable[bool]], deadline: RequestDeadline
+) -> None:
+    while not deadline.is_done():
+        if await is_disconnected():
+            logger.info("Client disconnected, cancelling request")
+            deadline.cancel(CLIENT_DISCONNECTED)
+            return
+        await asyncio.sleep(settings.REQUEST_DISCONNECT_POLL_SECONDS)
+
+
+async def cancel_on_disconnect(
+    event_chunks: AsyncIterator[T],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    deadline: RequestDeadline,
+) -> AsyncIterator[T]:
+    """
+    Pass `event_chunks` through while watching the client connection, cancelling
+    `deadline` once the client goes away.
+    """
+    watcher = asyncio.create_task(watch_disconnect(is_disconnected, deadline))
+    try:
+        async for chunk in event_chunks:
+            yield chunk
+    finally:
+        watcher.cancel()
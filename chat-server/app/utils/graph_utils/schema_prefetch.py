@@ -0,0 +1,152 @@
+import asyncio
+import re
+from dataclasses import dataclass, field
+
+from langchain_core.runnables import RunnableConfig
+
+from app.core.config import settings
+from app.core.log import logger
+from app.models.schema import DatasetSchema
+from app.services.gopie.sql_executor import (
+    SQL_RESPONSE_TYPE,
+    execute_sql_with_limit,
+)
+from app.services.qdrant.get_schema import (
+    get_schema_by_dataset_ids,
+    get_schema_from_qdrant,
+)
+from app.services.qdrant.schema_search import search_schemas
+from app.utils.model_registry.model_provider import get_model_provider
+
+
+@dataclass
+class PrefetchedSchemas:
+    """
+    Schema lookups started for the raw user query while process_context runs.
+
+    Lookups keyed on dataset ids are always reusable. The semantic search results
+    are only reused for a search query that is close enough to the raw query.
+    """
+
+    query: str
+    searched_schemas: list[DatasetSchema] | None = None
+    relevant_dataset_ids: list[str] = field(default_factory=list)
+    relevant_dataset_schemas: list[DatasetSchema] | None = None
+    dataset_schemas: dict[str, DatasetSchema] = field(default_factory=dict)
+    sample_data: dict[str, SQL_RESPONSE_TYPE] = field(default_factory=dict)
+
+    def get_searched_schemas(self, query: str) -> list[DatasetSchema] | None:
+        if self.searched_schemas is None:
+            return None
+        similarity = query_similarity(self.query, query)
+        if similarity < settings.SCHEMA_PREFETCH_MIN_SIMILARITY:
+            logger.debug(f"Discarding prefetched schema search ({similarity:.2f}): '{query}'")
+            return None
+        return self.searched_schemas
+
+    def get_relevant_dataset_schemas(
+        self, dataset_ids: list[str] | None
+    ) -> list[DatasetSchema] | None:
+        if self.relevant_dataset_schemas is None or sorted(dataset_ids or []) != sorted(
+            self.relevant_dataset_ids
+        ):
+            return None
+        return self.relevant_dataset_schemas
+
+    def get_dataset(self, dataset_id: str) -> tuple[DatasetSchema, SQL_RESPONSE_TYPE] | None:
+        if dataset_id not in self.dataset_schemas or dataset_id not in self.sample_data:
+            return None
+        return self.dataset_schemas[dataset_id], self.sample_data[dataset_id]
+
+
+def _tokens(text: str) -> set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def query_similarity(a: str, b: str) -> float:
+    """
+    Word overlap (Jaccard) of two queries; cheap enough to run without a network call.
+    """
+    tokens_a, tokens_b = _tokens(a), _tokens(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+async def fetch_sample_data(dataset_name: str) -> SQL_RESPONSE_TYPE:
+    return await execute_sql_with_limit(query=f"SELECT * FROM {dataset_name} LIMIT 50")
+
+
+async def prefetch_schemas(
+    query: str,
+    dataset_ids: list[str] | None,
+    project_ids: list[str] | None,
+    relevant_dataset_ids: list[str] | None,
+    config: RunnableConfig,
+) -> PrefetchedSchemas:
+    """
+    Run the lookups the dataset agent starts with: the schema and sample rows of a
+    single dataset, or the semantic schema search and the schemas of datasets used
+    earlier in the chat for the multi dataset agent.
+    """
+    prefetched = PrefetchedSchemas(query=query, relevant_dataset_ids=relevant_dataset_ids or [])
+
+    async def fetch_dataset(dataset_id: str) -> None:
+        schema = await get_schema_from_qdrant(dataset_id=dataset_id)
+        if schema is None:
+            return
+        prefetched.dataset_schemas[dataset_id] = schema
+        prefetched.sample_data[dataset_id] = await fetch_sample_data(schema.dataset_name)
+
+    async def search() -> None:
+        embeddings_model = get_model_provider(config).get_embeddings_model()
+        prefetched.searched_schemas = await search_schemas(
+            user_query=query,
+            embeddings=embeddings_model,
+            dataset_ids=dataset_ids,
+            project_ids=project_ids,
+        )
+
+    async def fetch_relevant() -> None:
+        prefetched.relevant_dataset_schemas = await get_schema_by_dataset_ids(
+            dataset_ids=relevant_dataset_ids
+        )
+
+    if dataset_ids and len(dataset_ids) == 1:
+        tasks = [fetch_dataset(dataset_ids[0])]
+    else:
+        tasks = [search(), fetch_relevant()]
+
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, Exception):
+            logger.warning(f"Schema prefetch failed: {result!s}")
+
+    return prefetched
+
+
+def start_schema_prefetch(
+    query: str,
+    dataset_ids: list[str] | None,
+    project_ids: list[str] | None,
+    relevant_dataset_ids: list[str] | None,
+    config: RunnableConfig,
+) -> asyncio.Task | None:
+    if not settings.SCHEMA_PREFETCH_ENABLED or not query:
+        return None
+    return asyncio.create_task(
+        prefetch_schemas(query, dataset_ids, project_ids, relevant_dataset_ids, config)
+    )
+
+
+async def collect_schema_prefetch(task: asyncio.Task | None) -> PrefetchedSchemas | None:
+    """
+    Wait up to SCHEMA_PREFETCH_WAIT_SECONDS for a prefetch still in flight; a slow
+    prefetch is cancelled and the dataset agent does its own lookups.
+    """
+    if task is None:
+        return None
+    try:
+        return await asyncio.wait_for(task, settings.SCHEMA_PREFETCH_WAIT_SECONDS)
+    except Exception as e:
+        logger.debug(f"Schema prefetch not used: {e!r}")
+        return None
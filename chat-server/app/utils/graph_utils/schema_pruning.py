@@ -0,0 +1,122 @@
+import re
+from collections.abc import Iterable
+
+from app.core.config import settings
+from app.models.schema import ColumnSchema, DatasetSchema
+from app.utils.model_registry.token_counter import TokenCounter
+
+KEY_TOKENS = {"id", "code", "key"}
+MISSING_COLUMN_PATTERN = re.compile(
+    r"(column|field)[^.\n]{0,80}(not found|does not exist|missing|unknown)"
+    r"|(missing|unknown|nonexistent)\s+(column|field)"
+    r"|referenced column|does not have a column",
+    re.IGNORECASE,
+)
+
+
+def tokenize(text: str | None) -> set[str]:
+    """
+    Lowercase word tokens of a column name, description or query, with camelCase
+    and snake_case split and a trailing plural "s" dropped.
+    """
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text or "").lower()
+    return {
+        word[:-1] if len(word) > 3 and word.endswith("s") else word
+        for word in re.findall(r"[a-z0-9]+", text)
+    }
+
+
+def is_key_column(column: ColumnSchema) -> bool:
+    return bool(tokenize(column.column_name) & KEY_TOKENS)
+
+
+def is_missing_column_error(messages: Iterable[str | None]) -> bool:
+    """
+    Whether any of the errors or validation feedback blames a column that was
+    not found, i.e. one the pruned schema may have left out.
+    """
+    return any(message and MISSING_COLUMN_PATTERN.search(message) for message in messages)
+
+
+def get_required_columns(datasets_info: dict | None) -> dict[str, set[str]]:
+    """
+    Columns named in the column assumptions or verified column values, per
+    dataset table name.
+    """
+    required: dict[str, set[str]] = {}
+    if not datasets_info:
+        return required
+
+    for assumption in datasets_info.get("column_assumptions") or []:
+        dataset_name = assumption.get("dataset")
+        if not dataset_name:
+            continue
+        columns = required.setdefault(dataset_name, set())
+        columns.update(
+            column.get("name") for column in assumption.get("columns", []) if column.get("name")
+        )
+
+    column_requirements = datasets_info.get("correct_column_requirements")
+    if column_requirements:
+        for dataset_name, analysis in column_requirements.datasets.items():
+            columns = required.setdefault(dataset_name, set())
+            columns.update(column.column_name for column in analysis.columns_analyzed)
+
+    return required
+
+
+def prune_columns(
+    schema: DatasetSchema,
+    query: str,
+    required_columns: Iterable[str] = (),
+    referenced_sql: Iterable[str] = (),
+) -> list[ColumnSchema] | None:
+    """
+    Columns of `schema` worth showing for `query`, in schema order, or None when
+    the schema is narrow enough to show whole.
+
+    Required columns come first, then key columns, then the
+    SCHEMA_PRUNING_MAX_COLUMNS columns whose name and description overlap most
+    with the query, all within SCHEMA_PRUNING_TOKEN_BUDGET. Columns referenced in
+    `referenced_sql` count as required.
+    """
+    columns = schema.columns or []
+    if not settings.SCHEMA_PRUNING_ENABLED or len(columns) <= settings.SCHEMA_PRUNING_MAX_COLUMNS:
+        return None
+
+    query_tokens = tokenize(query)
+    required = {name.lower() for name in required_columns}
+    sql_identifiers = set(re.findall(r"\w+", " ".join(referenced_sql).lower()))
+
+    def priority(column: ColumnSchema) -> int:
+        name = column.column_name.lower()
+        if name in required or name in sql_identifiers:
+            return 2
+        return 1 if is_key_column(column) else 0
+
+    def relevance(column: ColumnSchema) -> int:
+        name_overlap = len(tokenize(column.column_name) & query_tokens)
+        description_overlap = len(tokenize(column.column_description) & query_tokens)
+        return 3 * name_overlap + description_overlap
+
+    ranked = sorted(
+        range(len(columns)),
+        key=lambda index: (-priority(columns[index]), -relevance(columns[index]), index),
+    )
+
+    kept: set[int] = set()
+    tokens = 0
+    ranked_columns = 0
+    for index in ranked:
+        column = columns[index]
+        is_ranked = priority(column) == 0
+        if is_ranked and ranked_columns >= settings.SCHEMA_PRUNING_MAX_COLUMNS:
+            break
+        cost = TokenCounter.count_text(column.format_for_prompt()) + 1
+        if tokens + cost > settings.SCHEMA_PRUNING_TOKEN_BUDGET:
+            continue
+        kept.add(index)
+        tokens += cost
+        ranked_columns += is_ranked
+
+    return [columns[index] for index in sorted(kept)]
@@ -1,3 +1,5 @@
+from functools import cache
+
 from langchain_core.prompts import ChatPromptTemplate
 from langsmith import Client
 
@@ -6,17 +8,19 @@ from app.core.log import logger
 from app.workflow.prompts.prompt_selector import PromptSelector
 
 
+@cache
 def get_langsmith_client():
     return Client(api_key=settings.LANGSMITH_API_KEY)
 
 
-def pull_prompt(prompt_name: str):
+def pull_prompt(prompt_name: str, version: str | None = None):
     client = get_langsmith_client()
 
     try:
         prompt = client.get_prompt(prompt_name)
         if prompt:
-            return client.pull_prompt(prompt_name)
+            identifier = f"{prompt_name}:{version}" if version else prompt_name
+            return client.pull_prompt(identifier)
         else:
             return push_and_get_prompt(prompt_name)
     except Exception as e:
@@ -3,9 +3,17 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 
 from app.core.config import settings
-from app.core.log import logger
-from app.utils.langsmith.client import pull_prompt
+from app.utils.langsmith.prompt_registry import PromptRegistry
 from app.utils.model_registry.model_provider import get_configured_llm_for_node
+from app.utils.model_registry.model_router import (
+    ModelRouter,
+    with_model_routing,
+)
+from app.utils.model_registry.model_selection import get_node_model
+from app.utils.model_registry.response_cache import (
+    is_response_cache_enabled,
+    with_response_cache,
+)
 from app.workflow.prompts.prompt_selector import NodeName, PromptSelector
 
 
@@ -27,53 +35,34 @@ class PromptManager:
 
     def get_prompt_template(self) -> ChatPromptTemplate:
         """
-        Get a prompt template from LangSmith hub if enabled, otherwise return fallback.
+        Get a prompt template from the LangSmith prompt cache if enabled, otherwise
+        (or while it is not cached yet) return fallback.
         """
 
         if self._is_langsmith_enabled():
-            try:
-                langsmith_prompt = pull_prompt(self.prompt_name)
+            langsmith_prompt = PromptRegistry.get(self.prompt_name)
+            if langsmith_prompt is not None:
                 return langsmith_prompt
 
-            except Exception as e:
-                logger.warning(
-                    f"Failed to load LangSmith prompt "
-                    f"'{self.prompt_name}': {e}. "
-                    f"Using fallback prompt instead."
-                )
-
-                return self.prompt_selector.get_prompt_template(self.prompt_name)
-
-        else:
-            return self.prompt_selector.get_prompt_template(self.prompt_name)
+        return self.prompt_selector.get_prompt_template(self.prompt_name)
 
     def get_prompt(self) -> list[BaseMessage]:
         """
-        Get a prompt from LangSmith hub if enabled, otherwise return fallback.
+        Get a prompt from the LangSmith prompt cache if enabled, otherwise (or while
+        it is not cached yet) return fallback.
         """
 
-        formatted_input = self._get_formatted_input()
-
         if self._is_langsmith_enabled():
-            try:
-                langsmith_prompt = pull_prompt(self.prompt_name)
+            langsmith_prompt = PromptRegistry.get(self.prompt_name)
+            if langsmith_prompt is not None:
+                formatted_input = self._get_formatted_input()
                 return (
                     langsmith_prompt.format_messages(**formatted_input)
                     if formatted_input
                     else langsmith_prompt.format_messages(**self.kwargs)
                 )
 
-            except Exception as e:
-                logger.warning(
-                    f"Failed to load LangSmith prompt "
-                    f"'{self.prompt_name}': {e}. "
-                    f"Using fallback prompt instead."
-                )
-
-                return self.prompt_selector.get_prompt(self.prompt_name, **self.kwargs)
-
-        else:
-            return self.prompt_selector.get_prompt(self.prompt_name, **self.kwargs)
+        return self.prompt_selector.get_prompt(self.prompt_name, **self.kwargs)
 
 
 def get_prompt(node_name: NodeName, **kwargs) -> list[BaseMessage]:
@@ -91,7 +80,8 @@ def get_prompt_llm_chain(
     Build a runnable chain that:
       - accepts raw variables as input
       - formats them into messages using the existing prompt manager
-      - invokes the configured LLM
+      - invokes the configured LLM, or for adaptive nodes the one `ModelRouter`
+        picks for the call
 
     This keeps the runnable input as the original variables.
     """
@@ -112,11 +102,21 @@ def get_prompt_llm_chain(
         {"run_name": f"{node_name}_prompt_chain", "callbacks": []}
     )
 
-    llm = get_configured_llm_for_node(
-        node_name,
-        config,
-        tool_names=tool_names,
-        schema=schema,
-    )
-
-    return formatter | llm
+    def get_llm(model_id: str | None = None) -> Runnable:
+        llm = get_configured_llm_for_node(
+            node_name,
+            config,
+            tool_names=tool_names,
+            schema=schema,
+            model_id=model_id,
+        )
+        if is_response_cache_enabled(node_name):
+            llm = with_response_cache(
+                llm, node_name, model_id or get_node_model(node_name, config), schema
+            )
+        return llm
+
+    if ModelRouter.is_enabled(node_name, config):
+        return with_model_routing(node_name, formatter, get_llm)
+
+    return formatter | get_llm()
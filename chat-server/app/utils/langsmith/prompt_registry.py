@@ -0,0 +1,107 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from app.core.config import settings
+from app.core.log import logger
+from app.utils.langsmith.client import pull_prompt
+
+
+@dataclass
+class CachedPrompt:
+    template: ChatPromptTemplate
+    version: str | None
+    fetched_at: float
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.fetched_at > settings.LANGSMITH_PROMPT_TTL_SECONDS
+
+
+class PromptRegistry:
+    """
+    In-process cache of LangSmith prompts.
+
+    Prompts are fetched in background tasks and served from memory; requests never
+    wait on LangSmith. A missing prompt returns None so callers fall back to the
+    PromptSelector template while the first fetch runs. Expired prompts keep being
+    served until the refresh completes (stale-while-revalidate). Versions can be
+    pinned per prompt with LANGSMITH_PROMPT_VERSIONS, e.g. {"plan_query": "prod"}.
+    """
+
+    prompts: dict[str, CachedPrompt] = {}
+    refresh_tasks: dict[str, asyncio.Task] = {}
+    failed_at: dict[str, float] = {}
+
+    @classmethod
+    def get_version(cls, prompt_name: str) -> str | None:
+        return settings.LANGSMITH_PROMPT_VERSIONS.get(prompt_name)
+
+    @classmethod
+    def get(cls, prompt_name: str) -> ChatPromptTemplate | None:
+        """
+        Get the cached template for a prompt, scheduling a background refresh when
+        it is missing, expired or its pinned version changed.
+        """
+        cached = cls.prompts.get(prompt_name)
+        if cached is None or cached.is_stale() or cached.version != cls.get_version(prompt_name):
+            cls.schedule_refresh(prompt_name)
+        return cached.template if cached else None
+
+    @classmethod
+    def schedule_refresh(cls, prompt_name: str) -> None:
+        task = cls.refresh_tasks.get(prompt_name)
+        if task and not task.done():
+            return
+
+        failed_at = cls.failed_at.get(prompt_name)
+        if failed_at and time.monotonic() - failed_at < settings.LANGSMITH_PROMPT_RETRY_SECONDS:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        cls.refresh_tasks[prompt_name] = loop.create_task(cls.refresh(prompt_name))
+
+    @classmethod
+    async def refresh(cls, prompt_name: str) -> None:
+        version = cls.get_version(prompt_name)
+        try:
+            template = await asyncio.to_thread(pull_prompt, prompt_name, version)
+            cls.prompts[prompt_name] = CachedPrompt(
+                template=template,
+                version=version,
+                fetched_at=time.monotonic(),
+            )
+            cls.failed_at.pop(prompt_name, None)
+        except Exception as e:
+            cls.failed_at[prompt_name] = time.monotonic()
+            logger.warning(
+                f"Failed to refresh LangSmith prompt '{prompt_name}': {e!s}. "
+                f"Serving {'cached' if prompt_name in cls.prompts else 'fallback'} prompt."
+            )
+
+    @classmethod
+    def warm_up(cls, prompt_names: Iterable[str]) -> None:
+        for prompt_name in prompt_names:
+            cls.schedule_refresh(prompt_name)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        return {
+            "cached": len(cls.prompts),
+            "stale": sum(prompt.is_stale() for prompt in cls.prompts.values()),
+            "refreshing": sum(not task.done() for task in cls.refresh_tasks.values()),
+            "failing": len(cls.failed_at),
+        }
+
+    @classmethod
+    async def close(cls) -> None:
+        for task in cls.refresh_tasks.values():
+            task.cancel()
+        await asyncio.gather(*cls.refresh_tasks.values(), return_exceptions=True)
+        cls.refresh_tasks = {}
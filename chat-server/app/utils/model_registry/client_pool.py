@@ -0,0 +1,141 @@
+from collections import Counter
+from typing import Any, Callable, TypeVar
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+from app.core.config import settings
+from app.utils.model_registry.rate_limiter import RateLimitedTransport
+
+PooledModel = TypeVar("PooledModel", ChatOpenAI, OpenAIEmbeddings)
+
+
+class ClientPool:
+    """
+    Process-wide pool of LLM and embedding clients.
+
+    HTTP transports are shared per base URL so that keep-alive connections and TLS
+    sessions are reused across requests. Model instances are shared per
+    (provider, base URL, model) and only carry static configuration; per-request
+    metadata is applied to a shallow copy by `with_request_overrides`. Async
+    transports are wrapped in `RateLimitedTransport` so every LLM and embedding
+    call honours the per-(gateway, model) rate limits.
+    """
+
+    http_clients: dict[str, httpx.Client] = {}
+    http_async_clients: dict[str, httpx.AsyncClient] = {}
+    llms: dict[tuple[str, str, str], ChatOpenAI] = {}
+    embeddings: dict[tuple[str, str, str], OpenAIEmbeddings] = {}
+    counters: Counter = Counter()
+
+    @classmethod
+    def _get_limits(cls) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    @classmethod
+    def get_http_client_kwargs(cls, base_url: str | None) -> dict[str, Any]:
+        """
+        Get the shared sync and async HTTP clients for a base URL, in the keyword
+        form accepted by `ChatOpenAI` and `OpenAIEmbeddings`.
+        """
+        key = base_url or "default"
+        if key not in cls.http_async_clients:
+            cls.http_clients[key] = DefaultHttpxClient(limits=cls._get_limits())
+            cls.http_async_clients[key] = DefaultAsyncHttpxClient(
+                transport=RateLimitedTransport(
+                    key, httpx.AsyncHTTPTransport(limits=cls._get_limits())
+                )
+            )
+        return {
+            "http_client": cls.http_clients[key],
+            "http_async_client": cls.http_async_clients[key],
+        }
+
+    @classmethod
+    def _get_or_create(
+        cls,
+        pool: dict[tuple[str, str, str], PooledModel],
+        kind: str,
+        key: tuple[str, str, str],
+        factory: Callable[[], PooledModel],
+    ) -> PooledModel:
+        model = pool.get(key)
+        if model is None:
+            cls.counters[f"{kind}_misses"] += 1
+            model = factory()
+            pool[key] = model
+        else:
+            cls.counters[f"{kind}_hits"] += 1
+        return model
+
+    @classmethod
+    def get_llm(
+        cls,
+        provider: str,
+        base_url: str | None,
+        model_name: str,
+        factory: Callable[[], ChatOpenAI],
+    ) -> ChatOpenAI:
+        key = (provider, base_url or "default", model_name)
+        return cls._get_or_create(cls.llms, "llm", key, factory)
+
+    @classmethod
+    def get_embeddings(
+        cls,
+        provider: str,
+        base_url: str | None,
+        model_name: str,
+        factory: Callable[[], OpenAIEmbeddings],
+    ) -> OpenAIEmbeddings:
+        key = (provider, base_url or "default", model_name)
+        return cls._get_or_create(cls.embeddings, "embeddings", key, factory)
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        return {
+            "http_clients": len(cls.http_async_clients),
+            "llm_clients": len(cls.llms),
+            "embedding_clients": len(cls.embeddings),
+            "llm_hits": cls.counters["llm_hits"],
+            "llm_misses": cls.counters["llm_misses"],
+            "embeddings_hits": cls.counters["embeddings_hits"],
+            "embeddings_misses": cls.counters["embeddings_misses"],
+            "pooled_models": sorted(
+                f"{provider}:{model_name}@{base_url}"
+                for provider, base_url, model_name in [*cls.llms, *cls.embeddings]
+            ),
+        }
+
+    @classmethod
+    async def close(cls) -> None:
+        for client in cls.http_clients.values():
+            client.close()
+        for async_client in cls.http_async_clients.values():
+            await async_client.aclose()
+        cls.http_clients = {}
+        cls.http_async_clients = {}
+        cls.llms = {}
+        cls.embeddings = {}
+        cls.counters = Counter()
+
+
+def with_request_overrides(model: PooledModel, overrides: dict[str, Any]) -> PooledModel:
+    """
+    Return a shallow copy of a pooled model with per-request field overrides.
+
+    The copy shares the underlying OpenAI and HTTP clients with the pooled model.
+    `model_kwargs` overrides are merged so headers such as `extra_headers` are sent
+    along with any static model kwargs.
+    """
+    if not overrides:
+        return model
+
+    update = dict(overrides)
+    if "model_kwargs" in update:
+        update["model_kwargs"] = {**model.model_kwargs, **update["model_kwargs"]}
+    return model.model_copy(update=update)
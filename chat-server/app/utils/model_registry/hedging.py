@@ -0,0 +1,232 @@
+import asyncio
+import contextlib
+import time
+from collections import Counter
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import merge_configs
+
+from app.core.config import settings
+from app.core.log import logger
+from app.core.rolling_window import RollingWindows
+from app.utils.graph_utils.request_deadline import RequestCancelledError
+
+LATENCY_WINDOW = 500
+
+
+class _FirstResponseHandler(AsyncCallbackHandler):
+    def __init__(self, attempt: "_Attempt"):
+        self.attempt = attempt
+
+    async def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self.attempt.mark_responded(streamed=True)
+
+    async def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        self.attempt.mark_responded()
+
+
+class _Attempt:
+    """
+    One in-flight LLM request. It has responded once the first token streamed in
+    or, for non-streaming calls, once it finished.
+    """
+
+    def __init__(
+        self,
+        runnable: Runnable,
+        input: Any,
+        config: RunnableConfig,
+        kwargs: dict[str, Any],
+    ):
+        self.started_at = time.monotonic()
+        self.responded_at: float | None = None
+        self.streamed = False
+        self.responded = asyncio.Event()
+        config = merge_configs(config, {"callbacks": [_FirstResponseHandler(self)]})
+        self.task = asyncio.create_task(runnable.ainvoke(input, config, **kwargs))
+        self.task.add_done_callback(lambda _: self.mark_responded())
+
+    def mark_responded(self, streamed: bool = False) -> None:
+        self.streamed = self.streamed or streamed
+        if not self.responded.is_set():
+            self.responded_at = time.monotonic()
+            self.responded.set()
+
+    def failed_before_streaming(self) -> bool:
+        """
+        Whether the request failed before the user saw any of its output, so
+        another request can still take over.
+        """
+        if not self.task.done() or self.task.cancelled() or self.streamed:
+            return False
+        error = self.task.exception()
+        return error is not None and not isinstance(error, RequestCancelledError)
+
+    async def wait_responded(self, timeout: float | None = None) -> bool:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.responded.wait(), timeout)
+        return self.responded.is_set()
+
+    async def cancel(self) -> None:
+        if not self.task.done():
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+
+
+async def _first_to_respond(primary: _Attempt, hedge: _Attempt) -> _Attempt:
+    """
+    The attempt that responds first, skipping one that failed while the other is
+    still running.
+    """
+    pending = {
+        asyncio.create_task(primary.responded.wait()): primary,
+        asyncio.create_task(hedge.responded.wait()): hedge,
+    }
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in done:
+                attempt = pending.pop(waiter)
+                if not attempt.failed_before_streaming() or not pending:
+                    return attempt
+        return primary
+    finally:
+        for waiter in pending:
+            waiter.cancel()
+
+
+class LLMHedger:
+    """
+    Process-wide time-to-first-response tracking and hedge counters per
+    (node, model).
+
+    Once a node has LLM_HEDGE_MIN_SAMPLES samples, a request that has not
+    responded by the node's LLM_HEDGE_PERCENTILE (or LLM_HEDGE_PERCENTILES
+    override) gets a second request; whichever responds first is kept and the
+    other cancelled. A request failing before it streamed anything falls back to
+    the alternate at once.
+    """
+
+    latencies: RollingWindows = RollingWindows(LATENCY_WINDOW)
+    counters: dict[tuple[str, str], Counter] = {}
+
+    @classmethod
+    def get_percentile(cls, node_name: str) -> float:
+        return settings.LLM_HEDGE_PERCENTILES.get(node_name, settings.LLM_HEDGE_PERCENTILE)
+
+    @classmethod
+    def is_enabled(cls, node_name: str) -> bool:
+        return settings.LLM_HEDGING_ENABLED and cls.get_percentile(node_name) > 0
+
+    @classmethod
+    def get_hedge_delay(cls, node_name: str, model_id: str) -> float | None:
+        """
+        Seconds to wait for the first response before hedging, or None while the
+        node has too few samples to tell a slow request apart.
+        """
+        latencies = cls.latencies[(node_name, model_id)]
+        if len(latencies) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return latencies.percentile(cls.get_percentile(node_name))
+
+    @classmethod
+    def record(cls, node_name: str, model_id: str, seconds: float) -> None:
+        cls.latencies[(node_name, model_id)].append(seconds)
+
+    @classmethod
+    async def invoke(
+        cls,
+        primary: Runnable,
+        alternate: Runnable,
+        node_name: str,
+        model_id: str,
+        input: Any,
+        config: RunnableConfig,
+        kwargs: dict[str, Any],
+    ) -> Any:
+        key = (node_name, model_id)
+        delay = cls.get_hedge_delay(node_name, model_id)
+        counters = cls.counters.setdefault(key, Counter())
+        counters["calls"] += 1
+
+        first = _Attempt(primary, input, config, kwargs)
+        second: _Attempt | None = None
+        try:
+            if not await first.wait_responded(delay):
+                counters["hedged"] += 1
+                second = _Attempt(alternate, input, config, kwargs)
+                winner = await _first_to_respond(first, second)
+                if winner is second:
+                    counters["hedge_wins"] += 1
+            elif first.failed_before_streaming():
+                logger.warning(
+                    f"LLM call for '{node_name}' failed, falling back: {first.task.exception()!s}"
+                )
+                counters["fallbacks"] += 1
+                second = winner = _Attempt(alternate, input, config, kwargs)
+            else:
+                winner = first
+
+            if first.responded_at is None:
+                # A censored sample keeps slow upstreams in the distribution.
+                cls.record(node_name, model_id, time.monotonic() - first.started_at)
+            elif not first.failed_before_streaming():
+                cls.record(node_name, model_id, first.responded_at - first.started_at)
+
+            for attempt in (first, second):
+                if attempt is not None and attempt is not winner:
+                    await attempt.cancel()
+            return await winner.task
+        finally:
+            for attempt in (first, second):
+                if attempt is not None:
+                    await attempt.cancel()
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        stats = {}
+        for key, counters in cls.counters.items():
+            node_name, model_id = key
+            calls = counters["calls"]
+            first_response_p50 = cls.latencies[key].percentile(0.5)
+            stats[f"{node_name}:{model_id}"] = {
+                "calls": calls,
+                "hedged": counters["hedged"],
+                "hedge_wins": counters["hedge_wins"],
+                "fallbacks": counters["fallbacks"],
+                "hedge_rate": round(counters["hedged"] / calls, 3) if calls else 0.0,
+                "hedge_delay_ms": round((cls.get_hedge_delay(node_name, model_id) or 0) * 1000),
+                "first_response_ms_p50": round((first_response_p50 or 0) * 1000),
+            }
+        return {"enabled": settings.LLM_HEDGING_ENABLED, "nodes": stats}
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.latencies = RollingWindows(LATENCY_WINDOW)
+        cls.counters = {}
+
+
+def with_hedging(
+    primary: Runnable,
+    alternate: Runnable,
+    node_name: str,
+    model_id: str,
+) -> Runnable:
+    """
+    Wrap a configured node LLM so slow or failed requests are hedged with
+    `alternate`; see `LLMHedger`.
+    """
+
+    async def ahedged_invoke(input: Any, config: RunnableConfig, **kwargs: Any) -> Any:
+        return await LLMHedger.invoke(
+            primary, alternate, node_name, model_id, input, config, kwargs
+        )
+
+    def hedged_invoke(input: Any, config: RunnableConfig, **kwargs: Any) -> Any:
+        # Sync callers are not hedged; every graph node invokes LLMs async.
+        return primary.invoke(input, config, **kwargs)
+
+    return RunnableLambda(hedged_invoke, afunc=ahedged_invoke, name=f"{node_name}_hedged_llm")
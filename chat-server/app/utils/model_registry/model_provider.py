@@ -1,18 +1,24 @@
 from typing import Generic, Optional, Type, TypeVar, Union
 
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 from typing_extensions import overload
 
 from app.core.config import settings
 from app.models.provider import EmbeddingProvider, LLMProvider
-from app.tool_utils.tools import ToolNames, get_tools
+from app.tool_utils.tools import ToolNames
+from app.utils.graph_utils.request_deadline import get_remaining_timeout
+from app.utils.model_registry.hedging import LLMHedger, with_hedging
 from app.utils.model_registry.model_selection import (
     get_node_model,
     get_node_temperature,
     requires_json_mode,
 )
+from app.utils.model_registry.output_specs import (
+    bind_structured_output,
+    bind_tool_specs,
+)
 from app.utils.providers.embedding_providers import (
     BaseEmbeddingProvider,
     CustomEmbeddingProvider,
@@ -47,8 +53,8 @@ class StructuredLLM(Generic[StructuredOutputType]):
         ...
 
 
-def get_llm_provider(metadata: dict[str, str]) -> BaseLLMProvider:
-    gateway_type = LLMProvider(settings.LLM_GATEWAY_PROVIDER)
+def get_llm_provider(metadata: dict[str, str], gateway: str | None = None) -> BaseLLMProvider:
+    gateway_type = LLMProvider(gateway or settings.LLM_GATEWAY_PROVIDER)
     match gateway_type:
         case LLMProvider.PORTKEY:
             return PortkeyLLMProvider(metadata)
@@ -79,13 +85,14 @@ class ModelProvider:
     def __init__(
         self,
         metadata: dict[str, str],
+        gateway: str | None = None,
     ):
         self.metadata = metadata
-        self.llm_provider = get_llm_provider(metadata)
-        self.embedding_provider = get_embedding_provider(metadata)
+        self.llm_provider = get_llm_provider({**metadata}, gateway)
+        self.embedding_provider = get_embedding_provider({**metadata})
 
     def get_llm(self, model_id: str):
-        model = self.llm_provider.get_llm_model(model_id)
+        model = self.llm_provider.get_pooled_llm_model(model_id)
         return model
 
     def get_llm_with_tools(
@@ -93,20 +100,23 @@ class ModelProvider:
         model_id: str,
         tool_names: list[ToolNames],
     ):
-        tools = get_tools(tool_names)
-        tool_functions = [tool for tool, _ in tools.values()]
         llm = self.get_llm(model_id)
-        return llm.bind_tools(tool_functions)
+        return bind_tool_specs(llm, tool_names)
 
     def get_embeddings_model(self):
-        return self.embedding_provider.get_embeddings_model(settings.DEFAULT_EMBEDDING_MODEL)
+        return self.embedding_provider.get_pooled_embeddings_model(settings.DEFAULT_EMBEDDING_MODEL)
 
 
 def get_model_provider(
     config: RunnableConfig = RunnableConfig(),
+    gateway: str | None = None,
 ) -> ModelProvider:
     metadata = config.get("configurable", {}).get("metadata", {})
-    return ModelProvider(metadata=metadata)
+    return ModelProvider(metadata=metadata, gateway=gateway)
+
+
+def is_token_streaming(config: RunnableConfig) -> bool:
+    return config.get("configurable", {}).get("stream_tokens", True)
 
 
 @overload
@@ -117,6 +127,7 @@ def get_configured_llm_for_node(
     tool_names: list[ToolNames] | None = None,
     schema: None = None,
     force_tool_calls: bool = False,
+    model_id: str | None = None,
 ) -> ChatOpenAI:
     ...
 
@@ -128,6 +139,7 @@ def get_configured_llm_for_node(
     *,
     tool_names: list[ToolNames] | None = None,
     schema: Type[StructuredOutputType],
+    model_id: str | None = None,
 ) -> StructuredLLM[StructuredOutputType]:
     ...
 
@@ -139,15 +151,19 @@ def get_configured_llm_for_node(
     tool_names: list[ToolNames] | None = None,
     force_tool_calls: bool = False,
     schema: Optional[Type[StructuredOutputType]] = None,
+    model_id: str | None = None,
 ) -> Union[ChatOpenAI, StructuredLLM[StructuredOutputType]]:
     """
-    Get a configured LLM for a workflow node with type inference.
+    Get a configured LLM for a workflow node with type inference. With
+    LLM_HEDGING_ENABLED, slow or failed requests are hedged against the
+    LLM_HEDGE_MODEL / LLM_HEDGE_GATEWAY_PROVIDER alternate.
 
     Args:
         node_name: Name of the workflow node
         config: Runnable configuration
         tool_names: Optional list of tools to bind to the LLM
         schema: Pydantic model class for structured output (required for type inference)
+        model_id: Model to use instead of the node's configured model
 
     Returns:
         Configured LLM that returns the specified Pydantic model type
@@ -156,19 +172,57 @@ def get_configured_llm_for_node(
         llm = get_configured_llm_for_node("validate_input", config, schema=ValidateInputOutput)
         result = await llm.ainvoke(prompt)  # result is typed as ValidateInputOutput
     """
+    model_id = model_id or get_node_model(node_name, config)
+    llm = _configure_node_llm(
+        get_model_provider(config),
+        model_id,
+        node_name,
+        config,
+        tool_names=tool_names,
+        force_tool_calls=force_tool_calls,
+        schema=schema,
+    )
+    if not LLMHedger.is_enabled(node_name):
+        return llm
+
+    alternate = _configure_node_llm(
+        get_model_provider(config, settings.LLM_HEDGE_GATEWAY_PROVIDER or None),
+        settings.LLM_HEDGE_MODEL or model_id,
+        node_name,
+        config,
+        tool_names=tool_names,
+        force_tool_calls=force_tool_calls,
+        schema=schema,
+    )
+    return with_hedging(llm, alternate, node_name, model_id)
+
+
+def _configure_node_llm(
+    model_provider: ModelProvider,
+    model_id: str,
+    node_name: str,
+    config: RunnableConfig,
+    *,
+    tool_names: list[ToolNames] | None,
+    force_tool_calls: bool,
+    schema: Optional[Type[StructuredOutputType]],
+) -> Runnable:
     json_mode = requires_json_mode(node_name)
     temperature = get_node_temperature(node_name)
-    model_id = get_node_model(node_name)
 
-    model_provider = get_model_provider(config)
     if tool_names:
         llm = model_provider.get_llm_with_tools(model_id, tool_names)
     else:
         llm = model_provider.get_llm(model_id)
+    if not is_token_streaming(config):
+        llm = llm.bind(stream=False)
+    timeout = get_remaining_timeout(config)
+    if timeout is not None:
+        llm = llm.bind(timeout=timeout)
     if temperature:
         llm = llm.bind(temperature=temperature)
     if schema:
-        structured_llm = llm.with_structured_output(schema=schema, method="json_schema")
+        structured_llm = bind_structured_output(llm, schema, model_id)
         return structured_llm
     elif json_mode:
         llm = llm.bind(response_format={"type": "json_object"})
@@ -180,7 +234,7 @@ def get_configured_llm_for_node(
 def get_llm_for_other_task(node_name: str, config: RunnableConfig):
     json_mode = requires_json_mode(node_name)
     temperature = get_node_temperature(node_name)
-    model_id = get_node_model(node_name)
+    model_id = get_node_model(node_name, config)
 
     model_provider = get_model_provider(config)
     llm = model_provider.get_llm(model_id)
@@ -0,0 +1,202 @@
+import time
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from app.core.config import settings
+from app.core.rolling_window import RollingWindow
+from app.models.provider import ModelCategory
+from app.utils.graph_utils.execution_profile import get_execution_profile
+from app.utils.graph_utils.request_deadline import RequestCancelledError
+from app.utils.model_registry.model_selection import (
+    get_model_id_for_category,
+    get_node_config,
+)
+from app.utils.model_registry.token_counter import TokenCounter
+
+STATS_WINDOW = 200
+TIERS = [ModelCategory.FAST, ModelCategory.BALANCED, ModelCategory.ADVANCED]
+
+
+@dataclass(frozen=True)
+class ComplexityEstimate:
+    prompt_tokens: int
+    datasets: int
+    query_words: int
+    # Retry after a failed or rejected attempt.
+    retry: bool
+
+    def is_simple(self) -> bool:
+        return (
+            not self.retry
+            and self.datasets <= 1
+            and self.query_words <= settings.MODEL_ROUTING_SIMPLE_QUERY_WORDS
+            and self.prompt_tokens <= settings.MODEL_ROUTING_SIMPLE_PROMPT_TOKENS
+        )
+
+
+def estimate_complexity(variables: dict, messages: list[BaseMessage]) -> ComplexityEstimate:
+    """
+    Cheap complexity estimate of a node call from its prompt variables and the
+    rendered prompt.
+    """
+    datasets_info = variables.get("datasets_info") or {}
+    if isinstance(datasets_info, dict) and datasets_info.get("schemas"):
+        datasets = len(datasets_info["schemas"])
+    else:
+        datasets = 1 if variables.get("dataset_schema") else 0
+
+    return ComplexityEstimate(
+        prompt_tokens=sum(TokenCounter.count_text(str(message.content)) for message in messages),
+        datasets=datasets,
+        query_words=len(str(variables.get("user_query") or "").split()),
+        retry=bool(
+            variables.get("retry_count")
+            or variables.get("error_messages")
+            or variables.get("validation_result")
+        ),
+    )
+
+
+@dataclass
+class _CallStats:
+    latencies: RollingWindow
+    errors: deque[bool]
+
+    def error_rate(self) -> float:
+        return sum(self.errors) / len(self.errors)
+
+
+class ModelRouter:
+    """
+    Per-call model tier selection for nodes with `adaptive=True`.
+
+    A simple call (one dataset, a short question, a small prompt and no retry)
+    goes one tier below the node's configured tier. A tier whose model runs over
+    the node's MODEL_ROUTING_LATENCY_SLO_SECONDS at p95, or fails more often than
+    MODEL_ROUTING_MAX_ERROR_RATE, over its last calls is downgraded one tier
+    further when the lower tier meets the SLO. Retries keep the configured tier.
+    An explicit latency mode takes precedence over routing.
+    """
+
+    stats: dict[tuple[str, str], _CallStats] = {}
+    counters: dict[str, Counter] = {}
+
+    @classmethod
+    def is_enabled(cls, node_name: str, config: RunnableConfig | None = None) -> bool:
+        return (
+            settings.MODEL_ROUTING_ENABLED
+            and get_node_config(node_name).adaptive
+            and get_execution_profile(config).model_category is None
+        )
+
+    @classmethod
+    def _get_stats(cls, node_name: str, model_id: str) -> _CallStats:
+        key = (node_name, model_id)
+        if key not in cls.stats:
+            cls.stats[key] = _CallStats(RollingWindow(STATS_WINDOW), deque(maxlen=STATS_WINDOW))
+        return cls.stats[key]
+
+    @classmethod
+    def meets_slo(cls, node_name: str, model_id: str) -> bool:
+        stats = cls._get_stats(node_name, model_id)
+        if len(stats.errors) < settings.MODEL_ROUTING_MIN_SAMPLES:
+            return True
+        slo = settings.MODEL_ROUTING_LATENCY_SLOS.get(
+            node_name, settings.MODEL_ROUTING_LATENCY_SLO_SECONDS
+        )
+        p95 = stats.latencies.percentile(0.95)
+        if p95 is not None and p95 > slo:
+            return False
+        return stats.error_rate() <= settings.MODEL_ROUTING_MAX_ERROR_RATE
+
+    @classmethod
+    def select_model(cls, node_name: str, estimate: ComplexityEstimate) -> str:
+        counters = cls.counters.setdefault(node_name, Counter())
+        configured = TIERS.index(get_node_config(node_name).complexity)
+        tier = configured
+        if estimate.is_simple() and tier > 0:
+            tier -= 1
+            counters["simple_downgrades"] += 1
+
+        model_id = get_model_id_for_category(TIERS[tier])
+        if not estimate.retry and tier > 0 and not cls.meets_slo(node_name, model_id):
+            lower_model_id = get_model_id_for_category(TIERS[tier - 1])
+            if lower_model_id != model_id and cls.meets_slo(node_name, lower_model_id):
+                tier -= 1
+                model_id = lower_model_id
+                counters["slo_downgrades"] += 1
+
+        counters[TIERS[tier].value] += 1
+        return model_id
+
+    @classmethod
+    def record(cls, node_name: str, model_id: str, seconds: float | None) -> None:
+        """
+        Record a call's latency, or a failed call when `seconds` is None.
+        """
+        stats = cls._get_stats(node_name, model_id)
+        stats.errors.append(seconds is None)
+        if seconds is not None:
+            stats.latencies.append(seconds)
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        models = {}
+        for (node_name, model_id), stats in cls.stats.items():
+            p95 = stats.latencies.percentile(0.95)
+            models[f"{node_name}:{model_id}"] = {
+                "calls": len(stats.errors),
+                "latency_p95_seconds": round(p95, 3) if p95 is not None else None,
+                "error_rate": round(stats.error_rate(), 3) if stats.errors else 0.0,
+                "meets_slo": cls.meets_slo(node_name, model_id),
+            }
+        return {
+            "enabled": settings.MODEL_ROUTING_ENABLED,
+            "routes": {node_name: dict(counters) for node_name, counters in cls.counters.items()},
+            "models": models,
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.stats = {}
+        cls.counters = {}
+
+
+def with_model_routing(
+    node_name: str,
+    formatter: Runnable,
+    get_llm: Callable[[str], Runnable],
+) -> Runnable:
+    """
+    Build a prompt chain that renders the prompt with `formatter`, picks the model
+    with `ModelRouter` and calls the LLM `get_llm` configures for it.
+    """
+
+    async def arouted_invoke(variables: dict | None, config: RunnableConfig) -> Any:
+        messages = await formatter.ainvoke(variables, config)
+        estimate = estimate_complexity(variables or {}, messages)
+        model_id = ModelRouter.select_model(node_name, estimate)
+
+        start = time.monotonic()
+        try:
+            response = await get_llm(model_id).ainvoke(messages, config)
+        except RequestCancelledError:
+            raise
+        except Exception:
+            ModelRouter.record(node_name, model_id, None)
+            raise
+        ModelRouter.record(node_name, model_id, time.monotonic() - start)
+        return response
+
+    def routed_invoke(variables: dict | None, config: RunnableConfig) -> Any:
+        # Sync callers are not routed; every graph node invokes chains async.
+        messages = formatter.invoke(variables, config)
+        model_id = get_model_id_for_category(get_node_config(node_name).complexity)
+        return get_llm(model_id).invoke(messages, config)
+
+    return RunnableLambda(routed_invoke, afunc=arouted_invoke, name=f"{node_name}_routed_chain")
@@ -5,6 +5,19 @@ from langchain_core.runnables import RunnableConfig
 
 from app.core.config import settings
 from app.models.provider import ModelCategory, TemperatureCategory
+from app.utils.graph_utils.execution_profile import get_execution_profile
+
+
+def get_model_id_for_category(category: ModelCategory) -> str:
+    match category:
+        case ModelCategory.FAST:
+            return settings.FAST_MODEL or settings.DEFAULT_LLM_MODEL
+        case ModelCategory.BALANCED:
+            return settings.BALANCED_MODEL or settings.DEFAULT_LLM_MODEL
+        case ModelCategory.ADVANCED:
+            return settings.ADVANCED_MODEL or settings.DEFAULT_LLM_MODEL
+        case _:
+            return settings.DEFAULT_LLM_MODEL
 
 
 @dataclass
@@ -14,19 +27,14 @@ class NodeConfig:
     complexity: ModelCategory
     temperature: TemperatureCategory
     json_mode: bool = False
+    cache_responses: bool = False
+    # Pick the tier per call from the input's complexity and observed latency.
+    adaptive: bool = False
 
     @property
     def model_id(self) -> str:
         """Get the model ID based on complexity"""
-        match self.complexity:
-            case ModelCategory.FAST:
-                return settings.FAST_MODEL or settings.DEFAULT_LLM_MODEL
-            case ModelCategory.BALANCED:
-                return settings.BALANCED_MODEL or settings.DEFAULT_LLM_MODEL
-            case ModelCategory.ADVANCED:
-                return settings.ADVANCED_MODEL or settings.DEFAULT_LLM_MODEL
-            case _:
-                return settings.DEFAULT_LLM_MODEL
+        return get_model_id_for_category(self.complexity)
 
 
 NODE_CONFIGS = {
@@ -36,21 +44,27 @@ NODE_CONFIGS = {
         ModelCategory.FAST, TemperatureCategory.DETERMINISTIC, json_mode=True
     ),
     "validate_result": NodeConfig(
-        ModelCategory.BALANCED, TemperatureCategory.DETERMINISTIC, json_mode=True
+        ModelCategory.BALANCED,
+        TemperatureCategory.DETERMINISTIC,
+        json_mode=True,
+        cache_responses=True,
     ),
     "check_visualization": NodeConfig(ModelCategory.FAST, TemperatureCategory.DETERMINISTIC),
     "identify_datasets": NodeConfig(
-        ModelCategory.BALANCED, TemperatureCategory.DETERMINISTIC, json_mode=True
+        ModelCategory.BALANCED,
+        TemperatureCategory.DETERMINISTIC,
+        json_mode=True,
+        cache_responses=True,
     ),
     "plan_query": NodeConfig(
-        ModelCategory.ADVANCED, TemperatureCategory.LOW_VARIATION, json_mode=True
+        ModelCategory.ADVANCED, TemperatureCategory.LOW_VARIATION, json_mode=True, adaptive=True
     ),
     "plan_sql_query_tool": NodeConfig(
         ModelCategory.ADVANCED, TemperatureCategory.LOW_VARIATION, json_mode=True
     ),
     "visualize_data": NodeConfig(ModelCategory.FAST, TemperatureCategory.LOW_VARIATION),
     "process_query": NodeConfig(
-        ModelCategory.ADVANCED, TemperatureCategory.BALANCED, json_mode=True
+        ModelCategory.ADVANCED, TemperatureCategory.BALANCED, json_mode=True, adaptive=True
     ),
     "process_context": NodeConfig(
         ModelCategory.BALANCED, TemperatureCategory.BALANCED, json_mode=True
@@ -70,6 +84,7 @@ EXTERNAL_FUNCTION_CONFIGS = {
         ModelCategory.BALANCED, TemperatureCategory.BALANCED, json_mode=True
     ),
     "progress_message": NodeConfig(ModelCategory.FAST, TemperatureCategory.CREATIVE),
+    "summarize_chat_history": NodeConfig(ModelCategory.FAST, TemperatureCategory.DETERMINISTIC),
 }
 
 
@@ -91,7 +106,13 @@ def requires_json_mode(node_name: str) -> bool:
     return get_node_config(node_name).json_mode
 
 
-def get_node_model(node_name: str) -> str:
+def get_node_model(node_name: str, config: RunnableConfig | None = None) -> str:
+    """
+    Model for a node; the request's execution profile may override the node's category.
+    """
+    model_category = get_execution_profile(config).model_category
+    if model_category is not None:
+        return get_model_id_for_category(model_category)
     return get_node_config(node_name).model_id
 
 
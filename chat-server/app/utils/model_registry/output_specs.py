@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from functools import cache, partial
+from typing import Any
+
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_openai.chat_models.base import (
+    _convert_to_openai_response_format,
+    _oai_structured_outputs_parser,
+)
+from pydantic import BaseModel
+
+from app.core.log import logger
+from app.tool_utils.tools import ToolNames, get_tools
+
+
+@dataclass(frozen=True)
+class StructuredOutputSpec:
+    """
+    Pre-compiled `with_structured_output(schema, method="json_schema")` pieces for
+    a pydantic schema: the request `response_format`, the tracing metadata and the
+    output parser.
+    """
+
+    schema: type[BaseModel]
+    response_format: dict[str, Any]
+    ls_structured_output_format: dict[str, Any]
+    parser: Runnable
+
+    def bind(self, llm: Runnable) -> Runnable:
+        bound = llm.bind(
+            response_format=self.response_format,
+            ls_structured_output_format=self.ls_structured_output_format,
+        )
+        return bound | self.parser
+
+
+def _supports_json_schema(model_name: str | None) -> bool:
+    """
+    Mirrors the models langchain-openai downgrades to function calling because
+    they don't support OpenAI's Structured Output API.
+    """
+    if not model_name:
+        return True
+    return not (
+        model_name.startswith("gpt-3") or model_name.startswith("gpt-4-") or model_name == "gpt-4"
+    )
+
+
+@cache
+def get_tool_specs(tool_names: tuple[ToolNames, ...]) -> tuple[dict[str, Any], ...]:
+    """
+    Get the OpenAI tool definitions for a tool set, converted once per process.
+    """
+    tools = get_tools(list(tool_names))
+    return tuple(convert_to_openai_tool(tool) for tool, _ in tools.values())
+
+
+@cache
+def get_structured_output_spec(schema: type[BaseModel]) -> StructuredOutputSpec:
+    """
+    Compile the json_schema structured-output request and parser for a schema once
+    per process.
+    """
+    return StructuredOutputSpec(
+        schema=schema,
+        response_format=_convert_to_openai_response_format(schema),
+        ls_structured_output_format={
+            "kwargs": {"method": "json_schema", "strict": None},
+            "schema": convert_to_openai_tool(schema),
+        },
+        parser=RunnableLambda(partial(_oai_structured_outputs_parser, schema=schema)).with_types(
+            output_type=schema
+        ),
+    )
+
+
+def bind_tool_specs(llm: Runnable, tool_names: list[ToolNames]) -> Runnable:
+    return llm.bind(tools=list(get_tool_specs(tuple(tool_names))))
+
+
+def bind_structured_output(
+    llm: Runnable, schema: type[BaseModel], model_name: str | None = None
+) -> Runnable:
+    """
+    Equivalent of `llm.with_structured_output(schema, method="json_schema")` using
+    the cached schema compilation. Unlike calling `with_structured_output` through
+    a `RunnableBinding`, previously bound kwargs (e.g. temperature) are kept.
+    """
+    if not _supports_json_schema(model_name):
+        return llm.with_structured_output(schema=schema, method="json_schema")
+    return get_structured_output_spec(schema).bind(llm)
+
+
+def warm_up_output_specs() -> None:
+    """
+    Pre-compile the tool definitions for every registered tool so the first
+    request doesn't pay for tool module imports and JSON schema generation.
+    """
+    for tool_name in ToolNames:
+        try:
+            get_tool_specs((tool_name,))
+        except Exception as e:
+            logger.warning(f"Failed to pre-compile tool spec for '{tool_name.value}': {e!s}")
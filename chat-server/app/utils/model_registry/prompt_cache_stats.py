@@ -0,0 +1,117 @@
+import time
+from collections import Counter
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+from app.core.rolling_window import RollingWindows
+
+LATENCY_WINDOW = 500
+
+
+class PromptCacheStats:
+    """
+    Process-wide provider prompt cache usage per model: prompt tokens, prompt
+    tokens served from the provider's cache, and time to first token of calls
+    with and without a cache hit.
+    """
+
+    counters: dict[str, Counter] = {}
+    first_token_seconds: RollingWindows = RollingWindows(LATENCY_WINDOW)
+
+    @classmethod
+    def record(
+        cls,
+        model: str,
+        input_tokens: int,
+        cached_tokens: int,
+        first_token_seconds: float | None,
+    ) -> None:
+        counters = cls.counters.setdefault(model, Counter())
+        counters["calls"] += 1
+        counters["input_tokens"] += input_tokens
+        counters["cached_tokens"] += cached_tokens
+        if cached_tokens:
+            counters["cache_hits"] += 1
+        if first_token_seconds is not None:
+            cls.first_token_seconds[(model, bool(cached_tokens))].append(first_token_seconds)
+
+    @classmethod
+    def _p50_ms(cls, model: str, cached: bool) -> float | None:
+        p50 = cls.first_token_seconds[(model, cached)].percentile(0.5)
+        return round(p50 * 1000, 1) if p50 is not None else None
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        stats = {}
+        for model, counters in cls.counters.items():
+            input_tokens = counters["input_tokens"]
+            stats[model] = {
+                "calls": counters["calls"],
+                "cache_hits": counters["cache_hits"],
+                "input_tokens": input_tokens,
+                "cached_tokens": counters["cached_tokens"],
+                "cached_token_ratio": (
+                    round(counters["cached_tokens"] / input_tokens, 3) if input_tokens else 0.0
+                ),
+                "first_token_ms_p50_cached": cls._p50_ms(model, True),
+                "first_token_ms_p50_uncached": cls._p50_ms(model, False),
+            }
+        return stats
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.counters = {}
+        cls.first_token_seconds = RollingWindows(LATENCY_WINDOW)
+
+
+class PromptCacheCallbackHandler(AsyncCallbackHandler):
+    """
+    Feeds `PromptCacheStats` from the usage metadata of chat model runs.
+
+    Streamed responses only carry usage when the model has `stream_usage`
+    enabled (LLM_STREAM_USAGE).
+    """
+
+    def __init__(self):
+        self.started_at: dict[UUID, float] = {}
+        self.first_token_at: dict[UUID, float] = {}
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[BaseMessage]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        self.started_at[run_id] = time.monotonic()
+
+    async def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self.first_token_at.setdefault(run_id, time.monotonic())
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started_at = self.started_at.pop(run_id, None)
+        first_token_at = self.first_token_at.pop(run_id, None) or time.monotonic()
+        first_token_seconds = first_token_at - started_at if started_at is not None else None
+
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if not usage:
+                    continue
+                model = (response.llm_output or {}).get("model_name") or (
+                    message.response_metadata.get("model_name", "unknown")
+                )
+                cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+                PromptCacheStats.record(
+                    model, usage.get("input_tokens", 0), cached_tokens or 0, first_token_seconds
+                )
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self.started_at.pop(run_id, None)
+        self.first_token_at.pop(run_id, None)
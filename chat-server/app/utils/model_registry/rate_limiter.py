@@ -0,0 +1,248 @@
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.core.log import logger
+
+# Rough size of a token in serialized request JSON; good enough for admission.
+CHARS_PER_TOKEN = 4
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+
+@dataclass
+class TokenBucket:
+    """
+    Bucket refilled at `rate` per second up to `capacity`.
+    """
+
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def per_minute(cls, limit: int, burst_seconds: float) -> "TokenBucket":
+        rate = limit / 60
+        capacity = max(1.0, rate * burst_seconds)
+        return cls(rate=rate, capacity=capacity, tokens=capacity)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Seconds until `amount` can be taken. Amounts above the capacity wait for
+        a full bucket instead of never being admitted.
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+@dataclass
+class ProviderLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets of one (gateway, model).
+
+    Callers are admitted one at a time in arrival order, so a large prompt is not
+    starved by a stream of small ones and bursts turn into queueing delay.
+    """
+
+    requests: TokenBucket | None
+    tokens: TokenBucket | None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    paused_until: float = 0.0
+    waiting: int = 0
+
+    def wait_time(self, prompt_tokens: int) -> float:
+        now = time.monotonic()
+        wait = self.paused_until - now
+        if self.requests:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens:
+            wait = max(wait, self.tokens.wait_time(prompt_tokens, now))
+        return wait
+
+    async def acquire(self, prompt_tokens: int) -> float:
+        """
+        Wait until the call fits both buckets and take from them.
+
+        Returns:
+            Seconds spent waiting, 0 when admitted at once.
+        """
+        start = time.monotonic()
+        throttled = self.lock.locked()
+        self.waiting += 1
+        try:
+            async with self.lock:
+                while (wait := self.wait_time(prompt_tokens)) > 0:
+                    throttled = True
+                    await asyncio.sleep(wait)
+                if self.requests:
+                    self.requests.take(1)
+                if self.tokens:
+                    self.tokens.take(prompt_tokens)
+        finally:
+            self.waiting -= 1
+        return time.monotonic() - start if throttled else 0.0
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """
+    Process-wide client-side rate limits for LLM and embedding calls.
+
+    Limits are kept per (gateway, model): LLM_RATE_LIMIT_RPM and LLM_RATE_LIMIT_TPM
+    apply to every model unless LLM_RATE_LIMITS overrides them. Buckets hold
+    LLM_RATE_LIMIT_BURST_SECONDS worth of capacity. A 429 from the provider pauses
+    the (gateway, model) for its Retry-After so retries queue instead of failing.
+    """
+
+    limiters: dict[tuple[str, str], ProviderLimiter] = {}
+    counters: dict[tuple[str, str], Counter] = {}
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(
+            settings.LLM_RATE_LIMIT_RPM or settings.LLM_RATE_LIMIT_TPM or settings.LLM_RATE_LIMITS
+        )
+
+    @classmethod
+    def get_limits(cls, model: str) -> tuple[int, int]:
+        override = settings.LLM_RATE_LIMITS.get(model, {})
+        return (
+            override.get("rpm", settings.LLM_RATE_LIMIT_RPM),
+            override.get("tpm", settings.LLM_RATE_LIMIT_TPM),
+        )
+
+    @classmethod
+    def get_limiter(cls, gateway: str, model: str) -> ProviderLimiter | None:
+        key = (gateway, model)
+        if key not in cls.limiters:
+            rpm, tpm = cls.get_limits(model)
+            burst_seconds = settings.LLM_RATE_LIMIT_BURST_SECONDS
+            cls.limiters[key] = ProviderLimiter(
+                requests=TokenBucket.per_minute(rpm, burst_seconds) if rpm else None,
+                tokens=TokenBucket.per_minute(tpm, burst_seconds) if tpm else None,
+            )
+            cls.counters[key] = Counter()
+        limiter = cls.limiters[key]
+        if limiter.requests is None and limiter.tokens is None:
+            return None
+        return limiter
+
+    @classmethod
+    async def acquire(cls, gateway: str, model: str, prompt_tokens: int) -> None:
+        limiter = cls.get_limiter(gateway, model)
+        if limiter is None:
+            return
+        waited = await limiter.acquire(prompt_tokens)
+        counters = cls.counters[(gateway, model)]
+        counters["requests"] += 1
+        counters["prompt_tokens"] += prompt_tokens
+        if waited > 0:
+            counters["throttled"] += 1
+            counters["wait_ms"] += round(waited * 1000)
+
+    @classmethod
+    def report_rate_limited(cls, gateway: str, model: str, retry_after: float) -> None:
+        limiter = cls.get_limiter(gateway, model)
+        if limiter is None:
+            return
+        logger.warning(f"Rate limited by {gateway} for {model}, pausing {retry_after:.1f}s")
+        limiter.pause(retry_after)
+        cls.counters[(gateway, model)]["provider_429"] += 1
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        stats = {}
+        for (gateway, model), limiter in cls.limiters.items():
+            if limiter.requests is None and limiter.tokens is None:
+                continue
+            rpm, tpm = cls.get_limits(model)
+            stats[f"{model}@{gateway}"] = {
+                "rpm": rpm,
+                "tpm": tpm,
+                "waiting": limiter.waiting,
+                **cls.counters[(gateway, model)],
+            }
+        return {"enabled": cls.is_enabled(), "limits": stats}
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.limiters = {}
+        cls.counters = {}
+
+
+def estimate_prompt_tokens(body: bytes, payload: dict[str, Any]) -> int:
+    """
+    Estimate the prompt tokens of an OpenAI-style request body. Embedding inputs
+    that were already tokenized are counted exactly.
+    """
+    inputs = payload.get("input")
+    if isinstance(inputs, list) and inputs and all(isinstance(item, list) for item in inputs):
+        return sum(len(item) for item in inputs)
+    return max(1, len(body) // CHARS_PER_TOKEN)
+
+
+def get_retry_after(headers: httpx.Headers) -> float:
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return DEFAULT_RETRY_AFTER_SECONDS
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    HTTP transport applying `RateLimiter` to the requests of one gateway.
+
+    Sitting below the OpenAI client, it also covers the client's own retries.
+    """
+
+    def __init__(self, gateway: str, transport: httpx.AsyncBaseTransport):
+        self.gateway = gateway
+        self.transport = transport
+
+    def _get_model(self, request: httpx.Request) -> tuple[str | None, int]:
+        if request.method != "POST":
+            return None, 0
+        try:
+            body = request.content
+            payload = json.loads(body)
+        except (httpx.RequestNotRead, ValueError):
+            return None, 0
+        if not isinstance(payload, dict) or not isinstance(payload.get("model"), str):
+            return None, 0
+        return payload["model"], estimate_prompt_tokens(body, payload)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model = None
+        if RateLimiter.is_enabled():
+            model, prompt_tokens = self._get_model(request)
+            if model:
+                await RateLimiter.acquire(self.gateway, model, prompt_tokens)
+
+        response = await self.transport.handle_async_request(request)
+        if model and response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+            RateLimiter.report_rate_limited(self.gateway, model, get_retry_after(response.headers))
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import (
+    BaseMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.log import logger
+from app.utils.model_registry.model_selection import get_node_config
+
+
+class ResponseCacheBackend(ABC):
+    """
+    Storage for serialized LLM responses. Values are JSON-compatible dicts.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> dict | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+
+class MemoryResponseCache(ResponseCacheBackend):
+    """
+    Process-local LRU cache bounded by LLM_RESPONSE_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, key: str) -> dict | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        self.entries[key] = (time.time() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self.entries.clear()
+
+
+class DiskResponseCache(ResponseCacheBackend):
+    """
+    One JSON file per entry under LLM_RESPONSE_CACHE_DIR, shared by workers on
+    the same host and kept across restarts.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+
+        if entry["expires_at"] < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return entry["value"]
+
+    def _write(self, key: str, value: dict, ttl: float) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"expires_at": time.time() + ttl, "value": value}))
+        tmp_path.replace(path)
+
+    def _clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    async def get(self, key: str) -> dict | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+
+class ResponseCache:
+    """
+    Exact-match cache of LLM responses for nodes with `cache_responses` enabled in
+    NODE_CONFIGS. Entries are keyed on (node name, model id, rendered prompt hash,
+    output schema). Lookups or writes that fail never fail the request.
+    """
+
+    backend: ResponseCacheBackend | None = None
+    counters: Counter = Counter()
+
+    @classmethod
+    def get_backend(cls) -> ResponseCacheBackend:
+        if cls.backend is None:
+            match settings.LLM_RESPONSE_CACHE_BACKEND:
+                case "disk":
+                    cls.backend = DiskResponseCache(settings.LLM_RESPONSE_CACHE_DIR)
+                case "memory":
+                    cls.backend = MemoryResponseCache(settings.LLM_RESPONSE_CACHE_MAX_ENTRIES)
+                case backend:
+                    raise ValueError(f"Unknown LLM response cache backend: {backend}")
+        return cls.backend
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        return {
+            "enabled": settings.LLM_RESPONSE_CACHE_ENABLED,
+            "backend": settings.LLM_RESPONSE_CACHE_BACKEND,
+            **cls.counters,
+        }
+
+    @classmethod
+    async def clear(cls) -> None:
+        await cls.get_backend().clear()
+        cls.counters = Counter()
+
+
+def is_response_cache_enabled(node_name: str) -> bool:
+    return settings.LLM_RESPONSE_CACHE_ENABLED and get_node_config(node_name).cache_responses
+
+
+def get_response_cache_key(
+    node_name: str,
+    model_id: str,
+    messages: list[BaseMessage],
+    schema: type[BaseModel] | None = None,
+) -> str:
+    payload = json.dumps(
+        {
+            "node": node_name,
+            "model": model_id,
+            "messages": [message_to_dict(message) for message in messages],
+            "schema": schema.model_json_schema() if schema else None,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _serialize(response: Any) -> dict | None:
+    if isinstance(response, BaseMessage):
+        return {"type": "message", "data": message_to_dict(response)}
+    if isinstance(response, BaseModel):
+        return {"type": "schema", "data": response.model_dump(mode="json")}
+    return None
+
+
+def _deserialize(value: dict, schema: type[BaseModel] | None) -> Any:
+    if value["type"] == "schema" and schema:
+        return schema.model_validate(value["data"])
+    if value["type"] == "message":
+        return messages_from_dict([value["data"]])[0]
+    raise ValueError(f"Cannot restore cached response of type {value['type']}")
+
+
+def with_response_cache(
+    llm: Runnable,
+    node_name: str,
+    model_id: str,
+    schema: type[BaseModel] | None = None,
+) -> Runnable:
+    """
+    Wrap a configured node LLM so identical rendered prompts are answered from the
+    response cache instead of calling the model.
+    """
+
+    async def acached_invoke(messages: list[BaseMessage], config: RunnableConfig) -> Any:
+        key = get_response_cache_key(node_name, model_id, messages, schema)
+        backend = ResponseCache.get_backend()
+
+        try:
+            cached = await backend.get(key)
+            if cached is not None:
+                ResponseCache.counters[f"{node_name}_hits"] += 1
+                return _deserialize(cached, schema)
+        except Exception as e:
+            logger.warning(f"LLM response cache lookup failed for '{node_name}': {e!s}")
+
+        ResponseCache.counters[f"{node_name}_misses"] += 1
+        response = await llm.ainvoke(messages, config)
+
+        value = _serialize(response)
+        if value is not None:
+            try:
+                await backend.set(key, value, settings.LLM_RESPONSE_CACHE_TTL_SECONDS)
+            except Exception as e:
+                logger.warning(f"LLM response cache write failed for '{node_name}': {e!s}")
+
+        return response
+
+    def cached_invoke(messages: list[BaseMessage], config: RunnableConfig) -> Any:
+        # Sync callers bypass the cache; every graph node invokes chains async.
+        return llm.invoke(messages, config)
+
+    return RunnableLambda(cached_invoke, afunc=acached_invoke, name=f"{node_name}_cached_llm")
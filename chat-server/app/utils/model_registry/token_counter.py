@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+from collections import Counter, OrderedDict
+from typing import Any, Protocol
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from app.core.config import settings
+from app.core.log import logger
+
+# Per-message framing (role, separators) and per-tool-call overhead.
+MESSAGE_OVERHEAD_TOKENS = 5
+TOOL_CALL_OVERHEAD_TOKENS = 10
+
+
+class Tokenizer(Protocol):
+    name: str
+
+    def count(self, text: str) -> int:
+        ...
+
+
+class HeuristicTokenizer:
+    """
+    Character based estimate: ~4 ASCII characters per token, ~2 characters per
+    token for other scripts, which BPE vocabularies split much finer.
+    """
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        if text.isascii():
+            return len(text) // 4
+        non_ascii = len(text) - len(text.encode("ascii", "ignore"))
+        return (len(text) - non_ascii) // 4 + (non_ascii + 1) // 2
+
+
+class TiktokenTokenizer:
+    name = "tiktoken"
+
+    def __init__(self, encoding_name: str):
+        import tiktoken
+
+        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.name = f"tiktoken:{encoding_name}"
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+def _message_key(message: BaseMessage) -> str:
+    # A digest keeps long messages (SQL results, schemas) out of the cache keys.
+    digest = hashlib.sha256(message.type.encode())
+    digest.update(b"\0" + str(message.content).encode())
+    if isinstance(message, AIMessage) and message.tool_calls:
+        digest.update(b"\0" + str([tool.get("args", {}) for tool in message.tool_calls]).encode())
+    return digest.hexdigest()
+
+
+class TokenCounter:
+    """
+    Process-wide token counting for prompt budgeting.
+
+    The tokenizer is picked by TOKENIZER ("tiktoken" with TOKENIZER_ENCODING, or
+    "heuristic") and can be replaced with `set_tokenizer`. Message counts are
+    cached by a digest of the message content, so chat history resent with every
+    request is only tokenized once.
+    """
+
+    tokenizer: Tokenizer | None = None
+    message_tokens: OrderedDict[str, int] = OrderedDict()
+    counters: Counter = Counter()
+
+    @classmethod
+    def get_tokenizer(cls) -> Tokenizer:
+        if cls.tokenizer is None:
+            if settings.TOKENIZER == "tiktoken":
+                try:
+                    cls.tokenizer = TiktokenTokenizer(settings.TOKENIZER_ENCODING)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to load tiktoken encoding '{settings.TOKENIZER_ENCODING}', "
+                        f"estimating tokens from characters: {e!s}"
+                    )
+            if cls.tokenizer is None:
+                cls.tokenizer = HeuristicTokenizer()
+        return cls.tokenizer
+
+    @classmethod
+    def set_tokenizer(cls, tokenizer: Tokenizer) -> None:
+        cls.tokenizer = tokenizer
+        cls.message_tokens = OrderedDict()
+
+    @classmethod
+    async def warm_up(cls) -> None:
+        """
+        Load the tokenizer at startup instead of on the first request, in a thread:
+        a tiktoken encoding is downloaded the first time it is loaded.
+        """
+        await asyncio.to_thread(cls.get_tokenizer)
+
+    @classmethod
+    def count_text(cls, text: str) -> int:
+        return cls.get_tokenizer().count(text) if text else 0
+
+    @classmethod
+    def count_message(cls, message: BaseMessage) -> int:
+        key = _message_key(message)
+        tokens = cls.message_tokens.get(key)
+        if tokens is not None:
+            cls.counters["hits"] += 1
+            cls.message_tokens.move_to_end(key)
+            return tokens
+
+        cls.counters["misses"] += 1
+        tokens = cls.count_text(str(message.content) if message.content else "")
+        tokens += MESSAGE_OVERHEAD_TOKENS
+        if isinstance(message, AIMessage) and message.tool_calls:
+            tokens += TOOL_CALL_OVERHEAD_TOKENS + sum(
+                cls.count_text(str(tool.get("args", {}))) + TOOL_CALL_OVERHEAD_TOKENS
+                for tool in message.tool_calls
+            )
+
+        cls.message_tokens[key] = tokens
+        if len(cls.message_tokens) > settings.TOKEN_COUNT_CACHE_SIZE:
+            cls.message_tokens.popitem(last=False)
+        return tokens
+
+    @classmethod
+    def count_messages(cls, messages: list[BaseMessage]) -> int:
+        return sum(cls.count_message(message) for message in messages)
+
+    @classmethod
+    def get_stats(cls) -> dict[str, Any]:
+        return {
+            "tokenizer": cls.tokenizer.name if cls.tokenizer else None,
+            "cached_messages": len(cls.message_tokens),
+            "hits": cls.counters["hits"],
+            "misses": cls.counters["misses"],
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.tokenizer = None
+        cls.message_tokens = OrderedDict()
+        cls.counters = Counter()
@@ -1,9 +1,29 @@
 from abc import ABC, abstractmethod
+from typing import Any
 
 from langchain_openai import OpenAIEmbeddings
 
+from app.utils.model_registry.client_pool import (
+    ClientPool,
+    with_request_overrides,
+)
+
 
 class BaseEmbeddingProvider(ABC):
+    base_url: str | None = None
+
     @abstractmethod
     def get_embeddings_model(self, model_name: str) -> OpenAIEmbeddings:
         pass
+
+    def get_request_overrides(self) -> dict[str, Any]:
+        return {}
+
+    def get_pooled_embeddings_model(self, model_name: str) -> OpenAIEmbeddings:
+        embeddings = ClientPool.get_embeddings(
+            type(self).__name__,
+            self.base_url,
+            model_name,
+            lambda: self.get_embeddings_model(model_name),
+        )
+        return with_request_overrides(embeddings, self.get_request_overrides())
@@ -1,6 +1,7 @@
 from langchain_openai import OpenAIEmbeddings
 
 from app.core.config import settings
+from app.utils.model_registry.client_pool import ClientPool
 
 from .base import BaseEmbeddingProvider
 
@@ -10,11 +11,12 @@ class CustomEmbeddingProvider(BaseEmbeddingProvider):
         self,
         metadata: dict[str, str],
     ):
-        pass
+        self.base_url = settings.CUSTOM_EMBEDDING_BASE_URL
 
     def get_embeddings_model(self, model_name: str) -> OpenAIEmbeddings:
         return OpenAIEmbeddings(
             base_url=settings.CUSTOM_EMBEDDING_BASE_URL,
             api_key=settings.CUSTOM_EMBEDDING_API_KEY,  # type: ignore
             model=model_name,
+            **ClientPool.get_http_client_kwargs(settings.CUSTOM_EMBEDDING_BASE_URL),
         )
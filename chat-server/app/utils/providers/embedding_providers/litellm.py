@@ -1,6 +1,7 @@
 from langchain_openai import OpenAIEmbeddings
 
 from app.core.config import settings
+from app.utils.model_registry.client_pool import ClientPool
 
 from .base import BaseEmbeddingProvider
 
@@ -11,6 +12,7 @@ class LiteLLMEmbeddingProvider(BaseEmbeddingProvider):
         metadata: dict[str, str],
     ):
         self.metadata = metadata
+        self.base_url = settings.LITELLM_BASE_URL
         self.headers = {
             "Authorization": f"Bearer {settings.LITELLM_MASTER_KEY}",
         }
@@ -21,4 +23,5 @@ class LiteLLMEmbeddingProvider(BaseEmbeddingProvider):
             base_url=settings.LITELLM_BASE_URL,
             default_headers=self.headers,
             model=model_name,
+            **ClientPool.get_http_client_kwargs(settings.LITELLM_BASE_URL),
         )
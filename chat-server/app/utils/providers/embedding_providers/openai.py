@@ -1,6 +1,7 @@
 from langchain_openai import OpenAIEmbeddings
 
 from app.core.config import settings
+from app.utils.model_registry.client_pool import ClientPool
 
 from .base import BaseEmbeddingProvider
 
@@ -16,4 +17,5 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
         return OpenAIEmbeddings(
             api_key=settings.OPENAI_API_KEY,  # type: ignore
             model=model_name,
+            **ClientPool.get_http_client_kwargs(self.base_url),
         )
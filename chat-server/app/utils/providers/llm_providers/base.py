@@ -1,16 +1,25 @@
 from abc import ABC, abstractmethod
+from typing import Any
 
 from langchain_openai import ChatOpenAI
 
+from app.core.config import settings
+from app.utils.model_registry.client_pool import (
+    ClientPool,
+    with_request_overrides,
+)
+
 
 class BaseLLMProvider(ABC):
+    base_url: str | None = None
+
     @abstractmethod
     def get_llm_model(
         self,
         model_name: str,
     ) -> ChatOpenAI:
         """
-        Get an LLM model instance.
+        Build a new LLM model instance carrying only static configuration.
 
         Args:
             model_name: Name of the model to use
@@ -19,3 +28,24 @@ class BaseLLMProvider(ABC):
             ChatOpenAI instance
         """
         pass
+
+    def get_request_overrides(self) -> dict[str, Any]:
+        """
+        Per-request model field overrides (headers, request body metadata, tracing
+        metadata) applied on top of the pooled model instance.
+        """
+        return {}
+
+    def get_pooled_llm_model(self, model_name: str) -> ChatOpenAI:
+        """
+        Get a shared LLM model instance with this request's metadata applied.
+        """
+        llm = ClientPool.get_llm(
+            type(self).__name__,
+            self.base_url,
+            model_name,
+            lambda: self.get_llm_model(model_name).model_copy(
+                update={"stream_usage": settings.LLM_STREAM_USAGE}
+            ),
+        )
+        return with_request_overrides(llm, self.get_request_overrides())
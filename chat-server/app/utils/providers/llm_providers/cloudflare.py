@@ -3,6 +3,7 @@ import json
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.utils.model_registry.client_pool import ClientPool
 
 from .base import BaseLLMProvider
 
@@ -19,6 +20,20 @@ class CloudflareLLMProvider(BaseLLMProvider):
         gateway_id = settings.CLOUDFLARE_GATEWAY_ID
 
         self.openai_compat_url = f"{base_url}/{provider}/{account_id}/{gateway_id}/compat"
+        self.base_url = self.openai_compat_url
+
+    def get_request_overrides(self):
+        return {
+            "model_kwargs": {
+                "extra_headers": {
+                    "cf-aig-metadata": json.dumps(
+                        {
+                            **self.metadata,
+                        }
+                    ),
+                },
+            },
+        }
 
     def get_llm_model(
         self,
@@ -30,11 +45,6 @@ class CloudflareLLMProvider(BaseLLMProvider):
             "Content-Type": "application/json",
             "Authorization": f"Bearer {settings.CLOUDFLARE_PROVIDER_API_KEY}",
             "cf-aig-authorization": f"Bearer {settings.CLOUDFLARE_API_TOKEN}",
-            "cf-aig-metadata": json.dumps(
-                {
-                    **self.metadata,
-                }
-            ),
         }
 
         kwargs = {
@@ -42,6 +52,7 @@ class CloudflareLLMProvider(BaseLLMProvider):
             "base_url": base_url,
             "default_headers": headers,
             "model": model_name,
+            **ClientPool.get_http_client_kwargs(base_url),
         }
         llm = ChatOpenAI(**kwargs)
         return llm
@@ -1,6 +1,7 @@
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.utils.model_registry.client_pool import ClientPool
 
 from .base import BaseLLMProvider
 
@@ -11,6 +12,7 @@ class LiteLLMProvider(BaseLLMProvider):
         metadata: dict[str, str],
     ):
         self.metadata = metadata
+        self.base_url = settings.LITELLM_BASE_URL
 
         self.litellm_key_header_name = settings.LITELLM_KEY_HEADER_NAME
         self.litellm_virtual_key = settings.LITELLM_VIRTUAL_KEY
@@ -33,6 +35,15 @@ class LiteLLMProvider(BaseLLMProvider):
                 self.litellm_key_header_name: self.litellm_virtual_key,
             }
 
+    def get_request_overrides(self):
+        return {
+            "extra_body": {
+                "metadata": {
+                    **self.metadata,
+                },
+            },
+        }
+
     def get_llm_model(
         self,
         model_name: str,
@@ -42,11 +53,7 @@ class LiteLLMProvider(BaseLLMProvider):
             "base_url": settings.LITELLM_BASE_URL,
             "model": model_name,
             "default_headers": self.headers,
-            "extra_body": {
-                "metadata": {
-                    **self.metadata,
-                },
-            },
+            **ClientPool.get_http_client_kwargs(settings.LITELLM_BASE_URL),
         }
 
         llm = ChatOpenAI(**kwargs)
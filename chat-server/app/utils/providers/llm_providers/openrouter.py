@@ -1,6 +1,7 @@
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.utils.model_registry.client_pool import ClientPool
 
 from .base import BaseLLMProvider
 
@@ -8,6 +9,14 @@ from .base import BaseLLMProvider
 class OpenRouterLLMProvider(BaseLLMProvider):
     def __init__(self, metadata: dict[str, str]):
         self.metadata = metadata
+        self.base_url = settings.OPENROUTER_BASE_URL
+
+    def get_request_overrides(self):
+        return {
+            "metadata": {
+                **self.metadata,
+            },
+        }
 
     def get_llm_model(
         self,
@@ -17,9 +26,7 @@ class OpenRouterLLMProvider(BaseLLMProvider):
             "api_key": settings.OPENROUTER_API_KEY,
             "base_url": settings.OPENROUTER_BASE_URL,
             "model": model_name,
-            "metadata": {
-                **self.metadata,
-            },
+            **ClientPool.get_http_client_kwargs(settings.OPENROUTER_BASE_URL),
         }
 
         llm = ChatOpenAI(**kwargs)
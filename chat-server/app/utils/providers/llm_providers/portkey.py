@@ -2,6 +2,7 @@ from langchain_openai import ChatOpenAI
 from portkey_ai import PORTKEY_GATEWAY_URL, createHeaders
 
 from app.core.config import settings
+from app.utils.model_registry.client_pool import ClientPool
 
 from .base import BaseLLMProvider
 
@@ -46,11 +47,37 @@ class PortkeyLLMProvider(BaseLLMProvider):
             **headers,
         )
 
+    def get_static_headers(self):
+        headers = {
+            "api_key": settings.PORTKEY_API_KEY,
+        }
+        if self.config:
+            headers["config"] = self.config
+        if self.provider_name:
+            headers["provider"] = self.provider_name
+        return createHeaders(
+            **headers,
+        )
+
+    def get_request_overrides(self):
+        return {
+            "model_kwargs": {
+                "extra_headers": createHeaders(
+                    trace_id=self.trace_id,
+                    chat_id=self.chat_id,
+                    metadata={
+                        "_user": self.user,
+                        **self.metadata,
+                    },
+                ),
+            },
+        }
+
     def get_llm_model(
         self,
         model_name: str,
     ):
-        headers = self.get_headers()
+        headers = self.get_static_headers()
         if self.self_hosted:
             provider_api_key = self.provider_api_key
         else:
@@ -61,6 +88,7 @@ class PortkeyLLMProvider(BaseLLMProvider):
             "base_url": self.base_url,
             "default_headers": headers,
             "model": model_name,
+            **ClientPool.get_http_client_kwargs(self.base_url),
         }
 
         llm = ChatOpenAI(**kwargs)
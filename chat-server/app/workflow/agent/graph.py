@@ -4,6 +4,7 @@ from app.models.schema import ConfigSchema
 from app.workflow.agent.node.generate_result import generate_result
 from app.workflow.agent.node.router import query_router
 
+from .node.answer_cache import replay_cached_answer, store_cached_answer
 from .node.context_processor import process_context
 from .node.multi_dataset import call_multi_dataset_agent
 from .node.single_dataset import call_single_dataset_agent
@@ -24,13 +25,19 @@ graph_builder.add_node("stream_invalid_response", stream_invalid_response)
 graph_builder.add_node("process_context", process_context)
 graph_builder.add_node(
     supervisor,
-    destinations=("multi_dataset_agent", "single_dataset_agent", "visualization_agent"),
+    destinations=(
+        "multi_dataset_agent",
+        "single_dataset_agent",
+        "visualization_agent",
+        "replay_cached_answer",
+    ),
 )
 graph_builder.add_node("multi_dataset_agent", call_multi_dataset_agent)
 graph_builder.add_node("single_dataset_agent", call_single_dataset_agent)
 graph_builder.add_node("visualization_agent", call_visualization_agent)
+graph_builder.add_node("replay_cached_answer", replay_cached_answer)
 graph_builder.add_node("generate_result", generate_result)
-graph_builder.add_node("post_agent_fork", lambda state: state)
+graph_builder.add_node("post_agent_fork", store_cached_answer)
 graph_builder.add_node("query_router", lambda state: state, defer=True)
 
 graph_builder.add_conditional_edges(
@@ -54,6 +61,7 @@ graph_builder.add_edge("process_context", "query_router")
 graph_builder.add_edge("validate_input", "query_router")
 graph_builder.add_edge("multi_dataset_agent", "post_agent_fork")
 graph_builder.add_edge("single_dataset_agent", "post_agent_fork")
+graph_builder.add_edge("replay_cached_answer", "post_agent_fork")
 graph_builder.add_edge("post_agent_fork", "generate_result")
 graph_builder.add_edge("stream_invalid_response", END)
 graph_builder.add_edge("visualization_agent", END)
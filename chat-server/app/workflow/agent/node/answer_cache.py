@@ -0,0 +1,106 @@
+import asyncio
+import copy
+from datetime import datetime
+
+from langchain_core.callbacks.manager import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+
+from app.core.config import settings
+from app.core.constants import SQL_QUERIES_GENERATED, SQL_QUERIES_GENERATED_ARG
+from app.models.query import QueryResult, SqlQueryInfo
+from app.services.gopie.sql_executor import execute_sql, truncate_if_too_large
+from app.utils.graph_utils.answer_cache import (
+    SemanticAnswerCache,
+    get_answer_scope,
+    get_sql_query_infos,
+    is_cacheable,
+)
+from app.workflow.events.event_utils import configure_node
+
+from ..types import AgentState
+from .multi_dataset import (
+    transform_output_state as transform_multi_dataset_output,
+)
+from .single_dataset import (
+    transform_output_state as transform_single_dataset_output,
+)
+
+
+async def refresh_sql_result(sql_query_info: SqlQueryInfo) -> None:
+    try:
+        full_result_data = await execute_sql(query=sql_query_info.sql_query)
+        sql_query_info.full_sql_result = full_result_data
+        sql_query_info.sql_query_result = truncate_if_too_large(full_result_data)
+        sql_query_info.success = True
+        sql_query_info.error = None
+    except Exception as err:
+        sql_query_info.sql_query_result = None
+        sql_query_info.full_sql_result = None
+        sql_query_info.success = False
+        sql_query_info.error = str(err)
+
+
+@configure_node(
+    role="intermediate",
+    progress_message="Reusing the answer to a similar question...",
+)
+async def replay_cached_answer(state: AgentState, config: RunnableConfig) -> dict:
+    """
+    Replays the SQL of a semantically matching earlier question instead of running
+    the dataset agents, re-executing it for fresh results when configured.
+    """
+    query_result: QueryResult = copy.deepcopy(state["cached_query_result"])  # type: ignore
+    query_result.original_user_query = state.get("user_query") or ""
+    query_result.timestamp = datetime.now()
+
+    sql_query_infos = get_sql_query_infos(query_result)
+    if settings.SEMANTIC_ANSWER_CACHE_REEXECUTE:
+        await asyncio.gather(*(refresh_sql_result(info) for info in sql_query_infos))
+
+    await adispatch_custom_event(
+        "gopie-agent",
+        {
+            "content": "SQL queries executed",
+            "name": SQL_QUERIES_GENERATED,
+            "values": {SQL_QUERIES_GENERATED_ARG: [info.sql_query for info in sql_query_infos]},
+        },
+    )
+
+    query_result.calculate_execution_time()
+
+    if query_result.single_dataset_query_result:
+        return transform_single_dataset_output({"query_result": query_result}, state)
+    return transform_multi_dataset_output(
+        {"query_result": query_result, "continue_execution": True}, state
+    )
+
+
+async def store_cached_answer(state: AgentState, config: RunnableConfig) -> dict:
+    """
+    Stores the answer of a freshly executed, self-contained question in the
+    background so paraphrases of it can be replayed.
+    """
+    schema_version = state.get("schema_version")
+    query_result = state.get("query_result")
+
+    if (
+        not settings.SEMANTIC_ANSWER_CACHE_ENABLED
+        or not schema_version
+        or state.get("cached_query_result") is not None
+        or state.get("continue_execution") is False
+        or not is_cacheable(query_result)
+    ):
+        return {}
+
+    SemanticAnswerCache.schedule_store(
+        scope=get_answer_scope(state.get("dataset_ids"), state.get("project_ids")),
+        version=schema_version,
+        query=state.get("enhanced_query") or "",
+        query_result=query_result,  # type: ignore
+        project_ids={
+            *(state.get("schema_project_ids") or []),
+            *(state.get("project_ids") or []),
+        },
+        config=config,
+    )
+    return {}
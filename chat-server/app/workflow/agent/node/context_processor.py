@@ -1,20 +1,32 @@
 import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
 
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
 from app.core.log import logger
+from app.models.chat import Role
+from app.models.query import QueryResult
 from app.models.schema import DatasetSchema
 from app.services.qdrant.get_schema import (
     get_project_schema,
     get_schema_from_qdrant,
 )
 from app.utils.chat_history.processor import ChatHistoryProcessor
-from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
-from app.workflow.events.event_utils import (
-    configure_node,
-    fake_streaming_response,
+from app.utils.chat_history.state_store import get_conversation_state
+from app.utils.graph_utils.answer_cache import (
+    SemanticAnswerCache,
+    get_answer_scope,
+    get_schema_version,
+)
+from app.utils.graph_utils.schema_prefetch import (
+    collect_schema_prefetch,
+    start_schema_prefetch,
 )
+from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
+from app.workflow.events.event_utils import configure_node, emit_message
 
 from ..types import AgentState
 
@@ -51,12 +63,34 @@ class ProcessContextOutput(BaseModel):
 
 
 async def get_project_custom_prompts(
-    dataset_ids: list[str] | None, project_ids: list[str] | None
+    dataset_ids: list[str] | None,
+    project_ids: list[str] | None,
+    schema_cache: dict[str, DatasetSchema] | None = None,
 ) -> tuple[list[str], list[DatasetSchema | None]]:
-    tasks = [get_schema_from_qdrant(dataset_id=dataset_id) for dataset_id in dataset_ids or []]
+    """
+    Schemas of the datasets and projects with their custom prompts. Schemas found
+    in `schema_cache` (the chat's conversation state) are not fetched again.
+    """
+    if schema_cache is None:
+        schema_cache = {}
+
+    async def get_schema(key: str, fetch: Callable[[], Awaitable[DatasetSchema | None]]):
+        if key in schema_cache:
+            return schema_cache[key]
+        schema = await fetch()
+        if schema:
+            schema_cache[key] = schema
+        return schema
+
+    tasks = [
+        get_schema(f"dataset:{dataset_id}", partial(get_schema_from_qdrant, dataset_id=dataset_id))
+        for dataset_id in dataset_ids or []
+    ]
 
     for project_id in project_ids or []:
-        tasks.append(get_project_schema(project_id=project_id))
+        tasks.append(
+            get_schema(f"project:{project_id}", partial(get_project_schema, project_id=project_id))
+        )
 
     schemas = await asyncio.gather(*tasks)
 
@@ -69,6 +103,26 @@ async def get_project_custom_prompts(
     return list(set(project_custom_prompts)), schemas
 
 
+async def lookup_cached_answer(
+    enhanced_query: str,
+    dataset_ids: list[str] | None,
+    project_ids: list[str] | None,
+    schema_version: str,
+    config: RunnableConfig,
+) -> QueryResult | None:
+    try:
+        cached_answer = await SemanticAnswerCache.lookup(
+            scope=get_answer_scope(dataset_ids, project_ids),
+            version=schema_version,
+            query=enhanced_query,
+            config=config,
+        )
+        return cached_answer.query_result if cached_answer else None
+    except Exception as e:
+        logger.warning(f"Semantic answer cache lookup failed: {e!s}")
+        return None
+
+
 @configure_node(
     role="intermediate",
     progress_message="Processing chat context...",
@@ -84,8 +138,18 @@ async def process_context(state: AgentState, config: RunnableConfig) -> dict:
     relevant_datasets_ids = history_context["datasets_used"]
     dataset_ids = state.get("dataset_ids", [])
     project_ids = state.get("project_ids", [])
+
+    # Speculatively run the dataset agent's first lookups for the raw query while
+    # the context is processed.
+    prefetch_task = start_schema_prefetch(
+        user_input, dataset_ids, project_ids, relevant_datasets_ids, config
+    )
+
+    conversation_state = get_conversation_state(config)
     project_custom_prompts, schemas = await get_project_custom_prompts(
-        dataset_ids=dataset_ids, project_ids=project_ids
+        dataset_ids=dataset_ids,
+        project_ids=project_ids,
+        schema_cache=conversation_state.schemas if conversation_state else None,
     )
     chain_input = {
         "current_query": user_input,
@@ -118,11 +182,26 @@ async def process_context(state: AgentState, config: RunnableConfig) -> dict:
         else:
             final_query = enhanced_query
 
-        await fake_streaming_response(parsed_response.status_message, config)
+        await emit_message(parsed_response.status_message, Role.INTERMEDIATE)
 
         if generate_visualization and not (last_vizpaths or relevant_sql_queries):
             is_new_data_needed = True
 
+        # Only self-contained questions are answered from / stored in the answer cache.
+        schema_version = None
+        cached_query_result = None
+        if settings.SEMANTIC_ANSWER_CACHE_ENABLED and is_new_data_needed and not is_follow_up:
+            schema_version = get_schema_version(schemas)
+            cached_query_result = await lookup_cached_answer(
+                enhanced_query, dataset_ids, project_ids, schema_version, config
+            )
+
+        prefetched_schemas = None
+        if is_new_data_needed and cached_query_result is None:
+            prefetched_schemas = await collect_schema_prefetch(prefetch_task)
+        elif prefetch_task:
+            prefetch_task.cancel()
+
         return {
             "user_query": final_query,
             "new_data_needed": is_new_data_needed,
@@ -131,6 +210,10 @@ async def process_context(state: AgentState, config: RunnableConfig) -> dict:
             "relevant_sql_queries": relevant_sql_queries,
             "enhanced_query": enhanced_query,
             "previous_json_paths": last_vizpaths,
+            "schema_version": schema_version,
+            "schema_project_ids": list({schema.project_id for schema in schemas if schema}),
+            "cached_query_result": cached_query_result,
+            "prefetched_schemas": prefetched_schemas,
         }
 
     except Exception as e:
@@ -143,4 +226,5 @@ async def process_context(state: AgentState, config: RunnableConfig) -> dict:
             "relevant_sql_queries": [],
             "enhanced_query": user_input,
             "previous_json_paths": last_vizpaths,
+            "prefetched_schemas": await collect_schema_prefetch(prefetch_task),
         }
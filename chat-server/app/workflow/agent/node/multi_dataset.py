@@ -84,6 +84,7 @@ async def call_multi_dataset_agent(state: AgentState, config: RunnableConfig) ->
         "user_query": state["user_query"] or "",
         "relevant_datasets_ids": state.get("relevant_datasets_ids", []),
         "previous_sql_queries": state.get("previous_sql_queries", []),
+        "prefetched_schemas": state.get("prefetched_schemas"),
     }
 
     output_state = await multi_dataset_graph.ainvoke(input_state, config=config)
@@ -72,6 +72,7 @@ async def call_single_dataset_agent(state: AgentState, config: RunnableConfig) -
         "dataset_id": dataset_id,
         "user_query": user_query,
         "previous_sql_queries": state.get("previous_sql_queries", []),
+        "prefetched_schemas": state.get("prefetched_schemas"),
     }
 
     output_state = await single_dataset_graph.ainvoke(input_state, config=config)
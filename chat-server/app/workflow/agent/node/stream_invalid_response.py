@@ -1,11 +1,8 @@
-from langchain_core.language_models.fake_chat_models import (
-    GenericFakeChatModel,
-)
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 
 from app.core.log import logger
-from app.workflow.events.event_utils import configure_node
+from app.workflow.events.event_utils import configure_node, emit_message
 
 from ..types import AgentState
 
@@ -16,10 +13,10 @@ from ..types import AgentState
 )
 async def stream_invalid_response(state: AgentState, config: RunnableConfig):
     """
-    Generates a simulated AI response based on the last message in the agent state.
+    Sends the last message in the agent state to the client as the AI response.
 
-    This function retrieves the most recent message from the agent's message history, uses a generic
-    fake chat model to generate a response, and returns the response wrapped in an `AIMessage` within a dictionary.
+    This function retrieves the most recent message from the agent's message history, emits it as a
+    single message event, and returns it wrapped in an `AIMessage` within a dictionary.
 
     Returns:
         dict: A dictionary containing a single-item list of `AIMessage` objects with the generated response.
@@ -29,9 +26,9 @@ async def stream_invalid_response(state: AgentState, config: RunnableConfig):
         logger.debug(f"Last message is not an AIMessage: {last_message}")
         pass
 
-    llm = GenericFakeChatModel(messages=iter([last_message]), metadata=config.get("metadata", {}))
-    response = await llm.ainvoke(input=last_message.content, config=config)
+    content = str(last_message.content)
+    await emit_message(content)
 
     return {
-        "messages": [AIMessage(content=response.content)],
+        "messages": [AIMessage(content=content)],
     }
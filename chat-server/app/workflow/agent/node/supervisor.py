@@ -15,6 +15,10 @@ def supervisor(
         return Command(
             goto="visualization_agent",
         )
+    elif state.get("cached_query_result") is not None:
+        return Command(
+            goto="replay_cached_answer",
+        )
     else:
         if datasets_count == 1:
             return Command(
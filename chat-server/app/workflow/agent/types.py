@@ -3,6 +3,7 @@ from typing import Annotated, TypedDict
 from langgraph.graph.message import add_messages
 
 from app.models.query import QueryResult
+from app.utils.graph_utils.schema_prefetch import PrefetchedSchemas
 from app.workflow.graph.visualize_data_graph.types import Dataset
 
 
@@ -28,3 +29,8 @@ class AgentState(TypedDict):
     invalid_input: bool | None
     query_result: QueryResult | None
     continue_execution: bool | None
+    enhanced_query: str | None
+    schema_version: str | None
+    schema_project_ids: list[str] | None
+    cached_query_result: QueryResult | None
+    prefetched_schemas: PrefetchedSchemas | None
@@ -0,0 +1,101 @@
+import asyncio
+from typing import AsyncIterable
+
+from app.core.config import settings
+from app.models.chat import EventChunkData, Role
+
+_END = object()
+
+
+def is_content_chunk(event_chunk: EventChunkData) -> bool:
+    return event_chunk.role == Role.AI and not event_chunk.category and not event_chunk.extra_data
+
+
+async def _produce(event_chunks: AsyncIterable[EventChunkData], queue: asyncio.Queue) -> None:
+    # Waits while the queue is full, so a slow client holds the graph back.
+    try:
+        async for event_chunk in event_chunks:
+            await queue.put(event_chunk)
+        await queue.put(_END)
+    except Exception as e:
+        await queue.put(e)
+
+
+async def coalesce_event_chunks(
+    event_chunks: AsyncIterable[EventChunkData],
+    window_seconds: float | None = None,
+    max_bytes: int | None = None,
+) -> AsyncIterable[EventChunkData]:
+    """
+    Merge consecutive AI content chunks so a response is written in a few larger
+    SSE frames instead of one frame per token.
+
+    Content is held for at most `window_seconds` after the first buffered token or
+    until `max_bytes` are buffered (STREAM_COALESCE_* settings by default). Tool
+    calls and intermediate messages flush the buffer and are passed on at once.
+    A window of 0 disables coalescing.
+
+    At most STREAM_COALESCE_QUEUE_SIZE chunks are read ahead of the client.
+    """
+    window_seconds = (
+        settings.STREAM_COALESCE_WINDOW_SECONDS if window_seconds is None else window_seconds
+    )
+    max_bytes = settings.STREAM_COALESCE_MAX_BYTES if max_bytes is None else max_bytes
+
+    if window_seconds <= 0:
+        async for event_chunk in event_chunks:
+            yield event_chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.STREAM_COALESCE_QUEUE_SIZE)
+    producer = asyncio.create_task(_produce(event_chunks, queue))
+
+    buffer: list[str] = []
+    buffered_bytes = 0
+    flush_at = 0.0
+
+    def flush() -> EventChunkData:
+        nonlocal buffered_bytes
+        content = "".join(buffer)
+        buffer.clear()
+        buffered_bytes = 0
+        return EventChunkData(role=Role.AI, content=content, category=None, extra_data=None)
+
+    try:
+        while True:
+            if buffer:
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(flush_at - loop.time(), 0))
+                except TimeoutError:
+                    yield flush()
+                    continue
+            else:
+                item = await queue.get()
+
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                if buffer:
+                    yield flush()
+                raise item
+
+            if not is_content_chunk(item):
+                if buffer:
+                    yield flush()
+                yield item
+                continue
+
+            if not buffer:
+                flush_at = loop.time() + window_seconds
+            buffer.append(item.content)
+            buffered_bytes += len(item.content.encode())
+            if buffered_bytes >= max_bytes:
+                yield flush()
+
+        if buffer:
+            yield flush()
+    finally:
+        # Wait for the graph and its deadline to shut down before the response ends.
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
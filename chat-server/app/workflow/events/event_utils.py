@@ -3,14 +3,11 @@ from functools import wraps
 from typing import Any
 
 from langchain_core.callbacks import adispatch_custom_event
-from langchain_core.language_models.fake_chat_models import (
-    GenericFakeChatModel,
-)
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
-from app.core.log import logger
-from app.models.chat import NodeEventConfig, Role
+from app.core.constants import MESSAGE_EVENT
+from app.models.chat import MessageEventData, NodeEventConfig, Role
 from app.utils.model_registry.model_provider import get_llm_for_other_task
 
 
@@ -71,29 +68,6 @@ Rules:
     return progress_message
 
 
-async def stream_dynamic_message(context: str, config: RunnableConfig):
-    """
-    Stream a dynamic message based on the context.
-    """
-    prev_metadata = config.get("metadata")
-
-    try:
-        dynamic_message = await create_dynamic_progress_message(context, config)
-        logger.debug(dynamic_message)
-
-        config.update(
-            metadata=NodeEventConfig(
-                role=Role.INTERMEDIATE,
-                progress_message="",
-            ).model_dump()
-        )
-    finally:
-        if prev_metadata is not None:
-            config.update(metadata=prev_metadata)
-        else:
-            config.pop("metadata", None)
-
-
 async def non_streaming_dynamic_message(context: str, config: RunnableConfig):
     """
     Send a non-streaming dynamic message based on the context.
@@ -108,26 +82,11 @@ async def non_streaming_dynamic_message(context: str, config: RunnableConfig):
     )
 
 
-async def fake_streaming_response(response: str, config: RunnableConfig):
+async def emit_message(content: str, role: Role = Role.AI):
     """
-    Fake a streaming response.
+    Send a complete, pre-computed message to the client as a single event.
     """
-    prev_metadata = config.get("metadata")
-    try:
-        config.update(
-            metadata=NodeEventConfig(
-                role=Role.INTERMEDIATE,
-                progress_message=response,
-            ).model_dump()
-        )
-
-        llm = GenericFakeChatModel(
-            messages=iter([AIMessage(content=response)]),
-        )
-
-        await llm.ainvoke(input=response, config=config)
-    finally:
-        if prev_metadata is not None:
-            config.update(metadata=prev_metadata)
-        else:
-            config.pop("metadata", None)
+    await adispatch_custom_event(
+        MESSAGE_EVENT,
+        MessageEventData(role=role, content=content).model_dump(),
+    )
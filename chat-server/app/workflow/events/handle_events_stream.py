@@ -2,12 +2,26 @@ from typing import Any
 
 from langchain_core.runnables.schema import StreamEvent
 
-from app.models.chat import EventChunkData, ExtraData, Role
+from app.core.constants import MESSAGE_EVENT
+from app.models.chat import EventChunkData, ExtraData, MessageEventData, Role
+
+# Run types (and custom event names) EventStreamHandler turns into client chunks.
+# Passed as `include_types` to astream_events so chain, prompt, parser and lambda
+# runs across all subgraphs are dropped by the tracer before they are queued.
+STREAMED_EVENT_TYPES = ["chat_model", "tool", "gopie-agent", MESSAGE_EVENT]
 
 
 class EventStreamHandler:
-    def __init__(self):
-        self._intermediate_stream_sent = False
+    def __init__(self, stream_tokens: bool = True):
+        """
+        With `stream_tokens` off the chat models are called without streaming, so
+        progress messages are sent when a model starts and AI content when it ends.
+        Tokens from models that stream anyway are skipped in favour of the final output.
+        """
+        self.stream_tokens = stream_tokens
+        # Intermediate model runs whose progress message was sent. Tracked per run
+        # since models of parallel subqueries stream concurrently.
+        self._intermediate_runs_sent: set[str | None] = set()
 
     def handle_events_stream(
         self,
@@ -31,6 +45,9 @@ class EventStreamHandler:
             if not should_display_tool:
                 return self._create_empty_event_data()
 
+        elif self._is_custom_event(event_type) and event.get("name") == MESSAGE_EVENT:
+            return self.create_message_event_data(MessageEventData(**event.get("data", {})))
+
         elif self._is_custom_event(event_type):
             (
                 content,
@@ -66,6 +83,22 @@ class EventStreamHandler:
     def _is_custom_event(self, event_type: str) -> bool:
         return event_type == "on_custom_event"
 
+    def create_message_event_data(self, message: MessageEventData) -> EventChunkData:
+        """
+        A complete message sent with `emit_message`. AI messages end with the same
+        newline a streamed chat model response ends with.
+        """
+        content = message.content
+        if message.role == Role.AI:
+            content += "\n"
+
+        return EventChunkData(
+            role=message.role,
+            content=content,
+            category=None,
+            extra_data=None,
+        )
+
     def _create_empty_event_data(self) -> EventChunkData:
         return EventChunkData(
             role=None,
@@ -82,30 +115,39 @@ class EventStreamHandler:
         progress_message: str,
     ) -> str | None:
         content = None
+        run_id = event.get("run_id")
 
         if event_type == "on_chat_model_start":
             content = ""
 
             if role == Role.INTERMEDIATE:
-                self._intermediate_stream_sent = False
+                self._intermediate_runs_sent.discard(run_id)
+                if not self.stream_tokens:
+                    self._intermediate_runs_sent.add(run_id)
+                    content = progress_message
 
         elif event_type == "on_chat_model_stream":
             chunk = event.get("data", {}).get("chunk", None)
 
             if role == Role.INTERMEDIATE:
-                if self._intermediate_stream_sent:
+                if run_id in self._intermediate_runs_sent:
                     return None
                 else:
-                    self._intermediate_stream_sent = True
+                    self._intermediate_runs_sent.add(run_id)
                     content = progress_message
 
-            elif role == Role.AI and chunk and chunk.content:
+            elif role == Role.AI and chunk and chunk.content and self.stream_tokens:
                 content = chunk.content
 
         elif event_type == "on_chat_model_end":
             content = "\n"
             if role == Role.INTERMEDIATE:
+                self._intermediate_runs_sent.discard(run_id)
                 return None
+
+            output = event.get("data", {}).get("output", None)
+            if not self.stream_tokens and output is not None:
+                content = output.text() + "\n"
         return content
 
     def _handle_custom_events(
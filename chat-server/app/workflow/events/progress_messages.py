@@ -0,0 +1,79 @@
+import asyncio
+from typing import Literal
+
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+
+from app.core.config import settings
+from app.core.log import logger
+from app.workflow.events.event_utils import create_dynamic_progress_message
+
+ProgressMessageName = Literal["executing_sql", "breaking_down_query"]
+
+PROGRESS_MESSAGE_TEMPLATES: dict[ProgressMessageName, str] = {
+    "executing_sql": "Generated {count} SQL {queries}, running {them} on your data now...",
+    "breaking_down_query": (
+        "I'll break down your query into steps to give you a more complete answer:\n"
+        "{steps}\n\nPlease wait while I process these steps."
+    ),
+}
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def format_progress_message(name: ProgressMessageName, **values) -> str:
+    match name:
+        case "executing_sql":
+            count = values["count"]
+            return PROGRESS_MESSAGE_TEMPLATES[name].format(
+                count=count,
+                queries="query" if count == 1 else "queries",
+                them="it" if count == 1 else "them",
+            )
+        case "breaking_down_query":
+            steps = "\n".join(f"{i}. {step}" for i, step in enumerate(values["steps"], 1))
+            return PROGRESS_MESSAGE_TEMPLATES[name].format(steps=steps)
+
+
+async def _dispatch_progress_message(message: str) -> None:
+    await adispatch_custom_event("gopie-agent", {"content": message})
+
+
+async def _dispatch_llm_progress_message(fallback_message: str, config: RunnableConfig) -> None:
+    try:
+        message = await asyncio.wait_for(
+            create_dynamic_progress_message(fallback_message, config),
+            timeout=settings.PROGRESS_MESSAGE_LLM_TIMEOUT,
+        )
+    except Exception as e:
+        logger.debug(f"Using templated progress message: {e!r}")
+        message = fallback_message
+
+    try:
+        await _dispatch_progress_message(message)
+    except Exception as e:
+        logger.debug(f"Dropped progress message: {e!s}")
+
+
+async def emit_progress_message(
+    name: ProgressMessageName,
+    config: RunnableConfig,
+    **values,
+) -> None:
+    """
+    Emit a user facing progress message without delaying the node.
+
+    The templated message is dispatched right away. With
+    PROGRESS_MESSAGE_LLM_ENABLED the message is instead phrased by the LLM in a
+    background task and the template is used if that misses
+    PROGRESS_MESSAGE_LLM_TIMEOUT.
+    """
+    message = format_progress_message(name, **values)
+
+    if not settings.PROGRESS_MESSAGE_LLM_ENABLED:
+        await _dispatch_progress_message(message)
+        return
+
+    task = asyncio.create_task(_dispatch_llm_progress_message(message, config))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -1,14 +1,28 @@
-from langchain_core.language_models.fake_chat_models import (
-    GenericFakeChatModel,
-)
-from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages import BaseMessage
 from langchain_core.runnables import RunnableConfig
 
+from app.core.config import settings
 from app.core.log import logger
-from app.models.chat import Role
+from app.models.chat import MessageEventData, Role
+from app.models.router import LatencyMode
+from app.utils.chat_history.state_store import (
+    ConversationState,
+    ConversationStore,
+)
+from app.utils.chat_history.summarizer import ConversationSummaries
 from app.utils.graph_utils.extract_user_input import extract_user_input
+from app.utils.graph_utils.request_deadline import (
+    RequestCancelledError,
+    RequestDeadline,
+)
+from app.utils.model_registry.prompt_cache_stats import (
+    PromptCacheCallbackHandler,
+)
 from app.workflow.agent.graph import agent_graph
-from app.workflow.events.handle_events_stream import EventStreamHandler
+from app.workflow.events.handle_events_stream import (
+    STREAMED_EVENT_TYPES,
+    EventStreamHandler,
+)
 
 
 async def stream_graph_updates(
@@ -16,12 +30,31 @@ async def stream_graph_updates(
     user: str,
     trace_id: str,
     chat_id: str,
+    client_chat_id: str | None = None,
     dataset_ids: list[str] | None = None,
     project_ids: list[str] | None = None,
+    stream_tokens: bool = True,
+    latency_mode: LatencyMode | None = None,
+    deadline: RequestDeadline | None = None,
+    conversation_state: ConversationState | None = None,
 ):
     """
     Asynchronously streams graph-based agent updates in response to user messages, yielding event data suitable for Server-Sent Events (SSE).
 
+    With `stream_tokens` off the LLMs are called without token streaming and each
+    AI response is yielded as a single chunk, for clients that aggregate the output.
+    `latency_mode` selects the execution profile the graph nodes run with, falling
+    back to DEFAULT_LATENCY_MODE.
+
+    The graph runs until `deadline` (REQUEST_DEADLINE_SECONDS by default) passes or
+    is cancelled, at which point all in-flight work is cancelled.
+
+    `conversation_state` is the chat's state kept between requests; the graph
+    nodes read and record context in it. Once the response is complete, it is
+    persisted and older chat history is summarized in the background for the
+    chat's next requests. Summaries are only kept for a `client_chat_id` the
+    client sent, not for a `chat_id` generated for this request alone.
+
     Raises:
         ValueError: If neither dataset_ids nor project_ids are provided.
 
@@ -40,7 +73,8 @@ async def stream_graph_updates(
         "initial_user_query": user_input,
     }
 
-    event_stream_handler = EventStreamHandler()
+    deadline = deadline or RequestDeadline.after(settings.REQUEST_DEADLINE_SECONDS)
+    event_stream_handler = EventStreamHandler(stream_tokens=stream_tokens)
     metadata = {
         "trace_id": trace_id,
         "chat_id": chat_id,
@@ -48,34 +82,56 @@ async def stream_graph_updates(
     }
     config = RunnableConfig(
         metadata=metadata,
+        callbacks=[PromptCacheCallbackHandler()],
         configurable={
             "metadata": metadata,
             "chat_history": messages[:-1],
+            "client_chat_id": client_chat_id,
+            "stream_tokens": stream_tokens,
+            "latency_mode": latency_mode,
+            "deadline": deadline,
+            "conversation_state": conversation_state,
         },
     )
 
+    events = agent_graph.astream_events(
+        input_state,
+        subgraphs=True,
+        version="v2",
+        config=config,
+        include_types=STREAMED_EVENT_TYPES,
+    )
+
     try:
-        async for event in agent_graph.astream_events(
-            input_state,
-            subgraphs=True,
-            version="v2",
-            config=config,
-        ):
+        # Cancelling the pending step cancels the graph run and everything in it.
+        async for event in deadline.iterate(events):
             extracted_event_data = event_stream_handler.handle_events_stream(event)
             if extracted_event_data.role:
                 yield extracted_event_data
 
+        # The response is out; summarize what the next request's window will leave out.
+        ConversationSummaries.schedule(client_chat_id, messages[:-1], metadata)
+        await ConversationStore.save(conversation_state)
+
+    except RequestCancelledError as e:
+        logger.info(f"Request {trace_id} stopped: {e!s}")
+        # A client that went away gets no reply, one that waited too long does.
+        if not deadline.is_cancelled():
+            yield event_stream_handler.create_message_event_data(
+                MessageEventData(
+                    role=Role.AI,
+                    content="Sorry, this is taking longer than expected. Please try again.",
+                )
+            )
+
     except Exception as e:
         error_text = "Sorry, something went wrong while processing your request. Please try again."
 
-        llm = GenericFakeChatModel(
-            messages=iter([AIMessage(content=error_text)]),
-            metadata={"role": Role.AI.value, "progress_message": ""},
+        yield event_stream_handler.create_message_event_data(
+            MessageEventData(role=Role.AI, content=error_text)
         )
 
-        async for event in llm.astream_events(error_text, config=config):
-            extracted_event_data = event_stream_handler.handle_events_stream(event)
-            if extracted_event_data.role:
-                yield extracted_event_data
-
         logger.exception(e)
+
+    finally:
+        await events.aclose()
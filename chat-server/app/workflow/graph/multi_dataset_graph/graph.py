@@ -8,6 +8,11 @@ from .node.analyze_query import analyze_query, route_from_analysis
 from .node.execute_query import execute_query
 from .node.generate_subqueries import generate_subqueries
 from .node.identify_datasets import identify_datasets, route_from_datasets
+from .node.parallel_subqueries import (
+    merge_subquery_results,
+    route_subqueries,
+    run_subquery,
+)
 from .node.plan_query import plan_query
 from .node.response_handler import route_response_handler
 from .node.stream_updates import (
@@ -35,6 +40,8 @@ graph_builder.add_node("validate_result", validate_result)
 graph_builder.add_node("tools", ToolNode(tool_names=list(ToolNames)))
 graph_builder.add_node("route_response", lambda state: state)
 graph_builder.add_node("pass_on_results", lambda state: state)
+graph_builder.add_node("run_subquery", run_subquery)
+graph_builder.add_node("merge_subquery_results", merge_subquery_results)
 
 graph_builder.add_conditional_edges(
     "analyze_query",
@@ -46,6 +53,12 @@ graph_builder.add_conditional_edges(
     },
 )
 
+graph_builder.add_conditional_edges(
+    "generate_subqueries",
+    route_subqueries,
+    ["identify_datasets", "run_subquery"],
+)
+
 graph_builder.add_conditional_edges(
     "identify_datasets",
     route_from_datasets,
@@ -84,11 +97,12 @@ graph_builder.add_conditional_edges(
 )
 
 graph_builder.add_edge(START, "analyze_query")
-graph_builder.add_edge("generate_subqueries", "identify_datasets")
 graph_builder.add_edge("analyze_dataset", "plan_query")
 graph_builder.add_edge("tools", "analyze_query")
 graph_builder.add_edge("plan_query", "execute_query")
 graph_builder.add_edge("execute_query", "validate_result")
 graph_builder.add_edge("pass_on_results", END)
+graph_builder.add_edge("run_subquery", "merge_subquery_results")
+graph_builder.add_edge("merge_subquery_results", "stream_updates")
 
 multi_dataset_graph = graph_builder.compile()
@@ -16,6 +16,7 @@ async def analyze_dataset(state: State) -> dict:
     """
 
     query_result = state["query_result"]
+    query_index = state.get("subquery_index", 0)
     datasets_info = state["datasets_info"]
     last_message = state["messages"][-1]
 
@@ -44,7 +45,7 @@ Here are results from the analysis of the datasets:
 
     except Exception as e:
         error_msg = f"Error analyzing dataset: {e!s}"
-        query_result.add_error_message(error_msg, "Error analyzing dataset")
+        query_result.add_error_message(error_msg, "Error analyzing dataset", query_index)
 
         return {
             "query_result": query_result,
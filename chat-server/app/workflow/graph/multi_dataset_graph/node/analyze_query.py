@@ -5,15 +5,13 @@ from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.runnables import RunnableConfig
 
+from app.models.chat import Role
 from app.models.message import ErrorMessage, IntermediateStep
 from app.models.query import QueryResult, ToolUsedResult
 from app.tool_utils.tool_node import has_tool_calls
 from app.tool_utils.tools import ToolNames
 from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
-from app.workflow.events.event_utils import (
-    configure_node,
-    fake_streaming_response,
-)
+from app.workflow.events.event_utils import configure_node, emit_message
 from app.workflow.graph.multi_dataset_graph.types import State
 
 
@@ -163,7 +161,7 @@ async def _handle_analysis_response(
     }
 
     if status_message:
-        await fake_streaming_response(status_message, config)
+        await emit_message(status_message, Role.INTERMEDIATE)
 
     return result
 
@@ -5,7 +5,7 @@ from app.core.constants import SQL_QUERIES_GENERATED, SQL_QUERIES_GENERATED_ARG
 from app.models.message import ErrorMessage, IntermediateStep
 from app.models.query import SqlQueryInfo
 from app.services.gopie.sql_executor import execute_sql, truncate_if_too_large
-from app.workflow.events.event_utils import stream_dynamic_message
+from app.workflow.events.progress_messages import emit_progress_message
 from app.workflow.graph.multi_dataset_graph.types import State
 
 
@@ -33,10 +33,7 @@ async def execute_query(state: State, config: RunnableConfig) -> dict:
 
         sql_results: list[SqlQueryInfo] = []
 
-        await stream_dynamic_message(
-            f"create a 1 to 2 sentence message saying that here are the generated SQL queries and now let's execute them: {sql_queries}",
-            config,
-        )
+        await emit_progress_message("executing_sql", config, count=len(sql_queries))
 
         for query_info in sql_queries:
             try:
@@ -88,7 +85,7 @@ async def execute_query(state: State, config: RunnableConfig) -> dict:
 
     except Exception as e:
         error_msg = f"Query execution error: {e!s}"
-        query_result.add_error_message(error_msg, "Query execution")
+        query_result.add_error_message(error_msg, "Query execution", query_index)
         query_result.subqueries[query_index].retry_count += 1
 
         await adispatch_custom_event(
@@ -3,8 +3,9 @@ from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 
 from app.models.message import ErrorMessage, IntermediateStep
+from app.utils.graph_utils.execution_profile import get_execution_profile
 from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
-from app.workflow.events.event_utils import stream_dynamic_message
+from app.workflow.events.progress_messages import emit_progress_message
 from app.workflow.graph.multi_dataset_graph.types import State
 
 
@@ -26,13 +27,17 @@ async def generate_subqueries(state: State, config: RunnableConfig):
     query_result = state.get("query_result")
 
     try:
-        assessment_llm = get_prompt_llm_chain(
-            "assess_query_complexity", config, schema=AssessQueryComplexityOutput
-        )
-        assessment_response = await assessment_llm.ainvoke({"user_input": user_input})
+        needs_breakdown = False
+        explanation = "Query breakdown is skipped for the fast latency mode"
+
+        if get_execution_profile(config).break_down_queries:
+            assessment_llm = get_prompt_llm_chain(
+                "assess_query_complexity", config, schema=AssessQueryComplexityOutput
+            )
+            assessment_response = await assessment_llm.ainvoke({"user_input": user_input})
 
-        needs_breakdown = assessment_response.needs_breakdown
-        explanation = assessment_response.explanation
+            needs_breakdown = assessment_response.needs_breakdown
+            explanation = assessment_response.explanation
 
         subqueries = []
 
@@ -44,24 +49,13 @@ async def generate_subqueries(state: State, config: RunnableConfig):
 
             subqueries = subqueries_response.subqueries
 
-            await stream_dynamic_message(
-                f"""
-Create a short message that tells the user displaying the subqueries nicely.
-Don't care about characters over here, but ensure that you display the whole subqueries properly.
-
-I'll break down your query into steps to give you a more complete answer:
-{subqueries}
-
-Please wait while I process these steps.
-                """,
-                config,
-            )
-
             if len(subqueries) > 2:
                 subqueries = subqueries[:2]
 
             if not subqueries:
                 subqueries = [user_input]
+            else:
+                await emit_progress_message("breaking_down_query", config, steps=subqueries)
         else:
             subqueries = [user_input]
 
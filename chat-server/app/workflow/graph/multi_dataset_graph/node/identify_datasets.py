@@ -57,24 +57,37 @@ async def identify_datasets(state: State, config: RunnableConfig):
     validation_result = state.get("validation_result", None)
 
     relevant_datasets_ids = state.get("relevant_datasets_ids", [])
+    prefetched_schemas = state.get("prefetched_schemas")
 
     try:
         embeddings_model = get_model_provider(config).get_embeddings_model()
 
-        relevant_dataset_schemas = await get_schema_by_dataset_ids(
-            dataset_ids=relevant_datasets_ids
+        relevant_dataset_schemas = (
+            prefetched_schemas.get_relevant_dataset_schemas(relevant_datasets_ids)
+            if prefetched_schemas
+            else None
         )
-
-        semantic_searched_datasets = []
-        try:
-            semantic_searched_datasets = await search_schemas(
-                user_query=user_query,
-                embeddings=embeddings_model,
-                dataset_ids=dataset_ids,
-                project_ids=project_ids,
+        if relevant_dataset_schemas is None:
+            relevant_dataset_schemas = await get_schema_by_dataset_ids(
+                dataset_ids=relevant_datasets_ids
             )
-        except Exception as e:
-            logger.warning(f"Vector search error: {e!s}. Unable to retrieve dataset information.")
+
+        semantic_searched_datasets = (
+            prefetched_schemas.get_searched_schemas(user_query) if prefetched_schemas else None
+        )
+        if semantic_searched_datasets is None:
+            semantic_searched_datasets = []
+            try:
+                semantic_searched_datasets = await search_schemas(
+                    user_query=user_query,
+                    embeddings=embeddings_model,
+                    dataset_ids=dataset_ids,
+                    project_ids=project_ids,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Vector search error: {e!s}. Unable to retrieve dataset information."
+                )
 
         if not semantic_searched_datasets:
             query_result.set_node_message(
@@ -83,6 +96,7 @@ async def identify_datasets(state: State, config: RunnableConfig):
                     "No relevant datasets found by doing semantic search. This subquery is "
                     "not relevant to any datasets. Treating as conversational query."
                 },
+                query_index,
             )
 
             await adispatch_custom_event(
@@ -118,7 +132,7 @@ async def identify_datasets(state: State, config: RunnableConfig):
         node_message = response.node_message
 
         if node_message:
-            query_result.set_node_message("identify_datasets", node_message)
+            query_result.set_node_message("identify_datasets", node_message, query_index)
 
         all_available_schemas = relevant_dataset_schemas + semantic_searched_datasets
 
@@ -152,7 +166,7 @@ async def identify_datasets(state: State, config: RunnableConfig):
 
     except Exception as e:
         error_msg = f"Error identifying datasets: {e!s}"
-        query_result.add_error_message(str(e), "Error identifying datasets")
+        query_result.add_error_message(str(e), "Error identifying datasets", query_index)
         await adispatch_custom_event(
             "gopie-agent",
             {"content": "Error identifying datasets"},
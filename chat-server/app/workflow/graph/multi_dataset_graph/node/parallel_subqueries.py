@@ -0,0 +1,79 @@
+import copy
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import Send
+
+from app.core.config import settings
+from app.workflow.graph.multi_dataset_graph.subquery_graph import (
+    subquery_graph,
+)
+from app.workflow.graph.multi_dataset_graph.types import State, SubqueryResult
+
+
+def route_subqueries(state: State) -> str | list[Send]:
+    """
+    Fan out one run_subquery per subquery when there are several and parallel
+    execution is enabled, otherwise continue with the sequential loop.
+
+    Every branch gets its own copy of the query result so validation of one
+    subquery never sees another one half-way through.
+    """
+    subqueries = state.get("subqueries", [])
+
+    if not settings.MULTI_DATASET_PARALLEL_SUBQUERIES or len(subqueries) < 2:
+        return "identify_datasets"
+
+    return [
+        Send(
+            "run_subquery",
+            {
+                **state,
+                "subquery_index": index,
+                "query_result": copy.deepcopy(state["query_result"]),
+                "subquery_results": [],
+            },
+        )
+        for index in range(len(subqueries))
+    ]
+
+
+async def run_subquery(state: State, config: RunnableConfig) -> dict:
+    """
+    Run identify -> analyze -> plan -> execute -> validate for the subquery at
+    `subquery_index` and hand its result back for the ordered merge.
+    """
+    query_index = state["subquery_index"]
+    input_messages = state.get("messages", [])
+
+    output = await subquery_graph.ainvoke(state, config)
+
+    return {
+        "subquery_results": [
+            SubqueryResult(
+                index=query_index,
+                subquery=output["query_result"].subqueries[query_index],
+                messages=output["messages"][len(input_messages) :],
+            )
+        ]
+    }
+
+
+def merge_subquery_results(state: State) -> dict:
+    """
+    Place the parallel subquery results into QueryResult.subqueries in subquery
+    order, regardless of the order in which they finished. stream_updates then
+    sends one update for all of them.
+    """
+    query_result = state["query_result"]
+    messages = []
+
+    for result in sorted(state.get("subquery_results", []), key=lambda result: result["index"]):
+        query_result.subqueries[result["index"]] = result["subquery"]
+        messages.extend(result["messages"])
+
+    return {
+        "query_result": query_result,
+        "subquery_index": len(query_result.subqueries) - 1,
+        "continue_execution": True,
+        "messages": messages,
+    }
@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 
 from app.models.message import ErrorMessage, IntermediateStep
 from app.models.query import SqlQueryInfo
+from app.utils.graph_utils.schema_pruning import is_missing_column_error
 from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
 from app.workflow.events.event_utils import configure_node
 from app.workflow.graph.multi_dataset_graph.types import State
@@ -65,6 +66,11 @@ async def plan_query(state: State, config: RunnableConfig) -> dict:
     datasets_info = state.get("datasets_info", {})
     previous_sql_queries = state.get("previous_sql_queries", [])
     validation_result = state.get("validation_result", None)
+    failed_sql_errors = [
+        sql_query.error
+        for sql_query in query_result.subqueries[query_index].sql_queries
+        if sql_query.error
+    ]
 
     # Reset the SQL queries and tables used for the current subquery (due to validation logic)
     query_result.subqueries[query_index].sql_queries = []
@@ -83,6 +89,15 @@ async def plan_query(state: State, config: RunnableConfig) -> dict:
         if not datasets_info:
             raise Exception("Could not get preview information for any of the selected datasets")
 
+        # A retry caused by a column the pruned schema left out gets the full schema
+        expand_schemas = is_missing_column_error(
+            [
+                *failed_sql_errors,
+                *(message for error in error_messages or [] for message in error.values()),
+                validation_result,
+            ]
+        )
+
         chain_input = {
             "user_query": user_query,
             "datasets_info": datasets_info,
@@ -90,6 +105,7 @@ async def plan_query(state: State, config: RunnableConfig) -> dict:
             "retry_count": retry_count,
             "previous_sql_queries": previous_sql_queries,
             "validation_result": validation_result,
+            "expand_schemas": expand_schemas,
         }
 
         chain = get_prompt_llm_chain("plan_query", config, schema=PlanQueryOutput)
@@ -116,6 +132,7 @@ async def plan_query(state: State, config: RunnableConfig) -> dict:
                     "no_sql_response": response_for_no_sql,
                     "limitations": limitations,
                 },
+                query_index,
             )
         elif sql_queries:
             formatted_sql_queries = []
@@ -147,6 +164,7 @@ async def plan_query(state: State, config: RunnableConfig) -> dict:
                     "query_count": len(sql_queries),
                     "limitations": limitations,
                 },
+                query_index,
             )
         else:
             raise Exception(
@@ -160,7 +178,7 @@ async def plan_query(state: State, config: RunnableConfig) -> dict:
 
     except Exception as e:
         error_msg = f"Unexpected error in query planning: {e!s}"
-        query_result.add_error_message(error_msg, "Error in query planning")
+        query_result.add_error_message(error_msg, "Error in query planning", query_index)
 
         await adispatch_custom_event(
             "gopie-agent",
@@ -1,15 +1,12 @@
 import json
 
-from langchain_core.language_models.fake_chat_models import (
-    GenericFakeChatModel,
-)
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 
 from app.core.log import logger
 from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
-from app.workflow.events.event_utils import configure_node
+from app.workflow.events.event_utils import configure_node, emit_message
 from app.workflow.graph.multi_dataset_graph.types import State
 
 
@@ -20,30 +17,50 @@ class StreamUpdateResponse(BaseModel):
     )
 
 
+def is_parallel_run(state: State) -> bool:
+    """
+    Whether all subqueries already ran in parallel and were merged.
+    """
+    return bool(state.get("subquery_results"))
+
+
 async def stream_updates(state: State, config: RunnableConfig) -> dict:
+    """
+    Streams a user-friendly update on the subquery that just finished and decides
+    whether to continue with the remaining ones. After a parallel run, a single
+    update covers all subqueries.
+    """
     query_result = state.get("query_result", None)
     query_index = state.get("subquery_index", 0)
     subqueries = state.get("subqueries", [])
+    parallel = is_parallel_run(state)
 
     stream_message = ""
     continue_execution = False
 
     try:
-        subquery_result = query_result.subqueries[query_index]
+        if parallel:
+            subquery_result = [subquery.to_dict() for subquery in query_result.subqueries]
+            subquery_messages = f"""
+            These are all {len(subqueries)} subqueries, which ran in parallel:\n
+            {subqueries}
+        """
+        else:
+            subquery_result = query_result.subqueries[query_index].to_dict()
 
-        remaining_index = query_index + 1
-        remaining_subqueries = [sq for sq in subqueries[remaining_index:]]
+            remaining_index = query_index + 1
+            remaining_subqueries = [sq for sq in subqueries[remaining_index:]]
 
-        subquery_messages = f"""
+            subquery_messages = f"""
             This is subquery {query_index + 1} / {len(subqueries)}:\n
-            {subquery_result.query_text}\n\n
+            {query_result.subqueries[query_index].query_text}\n\n
 
             Remaining subqueries:
             {remaining_subqueries}
         """
 
         chain_input = {
-            "subquery_result": json.dumps(subquery_result.to_dict()),
+            "subquery_result": json.dumps(subquery_result),
             "original_user_query": query_result.original_user_query,
             "subquery_messages": subquery_messages,
         }
@@ -63,7 +80,7 @@ async def stream_updates(state: State, config: RunnableConfig) -> dict:
 
     return {
         "messages": [AIMessage(content=stream_message)],
-        "subquery_index": query_index + 1,
+        "subquery_index": query_index if parallel else query_index + 1,
         "continue_execution": continue_execution,
     }
 
@@ -76,18 +93,16 @@ async def check_further_execution_requirement(state: State, config: RunnableConf
     """
     Determines if further execution is required based on the continue_execution flag stored in state.
     Returns a string indicating the next step: "next_sub_query" or "end_execution".
+    After a parallel run no subqueries remain, so execution always ends.
     """
 
     continue_execution = state.get("continue_execution", True)
     last_message = state["messages"][-1]
 
     if isinstance(last_message, AIMessage):
-        llm = GenericFakeChatModel(
-            messages=iter([last_message]), metadata=config.get("metadata", {})
-        )
-        await llm.ainvoke(input=last_message.content, config=config)
+        await emit_message(str(last_message.content))
 
-    if continue_execution:
+    if continue_execution and not is_parallel_run(state):
         return "next_sub_query"
     else:
         return "end_execution"
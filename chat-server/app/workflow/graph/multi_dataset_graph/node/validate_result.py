@@ -5,8 +5,8 @@ from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 
-from app.core.config import settings
 from app.models.message import ErrorMessage
+from app.utils.graph_utils.execution_profile import get_execution_profile
 from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
 from app.workflow.events.event_utils import configure_node
 from app.workflow.graph.multi_dataset_graph.types import State
@@ -48,6 +48,9 @@ async def validate_result(state: State, config: RunnableConfig) -> dict[str, Any
 
     no_sql_response = query_result.subqueries[subquery_index].no_sql_response
 
+    if not get_execution_profile(config).validate_results:
+        return {"retry_count": retry_count, "recommendation": "route_response"}
+
     if no_sql_response:
         return {
             "retry_count": retry_count,
@@ -100,7 +103,7 @@ async def validate_result(state: State, config: RunnableConfig) -> dict[str, Any
         }
 
 
-async def route_result_validation(state: State) -> str:
+async def route_result_validation(state: State, config: RunnableConfig) -> str:
     """
     Determine the next workflow routing step based on the validation result, retry count, and last message in the state.
 
@@ -112,7 +115,8 @@ async def route_result_validation(state: State) -> str:
     retry_count = state.get("retry_count", 0)
     recommendation = state.get("recommendation", "route_response")
 
-    if retry_count >= settings.MAX_VALIDATION_RETRY_COUNT or isinstance(last_message, ErrorMessage):
+    max_retries = get_execution_profile(config).max_validation_retries
+    if retry_count >= max_retries or isinstance(last_message, ErrorMessage):
         return "route_response"
 
     if recommendation in RECOMMENDATION_LIST:
@@ -0,0 +1,44 @@
+from langgraph.graph import END, START, StateGraph
+
+from .node.analyze_dataset import analyze_dataset
+from .node.execute_query import execute_query
+from .node.identify_datasets import identify_datasets, route_from_datasets
+from .node.plan_query import plan_query
+from .node.validate_result import route_result_validation, validate_result
+from .types import ConfigSchema, State
+
+# identify -> analyze -> plan -> execute -> validate for a single subquery, used
+# by run_subquery when the subqueries of a question are executed in parallel.
+graph_builder = StateGraph(state_schema=State, config_schema=ConfigSchema)
+
+graph_builder.add_node("identify_datasets", identify_datasets)
+graph_builder.add_node("analyze_dataset", analyze_dataset)
+graph_builder.add_node("plan_query", plan_query)
+graph_builder.add_node("execute_query", execute_query)
+graph_builder.add_node("validate_result", validate_result)
+
+graph_builder.add_conditional_edges(
+    "identify_datasets",
+    route_from_datasets,
+    {
+        "analyze_dataset": "analyze_dataset",
+        "no_datasets_found": END,
+    },
+)
+
+graph_builder.add_conditional_edges(
+    "validate_result",
+    route_result_validation,
+    {
+        "route_response": END,
+        "replan": "plan_query",
+        "reidentify_datasets": "identify_datasets",
+    },
+)
+
+graph_builder.add_edge(START, "identify_datasets")
+graph_builder.add_edge("analyze_dataset", "plan_query")
+graph_builder.add_edge("plan_query", "execute_query")
+graph_builder.add_edge("execute_query", "validate_result")
+
+subquery_graph = graph_builder.compile()
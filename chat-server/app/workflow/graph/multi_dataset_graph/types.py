@@ -1,11 +1,13 @@
+import operator
 from typing import Annotated, TypedDict
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
 from app.models.data import ColumnValueMatching
-from app.models.query import QueryResult
+from app.models.query import QueryResult, SubQueryInfo
 from app.models.schema import DatasetSchema
+from app.utils.graph_utils.schema_prefetch import PrefetchedSchemas
 
 
 class FuzzyValue(TypedDict):
@@ -25,6 +27,12 @@ class DatasetsInfo(TypedDict):
     correct_column_requirements: ColumnValueMatching | None
 
 
+class SubqueryResult(TypedDict):
+    index: int
+    subquery: SubQueryInfo
+    messages: list[BaseMessage]
+
+
 class InputState(TypedDict):
     dataset_ids: list[str] | None
     project_ids: list[str] | None
@@ -32,6 +40,7 @@ class InputState(TypedDict):
     user_query: str
     relevant_datasets_ids: list[str] | None
     previous_sql_queries: list[str] | None
+    prefetched_schemas: PrefetchedSchemas | None
 
 
 class OutputState(TypedDict):
@@ -56,6 +65,8 @@ class State(TypedDict):
     recommendation: str
     continue_execution: bool | None
     validation_result: str | None
+    subquery_results: Annotated[list[SubqueryResult], operator.add]
+    prefetched_schemas: PrefetchedSchemas | None
 
 
 class ConfigSchema(TypedDict):
@@ -63,6 +74,7 @@ class ConfigSchema(TypedDict):
     trace_id: str
     chat_history: list[BaseMessage]
     user: str
+    latency_mode: str
 
 
 class ValidationResult(TypedDict):
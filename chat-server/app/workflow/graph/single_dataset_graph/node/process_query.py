@@ -14,17 +14,12 @@ from app.models.query import (
     SingleDatasetQueryResult,
     SqlQueryInfo,
 )
-from app.services.gopie.sql_executor import (
-    execute_sql,
-    execute_sql_with_limit,
-    truncate_if_too_large,
-)
+from app.services.gopie.sql_executor import execute_sql, truncate_if_too_large
 from app.services.qdrant.get_schema import get_schema_from_qdrant
+from app.utils.graph_utils.schema_prefetch import fetch_sample_data
 from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
-from app.workflow.events.event_utils import (
-    configure_node,
-    stream_dynamic_message,
-)
+from app.workflow.events.event_utils import configure_node
+from app.workflow.events.progress_messages import emit_progress_message
 from app.workflow.graph.single_dataset_graph.types import State
 
 
@@ -115,6 +110,7 @@ async def process_query(state: State, config: RunnableConfig) -> dict:
     prev_query_result = state.get("query_result", None)
     previous_sql_queries = state.get("previous_sql_queries", [])
     validation_result = state.get("validation_result", None)
+    prefetched_schemas = state.get("prefetched_schemas")
 
     query_result = QueryResult(
         original_user_query=user_query,
@@ -134,16 +130,20 @@ async def process_query(state: State, config: RunnableConfig) -> dict:
         if not dataset_id:
             raise Exception("No dataset ID provided")
 
-        dataset_schema = await get_schema_from_qdrant(dataset_id=dataset_id)
-        if dataset_schema is None:
-            raise Exception("Schema fetch error: Dataset not found")
+        prefetched_dataset = (
+            prefetched_schemas.get_dataset(dataset_id) if prefetched_schemas else None
+        )
+        if prefetched_dataset:
+            dataset_schema, sample_data = prefetched_dataset
+        else:
+            dataset_schema = await get_schema_from_qdrant(dataset_id=dataset_id)
+            if dataset_schema is None:
+                raise Exception("Schema fetch error: Dataset not found")
+            sample_data = await fetch_sample_data(dataset_schema.dataset_name)
 
         dataset_name = dataset_schema.dataset_name
         user_provided_dataset_name = dataset_schema.name
 
-        sample_data_query = f"SELECT * FROM {dataset_name} LIMIT 50"
-        sample_data = await execute_sql_with_limit(query=sample_data_query)
-
         rows_csv = convert_rows_to_csv(sample_data)  # type: ignore
 
         chain_input = {
@@ -174,10 +174,7 @@ async def process_query(state: State, config: RunnableConfig) -> dict:
         query_result.single_dataset_query_result.dataset_name = dataset_name
 
         if sql_queries:
-            await stream_dynamic_message(
-                f"create a 1 to 2 sentence message saying that here are the generated SQL queries and now let's execute them: {sql_queries}",
-                config,
-            )
+            await emit_progress_message("executing_sql", config, count=len(sql_queries))
 
             sql_results: list[SqlQueryInfo] = []
             for q, exp in zip(sql_queries, explanations):
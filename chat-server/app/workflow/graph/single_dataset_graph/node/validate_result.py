@@ -4,8 +4,8 @@ from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 
-from app.core.config import settings
 from app.models.message import AIMessage, ErrorMessage
+from app.utils.graph_utils.execution_profile import get_execution_profile
 from app.utils.langsmith.prompt_manager import get_prompt_llm_chain
 from app.workflow.events.event_utils import configure_node
 from app.workflow.graph.single_dataset_graph.types import State
@@ -44,6 +44,9 @@ async def validate_result(state: State, config: RunnableConfig) -> dict:
     query_result = state.get("query_result", None)
     retry_count = state.get("retry_count", 0)
 
+    if not get_execution_profile(config).validate_results:
+        return {"retry_count": retry_count, "recommendation": "pass_on_results"}
+
     # Validate the result with the LLM
     try:
         chain = get_prompt_llm_chain(
@@ -86,7 +89,7 @@ async def validate_result(state: State, config: RunnableConfig) -> dict:
         }
 
 
-async def route_result_validation(state: State) -> str:
+async def route_result_validation(state: State, config: RunnableConfig) -> str:
     """
     Determine the next workflow action based on the validation result, retry count, and last message.
 
@@ -99,7 +102,7 @@ async def route_result_validation(state: State) -> str:
 
     if (
         recommendation == "pass_on_results"
-        or retry_count >= settings.MAX_VALIDATION_RETRY_COUNT
+        or retry_count >= get_execution_profile(config).max_validation_retries
         or isinstance(last_message, ErrorMessage)
     ):
         return "pass_on_results"
@@ -4,6 +4,7 @@ from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
 from app.models.query import QueryResult
+from app.utils.graph_utils.schema_prefetch import PrefetchedSchemas
 
 
 class InputState(TypedDict):
@@ -11,6 +12,7 @@ class InputState(TypedDict):
     dataset_id: str | None
     user_query: str
     previous_sql_queries: list | None
+    prefetched_schemas: PrefetchedSchemas | None
 
 
 class OutputState(TypedDict):
@@ -26,6 +28,7 @@ class State(TypedDict):
     previous_sql_queries: list | None
     validation_result: str | None
     recommendation: str
+    prefetched_schemas: PrefetchedSchemas | None
 
 
 class ConfigSchema(TypedDict):
@@ -33,3 +36,4 @@ class ConfigSchema(TypedDict):
     trace_id: str
     chat_history: list[BaseMessage]
     user: str
+    latency_mode: str
@@ -13,6 +13,7 @@ from langsmith import traceable
 
 from app.core.config import settings
 from app.core.session import SingletonAiohttp
+from app.utils.graph_utils.request_deadline import with_deadline
 
 from .types import Dataset
 
@@ -89,8 +90,10 @@ async def get_sandbox():
     """
     if not settings.E2B_API_KEY:
         raise ValueError("E2B API key is not set. Please set up E2B to enable visualizations.")
-    sbx = await AsyncSandbox.create(timeout=settings.E2B_TIMEOUT, api_key=settings.E2B_API_KEY)
-    _ = await sbx.commands.run("pip install altair vl-convert-python")
+    sbx = await with_deadline(
+        AsyncSandbox.create(timeout=settings.E2B_TIMEOUT, api_key=settings.E2B_API_KEY)
+    )
+    _ = await with_deadline(sbx.commands.run("pip install altair vl-convert-python"))
     return sbx
 
 
@@ -131,7 +134,7 @@ async def run_python_code(
     Already has basic data visualization libraries installed.
     Always use altair to create visualizations and save them to json.
     """
-    execution = await sandbox.run_code(code)
+    execution = await with_deadline(sandbox.run_code(code), config)
     return execution.logs
 
 
@@ -0,0 +1,22 @@
+from app.models.schema import DatasetSchema
+
+
+def sort_schemas(schemas: list[DatasetSchema]) -> list[DatasetSchema]:
+    """
+    Order dataset schemas by table name so the same datasets always render the
+    same prompt text.
+    """
+    return sorted(schemas, key=lambda schema: schema.dataset_name or "")
+
+
+def join_prompt_sections(*sections: str) -> str:
+    """
+    Join the sections of a human message, skipping empty ones.
+
+    Providers cache the longest prompt prefix they have seen before. The system
+    instructions are static and come first, so sections are passed from the most
+    stable (dataset schemas) to the most request-specific, with the user query
+    last: retries, subqueries and follow-ups over the same datasets then share
+    the prefix up to the parts that changed.
+    """
+    return "\n\n".join(section.strip("\n") for section in sections if section)
@@ -5,6 +5,7 @@ from langchain_core.prompts import (
 )
 
 from app.models.schema import DatasetSchema
+from app.workflow.prompts.formatters.prompt_layout import sort_schemas
 
 
 def create_identify_datasets_prompt(
@@ -116,14 +117,10 @@ def format_identify_datasets_input(
     semantic_searched_datasets: list[DatasetSchema] = [],
     validation_result: str | None = None,
 ) -> dict:
-    input_str = f"USER QUERY: {user_query}"
+    relevant_dataset_schemas = sort_schemas(relevant_dataset_schemas)
+    semantic_searched_datasets = sort_schemas(semantic_searched_datasets)
 
-    input_str += (
-        f"\n\n=== RELEVANT DATASETS (From Chat History): {len(relevant_dataset_schemas)} ==="
-    )
-
-    if validation_result:
-        input_str += f"\n\n🔄 VALIDATION RESULT:\n{validation_result}"
+    input_str = f"=== RELEVANT DATASETS (From Chat History): {len(relevant_dataset_schemas)} ==="
 
     if relevant_dataset_schemas:
         input_str += "\nThese datasets were used in previous queries from chat history."
@@ -150,4 +147,9 @@ def format_identify_datasets_input(
     if not relevant_dataset_schemas and not semantic_searched_datasets:
         input_str += "\n\n⚠️  No datasets available for analysis"
 
+    if validation_result:
+        input_str += f"\n\n🔄 VALIDATION RESULT:\n{validation_result}"
+
+    input_str += f"\n\nUSER QUERY: {user_query}"
+
     return {"input": input_str}
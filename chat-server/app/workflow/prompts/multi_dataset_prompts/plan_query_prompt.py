@@ -4,8 +4,16 @@ from langchain_core.prompts import (
     HumanMessagePromptTemplate,
 )
 
+from app.utils.graph_utils.schema_pruning import (
+    get_required_columns,
+    prune_columns,
+)
 from app.utils.prompts import escape_value
 from app.workflow.graph.multi_dataset_graph.types import DatasetsInfo
+from app.workflow.prompts.formatters.prompt_layout import (
+    join_prompt_sections,
+    sort_schemas,
+)
 
 
 def create_plan_query_prompt(
@@ -82,29 +90,34 @@ def format_plan_query_input(
     retry_count: int = 0,
     previous_sql_queries: list | None = None,
     validation_result: str | None = None,
+    expand_schemas: bool = False,
 ) -> dict:
-    input_str = f"❓ USER QUERY: {user_query}\n"
-
-    if retry_count > 0:
-        input_str += f"🔄 RETRY ATTEMPT: {retry_count}/3\n"
-
-    if validation_result:
-        input_str += f"\n\n🔄 VALIDATION RESULT:\n{validation_result}"
+    datasets_str = ""
+    column_values_str = ""
 
     if datasets_info:
-        schemas = datasets_info.get("schemas", [])
+        schemas = sort_schemas(datasets_info.get("schemas", []))
+        required_columns = get_required_columns(datasets_info)
         if schemas:
-            input_str += f"\n📊 AVAILABLE DATASETS ({len(schemas)}):\n"
+            datasets_str += f"📊 AVAILABLE DATASETS ({len(schemas)}):\n"
             for i, schema in enumerate(schemas, 1):
-                input_str += f"\n--- Dataset {i} ---\n"
-                input_str += schema.format_for_prompt()
+                columns = None
+                if not expand_schemas:
+                    columns = prune_columns(
+                        schema,
+                        user_query,
+                        required_columns.get(schema.dataset_name, ()),
+                        previous_sql_queries or (),
+                    )
+                datasets_str += f"\n--- Dataset {i} ---\n"
+                datasets_str += schema.format_for_prompt(columns=columns)
 
         column_requirements = datasets_info.get("correct_column_requirements")
         if column_requirements:
-            input_str += "\n🔍 VERIFIED COLUMN VALUES:\n"
+            column_values_str += "🔍 VERIFIED COLUMN VALUES:\n"
             datasets_analysis = column_requirements.datasets
-            for dataset_name, analysis in datasets_analysis.items():
-                input_str += f"\nDataset: {dataset_name}\n"
+            for dataset_name, analysis in sorted(datasets_analysis.items()):
+                column_values_str += f"\nDataset: {dataset_name}\n"
                 for col_analysis in analysis.columns_analyzed:
                     col_name = col_analysis.column_name
                     verified_values = col_analysis.verified_values
@@ -118,12 +131,14 @@ def format_plan_query_input(
 
                         if exact_vals:
                             escaped_vals = [escape_value(val) for val in exact_vals]
-                            input_str += (
+                            column_values_str += (
                                 f"- {col_name} (exact matches): {', '.join(escaped_vals)}\n"
                             )
                         if not_found_vals:
                             escaped_vals = [escape_value(val) for val in not_found_vals]
-                            input_str += f"- {col_name} (not found): {', '.join(escaped_vals)}\n"
+                            column_values_str += (
+                                f"- {col_name} (not found): {', '.join(escaped_vals)}\n"
+                            )
 
                     if suggested_alternatives:
                         for suggestion in suggested_alternatives:
@@ -131,19 +146,36 @@ def format_plan_query_input(
                                 escaped_vals = [
                                     escape_value(val) for val in suggestion.similar_values
                                 ]
-                                input_str += f"- {col_name} (alternatives for '{suggestion.requested_value}'): {', '.join(escaped_vals)}\n"
+                                column_values_str += f"- {col_name} (alternatives for '{suggestion.requested_value}'): {', '.join(escaped_vals)}\n"
                             else:
-                                input_str += f"- {col_name} (no alternatives found for '{suggestion.requested_value}')\n"
+                                column_values_str += f"- {col_name} (no alternatives found for '{suggestion.requested_value}')\n"
 
+    validation_str = f"🔄 VALIDATION RESULT:\n{validation_result}" if validation_result else ""
+
+    errors_str = ""
     if error_messages and retry_count > 0:
-        input_str += "\n⚠️ PREVIOUS ERRORS:\n"
+        errors_str += "⚠️ PREVIOUS ERRORS:\n"
         for error in error_messages:
             for error_type, error_msg in error.items():
-                input_str += f"- {error_type}: {error_msg}\n"
+                errors_str += f"- {error_type}: {error_msg}\n"
 
+    previous_queries_str = ""
     if previous_sql_queries:
-        input_str += "\n📝 PREVIOUS QUERIES:\n"
+        previous_queries_str += "📝 PREVIOUS QUERIES:\n"
         for sql_query in previous_sql_queries:
-            input_str += f"- {sql_query}\n"
+            previous_queries_str += f"- {sql_query}\n"
 
+    query_str = ""
+    if retry_count > 0:
+        query_str += f"🔄 RETRY ATTEMPT: {retry_count}/3\n"
+    query_str += f"❓ USER QUERY: {user_query}"
+
+    input_str = join_prompt_sections(
+        datasets_str,
+        column_values_str,
+        validation_str,
+        errors_str,
+        previous_queries_str,
+        query_str,
+    )
     return {"input": input_str}
@@ -84,6 +84,6 @@ QUALITY STANDARDS:
 
 def format_sql_planning_input(user_query: str, dataset_info: str) -> dict:
     formatted_input = (
-        f"USER QUERY: {user_query}\n\nAVAILABLE DATASETS AND SCHEMAS:\n{dataset_info}\n"
+        f"AVAILABLE DATASETS AND SCHEMAS:\n{dataset_info}\n\nUSER QUERY: {user_query}\n"
     )
     return {"input": formatted_input}
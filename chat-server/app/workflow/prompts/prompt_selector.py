@@ -63,6 +63,14 @@ NodeName = Literal[
 
 
 class PromptSelector:
+    """
+    Maps node names to their prompt builders and input formatters.
+
+    Prompts are laid out for provider prompt caching: static system instructions
+    first, then dataset schemas in a stable order, then the request-specific
+    parts with the user query last (see `join_prompt_sections`).
+    """
+
     def __init__(self):
         """
         Sets up dictionaries that associate node names with their corresponding prompt generation and input formatting functions, enabling dynamic retrieval and formatting of prompts for various query processing tasks.
@@ -9,6 +9,7 @@ from app.models.schema import DatasetSchema
 from app.workflow.prompts.formatters.format_query_result import (
     format_query_result,
 )
+from app.workflow.prompts.formatters.prompt_layout import join_prompt_sections
 
 
 def create_process_query_prompt(
@@ -84,7 +85,8 @@ def format_process_query_input(
     Format user query, dataset information, and sample data for prompt input.
 
     Combines user query, dataset schema, sample data, and optional context (previous results
-    and validation) into a structured prompt string for language model processing.
+    and validation) into a structured prompt string for language model processing. The
+    dataset comes first and the user query last so the prompt prefix can be cached.
 
     Args:
         user_query (str): The user's question to be answered
@@ -101,25 +103,31 @@ def format_process_query_input(
     """
     formatted_schema = dataset_schema.format_for_prompt()
 
-    input_str = f"""❓ USER QUERY: {user_query}
-
-📊 DATASET INFORMATION:
+    dataset_str = f"""📊 DATASET INFORMATION:
 {formatted_schema}
 
 📄 SAMPLE DATA ({dataset_name}):
 {rows_csv}"""
 
-    if validation_result:
-        input_str += f"\n\n🔄 VALIDATION RESULT:\n{validation_result}"
+    validation_str = f"🔄 VALIDATION RESULT:\n{validation_result}" if validation_result else ""
 
+    prev_result_str = ""
     if prev_query_result:
         formatted_prev_result = format_query_result(prev_query_result)
-        input_str += f"\n\n🔄 PREVIOUS QUERY CONTEXT:\n{formatted_prev_result}"
+        prev_result_str = f"🔄 PREVIOUS QUERY CONTEXT:\n{formatted_prev_result}"
 
+    previous_queries_str = ""
     if previous_sql_queries:
-        input_str += "\n--- PREVIOUS SQL QUERIES ---\n"
-        input_str += "Previous SQL queries:"
+        previous_queries_str += "--- PREVIOUS SQL QUERIES ---\n"
+        previous_queries_str += "Previous SQL queries:"
         for sql_query in previous_sql_queries:
-            input_str += f"- {sql_query}\n"
-
+            previous_queries_str += f"- {sql_query}\n"
+
+    input_str = join_prompt_sections(
+        dataset_str,
+        prev_result_str,
+        validation_str,
+        previous_queries_str,
+        f"❓ USER QUERY: {user_query}",
+    )
     return {"input": input_str}
@@ -0,0 +1,98 @@
+"""
+Benchmark for admission control under overload: latency of completed requests
+when a burst arrives at twice the rate the upstreams can serve, with every request
+let in against a bounded concurrency with a short queue.
+
+The upstream (LLM, SQL, sandbox) is modelled as processor sharing: each request
+needs a fixed amount of work, and everything in flight slows down together once
+more than CAPACITY requests run at once.
+
+Run from the chat-server directory:
+
+    python -m tests.benchmarks.bench_admission
+"""
+
+import asyncio
+import logging
+import random
+import statistics
+import time
+
+from app.core import admission
+from app.core.admission import AdmissionController, AdmissionRejectedError
+from app.core.log import logger
+
+CAPACITY = 8
+STEPS = 10
+STEP_SECONDS = 0.005
+ARRIVAL_RATE = 2 * CAPACITY / (STEPS * STEP_SECONDS)
+DURATION_SECONDS = 1.5
+TENANTS = ["project-a", "project-b", "project-c", "project-d"]
+
+
+class Upstream:
+    def __init__(self):
+        self.in_flight = 0
+
+    async def call(self) -> None:
+        self.in_flight += 1
+        try:
+            for _ in range(STEPS):
+                await asyncio.sleep(STEP_SECONDS * max(1.0, self.in_flight / CAPACITY))
+        finally:
+            self.in_flight -= 1
+
+
+async def handle(upstream: Upstream, tenant: str, latencies: list[float], rejected: list[int]):
+    start = time.perf_counter()
+    try:
+        slot = await AdmissionController.acquire(tenant)
+    except AdmissionRejectedError:
+        rejected.append(1)
+        return
+    try:
+        await upstream.call()
+    finally:
+        slot.release()
+    latencies.append(time.perf_counter() - start)
+
+
+async def run(enabled: bool) -> tuple[list[float], int]:
+    AdmissionController.reset()
+    settings = admission.settings
+    settings.ADMISSION_CONTROL_ENABLED = enabled
+    settings.ADMISSION_MAX_CONCURRENT_REQUESTS = CAPACITY
+    settings.ADMISSION_MAX_CONCURRENT_REQUESTS_PER_TENANT = CAPACITY // 2
+    settings.ADMISSION_QUEUE_SIZE = CAPACITY
+    settings.ADMISSION_QUEUE_TIMEOUT_SECONDS = 0.1
+
+    random.seed(0)
+    upstream = Upstream()
+    latencies: list[float] = []
+    rejected: list[int] = []
+    tasks = []
+    deadline = time.perf_counter() + DURATION_SECONDS
+    while time.perf_counter() < deadline:
+        tenant = random.choice(TENANTS)
+        tasks.append(asyncio.create_task(handle(upstream, tenant, latencies, rejected)))
+        await asyncio.sleep(random.expovariate(ARRIVAL_RATE))
+    await asyncio.gather(*tasks)
+    return latencies, len(rejected)
+
+
+def percentile(values: list[float], p: float) -> float:
+    return statistics.quantiles(values, n=100)[int(p) - 1] * 1e3
+
+
+async def main() -> None:
+    logger.setLevel(logging.ERROR)
+    for label, enabled in (("unbounded", False), ("admission", True)):
+        latencies, rejected = await run(enabled)
+        print(
+            f"{label:10s} completed {len(latencies):4d}   rejected {rejected:4d}   "
+            f"p50 {percentile(latencies, 50):7.1f} ms   p99 {percentile(latencies, 99):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark for the non-streaming completion path: building a ChatCompletion from a
+response's events through per-event ChatCompletionChunk models and string
+concatenation, against aggregating the raw events into list buffers.
+
+Run from the chat-server directory:
+
+    python -m tests.benchmarks.bench_chat_completion
+"""
+
+import asyncio
+import time
+
+from openai.types.chat.chat_completion_message_tool_call import (
+    ChatCompletionMessageToolCall,
+    Function,
+)
+
+from app.models.chat import EventChunkData, ExtraData, Role
+from app.utils.adapters.openai.output import OpenAIOutputAdapter
+from tests.benchmarks.bench_sse_encoder import pydantic_chunk
+
+REQUESTS = 200
+TOKENS = 800
+
+EVENTS = [
+    EventChunkData(role=Role.INTERMEDIATE, content="Planning query...", category=None),
+    EventChunkData(
+        role=Role.INTERMEDIATE,
+        content="SQL queries executed",
+        category=None,
+        extra_data=ExtraData(name="sql_queries", args={"queries": ["SELECT 1"]}),
+    ),
+    *(
+        EventChunkData(role=Role.AI, content=f" token{index}", category=None)
+        for index in range(TOKENS)
+    ),
+]
+
+
+async def events():
+    for event in EVENTS:
+        yield event
+
+
+async def per_chunk_completion(adapter: OpenAIOutputAdapter) -> None:
+    # The previous implementation: a ResponseChunk per event, then `+=` on content.
+    content = ""
+    tool_calls = []
+    async for event in events():
+        chunk = pydantic_chunk(adapter, event)
+        if not chunk:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content += delta.content
+        for tool_call in delta.tool_calls or []:
+            tool_calls.append(
+                ChatCompletionMessageToolCall(
+                    id=tool_call.id,
+                    type="function",
+                    function=Function(
+                        name=tool_call.function.name, arguments=tool_call.function.arguments
+                    ),
+                )
+            )
+
+
+async def aggregated_completion(adapter: OpenAIOutputAdapter) -> None:
+    await adapter.create_chat_completion(events())
+
+
+async def measure(complete) -> float:
+    start = time.process_time()
+    for _ in range(REQUESTS):
+        await complete(OpenAIOutputAdapter(chat_id="bench", trace_id="bench-trace"))
+    return (time.process_time() - start) / REQUESTS * 1e3
+
+
+async def main() -> None:
+    before = await measure(per_chunk_completion)
+    after = await measure(aggregated_completion)
+    print(
+        f"CPU per completion ({TOKENS} tokens)   before {before:7.3f} ms   after {after:7.3f} ms   "
+        f"speedup {before / after:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
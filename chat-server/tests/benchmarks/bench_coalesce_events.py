@@ -0,0 +1,67 @@
+"""
+Benchmark for token coalescing in the streaming response: SSE frames (one write
+each) and bytes on the wire per response with and without coalesce_event_chunks.
+
+Tokens arrive the way a streamed LLM response does: a few tokens per network
+read with short gaps in between, plus intermediate messages between answers.
+
+Run from the chat-server directory:
+
+    python -m tests.benchmarks.bench_coalesce_events
+"""
+
+import asyncio
+import time
+
+from app.models.chat import EventChunkData, Role
+from app.utils.adapters.openai.output import OpenAIOutputAdapter
+from app.workflow.events.coalesce_events import coalesce_event_chunks
+
+TOKENS = 600
+TOKENS_PER_READ = 3
+READ_INTERVAL_SECONDS = 0.004
+WINDOW_SECONDS = 0.02
+MAX_BYTES = 1024
+
+
+async def llm_response():
+    yield EventChunkData(role=Role.INTERMEDIATE, content="Planning query...", category=None)
+    for index in range(TOKENS):
+        if index % TOKENS_PER_READ == 0:
+            await asyncio.sleep(READ_INTERVAL_SECONDS)
+        if index == TOKENS // 2:
+            yield EventChunkData(role=Role.INTERMEDIATE, content="Running SQL", category="sql")
+        yield EventChunkData(role=Role.AI, content=f" token{index}", category=None)
+
+
+async def measure(window_seconds: float) -> tuple[int, int, float]:
+    adapter = OpenAIOutputAdapter(chat_id="bench", trace_id="bench-trace")
+    event_chunks = coalesce_event_chunks(llm_response(), window_seconds, MAX_BYTES)
+
+    frames = 0
+    wire_bytes = 0
+    start = time.perf_counter()
+    async for frame in adapter.create_chat_completion_stream(event_chunks):
+        frames += 1
+        wire_bytes += len(frame.encode())
+    return frames, wire_bytes, time.perf_counter() - start
+
+
+async def main() -> None:
+    before_frames, before_bytes, before_seconds = await measure(0)
+    after_frames, after_bytes, after_seconds = await measure(WINDOW_SECONDS)
+
+    print(f"window {WINDOW_SECONDS * 1000:.0f} ms / {MAX_BYTES} bytes, {TOKENS} tokens")
+    print(
+        f"SSE frames per response    before {before_frames:8d}   after {after_frames:8d}   "
+        f"reduction {before_frames / after_frames:5.1f}x"
+    )
+    print(
+        f"bytes per response         before {before_bytes:8d}   after {after_bytes:8d}   "
+        f"reduction {before_bytes / after_bytes:5.1f}x"
+    )
+    print(f"stream duration            before {before_seconds:8.3f}s  after {after_seconds:8.3f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
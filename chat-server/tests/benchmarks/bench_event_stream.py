@@ -0,0 +1,165 @@
+"""
+Benchmark for the graph event stream: events produced and CPU time per request
+with the full astream_events v2 stream and with the STREAMED_EVENT_TYPES filter.
+
+The graph mirrors the shape of a multi-dataset request (subgraph, prompt | LLM |
+parser chains, a tool call, custom events and a streamed answer) with fake models
+so only the streaming overhead is measured.
+
+Run from the chat-server directory:
+
+    python -m tests.benchmarks.bench_event_stream
+"""
+
+import asyncio
+import time
+from typing import TypedDict
+
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.language_models.fake_chat_models import (
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+
+from app.models.chat import Role
+from app.workflow.events.event_utils import configure_node, emit_message
+from app.workflow.events.handle_events_stream import (
+    STREAMED_EVENT_TYPES,
+    EventStreamHandler,
+)
+
+REQUESTS = 30
+SUBQUERIES = 3
+ANSWER = "The total revenue grew by twelve percent year over year across all regions. " * 8
+
+
+class State(TypedDict):
+    query: str
+    answer: str
+
+
+prompt = ChatPromptTemplate.from_messages([("system", "You plan SQL."), ("human", "{query}")])
+
+
+def llm_chain(text: str):
+    return (
+        prompt | GenericFakeChatModel(messages=iter([AIMessage(content=text)])) | StrOutputParser()
+    )
+
+
+@tool
+def execute_sql_query(sql: str) -> str:
+    """Execute a SQL query."""
+    return '[{"total": 42}]'
+
+
+@configure_node(role="intermediate", progress_message="Planning query...")
+async def plan_query(state: State, config: RunnableConfig) -> dict:
+    sql = await llm_chain("SELECT SUM(revenue) FROM sales GROUP BY region").ainvoke(
+        {"query": state["query"]}, config
+    )
+    await adispatch_custom_event(
+        "gopie-agent", {"content": "Planned", "name": "plan", "values": {}}
+    )
+    result = await execute_sql_query.ainvoke(
+        {"sql": sql},
+        {**config, "metadata": {"tool_text": "Running SQL", "should_display_tool": True}},
+    )
+    return {"answer": result}
+
+
+@configure_node(role="intermediate", progress_message="Validating result...")
+async def validate_result(state: State, config: RunnableConfig) -> dict:
+    await llm_chain('{"is_valid": true}').ainvoke({"query": state["answer"]}, config)
+    await emit_message("Result looks good", Role.INTERMEDIATE)
+    return {}
+
+
+def build_subgraph():
+    graph = StateGraph(State)
+    graph.add_node("plan_query", plan_query)
+    graph.add_node("validate_result", validate_result)
+    graph.add_edge(START, "plan_query")
+    graph.add_edge("plan_query", "validate_result")
+    graph.add_edge("validate_result", END)
+    return graph.compile()
+
+
+@configure_node(role="ai", progress_message="")
+async def generate_result(state: State, config: RunnableConfig) -> dict:
+    answer = await llm_chain(ANSWER).ainvoke({"query": state["query"]}, config)
+    return {"answer": answer}
+
+
+def build_graph():
+    graph = StateGraph(State)
+    graph.add_node("process_context", lambda state: {"query": state["query"].strip()})
+    for index in range(SUBQUERIES):
+        graph.add_node(f"subquery_{index}", build_subgraph())
+    graph.add_node("generate_result", generate_result)
+
+    previous = "process_context"
+    graph.add_edge(START, previous)
+    for index in range(SUBQUERIES):
+        graph.add_edge(previous, f"subquery_{index}")
+        previous = f"subquery_{index}"
+    graph.add_edge(previous, "generate_result")
+    graph.add_edge("generate_result", END)
+    return graph.compile()
+
+
+async def run_request(graph, include_types: list[str] | None) -> tuple[int, list]:
+    handler = EventStreamHandler()
+    events = 0
+    chunks = []
+    async for event in graph.astream_events(
+        {"query": " revenue by region ", "answer": ""},
+        subgraphs=True,
+        version="v2",
+        include_types=include_types,
+    ):
+        events += 1
+        chunk = handler.handle_events_stream(event)
+        if chunk.role:
+            chunks.append(chunk)
+    return events, chunks
+
+
+async def measure(graph, include_types: list[str] | None) -> tuple[float, float, list]:
+    await run_request(graph, include_types)  # warm up
+
+    total_events = 0
+    chunks = []
+    start = time.process_time()
+    for _ in range(REQUESTS):
+        events, chunks = await run_request(graph, include_types)
+        total_events += events
+    cpu_ms = (time.process_time() - start) / REQUESTS * 1e3
+    return total_events / REQUESTS, cpu_ms, chunks
+
+
+async def main() -> None:
+    graph = build_graph()
+    before_events, before_cpu, before_chunks = await measure(graph, None)
+    after_events, after_cpu, after_chunks = await measure(graph, STREAMED_EVENT_TYPES)
+
+    assert before_chunks == after_chunks, "filtered stream must yield the same client chunks"
+
+    print(f"client chunks per request   {len(after_chunks)}")
+    print(
+        f"events per request          before {before_events:7.0f}   after {after_events:7.0f}   "
+        f"reduction {before_events / after_events:5.1f}x"
+    )
+    print(
+        f"CPU per request             before {before_cpu:7.2f} ms   after {after_cpu:7.2f} ms   "
+        f"speedup {before_cpu / after_cpu:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
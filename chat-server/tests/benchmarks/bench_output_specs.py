@@ -0,0 +1,66 @@
+"""
+Microbenchmark for per-node LLM setup overhead: tool binding and structured-output
+schema compilation, with and without the cached specs.
+
+Run from the chat-server directory:
+
+    python -m tests.benchmarks.bench_output_specs
+"""
+
+import timeit
+
+from langchain_openai import ChatOpenAI
+
+from app.tool_utils.tools import ToolNames, get_tool
+from app.utils.model_registry.output_specs import (
+    bind_structured_output,
+    bind_tool_specs,
+)
+from app.workflow.agent.node.context_processor import ProcessContextOutput
+from app.workflow.graph.multi_dataset_graph.node.identify_datasets import (
+    IdentifyDatasetsOutput,
+)
+from app.workflow.graph.multi_dataset_graph.node.plan_query import (
+    PlanQueryOutput,
+)
+
+ITERATIONS = 500
+TOOL_NAMES = [ToolNames.EXECUTE_SQL_QUERY, ToolNames.GET_TABLE_SCHEMA, ToolNames.PLAN_SQL_QUERY]
+SCHEMAS = [PlanQueryOutput, IdentifyDatasetsOutput, ProcessContextOutput]
+
+llm = ChatOpenAI(api_key="benchmark", model="gpt-4o")
+
+
+def uncached_tools():
+    # get_tool.__wrapped__ bypasses the cache: import lookup + signature conversion
+    tools = [get_tool.__wrapped__(tool_name)[1] for tool_name in TOOL_NAMES]
+    llm.bind_tools(tools)
+
+
+def cached_tools():
+    bind_tool_specs(llm, TOOL_NAMES)
+
+
+def uncached_schemas():
+    for schema in SCHEMAS:
+        llm.with_structured_output(schema=schema, method="json_schema")
+
+
+def cached_schemas():
+    for schema in SCHEMAS:
+        bind_structured_output(llm, schema, llm.model_name)
+
+
+def report(name: str, before, after) -> None:
+    after()  # compile once, as done at startup / on first request
+    before_us = timeit.timeit(before, number=ITERATIONS) / ITERATIONS * 1e6
+    after_us = timeit.timeit(after, number=ITERATIONS) / ITERATIONS * 1e6
+    print(
+        f"{name:<28} before {before_us:9.1f} us/call   after {after_us:9.1f} us/call   "
+        f"speedup {before_us / after_us:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    report(f"bind {len(TOOL_NAMES)} tools", uncached_tools, cached_tools)
+    report(f"structured output x{len(SCHEMAS)}", uncached_schemas, cached_schemas)
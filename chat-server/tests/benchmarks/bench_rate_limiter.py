@@ -0,0 +1,92 @@
+"""
+Benchmark for client-side LLM rate limiting: a burst of chat completion calls
+against a provider that answers 429 to anything beyond its requests-per-minute
+limit, with and without the rate limiter in front of it.
+
+The provider is scaled down to a one second window so the benchmark runs quickly.
+
+Run from the chat-server directory:
+
+    python -m tests.benchmarks.bench_rate_limiter
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+from app.core.log import logger
+from app.utils.model_registry import rate_limiter
+from app.utils.model_registry.rate_limiter import (
+    RateLimitedTransport,
+    RateLimiter,
+)
+
+PROVIDER_LIMIT = 20
+WINDOW_SECONDS = 1.0
+BURST = 60
+
+
+class Provider:
+    """
+    Fixed-window limiter of PROVIDER_LIMIT requests per WINDOW_SECONDS.
+    """
+
+    def __init__(self):
+        self.window_start = time.monotonic()
+        self.count = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        now = time.monotonic()
+        if now - self.window_start >= WINDOW_SECONDS:
+            self.window_start, self.count = now, 0
+        if self.count >= PROVIDER_LIMIT:
+            retry_after = WINDOW_SECONDS - (now - self.window_start)
+            return httpx.Response(429, headers={"retry-after-ms": str(int(retry_after * 1000))})
+        self.count += 1
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={})
+
+
+async def call(client: httpx.AsyncClient, latencies: list[float]) -> bool:
+    start = time.perf_counter()
+    response = await client.post(
+        "/chat/completions",
+        json={"model": "gpt-4o", "messages": [{"role": "user", "content": "total sales"}]},
+    )
+    latencies.append(time.perf_counter() - start)
+    return response.status_code == 200
+
+
+async def run(enabled: bool) -> tuple[int, list[float]]:
+    RateLimiter.reset()
+    settings = rate_limiter.settings
+    # Stay just under the provider's limit, as a configured limit would.
+    settings.LLM_RATE_LIMIT_RPM = int(PROVIDER_LIMIT * 0.9 * 60 / WINDOW_SECONDS) if enabled else 0
+    settings.LLM_RATE_LIMIT_BURST_SECONDS = WINDOW_SECONDS / 2
+
+    provider = Provider()
+    latencies: list[float] = []
+    async with httpx.AsyncClient(
+        transport=RateLimitedTransport("gateway", httpx.MockTransport(provider.handle)),
+        base_url="https://gateway.example.com",
+    ) as client:
+        results = await asyncio.gather(*(call(client, latencies) for _ in range(BURST)))
+    return sum(results), latencies
+
+
+async def main() -> None:
+    logger.setLevel(logging.ERROR)
+    for label, enabled in (("unlimited", False), ("rate limit", True)):
+        succeeded, latencies = await run(enabled)
+        print(
+            f"{label:10s} succeeded {succeeded:3d}/{BURST}   "
+            f"p50 {statistics.median(latencies) * 1e3:7.1f} ms   "
+            f"max {max(latencies) * 1e3:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark for the chat history sliding window: time to window a long history
+that is resent with every request, with the previous per-call character
+estimate and front-inserting loop vs the configured tokenizer, on the first
+request (cold counts) and on the following ones (cached counts).
+
+Uses tiktoken when its encoding can be loaded, the character heuristic otherwise.
+
+Run from the chat-server directory:
+
+    python -m tests.benchmarks.bench_sliding_window
+"""
+
+import logging
+import time
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from app.core.log import logger
+from app.utils.chat_history.sliding_window import apply_sliding_window
+from app.utils.model_registry.token_counter import TokenCounter
+
+HISTORY_LENGTHS = (100, 1000, 5000)
+REQUESTS = 20
+
+
+def previous_estimate_tokens(message: BaseMessage) -> int:
+    content = str(message.content) if message.content else ""
+    return len(content) // 4 + 5
+
+
+def previous_sliding_window(
+    chat_history: list[BaseMessage], min_messages: int, max_tokens: int
+) -> list[BaseMessage]:
+    if len(chat_history) <= min_messages:
+        return chat_history
+    if sum(previous_estimate_tokens(msg) for msg in chat_history) <= max_tokens:
+        return chat_history
+
+    total_messages = len(chat_history)
+    filtered_messages = []
+    current_tokens = 0
+    for i in range(total_messages - 1, max(total_messages - min_messages - 1, -1), -1):
+        filtered_messages.insert(0, chat_history[i])
+        current_tokens += previous_estimate_tokens(chat_history[i])
+    if current_tokens <= max_tokens:
+        for i in range(total_messages - min_messages - 1, -1, -1):
+            msg_tokens = previous_estimate_tokens(chat_history[i])
+            if current_tokens + msg_tokens <= max_tokens:
+                filtered_messages.insert(0, chat_history[i])
+                current_tokens += msg_tokens
+            else:
+                break
+    return filtered_messages
+
+
+def make_history(length: int) -> list[BaseMessage]:
+    return [
+        HumanMessage(content=f"राज्यवार कुल बिक्री {i} " * 5)
+        if i % 2 == 0
+        else AIMessage(content=f"Here are the total sales by state for request {i}. " * 10)
+        for i in range(length)
+    ]
+
+
+def timed(window, history: list[BaseMessage], max_tokens: int, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        window(history, 10, max_tokens)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    logger.setLevel(logging.ERROR)
+    print(f"tokenizer: {TokenCounter.get_tokenizer().name}")
+    for length in HISTORY_LENGTHS:
+        history = make_history(length)
+        # Keep roughly half the history so the window walks many messages.
+        max_tokens = length * 40
+        previous = timed(previous_sliding_window, history, max_tokens, REQUESTS)
+        cold = timed(apply_sliding_window, history, max_tokens, 1)
+        cached = timed(apply_sliding_window, history, max_tokens, REQUESTS)
+        print(
+            f"{length:5d} messages   previous {previous * 1e3:8.2f} ms   "
+            f"cold {cold * 1e3:8.2f} ms   cached {cached * 1e3:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Throughput benchmark for SSE encoding of streamed chat completion chunks: the
+pydantic ChatCompletionChunk + model_dump_json path against the pre-serialized
+ChatCompletionChunkEncoder templates.
+
+Run from the chat-server directory:
+
+    python -m tests.benchmarks.bench_sse_encoder
+"""
+
+import time
+
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
+
+from app.models.chat import EventChunkData, ExtraData, Role
+from app.utils.adapters.openai.output import OpenAIOutputAdapter
+
+CHUNKS = 50_000
+
+TOKENS = [
+    EventChunkData(role=Role.AI, content=token, category=None)
+    for token in 'The total revenue grew by 12% year over year, led by the "North" region.'.split()
+]
+INTERMEDIATE = [
+    EventChunkData(role=Role.INTERMEDIATE, content="Running SQL on sales", category="sql"),
+    EventChunkData(
+        role=Role.INTERMEDIATE,
+        content="SQL queries executed",
+        category=None,
+        extra_data=ExtraData(name="sql_queries", args={"queries": ["SELECT 1"]}),
+    ),
+]
+
+
+def pydantic_chunk(
+    adapter: OpenAIOutputAdapter, event: EventChunkData
+) -> ChatCompletionChunk | None:
+    """
+    The chunk the adapter built for an event before the encoder: a pydantic model
+    per event, serialized with model_dump_json.
+    """
+    if adapter.is_tool_call(event):
+        tool_call_function = adapter.get_tool_call_function(event)
+        if not tool_call_function:
+            return None
+        name, arguments = tool_call_function
+        tool_call = ChoiceDeltaToolCall(
+            id=f"call_{adapter.tool_calls_count}",
+            index=adapter.tool_calls_count,
+            type="function",
+            function=ChoiceDeltaToolCallFunction(name=name, arguments=arguments),
+        )
+        adapter.tool_calls_count += 1
+        delta = ChoiceDelta(tool_calls=[tool_call])
+    else:
+        delta = ChoiceDelta(content=event.content)
+        if adapter.first_chunk:
+            adapter.first_chunk = False
+            delta.role = "assistant"
+    return ChatCompletionChunk(
+        id=adapter.trace_id,
+        object="chat.completion.chunk",
+        created=adapter.created,
+        model=adapter.model,
+        choices=[Choice(index=0, delta=delta, finish_reason=None)],
+    )
+
+
+def pydantic_frames(events: list[EventChunkData]) -> None:
+    adapter = OpenAIOutputAdapter(chat_id="bench", trace_id="bench-trace")
+    for event in events:
+        chunk = pydantic_chunk(adapter, event)
+        if chunk:
+            f"data: {chunk.model_dump_json(exclude_defaults=True)}\n\n"
+
+
+def encoder_frames(events: list[EventChunkData]) -> None:
+    adapter = OpenAIOutputAdapter(chat_id="bench", trace_id="bench-trace")
+    for event in events:
+        adapter.event_to_sse(event)
+
+
+def report(name: str, events: list[EventChunkData]) -> None:
+    events = (events * (CHUNKS // len(events) + 1))[:CHUNKS]
+    results = []
+    for encode in (pydantic_frames, encoder_frames):
+        start = time.perf_counter()
+        encode(events)
+        results.append(CHUNKS / (time.perf_counter() - start))
+    before, after = results
+    print(
+        f"{name:<22} before {before:11,.0f} chunks/s   after {after:11,.0f} chunks/s   "
+        f"speedup {after / before:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    report("content tokens", TOKENS)
+    report("intermediate messages", INTERMEDIATE)
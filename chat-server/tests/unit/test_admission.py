@@ -0,0 +1,155 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1.routers import query
+from app.core import admission
+from app.core.admission import AdmissionController, AdmissionRejectedError
+
+
+@pytest.fixture(autouse=True)
+def admission_settings():
+    AdmissionController.reset()
+    with patch.object(admission, "settings") as mock_settings:
+        mock_settings.ADMISSION_CONTROL_ENABLED = True
+        mock_settings.ADMISSION_MAX_CONCURRENT_REQUESTS = 2
+        mock_settings.ADMISSION_MAX_CONCURRENT_REQUESTS_PER_TENANT = 1
+        mock_settings.ADMISSION_QUEUE_SIZE = 2
+        mock_settings.ADMISSION_QUEUE_TIMEOUT_SECONDS = 1
+        yield mock_settings
+    AdmissionController.reset()
+
+
+class TestAdmissionController:
+    async def test_queued_request_admitted_on_release(self):
+        """
+        Test that a request over the limit waits and is admitted when a slot frees up.
+        """
+        first = await AdmissionController.acquire("a")
+        waiting = asyncio.create_task(AdmissionController.acquire("a"))
+        await asyncio.sleep(0)
+
+        assert AdmissionController.get_stats()["queue_depth"] == 1
+        assert not waiting.done()
+
+        first.release()
+        second = await waiting
+
+        assert second.tenant == "a"
+        assert AdmissionController.get_stats()["active"] == 1
+        assert AdmissionController.get_stats()["queue_depth"] == 0
+
+    async def test_tenant_limit_does_not_block_other_tenants(self):
+        """
+        Test that a tenant at its limit does not hold up requests of other tenants.
+        """
+        await AdmissionController.acquire("a")
+        waiting = asyncio.create_task(AdmissionController.acquire("a"))
+        await asyncio.sleep(0)
+
+        other = await asyncio.wait_for(AdmissionController.acquire("b"), 0.1)
+
+        assert other.tenant == "b"
+        assert not waiting.done()
+        waiting.cancel()
+
+    async def test_full_queue_rejected(self, admission_settings):
+        """
+        Test that a full queue is rejected at once: 429 for a tenant at its limit, else 503.
+        """
+        admission_settings.ADMISSION_QUEUE_SIZE = 0
+        await AdmissionController.acquire("a")
+        await AdmissionController.acquire("b")
+
+        with pytest.raises(AdmissionRejectedError) as tenant_error:
+            await AdmissionController.acquire("a")
+        with pytest.raises(AdmissionRejectedError) as server_error:
+            await AdmissionController.acquire("c")
+
+        assert tenant_error.value.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert server_error.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert server_error.value.retry_after >= 1
+        assert AdmissionController.get_stats()["rejected_queue_full"] == 2
+
+    async def test_queue_timeout_rejected(self, admission_settings):
+        """
+        Test that a request waiting longer than the queue timeout is rejected and dequeued.
+        """
+        admission_settings.ADMISSION_QUEUE_TIMEOUT_SECONDS = 0.01
+        await AdmissionController.acquire("a")
+        await AdmissionController.acquire("b")
+
+        with pytest.raises(AdmissionRejectedError) as error:
+            await AdmissionController.acquire("c")
+
+        stats = AdmissionController.get_stats()
+        assert error.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert stats["queue_depth"] == 0
+        assert stats["rejected_timeout"] == 1
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """
+        Test that a client going away while queued frees its place in the queue.
+        """
+        await AdmissionController.acquire("a")
+        waiting = asyncio.create_task(AdmissionController.acquire("a"))
+        await asyncio.sleep(0)
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+        assert AdmissionController.get_stats()["queue_depth"] == 0
+
+    async def test_release_is_idempotent(self):
+        """
+        Test that releasing a slot twice frees it once.
+        """
+        slot = await AdmissionController.acquire("a")
+        slot.release()
+        slot.release()
+
+        assert AdmissionController.get_stats()["active"] == 0
+
+    async def test_disabled_admission_control(self, admission_settings):
+        """
+        Test that ADMISSION_CONTROL_ENABLED=False admits everything untracked.
+        """
+        admission_settings.ADMISSION_CONTROL_ENABLED = False
+
+        slots = [await AdmissionController.acquire("a") for _ in range(5)]
+        for slot in slots:
+            slot.release()
+
+        assert AdmissionController.get_stats()["active"] == 0
+
+
+class TestAdmissionResponses:
+    async def test_rejected_request_gets_retry_after(self, admission_settings):
+        """
+        Test that /chat/completions answers a rejected request with its status and Retry-After.
+        """
+        admission_settings.ADMISSION_QUEUE_SIZE = 0
+        admission_settings.ADMISSION_MAX_CONCURRENT_REQUESTS_PER_TENANT = 2
+        await AdmissionController.acquire("project")
+        await AdmissionController.acquire("other")
+
+        app = FastAPI()
+        app.include_router(query.router)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.post(
+                "/chat/completions",
+                json={
+                    "model": "gopie",
+                    "messages": [{"role": "user", "content": "total sales"}],
+                    "metadata": {"project_id": "project"},
+                },
+            )
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert int(response.headers["Retry-After"]) >= 1
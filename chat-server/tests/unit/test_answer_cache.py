@@ -0,0 +1,222 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.models.query import (
+    QueryResult,
+    SingleDatasetQueryResult,
+    SqlQueryInfo,
+)
+from app.utils.graph_utils.answer_cache import (
+    SemanticAnswerCache,
+    get_answer_scope,
+    is_cacheable,
+)
+from app.workflow.agent.node.answer_cache import (
+    replay_cached_answer,
+    store_cached_answer,
+)
+
+EMBEDDINGS = {
+    "top 5 states by gdp": [1.0, 0.0, 0.0],
+    "which 5 states have the highest gdp": [0.99, 0.1, 0.0],
+    "average rainfall in kerala": [0.0, 1.0, 0.0],
+}
+
+
+def make_query_result() -> QueryResult:
+    return QueryResult(
+        original_user_query="top 5 states by gdp",
+        execution_time=0,
+        timestamp=datetime.now(),
+        single_dataset_query_result=SingleDatasetQueryResult(
+            user_friendly_dataset_name="GDP",
+            dataset_name="gdp",
+            sql_results=[
+                SqlQueryInfo(
+                    sql_query="SELECT state, gdp FROM gdp ORDER BY gdp DESC LIMIT 5",
+                    explanation="Top 5 states",
+                    sql_query_result=[{"state": "MH", "gdp": 1}],
+                    full_sql_result=[{"state": "MH", "gdp": 1}],
+                )
+            ],
+            response_for_non_sql=None,
+            error=None,
+        ),
+    )
+
+
+@pytest.fixture(autouse=True)
+def answer_cache():
+    embeddings_model = Mock()
+    embeddings_model.aembed_query = AsyncMock(side_effect=lambda query: EMBEDDINGS[query])
+    model_provider = Mock()
+    model_provider.get_embeddings_model.return_value = embeddings_model
+
+    with patch(
+        "app.utils.graph_utils.answer_cache.get_model_provider", return_value=model_provider
+    ):
+        SemanticAnswerCache.invalidate()
+        SemanticAnswerCache.embeddings.clear()
+        SemanticAnswerCache.counters.clear()
+        yield SemanticAnswerCache
+        SemanticAnswerCache.invalidate()
+        SemanticAnswerCache.embeddings.clear()
+        SemanticAnswerCache.counters.clear()
+
+
+class TestSemanticAnswerCache:
+    scope = get_answer_scope(["ds1"], None)
+
+    async def store(self, answer_cache, query="top 5 states by gdp", version="v1"):
+        await answer_cache.store(
+            scope=self.scope,
+            version=version,
+            query=query,
+            query_result=make_query_result(),
+            project_ids={"p1"},
+            config={},
+        )
+
+    async def test_paraphrase_hits(self, answer_cache):
+        """
+        Test that a paraphrase above the similarity threshold returns the cached answer.
+        """
+        await self.store(answer_cache)
+
+        hit = await answer_cache.lookup(
+            self.scope, "v1", "which 5 states have the highest gdp", config={}
+        )
+
+        assert hit is not None
+        assert hit.query_result.single_dataset_query_result.sql_results[0].sql_query.startswith(
+            "SELECT state"
+        )
+
+    async def test_misses(self, answer_cache):
+        """
+        Test that dissimilar questions, other scopes and changed schema versions miss.
+        """
+        await self.store(answer_cache)
+
+        assert await answer_cache.lookup(self.scope, "v1", "average rainfall in kerala", {}) is None
+        assert await answer_cache.lookup(self.scope, "v2", "top 5 states by gdp", {}) is None
+        assert (
+            await answer_cache.lookup(
+                get_answer_scope(["ds2"], None), "v1", "top 5 states by gdp", {}
+            )
+            is None
+        )
+
+    async def test_invalidate_by_project(self, answer_cache):
+        """
+        Test that invalidating a project drops answers that used its datasets.
+        """
+        await self.store(answer_cache)
+
+        answer_cache.invalidate("other-project")
+        assert await answer_cache.lookup(self.scope, "v1", "top 5 states by gdp", {}) is not None
+
+        answer_cache.invalidate("p1")
+        assert await answer_cache.lookup(self.scope, "v1", "top 5 states by gdp", {}) is None
+
+    async def test_store_keeps_only_sql_when_reexecuting(self, answer_cache):
+        """
+        Test that results are dropped from stored answers when replay re-executes SQL.
+        """
+        with patch("app.utils.graph_utils.answer_cache.settings") as mock_settings:
+            mock_settings.SEMANTIC_ANSWER_CACHE_REEXECUTE = True
+            mock_settings.SEMANTIC_ANSWER_CACHE_MAX_ENTRIES_PER_SCOPE = 10
+            await self.store(answer_cache)
+
+        info = answer_cache.entries[self.scope][0].query_result.single_dataset_query_result
+        assert info.sql_results[0].full_sql_result is None
+
+    def test_failed_sql_not_cacheable(self):
+        """
+        Test that answers with failed SQL are not cached.
+        """
+        query_result = make_query_result()
+        assert is_cacheable(query_result) is True
+
+        query_result.single_dataset_query_result.sql_results[0].success = False
+        assert is_cacheable(query_result) is False
+
+
+class TestReplayCachedAnswer:
+    async def test_replay_reexecutes_sql(self):
+        """
+        Test that replaying a cached answer re-executes its SQL and builds datasets for the answer.
+        """
+        state = {
+            "user_query": "which 5 states have the highest gdp",
+            "cached_query_result": make_query_result(),
+            "datasets": [],
+            "messages": [],
+        }
+
+        with (
+            patch("app.workflow.agent.node.answer_cache.settings") as mock_settings,
+            patch(
+                "app.workflow.agent.node.answer_cache.execute_sql",
+                new=AsyncMock(return_value=[{"state": "KA", "gdp": 2}]),
+            ) as mock_execute_sql,
+            patch(
+                "app.workflow.agent.node.answer_cache.adispatch_custom_event", new=AsyncMock()
+            ) as mock_dispatch,
+        ):
+            mock_settings.SEMANTIC_ANSWER_CACHE_REEXECUTE = True
+            result = await replay_cached_answer(state, {})
+
+        mock_execute_sql.assert_awaited_once()
+        mock_dispatch.assert_awaited_once()
+        query_result = result["query_result"]
+        assert query_result.original_user_query == "which 5 states have the highest gdp"
+        assert query_result.single_dataset_query_result.sql_results[0].full_sql_result == [
+            {"state": "KA", "gdp": 2}
+        ]
+        assert len(result["datasets"]) == 1
+        assert state["cached_query_result"].single_dataset_query_result.sql_results[
+            0
+        ].full_sql_result == [{"state": "MH", "gdp": 1}]
+
+
+class TestStoreCachedAnswer:
+    async def test_store_runs_off_the_response_path(self, answer_cache):
+        """
+        Test that storing an answer does not wait for the query to be embedded.
+        """
+        embedded = asyncio.Event()
+
+        async def embed(query):
+            await embedded.wait()
+            return EMBEDDINGS[query]
+
+        answer_cache.embeddings.clear()
+        model_provider = Mock()
+        model_provider.get_embeddings_model.return_value.aembed_query = embed
+        state = {
+            "schema_version": "v1",
+            "query_result": make_query_result(),
+            "enhanced_query": "top 5 states by gdp",
+            "dataset_ids": ["ds1"],
+        }
+
+        with (
+            patch("app.workflow.agent.node.answer_cache.settings") as mock_settings,
+            patch(
+                "app.utils.graph_utils.answer_cache.get_model_provider",
+                return_value=model_provider,
+            ),
+        ):
+            mock_settings.SEMANTIC_ANSWER_CACHE_ENABLED = True
+            result = await asyncio.wait_for(store_cached_answer(state, {}), timeout=1)  # type: ignore
+            assert result == {}
+            assert answer_cache.get_stats()["storing"] == 1
+
+            embedded.set()
+            await asyncio.gather(*answer_cache.tasks)
+
+        assert answer_cache.get_stats()["entries"] == 1
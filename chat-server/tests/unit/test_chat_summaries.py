@@ -0,0 +1,210 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from app.core.constants import DATASETS_USED, DATASETS_USED_ARG
+from app.utils.chat_history import processor, sliding_window, summarizer
+from app.utils.chat_history.processor import ChatHistoryProcessor
+from app.utils.chat_history.summarizer import ConversationSummaries
+from app.utils.model_registry.token_counter import TokenCounter
+from app.workflow.graph import graph_stream
+
+
+class WordTokenizer:
+    name = "words"
+
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+def make_history(turns: int) -> list:
+    history = []
+    for i in range(turns):
+        history.append(HumanMessage(content=f"question {i} about sales"))
+        history.append(
+            AIMessage(
+                content=f"answer {i} with the total sales",
+                tool_calls=[
+                    {
+                        "name": DATASETS_USED,
+                        "args": {DATASETS_USED_ARG: [f"dataset_{i}"]},
+                        "id": f"call_{i}",
+                    }
+                ],
+            )
+        )
+    return history
+
+
+def make_config(history: list) -> RunnableConfig:
+    return RunnableConfig(
+        configurable={
+            "chat_history": history,
+            "client_chat_id": "chat",
+            "metadata": {"chat_id": "chat", "trace_id": "t"},
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def summary_settings():
+    ConversationSummaries.reset()
+    TokenCounter.set_tokenizer(WordTokenizer())
+    with (
+        patch.object(summarizer, "settings") as mock_settings,
+        patch.object(processor, "settings", mock_settings),
+    ):
+        mock_settings.CHAT_HISTORY_MAX_MESSAGES = 4
+        mock_settings.CHAT_HISTORY_MAX_TOKENS = 60
+        mock_settings.CHAT_SUMMARY_ENABLED = True
+        mock_settings.CHAT_SUMMARY_MIN_NEW_MESSAGES = 4
+        mock_settings.CHAT_SUMMARY_MAX_TOKENS = 100
+        mock_settings.CHAT_SUMMARY_MAX_CHATS = 10
+        yield mock_settings
+    ConversationSummaries.reset()
+    TokenCounter.reset()
+
+
+@pytest.fixture
+def summarize():
+    calls = []
+
+    async def fake_summarize(messages, previous_summary, config):
+        calls.append((len(messages), previous_summary, config))
+        return f"{previous_summary} +{len(messages)}".strip()
+
+    with patch.object(summarizer, "summarize_messages", fake_summarize):
+        yield calls
+
+
+async def wait_for_summaries():
+    for task in list(ConversationSummaries.tasks.values()):
+        await task
+
+
+class TestConversationSummaries:
+    async def test_dropped_messages_summarized_in_background(self, summarize):
+        """
+        Test that the messages left out of the window are summarized without the deadline.
+        """
+        history = make_history(10)
+        dropped = summarizer.get_dropped_message_count(history)
+
+        ConversationSummaries.schedule("chat", history, {"chat_id": "chat"})
+        await wait_for_summaries()
+
+        assert len(summarize) == 1
+        assert summarize[0][0] == dropped
+        assert "deadline" not in summarize[0][2]["configurable"]
+        assert ConversationSummaries.get("chat", history, dropped).end == dropped
+
+    async def test_rolls_previous_summary_forward(self, summarize):
+        """
+        Test that a later summary folds only the newly dropped messages into the previous one.
+        """
+        history = make_history(10)
+        ConversationSummaries.schedule("chat", history, {})
+        await wait_for_summaries()
+        first_end = ConversationSummaries.get("chat", history, len(history)).end
+
+        longer = history + make_history(14)[20:]
+        ConversationSummaries.schedule("chat", longer, {})
+        await wait_for_summaries()
+
+        assert summarize[1][1] == f"+{first_end}"
+        assert summarize[1][0] == summarizer.get_dropped_message_count(longer) - first_end
+
+    async def test_few_new_messages_not_resummarized(self, summarize):
+        """
+        Test that a summary is not rebuilt for every turn.
+        """
+        history = make_history(10)
+        ConversationSummaries.schedule("chat", history, {})
+        await wait_for_summaries()
+        ConversationSummaries.schedule("chat", history + make_history(11)[20:], {})
+        await wait_for_summaries()
+
+        assert len(summarize) == 1
+
+    async def test_changed_history_not_matched(self, summarize):
+        """
+        Test that a summary is not used for a history that differs from the one summarized.
+        """
+        history = make_history(10)
+        ConversationSummaries.schedule("chat", history, {})
+        await wait_for_summaries()
+
+        edited = [HumanMessage(content="a different first question"), *history[1:]]
+
+        assert ConversationSummaries.get("chat", edited, len(edited)) is None
+
+
+class TestHistoryProcessorSummary:
+    async def test_summary_replaces_dropped_messages(self, summarize):
+        """
+        Test that the prompt history leads with the summary and keeps datasets it covers.
+        """
+        history = make_history(10)
+        ConversationSummaries.schedule("chat", history, {})
+        await wait_for_summaries()
+
+        history_processor = ChatHistoryProcessor(make_config(history))
+        formatted = history_processor.format_chat_history()
+
+        assert formatted.startswith("Summary of earlier conversation:")
+        assert "dataset_0" in history_processor.get_datasets_used()
+        assert history_processor.get_context_summary()["summarized_message_count"] > 0
+
+    def test_without_summary_window_unchanged(self):
+        """
+        Test that the history is windowed as before until a summary exists.
+        """
+        history = make_history(10)
+        window = sliding_window.apply_sliding_window(history, 4, 60)
+
+        history_processor = ChatHistoryProcessor(make_config(history))
+
+        assert history_processor.filtered_history == window
+        assert history_processor.summary is None
+        assert ConversationSummaries.get_stats()["misses"] == 1
+
+    def test_generated_chat_id_not_summarized(self):
+        """
+        Test that a history without a client chat ID is neither looked up nor summarized.
+        """
+        history = make_history(10)
+        config = make_config(history)
+        config["configurable"]["client_chat_id"] = None
+
+        history_processor = ChatHistoryProcessor(config)
+
+        assert history_processor.summary is None
+        assert ConversationSummaries.get_stats()["misses"] == 0
+
+    async def test_stream_schedules_only_client_chat_id(self):
+        """
+        Test that the graph stream summarizes under the client's chat ID, not the generated one.
+        """
+
+        async def no_events(*args, **kwargs):
+            return
+            yield
+
+        fake_graph = MagicMock()
+        fake_graph.astream_events = no_events
+        with (
+            patch.object(graph_stream, "agent_graph", fake_graph),
+            patch.object(graph_stream.ConversationSummaries, "schedule") as schedule,
+        ):
+            async for _ in graph_stream.stream_graph_updates(
+                messages=[HumanMessage(content="total sales")],
+                user="user",
+                trace_id="trace",
+                chat_id="generated",
+                dataset_ids=["sales"],
+            ):
+                pass
+
+        assert schedule.call_args.args[0] is None
@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import pytest
+from langchain_openai import ChatOpenAI
+
+from app.utils.model_registry.client_pool import (
+    ClientPool,
+    with_request_overrides,
+)
+from app.utils.providers.llm_providers.custom import CustomLLMProvider
+
+
+@pytest.fixture(autouse=True)
+async def reset_client_pool():
+    await ClientPool.close()
+    yield
+    await ClientPool.close()
+
+
+class TestClientPool:
+    def test_http_clients_shared_per_base_url(self):
+        """
+        Test that the same HTTP clients are returned for a base URL and different ones for another.
+        """
+        first = ClientPool.get_http_client_kwargs("https://a.example.com")
+        second = ClientPool.get_http_client_kwargs("https://a.example.com")
+        other = ClientPool.get_http_client_kwargs("https://b.example.com")
+
+        assert first["http_async_client"] is second["http_async_client"]
+        assert first["http_client"] is second["http_client"]
+        assert first["http_async_client"] is not other["http_async_client"]
+
+    def test_pooled_llm_built_once_across_requests(self, sample_metadata):
+        """
+        Test that a provider builds its model once and later requests reuse it, with per-request metadata on a copy.
+        """
+        with patch("app.utils.providers.llm_providers.custom.settings") as mock_settings:
+            mock_settings.CUSTOM_LLM_API_KEY = "custom_key"
+            mock_settings.CUSTOM_LLM_BASE_URL = "https://custom.api"
+
+            with patch.object(
+                CustomLLMProvider,
+                "get_llm_model",
+                autospec=True,
+                side_effect=lambda self, model_name: ChatOpenAI(
+                    api_key="custom_key", model=model_name
+                ),
+            ) as mock_get_llm_model:
+                first = CustomLLMProvider({**sample_metadata, "chat_id": "a"})
+                second = CustomLLMProvider({**sample_metadata, "chat_id": "b"})
+
+                llm_a = first.get_pooled_llm_model("gpt-4o")
+                llm_b = second.get_pooled_llm_model("gpt-4o")
+
+            assert mock_get_llm_model.call_count == 1
+            assert llm_a.metadata["chat_id"] == "a"
+            assert llm_b.metadata["chat_id"] == "b"
+            assert llm_a.root_async_client is llm_b.root_async_client
+
+        stats = ClientPool.get_stats()
+        assert stats["llm_clients"] == 1
+        assert stats["llm_misses"] == 1
+        assert stats["llm_hits"] == 1
+
+    def test_with_request_overrides_merges_model_kwargs(self):
+        """
+        Test that request overrides merge into existing model kwargs without mutating the pooled model.
+        """
+        llm = ChatOpenAI(api_key="key", model="gpt-4o", model_kwargs={"user": "static"})
+
+        copy = with_request_overrides(
+            llm, {"model_kwargs": {"extra_headers": {"x-trace-id": "trace"}}}
+        )
+
+        assert copy.model_kwargs == {
+            "user": "static",
+            "extra_headers": {"x-trace-id": "trace"},
+        }
+        assert llm.model_kwargs == {"user": "static"}
+        assert with_request_overrides(llm, {}) is llm
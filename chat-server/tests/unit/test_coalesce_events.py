@@ -0,0 +1,171 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.models.chat import EventChunkData, ExtraData, Role
+from app.workflow.events.coalesce_events import coalesce_event_chunks
+
+
+def content(text: str) -> EventChunkData:
+    return EventChunkData(role=Role.AI, content=text, category=None)
+
+
+def intermediate(text: str) -> EventChunkData:
+    return EventChunkData(role=Role.INTERMEDIATE, content=text, category=None)
+
+
+async def collect(event_chunks, **kwargs) -> list[EventChunkData]:
+    return [chunk async for chunk in coalesce_event_chunks(event_chunks, **kwargs)]
+
+
+class TestCoalesceEventChunks:
+    async def test_consecutive_content_is_merged(self):
+        """
+        Test that tokens arriving within the window are merged into one chunk.
+        """
+
+        async def events():
+            for token in ["The ", "answer ", "is ", "42"]:
+                yield content(token)
+
+        chunks = await collect(events(), window_seconds=1.0, max_bytes=1024)
+
+        assert [chunk.content for chunk in chunks] == ["The answer is 42"]
+        assert chunks[0].role == Role.AI
+
+    async def test_intermediate_events_flush_immediately(self):
+        """
+        Test that intermediate and tool-call events flush buffered content and keep their order.
+        """
+        tool_call = EventChunkData(
+            role=Role.INTERMEDIATE,
+            content="",
+            category=None,
+            extra_data=ExtraData(name="sql_queries", args={}),
+        )
+
+        async def events():
+            yield content("Hello ")
+            yield content("there")
+            yield intermediate("Running SQL")
+            yield tool_call
+            yield content("Done")
+
+        chunks = await collect(events(), window_seconds=1.0, max_bytes=1024)
+
+        assert [(chunk.role, chunk.content) for chunk in chunks] == [
+            (Role.AI, "Hello there"),
+            (Role.INTERMEDIATE, "Running SQL"),
+            (Role.INTERMEDIATE, ""),
+            (Role.AI, "Done"),
+        ]
+        assert chunks[2].extra_data == tool_call.extra_data
+
+    async def test_byte_limit_flushes(self):
+        """
+        Test that the buffer is flushed once max_bytes are buffered.
+        """
+
+        async def events():
+            for _ in range(5):
+                yield content("ab")
+
+        chunks = await collect(events(), window_seconds=1.0, max_bytes=4)
+
+        assert [chunk.content for chunk in chunks] == ["abab", "abab", "ab"]
+
+    async def test_window_flushes_without_next_token(self):
+        """
+        Test that buffered content is sent after the window even while the stream is idle.
+        """
+        received: list[tuple[str, bool]] = []
+        resume = asyncio.Event()
+
+        async def events():
+            yield content("partial")
+            await resume.wait()
+            yield content(" rest")
+
+        async def consume():
+            async for chunk in coalesce_event_chunks(events(), window_seconds=0.01, max_bytes=1024):
+                received.append((chunk.content, resume.is_set()))
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        resume.set()
+        await task
+
+        assert received == [("partial", False), (" rest", True)]
+
+    async def test_zero_window_passes_through(self):
+        """
+        Test that a window of 0 disables coalescing.
+        """
+
+        async def events():
+            yield content("a")
+            yield content("b")
+
+        chunks = await collect(events(), window_seconds=0, max_bytes=1024)
+
+        assert [chunk.content for chunk in chunks] == ["a", "b"]
+
+    async def test_source_errors_propagate_after_flush(self):
+        """
+        Test that buffered content is flushed before an error from the source is raised.
+        """
+
+        async def events():
+            yield content("partial")
+            raise RuntimeError("boom")
+
+        chunks = []
+        with pytest.raises(RuntimeError, match="boom"):
+            async for chunk in coalesce_event_chunks(events(), window_seconds=1.0, max_bytes=1024):
+                chunks.append(chunk)
+
+        assert [chunk.content for chunk in chunks] == ["partial"]
+
+    async def test_slow_client_holds_source_back(self):
+        """
+        Test that the source is read at most a queue's worth ahead of the client.
+        """
+        produced = 0
+
+        async def events():
+            nonlocal produced
+            for i in range(1000):
+                produced += 1
+                yield intermediate(str(i))
+
+        with patch("app.workflow.events.coalesce_events.settings") as mock_settings:
+            mock_settings.STREAM_COALESCE_QUEUE_SIZE = 4
+            stream = coalesce_event_chunks(events(), window_seconds=1.0, max_bytes=1024)
+            await anext(stream)
+            await asyncio.sleep(0.01)
+            await stream.aclose()
+
+        assert produced <= 4 + 2
+
+    async def test_source_closed_before_stream_ends(self):
+        """
+        Test that closing the stream waits for the source to shut down.
+        """
+        closed = False
+
+        async def events():
+            nonlocal closed
+            try:
+                while True:
+                    yield intermediate("progress")
+                    await asyncio.sleep(0.001)
+            finally:
+                await asyncio.sleep(0.01)
+                closed = True
+
+        stream = coalesce_event_chunks(events(), window_seconds=1.0, max_bytes=1024)
+        await anext(stream)
+        await stream.aclose()
+
+        assert closed
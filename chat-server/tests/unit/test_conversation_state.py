@@ -0,0 +1,245 @@
+from collections import OrderedDict
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from app.core.constants import (
+    DATASETS_USED,
+    DATASETS_USED_ARG,
+    VISUALIZATION_RESULT,
+    VISUALIZATION_RESULT_ARG,
+)
+from app.models.schema import DatasetSchema
+from app.utils.adapters.openai.input import from_openai_format
+from app.utils.chat_history import processor, state_store
+from app.utils.chat_history.processor import ChatHistoryProcessor
+from app.utils.chat_history.state_store import (
+    ConversationState,
+    ConversationStore,
+    FileConversationStateBackend,
+)
+from app.utils.model_registry.token_counter import (
+    HeuristicTokenizer,
+    TokenCounter,
+)
+from app.workflow.agent.node import context_processor
+
+
+def make_raw_messages(turns: int) -> list[dict]:
+    raw_messages = []
+    for i in range(turns):
+        raw_messages.append({"role": "user", "content": f"question {i}"})
+        raw_messages.append({"role": "assistant", "content": f"answer {i}"})
+    return raw_messages
+
+
+def make_request(raw_messages: list[dict]) -> dict:
+    return {"messages": raw_messages, "metadata": {"dataset_id": "ds1", "chat_id": "chat"}}
+
+
+def convert(raw_messages: list[dict]) -> ConversationState | None:
+    """
+    Handle a request the way the query router does.
+    """
+    state = ConversationStore.states.get("chat")
+    request = from_openai_format(make_request(raw_messages), state)  # type: ignore
+    return ConversationStore.update(request.chat_id, state, raw_messages, request.messages)
+
+
+def make_schema(dataset_id: str, project_id: str) -> DatasetSchema:
+    return DatasetSchema(
+        name=dataset_id,
+        dataset_name=dataset_id,
+        dataset_description="",
+        project_id=project_id,
+        dataset_id=dataset_id,
+        columns=[],
+    )
+
+
+@pytest.fixture(autouse=True)
+def state_settings():
+    ConversationStore.reset()
+    TokenCounter.set_tokenizer(HeuristicTokenizer())
+    with (
+        patch.object(state_store, "settings") as mock_settings,
+        patch.object(processor, "settings", mock_settings),
+    ):
+        mock_settings.CONVERSATION_STATE_ENABLED = True
+        mock_settings.CONVERSATION_STATE_MAX_CHATS = 2
+        mock_settings.CONVERSATION_STATE_BACKEND = ""
+        mock_settings.CHAT_HISTORY_MAX_MESSAGES = 2
+        mock_settings.CHAT_HISTORY_MAX_TOKENS = 10
+        mock_settings.CHAT_SUMMARY_ENABLED = False
+        yield mock_settings
+    ConversationStore.reset()
+    TokenCounter.reset()
+
+
+class TestConversationStore:
+    def test_follow_up_converts_only_new_messages(self):
+        """
+        Test that a follow-up request reuses the messages converted for the previous one.
+        """
+        first = convert(make_raw_messages(2)[:-1])
+        converted = list(first.messages)  # type: ignore
+
+        second = convert(make_raw_messages(3)[:-1])
+
+        assert second is first
+        assert all(a is b for a, b in zip(second.messages, converted))  # type: ignore
+        assert len(second.messages) == 5  # type: ignore
+        assert ConversationStore.get_stats()["delta_messages"] == 2
+
+    def test_changed_history_converted_again(self):
+        """
+        Test that a history that does not continue the stored one is converted from scratch.
+        """
+        convert(make_raw_messages(2)[:-1])
+        edited = [{"role": "user", "content": "a different question"}, *make_raw_messages(3)[1:-1]]
+
+        state = convert(edited)
+
+        assert state.messages[0].content == "a different question"  # type: ignore
+        assert ConversationStore.get_stats()["delta_messages"] == 0
+        assert ConversationStore.get_stats()["converted_messages"] == 3 + 5
+
+    def test_edited_middle_message_converted_again(self):
+        """
+        Test that a history differing from the stored one only in a middle message is not reused.
+        """
+        convert(make_raw_messages(3)[:-1])
+        edited = make_raw_messages(4)[:-1]
+        edited[2] = {"role": "user", "content": "an edited question"}
+
+        state = convert(edited)
+
+        assert state.messages[2].content == "an edited question"  # type: ignore
+        assert ConversationStore.get_stats()["delta_messages"] == 0
+
+    def test_changed_history_drops_result_handles(self):
+        """
+        Test that result handles of a history the client no longer sends are not carried over.
+        """
+        state = convert(make_raw_messages(2)[:-1])
+        state.result_handles = ["s3://viz/1.json"]  # type: ignore
+        state.schemas["dataset:ds1"] = make_schema("ds1", "p1")  # type: ignore
+        edited = [{"role": "user", "content": "a different question"}, *make_raw_messages(3)[1:-1]]
+
+        state = convert(edited)
+
+        assert state.result_handles == []  # type: ignore
+        assert list(state.schemas) == ["dataset:ds1"]  # type: ignore
+
+    def test_tool_calls_indexed_per_message(self):
+        """
+        Test that the tool calls of a range of messages are looked up without scanning them.
+        """
+        state = ConversationState(chat_id="chat")
+        messages = [
+            HumanMessage(content="question"),
+            AIMessage(
+                content="",
+                tool_calls=[{"name": DATASETS_USED, "args": {DATASETS_USED_ARG: ["a"]}, "id": "1"}],
+            ),
+            HumanMessage(content="follow up"),
+            AIMessage(
+                content="",
+                tool_calls=[{"name": DATASETS_USED, "args": {DATASETS_USED_ARG: ["b"]}, "id": "2"}],
+            ),
+        ]
+        state.extend([], messages[:2])
+        state.extend([], messages)
+
+        assert [call["id"] for call in state.get_tool_calls(0, 2)] == ["1"]
+        assert [call["id"] for call in state.get_tool_calls(2, 4)] == ["2"]
+
+    def test_least_recently_used_chat_evicted(self):
+        """
+        Test that only CONVERSATION_STATE_MAX_CHATS chats are kept in memory.
+        """
+        for chat_id in ("a", "b", "c"):
+            ConversationStore.update(chat_id, None, [], [HumanMessage(content=chat_id)])
+
+        assert list(ConversationStore.states) == ["b", "c"]
+
+    async def test_file_backend_round_trip(self, tmp_path):
+        """
+        Test that a chat's messages and result handles are restored from the backend.
+        """
+        ConversationStore.set_backend(FileConversationStateBackend(str(tmp_path)))
+        state = convert(make_raw_messages(2)[:-1])
+        state.result_handles = ["s3://viz/1.json"]  # type: ignore
+        state.schemas["dataset:ds1"] = make_schema("ds1", "p1")  # type: ignore
+        await ConversationStore.save(state)
+        ConversationStore.states = OrderedDict()
+
+        restored = await ConversationStore.get("chat")
+
+        assert restored is not None
+        assert [m.content for m in restored.messages] == ["question 0", "answer 0", "question 1"]
+        assert restored.result_handles == ["s3://viz/1.json"]
+        assert restored.schemas == {}
+        assert restored.get_matching_prefix(make_raw_messages(3)[:-1]) == 3
+        assert ConversationStore.get_stats()["backend_hits"] == 1
+
+    def test_invalidate_schemas_of_project(self):
+        """
+        Test that schemas of a project whose datasets changed are dropped from all chats.
+        """
+        state = ConversationStore.update("chat", None, [], [HumanMessage(content="question")])
+        state.schemas = {  # type: ignore
+            "dataset:ds1": make_schema("ds1", "p1"),
+            "dataset:ds2": make_schema("ds2", "p2"),
+        }
+
+        ConversationStore.invalidate_schemas("p1")
+
+        assert list(state.schemas) == ["dataset:ds2"]  # type: ignore
+
+
+class TestConversationStateUse:
+    async def test_schemas_fetched_once_per_chat(self):
+        """
+        Test that a follow-up request reuses the schemas fetched for the chat.
+        """
+        schema_cache = {}
+        fetch = AsyncMock(return_value=make_schema("ds1", "p1"))
+
+        with patch.object(context_processor, "get_schema_from_qdrant", fetch):
+            await context_processor.get_project_custom_prompts(["ds1"], None, schema_cache)
+            _, schemas = await context_processor.get_project_custom_prompts(
+                ["ds1"], None, schema_cache
+            )
+
+        assert fetch.await_count == 1
+        assert schemas[0].dataset_id == "ds1"  # type: ignore
+
+    def test_result_handles_outlive_the_window(self):
+        """
+        Test that the last visualization is still found once it has left the window.
+        """
+        state = convert(make_raw_messages(4)[:-1])
+        state.messages[1] = AIMessage(  # type: ignore
+            content="answer 0",
+            tool_calls=[
+                {
+                    "name": VISUALIZATION_RESULT,
+                    "args": {VISUALIZATION_RESULT_ARG: ["s3://viz/1.json"]},
+                    "id": "viz",
+                }
+            ],
+        )
+
+        def make_config(history: list) -> RunnableConfig:
+            return RunnableConfig(
+                configurable={"chat_history": history, "conversation_state": state}
+            )
+
+        history = state.messages  # type: ignore
+        in_window = ChatHistoryProcessor(make_config(history[:2])).get_vizpaths()
+        out_of_window = ChatHistoryProcessor(make_config(history[:-1])).get_vizpaths()
+
+        assert in_window == out_of_window == ["s3://viz/1.json"]
@@ -1,4 +1,4 @@
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 from portkey_ai import PORTKEY_GATEWAY_URL
 
@@ -90,6 +90,8 @@ class TestPortkeyEmbeddingProvider:
                 base_url=PORTKEY_GATEWAY_URL,
                 default_headers={"test": "headers"},
                 model="text-embedding-ada-002",
+                http_client=ANY,
+                http_async_client=ANY,
             )
             assert result == mock_model
 
@@ -151,6 +153,8 @@ class TestLiteLLMEmbeddingProvider:
                 base_url="https://litellm.example.com",
                 default_headers={"Authorization": "Bearer master_key"},
                 model="text-embedding-ada-002",
+                http_client=ANY,
+                http_async_client=ANY,
             )
             assert result == mock_embeddings.return_value
 
@@ -177,6 +181,8 @@ class TestOpenAIEmbeddingProvider:
             mock_embeddings.assert_called_once_with(
                 api_key="openai_key",
                 model="text-embedding-ada-002",
+                http_client=ANY,
+                http_async_client=ANY,
             )
             assert result == mock_model
 
@@ -204,5 +210,7 @@ class TestCustomEmbeddingProvider:
                     base_url="https://custom.api",
                     api_key="custom_key",
                     model="text-embedding-ada-002",
+                    http_client=ANY,
+                    http_async_client=ANY,
                 )
                 assert result == mock_model
@@ -0,0 +1,238 @@
+from typing import TypedDict
+from unittest.mock import AsyncMock, patch
+
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.language_models.fake_chat_models import (
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+
+from app.core.constants import MESSAGE_EVENT
+from app.models.chat import Role
+from app.workflow.events import event_utils
+from app.workflow.events.event_utils import configure_node, emit_message
+from app.workflow.events.handle_events_stream import (
+    STREAMED_EVENT_TYPES,
+    EventStreamHandler,
+)
+
+
+def message_event(role: str, content: str) -> dict:
+    return {
+        "event": "on_custom_event",
+        "name": MESSAGE_EVENT,
+        "data": {"role": role, "content": content},
+        "metadata": {},
+    }
+
+
+class TestMessageEvents:
+    async def test_emit_message_dispatches_single_event(self):
+        """
+        Test that a pre-computed message is dispatched once as a typed custom event.
+        """
+        with patch.object(event_utils, "adispatch_custom_event", new=AsyncMock()) as dispatch:
+            await emit_message("Looking at your datasets", Role.INTERMEDIATE)
+
+        dispatch.assert_awaited_once_with(
+            MESSAGE_EVENT,
+            {"role": Role.INTERMEDIATE, "content": "Looking at your datasets"},
+        )
+
+    def test_ai_message_event_maps_to_ai_chunk(self):
+        """
+        Test that an AI message event becomes AI content ending with a newline, like a streamed response.
+        """
+        chunk = EventStreamHandler().handle_events_stream(message_event("ai", "The answer is 42"))
+
+        assert chunk.role == Role.AI
+        assert chunk.content == "The answer is 42\n"
+        assert chunk.category is None
+        assert chunk.extra_data is None
+
+    def test_intermediate_message_event_maps_to_intermediate_chunk(self):
+        """
+        Test that an intermediate message event becomes a single intermediate chunk.
+        """
+        chunk = EventStreamHandler().handle_events_stream(
+            message_event("intermediate", "Checking the schema")
+        )
+
+        assert chunk.role == Role.INTERMEDIATE
+        assert chunk.content == "Checking the schema"
+
+    def test_agent_custom_events_unchanged(self):
+        """
+        Test that other custom events still go through the gopie-agent handling.
+        """
+        chunk = EventStreamHandler().handle_events_stream(
+            {
+                "event": "on_custom_event",
+                "name": "gopie-agent",
+                "data": {"content": "Executing SQL"},
+                "metadata": {},
+            }
+        )
+
+        assert chunk.role == Role.INTERMEDIATE
+        assert chunk.content == "Executing SQL"
+
+
+class State(TypedDict):
+    answer: str
+
+
+@tool
+def lookup(value: str) -> str:
+    """Look up a value."""
+    return value
+
+
+@configure_node(role="intermediate", progress_message="Planning...")
+async def plan(state: State, config: RunnableConfig) -> dict:
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="select 1 from sales")]))
+    await (llm | StrOutputParser()).ainvoke("plan", config)
+    await adispatch_custom_event(
+        "gopie-agent", {"content": "Planned", "name": "plan", "values": {}}
+    )
+    await lookup.ainvoke(
+        {"value": "x"},
+        {**config, "metadata": {"tool_text": "Looking up", "should_display_tool": True}},
+    )
+    await emit_message("Checked", Role.INTERMEDIATE)
+    return {}
+
+
+@configure_node(role="ai", progress_message="")
+async def respond(state: State, config: RunnableConfig) -> dict:
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="The answer is 42")]))
+    return {"answer": await (llm | StrOutputParser()).ainvoke("respond", config)}
+
+
+def build_graph():
+    subgraph = StateGraph(State)
+    subgraph.add_node("plan", plan)
+    subgraph.add_edge(START, "plan")
+    subgraph.add_edge("plan", END)
+
+    graph = StateGraph(State)
+    graph.add_node("subquery", subgraph.compile())
+    graph.add_node("respond", respond)
+    graph.add_edge(START, "subquery")
+    graph.add_edge("subquery", "respond")
+    graph.add_edge("respond", END)
+    return graph.compile()
+
+
+async def stream_chunks(include_types: list[str] | None) -> tuple[int, list]:
+    handler = EventStreamHandler()
+    events = 0
+    chunks = []
+    async for event in build_graph().astream_events(
+        {"answer": ""}, subgraphs=True, version="v2", include_types=include_types
+    ):
+        events += 1
+        chunk = handler.handle_events_stream(event)
+        if chunk.role:
+            chunks.append(chunk)
+    return events, chunks
+
+
+class TestStreamedEventTypes:
+    async def test_filtered_stream_yields_same_chunks(self):
+        """
+        Test that filtering astream_events to STREAMED_EVENT_TYPES yields the same client chunks with fewer events.
+        """
+        all_events, all_chunks = await stream_chunks(None)
+        filtered_events, filtered_chunks = await stream_chunks(STREAMED_EVENT_TYPES)
+
+        assert filtered_chunks == all_chunks
+        assert filtered_events < all_events
+
+        contents = [chunk.content for chunk in filtered_chunks]
+        assert "Planning..." in contents
+        assert "Planned" in contents
+        assert "Looking up" in contents
+        assert "Checked" in contents
+        assert (
+            "".join(chunk.content for chunk in filtered_chunks if chunk.role == Role.AI).strip()
+            == "The answer is 42"
+        )
+
+
+class TestNonStreamingEvents:
+    def chat_model_event(self, event_type: str, role: str, data: dict | None = None) -> dict:
+        return {
+            "event": event_type,
+            "name": "ChatOpenAI",
+            "data": data or {},
+            "metadata": {"role": role, "progress_message": "Planning..."},
+        }
+
+    def test_progress_message_sent_on_model_start(self):
+        """
+        Test that without token streaming the intermediate progress message is sent when the model starts.
+        """
+        handler = EventStreamHandler(stream_tokens=False)
+
+        start = handler.handle_events_stream(
+            self.chat_model_event("on_chat_model_start", "intermediate")
+        )
+        stream = handler.handle_events_stream(
+            self.chat_model_event(
+                "on_chat_model_stream", "intermediate", {"chunk": AIMessage(content="{")}
+            )
+        )
+
+        assert start.role == Role.INTERMEDIATE
+        assert start.content == "Planning..."
+        assert stream.role is None
+
+    def test_ai_content_taken_from_model_output(self):
+        """
+        Test that without token streaming AI content comes from the final model output, once.
+        """
+        handler = EventStreamHandler(stream_tokens=False)
+
+        stream = handler.handle_events_stream(
+            self.chat_model_event("on_chat_model_stream", "ai", {"chunk": AIMessage(content="The")})
+        )
+        end = handler.handle_events_stream(
+            self.chat_model_event(
+                "on_chat_model_end", "ai", {"output": AIMessage(content="The answer is 42")}
+            )
+        )
+
+        assert stream.role is None
+        assert end.role == Role.AI
+        assert end.content == "The answer is 42\n"
+
+    async def test_graph_without_token_streaming(self):
+        """
+        Test that a graph run with non-streaming models yields the same progress and answer text.
+        """
+
+        @configure_node(role="ai", progress_message="")
+        async def answer(state: State, config: RunnableConfig) -> dict:
+            llm = GenericFakeChatModel(messages=iter([AIMessage(content="The answer is 42")]))
+            return {"answer": await llm.bind(stream=False).ainvoke("respond", config)}
+
+        graph = StateGraph(State)
+        graph.add_node("answer", answer)
+        graph.add_edge(START, "answer")
+        graph.add_edge("answer", END)
+
+        handler = EventStreamHandler(stream_tokens=False)
+        chunks = []
+        async for event in graph.compile().astream_events(
+            {"answer": ""}, version="v2", include_types=STREAMED_EVENT_TYPES
+        ):
+            chunk = handler.handle_events_stream(event)
+            if chunk.role and chunk.content:
+                chunks.append(chunk.content)
+
+        assert chunks == ["The answer is 42\n"]
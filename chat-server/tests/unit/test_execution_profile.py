@@ -0,0 +1,153 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
+
+from app.models.message import ErrorMessage
+from app.models.provider import ModelCategory
+from app.models.query import QueryResult
+from app.models.router import LatencyMode
+from app.utils.graph_utils.execution_profile import (
+    get_execution_profile,
+    get_latency_mode,
+)
+from app.utils.model_registry import model_selection
+from app.workflow.graph.multi_dataset_graph.node import generate_subqueries
+from app.workflow.graph.multi_dataset_graph.node import (
+    validate_result as multi_validate_result,
+)
+from app.workflow.graph.single_dataset_graph.node import (
+    validate_result as single_validate_result,
+)
+
+
+def make_config(latency_mode: LatencyMode | None) -> RunnableConfig:
+    return RunnableConfig(configurable={"latency_mode": latency_mode})
+
+
+def make_query_result() -> QueryResult:
+    query_result = QueryResult(
+        original_user_query="total sales", execution_time=0, timestamp=datetime.now()
+    )
+    query_result.add_subquery(query_text="total sales", sql_queries=[])
+    return query_result
+
+
+class TestExecutionProfile:
+    def test_default_mode(self):
+        """
+        Test that a request without latency_mode runs with DEFAULT_LATENCY_MODE.
+        """
+        assert get_latency_mode(make_config(None)) == LatencyMode.BALANCED
+        assert get_latency_mode(None) == LatencyMode.BALANCED
+
+    def test_fast_profile(self):
+        """
+        Test that fast mode skips validation and breakdown on the FAST model.
+        """
+        profile = get_execution_profile(make_config(LatencyMode.FAST))
+
+        assert profile.validate_results is False
+        assert profile.max_validation_retries == 0
+        assert profile.break_down_queries is False
+        assert profile.model_category == ModelCategory.FAST
+
+    def test_thorough_profile_allows_more_retries(self):
+        """
+        Test that thorough mode allows more validation retries than balanced mode.
+        """
+        balanced = get_execution_profile(make_config(LatencyMode.BALANCED))
+        thorough = get_execution_profile(make_config(LatencyMode.THOROUGH))
+
+        assert thorough.max_validation_retries > balanced.max_validation_retries
+        assert balanced.model_category is None
+
+    def test_profile_overrides_node_model(self):
+        """
+        Test that fast mode moves every node to the FAST model and balanced keeps the node's own.
+        """
+        with patch.object(model_selection, "settings") as mock_settings:
+            mock_settings.FAST_MODEL = "fast-model"
+            mock_settings.ADVANCED_MODEL = "advanced-model"
+
+            fast = model_selection.get_node_model("plan_query", make_config(LatencyMode.FAST))
+            balanced = model_selection.get_node_model(
+                "plan_query", make_config(LatencyMode.BALANCED)
+            )
+
+        assert fast == "fast-model"
+        assert balanced == "advanced-model"
+
+
+class TestFastModeNodes:
+    async def test_fast_mode_skips_multi_dataset_validation(self):
+        """
+        Test that the multi dataset validation makes no LLM call in fast mode.
+        """
+        state = {
+            "query_result": make_query_result(),
+            "subquery_index": 0,
+            "messages": [AIMessage(content="executed")],
+        }
+
+        with patch.object(multi_validate_result, "get_prompt_llm_chain") as get_chain:
+            output = await multi_validate_result.validate_result(
+                state, make_config(LatencyMode.FAST)
+            )
+
+        get_chain.assert_not_called()
+        assert output["recommendation"] == "route_response"
+
+    async def test_fast_mode_skips_single_dataset_validation(self):
+        """
+        Test that the single dataset validation makes no LLM call in fast mode.
+        """
+        state = {"query_result": make_query_result(), "messages": []}
+
+        with patch.object(single_validate_result, "get_prompt_llm_chain") as get_chain:
+            output = await single_validate_result.validate_result(
+                state, make_config(LatencyMode.FAST)
+            )
+
+        get_chain.assert_not_called()
+        assert output["recommendation"] == "pass_on_results"
+
+    async def test_retry_limit_follows_profile(self):
+        """
+        Test that the replan limit comes from the request's execution profile.
+        """
+        state = {
+            "retry_count": 2,
+            "recommendation": "replan",
+            "messages": [AIMessage(content="replan")],
+        }
+
+        balanced = await multi_validate_result.route_result_validation(
+            state, make_config(LatencyMode.BALANCED)
+        )
+        thorough = await multi_validate_result.route_result_validation(
+            state, make_config(LatencyMode.THOROUGH)
+        )
+
+        assert balanced == "route_response"
+        assert thorough == "replan"
+
+    async def test_fast_mode_skips_complexity_assessment(self):
+        """
+        Test that fast mode plans the question as a single query without the assessment call.
+        """
+        state = {"user_query": "total sales", "query_result": make_query_result()}
+        state["query_result"].subqueries = []
+
+        with (
+            patch.object(generate_subqueries, "get_prompt_llm_chain") as get_chain,
+            patch.object(generate_subqueries, "adispatch_custom_event", AsyncMock()),
+        ):
+            output = await generate_subqueries.generate_subqueries(
+                state, make_config(LatencyMode.FAST)
+            )
+
+        get_chain.assert_not_called()
+        assert output["subqueries"] == ["total sales"]
+        assert not isinstance(output["messages"][0], ErrorMessage)
@@ -0,0 +1,130 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+from app.utils.model_registry import hedging
+from app.utils.model_registry.hedging import LLMHedger, with_hedging
+
+
+class FakeLLM:
+    """
+    Answers after `seconds`, recording calls and cancellations.
+    """
+
+    def __init__(self, name: str, seconds: float, error: Exception | None = None):
+        self.name = name
+        self.seconds = seconds
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def __call__(self, input):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.name
+
+    def as_runnable(self):
+        return RunnableLambda(self)
+
+
+@pytest.fixture(autouse=True)
+def hedge_settings():
+    LLMHedger.reset()
+    with patch.object(hedging, "settings") as mock_settings:
+        mock_settings.LLM_HEDGING_ENABLED = True
+        mock_settings.LLM_HEDGE_PERCENTILE = 0.95
+        mock_settings.LLM_HEDGE_PERCENTILES = {}
+        mock_settings.LLM_HEDGE_MIN_SAMPLES = 5
+        yield mock_settings
+    LLMHedger.reset()
+
+
+def warm_up(seconds: float = 0.02, samples: int = 5):
+    for _ in range(samples):
+        LLMHedger.record("plan_query", "gpt-4o", seconds)
+
+
+async def invoke(primary: FakeLLM, alternate: FakeLLM):
+    llm = with_hedging(primary.as_runnable(), alternate.as_runnable(), "plan_query", "gpt-4o")
+    return await llm.ainvoke("prompt", RunnableConfig())
+
+
+def get_node_stats() -> dict:
+    return LLMHedger.get_stats()["nodes"]["plan_query:gpt-4o"]
+
+
+class TestLLMHedger:
+    async def test_no_hedge_without_latency_samples(self):
+        """
+        Test that a node is not hedged until it has enough latency samples.
+        """
+        primary, alternate = FakeLLM("primary", 0.05), FakeLLM("alternate", 0)
+
+        assert await invoke(primary, alternate) == "primary"
+        assert alternate.calls == 0
+        assert len(LLMHedger.latencies[("plan_query", "gpt-4o")]) == 1
+
+    async def test_slow_request_hedged_and_loser_cancelled(self):
+        """
+        Test that a request slower than the node's percentile is hedged, the faster
+        response kept and the slower request cancelled.
+        """
+        warm_up()
+        primary, alternate = FakeLLM("primary", 1), FakeLLM("alternate", 0.01)
+
+        assert await invoke(primary, alternate) == "alternate"
+        assert primary.cancelled
+
+        stats = get_node_stats()
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+        assert stats["hedge_rate"] == 1.0
+
+    async def test_fast_request_not_hedged(self):
+        """
+        Test that a request responding within the node's percentile is not hedged.
+        """
+        warm_up(seconds=0.5)
+        primary, alternate = FakeLLM("primary", 0.01), FakeLLM("alternate", 0)
+
+        assert await invoke(primary, alternate) == "primary"
+        assert alternate.calls == 0
+        assert get_node_stats()["hedged"] == 0
+
+    async def test_failed_request_falls_back(self):
+        """
+        Test that a request failing before it responded is retried on the alternate.
+        """
+        primary = FakeLLM("primary", 0, error=RuntimeError("upstream 502"))
+        alternate = FakeLLM("alternate", 0)
+
+        assert await invoke(primary, alternate) == "alternate"
+        assert get_node_stats()["fallbacks"] == 1
+
+    async def test_hedge_failure_keeps_primary(self):
+        """
+        Test that a failing hedge does not replace a slow primary that still succeeds.
+        """
+        warm_up()
+        primary = FakeLLM("primary", 0.1)
+        alternate = FakeLLM("alternate", 0, error=RuntimeError("upstream 502"))
+
+        assert await invoke(primary, alternate) == "primary"
+        assert get_node_stats()["hedge_wins"] == 0
+
+    def test_per_node_percentile_disables_hedging(self, hedge_settings):
+        """
+        Test that a node percentile of 0 turns hedging off for that node only.
+        """
+        hedge_settings.LLM_HEDGE_PERCENTILES = {"plan_query": 0}
+
+        assert not LLMHedger.is_enabled("plan_query")
+        assert LLMHedger.is_enabled("identify_datasets")
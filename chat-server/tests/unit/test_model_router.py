@@ -0,0 +1,141 @@
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+from app.models.router import LatencyMode
+from app.utils.model_registry import model_router, model_selection
+from app.utils.model_registry.model_router import (
+    ComplexityEstimate,
+    ModelRouter,
+    estimate_complexity,
+    with_model_routing,
+)
+from app.utils.model_registry.token_counter import (
+    HeuristicTokenizer,
+    TokenCounter,
+)
+
+
+@pytest.fixture(autouse=True)
+def routing_settings():
+    ModelRouter.reset()
+    TokenCounter.set_tokenizer(HeuristicTokenizer())
+    with (
+        patch.object(model_router, "settings") as mock_settings,
+        patch.object(model_selection, "settings") as mock_selection_settings,
+    ):
+        mock_selection_settings.FAST_MODEL = "fast-model"
+        mock_selection_settings.BALANCED_MODEL = "balanced-model"
+        mock_selection_settings.ADVANCED_MODEL = "advanced-model"
+        mock_settings.MODEL_ROUTING_ENABLED = True
+        mock_settings.MODEL_ROUTING_SIMPLE_QUERY_WORDS = 20
+        mock_settings.MODEL_ROUTING_SIMPLE_PROMPT_TOKENS = 8000
+        mock_settings.MODEL_ROUTING_LATENCY_SLO_SECONDS = 10.0
+        mock_settings.MODEL_ROUTING_LATENCY_SLOS = {}
+        mock_settings.MODEL_ROUTING_MAX_ERROR_RATE = 0.2
+        mock_settings.MODEL_ROUTING_MIN_SAMPLES = 5
+        yield mock_settings
+    ModelRouter.reset()
+    TokenCounter.reset()
+
+
+SIMPLE = ComplexityEstimate(prompt_tokens=2000, datasets=1, query_words=4, retry=False)
+COMPLEX = ComplexityEstimate(prompt_tokens=2000, datasets=3, query_words=4, retry=False)
+RETRY = ComplexityEstimate(prompt_tokens=2000, datasets=1, query_words=4, retry=True)
+
+
+def record_calls(model_id: str, seconds: float | None, calls: int = 5):
+    for _ in range(calls):
+        ModelRouter.record("plan_query", model_id, seconds)
+
+
+class TestModelRouter:
+    def test_simple_call_downgraded_one_tier(self):
+        """
+        Test that a simple plan_query call runs on the tier below ADVANCED.
+        """
+        assert ModelRouter.select_model("plan_query", SIMPLE) == "balanced-model"
+        assert ModelRouter.select_model("plan_query", COMPLEX) == "advanced-model"
+        assert ModelRouter.select_model("plan_query", RETRY) == "advanced-model"
+
+    def test_slo_violation_downgrades(self):
+        """
+        Test that a model over the latency SLO is downgraded when the lower tier meets it.
+        """
+        record_calls("advanced-model", 30.0)
+
+        assert ModelRouter.select_model("plan_query", COMPLEX) == "balanced-model"
+        assert ModelRouter.get_stats()["routes"]["plan_query"]["slo_downgrades"] == 1
+
+    def test_no_downgrade_when_lower_tier_misses_slo(self):
+        """
+        Test that the tier is kept when the lower tier is failing as well.
+        """
+        record_calls("advanced-model", 30.0)
+        record_calls("balanced-model", None)
+
+        assert ModelRouter.select_model("plan_query", COMPLEX) == "advanced-model"
+
+    def test_retry_keeps_configured_tier(self):
+        """
+        Test that a retry after a failed attempt is not downgraded for latency.
+        """
+        record_calls("advanced-model", 30.0)
+
+        assert ModelRouter.select_model("plan_query", RETRY) == "advanced-model"
+
+    def test_latency_mode_takes_precedence(self):
+        """
+        Test that routing is off for requests with an explicit fast or thorough mode.
+        """
+        fast = RunnableConfig(configurable={"latency_mode": LatencyMode.FAST})
+
+        assert ModelRouter.is_enabled("plan_query", RunnableConfig())
+        assert not ModelRouter.is_enabled("plan_query", fast)
+        assert not ModelRouter.is_enabled("identify_datasets", RunnableConfig())
+
+    def test_estimate_complexity(self):
+        """
+        Test that the estimate counts datasets, query words, prompt size and retries.
+        """
+        variables = {
+            "user_query": "total sales by state",
+            "datasets_info": {"schemas": [{}, {}]},
+            "retry_count": 1,
+        }
+
+        estimate = estimate_complexity(variables, [HumanMessage(content="x" * 400)])
+
+        assert estimate == ComplexityEstimate(
+            prompt_tokens=100, datasets=2, query_words=4, retry=True
+        )
+
+
+class TestModelRouting:
+    async def test_routed_chain_records_latency_and_errors(self):
+        """
+        Test that the routed chain calls the picked model and records its outcome.
+        """
+        formatter = RunnableLambda(lambda variables: [HumanMessage(content="prompt")])
+        calls = []
+
+        def get_llm(model_id: str):
+            async def call(messages):
+                calls.append(model_id)
+                if len(calls) > 1:
+                    raise RuntimeError("upstream 502")
+                return model_id
+
+            return RunnableLambda(call)
+
+        chain = with_model_routing("plan_query", formatter, get_llm)
+
+        assert await chain.ainvoke({"user_query": "total sales"}) == "balanced-model"
+        with pytest.raises(RuntimeError):
+            await chain.ainvoke({"user_query": "total sales"})
+
+        stats = ModelRouter.get_stats()["models"]["plan_query:balanced-model"]
+        assert stats["calls"] == 2
+        assert stats["error_rate"] == 0.5
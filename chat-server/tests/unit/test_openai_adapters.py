@@ -2,13 +2,39 @@ import json
 from typing import Any, Dict
 
 import pytest
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
 
 from app.models.chat import EventChunkData, ExtraData, Role
-from app.models.router import QueryRequest
+from app.models.router import LatencyMode, QueryRequest
 from app.utils.adapters.openai.input import from_openai_format
 from app.utils.adapters.openai.output import OpenAIOutputAdapter
 
 
+def parse_frame(frame: str | None) -> ChatCompletionChunk:
+    assert frame is not None
+    assert frame.startswith("data: ") and frame.endswith("\n\n")
+    return ChatCompletionChunk.model_validate_json(frame.removeprefix("data: "))
+
+
+def make_frame(
+    adapter: OpenAIOutputAdapter, delta: ChoiceDelta, finish_reason: str | None = None
+) -> str:
+    chunk = ChatCompletionChunk(
+        id=adapter.trace_id,
+        object="chat.completion.chunk",
+        created=adapter.created,
+        model=adapter.model,
+        choices=[Choice(index=0, delta=delta, finish_reason=finish_reason)],  # type: ignore
+    )
+    return f"data: {chunk.model_dump_json(exclude_defaults=True)}\n\n"
+
+
 class TestOpenAIInputAdapter:
     def test_from_openai_format_basic_request(self):
         openai_request: Dict[str, Any] = {
@@ -50,6 +76,36 @@ class TestOpenAIInputAdapter:
         assert result.project_ids == ["proj1", "proj2", "proj3"]
         assert result.dataset_ids == ["ds1", "ds2", "ds3", "ds4"]
 
+    def test_from_openai_format_with_latency_mode(self):
+        openai_request = {
+            "messages": [{"role": "user", "content": "Show me data"}],
+            "metadata": {"dataset_id": "ds1", "latency_mode": "Fast"},
+        }
+
+        result = from_openai_format(openai_request)  # type: ignore
+
+        assert result.latency_mode == LatencyMode.FAST
+
+    def test_from_openai_format_unknown_latency_mode(self):
+        openai_request = {
+            "messages": [{"role": "user", "content": "Show me data"}],
+            "metadata": {"dataset_id": "ds1", "latency_mode": "instant"},
+        }
+
+        result = from_openai_format(openai_request)  # type: ignore
+
+        assert result.latency_mode is None
+
+    def test_from_openai_format_with_chat_id(self):
+        openai_request = {
+            "messages": [{"role": "user", "content": "Show me data"}],
+            "metadata": {"dataset_id": "ds1", "chat_id": "chat-1"},
+        }
+
+        result = from_openai_format(openai_request)  # type: ignore
+
+        assert result.chat_id == "chat-1"
+
     def test_from_openai_format_empty_metadata(self):
         openai_request = {
             "messages": [{"role": "user", "content": "Test message"}],
@@ -123,7 +179,7 @@ class TestOpenAIOutputAdapter:
         assert output_adapter.first_chunk is True
         assert isinstance(output_adapter.created, int)
 
-    def test_create_tool_call_chunk_with_extra_data(self, output_adapter):
+    def test_event_to_sse_tool_call_with_extra_data(self, output_adapter):
         event_chunk = EventChunkData(
             role=Role.AI,
             content="Tool execution",
@@ -131,9 +187,8 @@ class TestOpenAIOutputAdapter:
             extra_data=ExtraData(name="execute_sql", args={"query": "SELECT * FROM users"}),
         )
 
-        result = output_adapter.create_tool_call_chunk(event_chunk)
+        result = parse_frame(output_adapter.event_to_sse(event_chunk))
 
-        assert result is not None
         assert result.id == "test_trace_456"
         assert result.object == "chat.completion.chunk"
         assert result.model == "gopie-chat"
@@ -142,8 +197,7 @@ class TestOpenAIOutputAdapter:
         choice = result.choices[0]
         assert choice.index == 0
         assert choice.finish_reason is None
-        assert hasattr(choice.delta, "tool_calls")
-        assert len(choice.delta.tool_calls) > 0
+        assert len(choice.delta.tool_calls) == 1
 
         tool_call = choice.delta.tool_calls[0]
         assert tool_call.id == "call_0"
@@ -151,18 +205,14 @@ class TestOpenAIOutputAdapter:
         assert tool_call.function.name == "execute_sql"
         assert "SELECT * FROM users" in tool_call.function.arguments
 
-    def test_create_tool_call_chunk_with_category(self, output_adapter):
+    def test_event_to_sse_tool_call_with_category(self, output_adapter):
         event_chunk = EventChunkData(
             role=Role.AI,
             content="Processing data",
             category="data_processing",
         )
 
-        result = output_adapter.create_tool_call_chunk(event_chunk)
-
-        assert result is not None
-        assert hasattr(result.choices[0].delta, "tool_calls")
-        assert len(result.choices[0].delta.tool_calls) > 0
+        result = parse_frame(output_adapter.event_to_sse(event_chunk))
 
         tool_call = result.choices[0].delta.tool_calls[0]
         assert tool_call.function.name == "tool_messages"
@@ -172,18 +222,14 @@ class TestOpenAIOutputAdapter:
         assert args["category"] == "data_processing"
         assert args["content"] == "Processing data"
 
-    def test_create_tool_call_chunk_with_intermediate_role(self, output_adapter):
+    def test_event_to_sse_tool_call_with_intermediate_role(self, output_adapter):
         event_chunk = EventChunkData(
             role=Role.INTERMEDIATE,
             content="Intermediate step",
             category="intermediate",
         )
 
-        result = output_adapter.create_tool_call_chunk(event_chunk)
-
-        assert result is not None
-        assert hasattr(result.choices[0].delta, "tool_calls")
-        assert len(result.choices[0].delta.tool_calls) > 0
+        result = parse_frame(output_adapter.event_to_sse(event_chunk))
 
         tool_call = result.choices[0].delta.tool_calls[0]
         assert tool_call.function.name == "tool_messages"
@@ -192,27 +238,25 @@ class TestOpenAIOutputAdapter:
         assert args["role"] == Role.INTERMEDIATE
         assert args["content"] == "Intermediate step"
 
-    def test_create_tool_call_chunk_with_empty_intermediate(self, output_adapter):
+    def test_event_to_sse_skips_empty_intermediate(self, output_adapter):
         event_chunk = EventChunkData(
             role=Role.INTERMEDIATE,
             content="",
             category="intermediate",
         )
 
-        result = output_adapter.create_tool_call_chunk(event_chunk)
-
-        assert result is None
+        assert output_adapter.event_to_sse(event_chunk) is None
+        assert output_adapter.tool_calls_count == 0
 
-    def test_event_to_response_regular_content(self, output_adapter):
+    def test_event_to_sse_regular_content(self, output_adapter):
         event_chunk = EventChunkData(
             role=Role.AI,
             content="This is a regular response",
             category=None,
         )
 
-        result = output_adapter.event_to_response(event_chunk)
+        result = parse_frame(output_adapter.event_to_sse(event_chunk))
 
-        assert result is not None
         assert result.id == "test_trace_456"
         assert result.object == "chat.completion.chunk"
 
@@ -222,14 +266,14 @@ class TestOpenAIOutputAdapter:
         assert choice.delta.role == "assistant"  # First chunk includes role
         assert choice.finish_reason is None
 
-    def test_event_to_response_subsequent_chunks(self, output_adapter):
+    def test_event_to_sse_subsequent_chunks(self, output_adapter):
         # First chunk
         event_chunk1 = EventChunkData(
             role=Role.AI,
             content="First chunk",
             category=None,
         )
-        result1 = output_adapter.event_to_response(event_chunk1)
+        result1 = parse_frame(output_adapter.event_to_sse(event_chunk1))
         assert result1.choices[0].delta.role == "assistant"
 
         # Second chunk
@@ -238,14 +282,13 @@ class TestOpenAIOutputAdapter:
             content="Second chunk",
             category=None,
         )
-        result2 = output_adapter.event_to_response(event_chunk2)
+        result2 = parse_frame(output_adapter.event_to_sse(event_chunk2))
         assert result2.choices[0].delta.role is None
 
-    def test_create_final_chunk(self, output_adapter):
-        """Test creating final chunk."""
-        result = output_adapter.create_final_chunk()
+    def test_final_frame(self, output_adapter):
+        """Test encoding the final chunk."""
+        result = parse_frame(output_adapter.encoder.final())
 
-        assert result is not None
         assert result.id == "test_trace_456"
         assert result.object == "chat.completion.chunk"
 
@@ -297,6 +340,26 @@ class TestOpenAIOutputAdapter:
         assert result.choices[0].message.tool_calls[0].function.name == "test_tool"
         assert result.choices[0].finish_reason == "stop"
 
+    def test_frames_match_pydantic_serialization(self, output_adapter):
+        encoder = output_adapter.encoder
+        content = 'Hé "quoted"\n\ttab \x01 ✓'
+        arguments = json.dumps({"queries": ["SELECT 'ü'"]})
+        tool_call = ChoiceDeltaToolCall(
+            id="call_3",
+            index=3,
+            type="function",
+            function=ChoiceDeltaToolCallFunction(name="sql_queries", arguments=arguments),
+        )
+
+        assert encoder.content(content, first=True) == make_frame(
+            output_adapter, ChoiceDelta(content=content, role="assistant")
+        )
+        assert encoder.content("") == make_frame(output_adapter, ChoiceDelta(content=""))
+        assert encoder.tool_call(3, "sql_queries", arguments) == make_frame(
+            output_adapter, ChoiceDelta(tool_calls=[tool_call])
+        )
+        assert encoder.final() == make_frame(output_adapter, ChoiceDelta(), finish_reason="stop")
+
     def test_tool_calls_counter_increment(self, output_adapter):
         # First tool call
         event_chunk1 = EventChunkData(
@@ -305,7 +368,7 @@ class TestOpenAIOutputAdapter:
             category="tool_call",
             extra_data=ExtraData(name="tool1", args={}),
         )
-        output_adapter.create_tool_call_chunk(event_chunk1)
+        output_adapter.event_to_sse(event_chunk1)
         assert output_adapter.tool_calls_count == 1
 
         # Second tool call
@@ -315,5 +378,6 @@ class TestOpenAIOutputAdapter:
             category="tool_call",
             extra_data=ExtraData(name="tool2", args={}),
         )
-        output_adapter.create_tool_call_chunk(event_chunk2)
+        result = parse_frame(output_adapter.event_to_sse(event_chunk2))
         assert output_adapter.tool_calls_count == 2
+        assert result.choices[0].delta.tool_calls[0].id == "call_1"
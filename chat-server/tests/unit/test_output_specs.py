@@ -0,0 +1,81 @@
+from langchain_core.messages import AIMessage
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, Field
+
+from app.tool_utils.tools import ToolNames
+from app.utils.model_registry.output_specs import (
+    bind_structured_output,
+    bind_tool_specs,
+    get_structured_output_spec,
+    get_tool_specs,
+)
+
+
+class SampleOutput(BaseModel):
+    answer: str = Field(description="The answer")
+    confidence: float = Field(description="Confidence between 0 and 1")
+
+
+def get_llm() -> ChatOpenAI:
+    return ChatOpenAI(api_key="key", model="gpt-4o")
+
+
+class TestOutputSpecs:
+    def test_tool_specs_match_bind_tools(self):
+        """
+        Test that cached tool specs are identical to the ones produced by `bind_tools`, and are compiled once.
+        """
+        from app.tool_utils.tools import get_tools
+
+        tool_names = [ToolNames.EXECUTE_SQL_QUERY, ToolNames.GET_TABLE_SCHEMA]
+        tools = [tool for tool, _ in get_tools(tool_names).values()]
+
+        expected = get_llm().bind_tools(tools)
+        actual = bind_tool_specs(get_llm(), tool_names)
+
+        assert actual.kwargs["tools"] == expected.kwargs["tools"]
+        assert get_tool_specs(tuple(tool_names)) is get_tool_specs(tuple(tool_names))
+
+    def test_structured_output_matches_with_structured_output(self):
+        """
+        Test that the cached structured output binding sends the same request as `with_structured_output`.
+        """
+        expected = get_llm().with_structured_output(schema=SampleOutput, method="json_schema")
+        actual = bind_structured_output(get_llm(), SampleOutput, "gpt-4o")
+
+        assert actual.first.kwargs == expected.first.kwargs
+        assert get_structured_output_spec(SampleOutput) is get_structured_output_spec(SampleOutput)
+
+    def test_structured_output_keeps_bound_kwargs(self):
+        """
+        Test that kwargs bound before the structured output, such as temperature, are kept.
+        """
+        llm = get_llm().bind(temperature=0.1)
+
+        structured = bind_structured_output(llm, SampleOutput, "gpt-4o")
+
+        assert structured.first.kwargs["temperature"] == 0.1
+        assert "response_format" in structured.first.kwargs
+
+    def test_structured_output_parser(self):
+        """
+        Test that the cached parser returns the schema instance from the parsed message.
+        """
+        parser = get_structured_output_spec(SampleOutput).parser
+        message = AIMessage(
+            content="", additional_kwargs={"parsed": {"answer": "42", "confidence": 0.9}}
+        )
+
+        result = parser.invoke(message)
+
+        assert result == SampleOutput(answer="42", confidence=0.9)
+
+    def test_legacy_models_fall_back(self):
+        """
+        Test that models without Structured Output API support use `with_structured_output`.
+        """
+        structured = bind_structured_output(
+            ChatOpenAI(api_key="key", model="gpt-4"), SampleOutput, "gpt-4"
+        )
+
+        assert "tools" in structured.first.kwargs
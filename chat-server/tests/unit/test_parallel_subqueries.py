@@ -0,0 +1,169 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+
+from app.models.query import QueryResult, SqlQueryInfo
+from app.workflow.graph.multi_dataset_graph.node import (
+    parallel_subqueries,
+    stream_updates,
+)
+from app.workflow.graph.multi_dataset_graph.node.parallel_subqueries import (
+    merge_subquery_results,
+    route_subqueries,
+    run_subquery,
+)
+from app.workflow.graph.multi_dataset_graph.types import State
+
+
+def make_state(subqueries: list[str]) -> dict:
+    query_result = QueryResult(
+        original_user_query="Compare sales and returns",
+        execution_time=0,
+        timestamp=datetime.now(),
+    )
+    for subquery in subqueries:
+        query_result.add_subquery(query_text=subquery, sql_queries=[])
+
+    return {
+        "subqueries": subqueries,
+        "subquery_index": 0,
+        "query_result": query_result,
+        "messages": [HumanMessage(content="Compare sales and returns")],
+        "subquery_results": [],
+    }
+
+
+class FakeSubqueryGraph:
+    """
+    Stands in for subquery_graph: answers each subquery after a per-subquery delay.
+    """
+
+    def __init__(self, delays: dict[int, float]):
+        self.delays = delays
+        self.events = []
+
+    async def ainvoke(self, state, config):
+        index = state["subquery_index"]
+        self.events.append(("start", index))
+        await asyncio.sleep(self.delays[index])
+        self.events.append(("finish", index))
+
+        query_result = state["query_result"]
+        query_result.subqueries[index].sql_queries = [
+            SqlQueryInfo(sql_query=f"SELECT {index}", explanation=f"subquery {index}")
+        ]
+        return {
+            **state,
+            "messages": [*state["messages"], AIMessage(content=f"validated {index}")],
+        }
+
+
+def build_fan_out_graph():
+    graph = StateGraph(State)
+    graph.add_node("generate_subqueries", lambda state: {})
+    graph.add_node("identify_datasets", lambda state: {})
+    graph.add_node("run_subquery", run_subquery)
+    graph.add_node("merge_subquery_results", merge_subquery_results)
+    graph.add_edge(START, "generate_subqueries")
+    graph.add_conditional_edges(
+        "generate_subqueries", route_subqueries, ["identify_datasets", "run_subquery"]
+    )
+    graph.add_edge("run_subquery", "merge_subquery_results")
+    graph.add_edge("merge_subquery_results", END)
+    graph.add_edge("identify_datasets", END)
+    return graph.compile()
+
+
+class TestParallelSubqueries:
+    def test_single_subquery_stays_sequential(self):
+        """
+        Test that a question with one subquery keeps the sequential path.
+        """
+        assert route_subqueries(make_state(["total sales"])) == "identify_datasets"
+
+    def test_disabled_fan_out_stays_sequential(self):
+        """
+        Test that MULTI_DATASET_PARALLEL_SUBQUERIES=False keeps the sequential path.
+        """
+        with patch.object(parallel_subqueries, "settings") as mock_settings:
+            mock_settings.MULTI_DATASET_PARALLEL_SUBQUERIES = False
+            assert route_subqueries(make_state(["sales", "returns"])) == "identify_datasets"
+
+    def test_fan_out_sends_isolated_branches(self):
+        """
+        Test that each subquery gets its own Send with its index and a copy of the query result.
+        """
+        state = make_state(["sales", "returns"])
+
+        sends = route_subqueries(state)
+
+        assert [send.node for send in sends] == ["run_subquery", "run_subquery"]
+        assert all(isinstance(send, Send) for send in sends)
+        assert [send.arg["subquery_index"] for send in sends] == [0, 1]
+        assert sends[0].arg["query_result"] is not state["query_result"]
+        assert sends[0].arg["query_result"] is not sends[1].arg["query_result"]
+
+    def test_merge_keeps_subquery_order(self):
+        """
+        Test that results finishing out of order are merged into QueryResult.subqueries in order.
+        """
+        state = make_state(["sales", "returns"])
+        first = make_state(["sales", "returns"])["query_result"].subqueries[0]
+        second = make_state(["sales", "returns"])["query_result"].subqueries[1]
+        first.tables_used = ["sales"]
+        second.tables_used = ["returns"]
+        state["subquery_results"] = [
+            {"index": 1, "subquery": second, "messages": [AIMessage(content="second")]},
+            {"index": 0, "subquery": first, "messages": [AIMessage(content="first")]},
+        ]
+
+        output = merge_subquery_results(state)
+
+        assert [sq.tables_used for sq in output["query_result"].subqueries] == [
+            ["sales"],
+            ["returns"],
+        ]
+        assert [message.content for message in output["messages"]] == ["first", "second"]
+        assert output["continue_execution"] is True
+
+    async def test_subqueries_run_concurrently(self):
+        """
+        Test that both parts of a two-part question run at once and merge results in order.
+        """
+        fake_graph = FakeSubqueryGraph({0: 0.02, 1: 0.01})
+
+        with patch.object(parallel_subqueries, "subquery_graph", fake_graph):
+            output = await build_fan_out_graph().ainvoke(make_state(["sales", "returns"]))
+
+        assert set(fake_graph.events[:2]) == {("start", 0), ("start", 1)}
+        subqueries = output["query_result"].subqueries
+        assert [sq.sql_queries[0].sql_query for sq in subqueries] == ["SELECT 0", "SELECT 1"]
+        assert [message.content for message in output["messages"][1:]] == [
+            "validated 0",
+            "validated 1",
+        ]
+
+    async def test_parallel_run_streams_one_update(self):
+        """
+        Test that merged parallel results get one update covering all subqueries.
+        """
+        state = make_state(["sales", "returns"])
+        state["subquery_index"] = 1
+        state["subquery_results"] = [{"index": 0}, {"index": 1}]
+        chain = AsyncMock()
+        chain.ainvoke.return_value = stream_updates.StreamUpdateResponse(
+            stream_update="Sales and returns are ready", continue_execution=True
+        )
+
+        with patch.object(stream_updates, "get_prompt_llm_chain", return_value=chain):
+            output = await stream_updates.stream_updates(state, {})  # type: ignore
+
+        chain_input = chain.ainvoke.await_args.args[0]
+        assert "sales" in chain_input["subquery_messages"]
+        assert "returns" in chain_input["subquery_messages"]
+        assert output["messages"][0].content == "Sales and returns are ready"
+        assert output["subquery_index"] == 1
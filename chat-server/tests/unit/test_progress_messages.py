@@ -0,0 +1,69 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.workflow.events import progress_messages
+from app.workflow.events.progress_messages import (
+    emit_progress_message,
+    format_progress_message,
+)
+
+
+class TestProgressMessages:
+    def test_format_templates(self):
+        """
+        Test that templated progress messages are formatted from their values.
+        """
+        assert format_progress_message("executing_sql", count=1) == (
+            "Generated 1 SQL query, running it on your data now..."
+        )
+        assert "running them" in format_progress_message("executing_sql", count=3)
+
+        message = format_progress_message("breaking_down_query", steps=["first", "second"])
+        assert "1. first\n2. second" in message
+
+    async def test_templated_message_dispatched_without_llm(self):
+        """
+        Test that the templated message is dispatched directly and no LLM is called by default.
+        """
+        with (
+            patch.object(progress_messages, "settings") as mock_settings,
+            patch.object(progress_messages, "adispatch_custom_event", new=AsyncMock()) as dispatch,
+            patch.object(
+                progress_messages, "create_dynamic_progress_message", new=AsyncMock()
+            ) as create_message,
+        ):
+            mock_settings.PROGRESS_MESSAGE_LLM_ENABLED = False
+            await emit_progress_message("executing_sql", {}, count=2)
+
+        dispatch.assert_awaited_once_with(
+            "gopie-agent",
+            {"content": "Generated 2 SQL queries, running them on your data now..."},
+        )
+        create_message.assert_not_called()
+
+    async def test_llm_phrasing_runs_in_background_with_deadline(self):
+        """
+        Test that LLM phrasing doesn't block the caller and falls back to the template after the deadline.
+        """
+
+        async def slow_message(context, config):
+            await asyncio.sleep(10)
+            return "never used"
+
+        with (
+            patch.object(progress_messages, "settings") as mock_settings,
+            patch.object(progress_messages, "adispatch_custom_event", new=AsyncMock()) as dispatch,
+            patch.object(progress_messages, "create_dynamic_progress_message", new=slow_message),
+        ):
+            mock_settings.PROGRESS_MESSAGE_LLM_ENABLED = True
+            mock_settings.PROGRESS_MESSAGE_LLM_TIMEOUT = 0.01
+
+            await emit_progress_message("executing_sql", {}, count=1)
+            dispatch.assert_not_called()
+
+            await asyncio.gather(*progress_messages._background_tasks)
+
+        dispatch.assert_awaited_once_with(
+            "gopie-agent",
+            {"content": "Generated 1 SQL query, running it on your data now..."},
+        )
@@ -0,0 +1,118 @@
+from uuid import uuid4
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from app.models.schema import DatasetSchema
+from app.utils.model_registry.prompt_cache_stats import (
+    PromptCacheCallbackHandler,
+    PromptCacheStats,
+)
+from app.workflow.prompts.multi_dataset_prompts.identify_datasets_prompt import (
+    format_identify_datasets_input,
+)
+from app.workflow.prompts.multi_dataset_prompts.plan_query_prompt import (
+    format_plan_query_input,
+)
+
+
+def make_schema(dataset_id: str) -> DatasetSchema:
+    return DatasetSchema(
+        name=f"Dataset {dataset_id}",
+        dataset_name=f"gp_{dataset_id}",
+        dataset_description="",
+        project_id="project",
+        dataset_id=dataset_id,
+        columns=[],
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    PromptCacheStats.reset()
+    yield
+    PromptCacheStats.reset()
+
+
+class TestPromptLayout:
+    def test_plan_query_shares_prefix_across_requests(self):
+        """
+        Test that plan_query inputs over the same datasets share everything up to the query.
+        """
+        first = format_plan_query_input(
+            user_query="total sales",
+            datasets_info={"schemas": [make_schema("sales"), make_schema("regions")]},
+        )["input"]
+        retry = format_plan_query_input(
+            user_query="sales by region",
+            datasets_info={"schemas": [make_schema("regions"), make_schema("sales")]},
+            retry_count=1,
+            error_messages=[{"sql": "column not found"}],
+        )["input"]
+
+        prefix = first[: first.index("❓ USER QUERY")]
+        assert retry.startswith(prefix)
+        assert first.endswith("❓ USER QUERY: total sales")
+        assert prefix.index("gp_regions") < prefix.index("gp_sales")
+
+    def test_identify_datasets_query_last(self):
+        """
+        Test that identify_datasets lists the schemas in table name order before the query.
+        """
+        input_str = format_identify_datasets_input(
+            user_query="total sales",
+            semantic_searched_datasets=[make_schema("sales"), make_schema("regions")],
+            validation_result="wrong dataset",
+        )["input"]
+
+        assert input_str.endswith("USER QUERY: total sales")
+        assert input_str.index("gp_regions") < input_str.index("gp_sales")
+        assert input_str.index("gp_sales") < input_str.index("VALIDATION RESULT")
+
+
+class TestPromptCacheStats:
+    async def test_handler_records_cached_tokens(self):
+        """
+        Test that cached prompt tokens and time to first token are recorded per model.
+        """
+        handler = PromptCacheCallbackHandler()
+        run_id = uuid4()
+        message = AIMessage(
+            content="answer",
+            usage_metadata={
+                "input_tokens": 1000,
+                "output_tokens": 10,
+                "total_tokens": 1010,
+                "input_token_details": {"cache_read": 800},
+            },
+            response_metadata={"model_name": "gpt-4o"},
+        )
+
+        await handler.on_chat_model_start({}, [[]], run_id=run_id)
+        await handler.on_llm_new_token("ans", run_id=run_id)
+        await handler.on_llm_end(
+            LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id
+        )
+
+        stats = PromptCacheStats.get_stats()["gpt-4o"]
+        assert stats["cache_hits"] == 1
+        assert stats["cached_token_ratio"] == 0.8
+        assert stats["first_token_ms_p50_cached"] is not None
+        assert stats["first_token_ms_p50_uncached"] is None
+        assert not handler.started_at
+
+    async def test_response_without_usage_ignored(self):
+        """
+        Test that responses without usage metadata are not counted.
+        """
+        handler = PromptCacheCallbackHandler()
+        run_id = uuid4()
+
+        await handler.on_chat_model_start({}, [[]], run_id=run_id)
+        await handler.on_llm_end(
+            LLMResult(generations=[[ChatGeneration(message=AIMessage(content="answer"))]]),
+            run_id=run_id,
+        )
+
+        assert PromptCacheStats.get_stats() == {}
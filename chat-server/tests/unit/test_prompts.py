@@ -1,8 +1,11 @@
+import asyncio
 from unittest.mock import Mock, patch
 
 import pytest
+from langchain_core.prompts import ChatPromptTemplate
 
 from app.utils.langsmith.prompt_manager import PromptManager, get_prompt
+from app.utils.langsmith.prompt_registry import CachedPrompt, PromptRegistry
 from app.workflow.prompts.prompt_selector import PromptSelector
 
 
@@ -244,3 +247,79 @@ class TestPromptDynamic:
             # Test with prompt_template=True
             result = selector.get_prompt_template("analyze_query")
             assert result == mock_template
+
+
+class TestPromptRegistry:
+    @pytest.fixture(autouse=True)
+    async def reset_registry(self):
+        await PromptRegistry.close()
+        PromptRegistry.prompts = {}
+        PromptRegistry.failed_at = {}
+        yield PromptRegistry
+        await PromptRegistry.close()
+        PromptRegistry.prompts = {}
+        PromptRegistry.failed_at = {}
+
+    async def test_cold_cache_falls_back_without_blocking(self, reset_registry):
+        """
+        Test that an uncached prompt returns the PromptSelector template while the fetch runs in the background.
+        """
+        langsmith_template = Mock(spec=ChatPromptTemplate)
+
+        with (
+            patch("app.utils.langsmith.prompt_manager.settings") as mock_settings,
+            patch(
+                "app.utils.langsmith.prompt_registry.pull_prompt",
+                return_value=langsmith_template,
+            ) as mock_pull,
+        ):
+            mock_settings.LANGSMITH_PROMPT = True
+
+            first = PromptManager("analyze_query").get_prompt_template()
+            assert first is not langsmith_template
+
+            await asyncio.gather(*reset_registry.refresh_tasks.values())
+            second = PromptManager("analyze_query").get_prompt_template()
+
+        assert second is langsmith_template
+        mock_pull.assert_called_once_with("analyze_query", None)
+
+    async def test_stale_prompt_served_while_revalidating(self, reset_registry):
+        """
+        Test that an expired prompt is still returned while a single refresh is scheduled.
+        """
+        stale_template = Mock(spec=ChatPromptTemplate)
+        reset_registry.prompts["plan_query"] = CachedPrompt(
+            template=stale_template, version=None, fetched_at=-1e9
+        )
+
+        with patch(
+            "app.utils.langsmith.prompt_registry.pull_prompt",
+            return_value=Mock(spec=ChatPromptTemplate),
+        ) as mock_pull:
+            assert reset_registry.get("plan_query") is stale_template
+            assert reset_registry.get("plan_query") is stale_template
+            await asyncio.gather(*reset_registry.refresh_tasks.values())
+
+        mock_pull.assert_called_once_with("plan_query", None)
+        assert reset_registry.get("plan_query") is mock_pull.return_value
+
+    async def test_pinned_version_and_failure_backoff(self, reset_registry):
+        """
+        Test that the pinned version is requested and a failed fetch isn't retried immediately.
+        """
+        with (
+            patch("app.utils.langsmith.prompt_registry.settings") as mock_settings,
+            patch(
+                "app.utils.langsmith.prompt_registry.pull_prompt",
+                side_effect=Exception("LangSmith down"),
+            ) as mock_pull,
+        ):
+            mock_settings.LANGSMITH_PROMPT_VERSIONS = {"plan_query": "abc123"}
+            mock_settings.LANGSMITH_PROMPT_RETRY_SECONDS = 30
+
+            assert reset_registry.get("plan_query") is None
+            await asyncio.gather(*reset_registry.refresh_tasks.values())
+            assert reset_registry.get("plan_query") is None
+
+        mock_pull.assert_called_once_with("plan_query", "abc123")
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.utils.model_registry import rate_limiter
+from app.utils.model_registry.rate_limiter import (
+    RateLimitedTransport,
+    RateLimiter,
+    estimate_prompt_tokens,
+)
+
+
+@pytest.fixture(autouse=True)
+def rate_limit_settings():
+    RateLimiter.reset()
+    with patch.object(rate_limiter, "settings") as mock_settings:
+        mock_settings.LLM_RATE_LIMIT_RPM = 0
+        mock_settings.LLM_RATE_LIMIT_TPM = 0
+        mock_settings.LLM_RATE_LIMITS = {}
+        mock_settings.LLM_RATE_LIMIT_BURST_SECONDS = 0.1
+        yield mock_settings
+    RateLimiter.reset()
+
+
+def make_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=RateLimitedTransport("gateway", httpx.MockTransport(handler)),
+        base_url="https://gateway.example.com",
+    )
+
+
+class TestRateLimiter:
+    async def test_requests_over_rpm_are_delayed(self, rate_limit_settings):
+        """
+        Test that requests beyond the burst capacity wait for the bucket to refill.
+        """
+        rate_limit_settings.LLM_RATE_LIMIT_RPM = 600
+
+        start = time.monotonic()
+        for _ in range(3):
+            await RateLimiter.acquire("gateway", "gpt-4o", 10)
+        elapsed = time.monotonic() - start
+
+        stats = RateLimiter.get_stats()["limits"]["gpt-4o@gateway"]
+        assert elapsed >= 0.18
+        assert stats["requests"] == 3
+        assert stats["throttled"] == 2
+
+    async def test_waiters_admitted_in_arrival_order(self, rate_limit_settings):
+        """
+        Test that a large prompt at the head of the queue is not overtaken by smaller ones.
+        """
+        rate_limit_settings.LLM_RATE_LIMIT_TPM = 60_000
+        admitted = []
+
+        async def call(name: str, tokens: int):
+            await RateLimiter.acquire("gateway", "gpt-4o", tokens)
+            admitted.append(name)
+
+        await RateLimiter.acquire("gateway", "gpt-4o", 100)
+        await asyncio.gather(call("large", 100), call("small", 1), call("smaller", 1))
+
+        assert admitted == ["large", "small", "smaller"]
+
+    async def test_per_model_override(self, rate_limit_settings):
+        """
+        Test that LLM_RATE_LIMITS limits only the models it names.
+        """
+        rate_limit_settings.LLM_RATE_LIMITS = {"gpt-4o": {"rpm": 60}}
+
+        assert RateLimiter.get_limiter("gateway", "gpt-4o") is not None
+        assert RateLimiter.get_limiter("gateway", "gpt-4o-mini") is None
+        assert RateLimiter.get_limiter("other", "gpt-4o") is not RateLimiter.get_limiter(
+            "gateway", "gpt-4o"
+        )
+
+    def test_estimate_prompt_tokens(self):
+        """
+        Test that pre-tokenized embedding inputs are counted exactly and text by size.
+        """
+        assert estimate_prompt_tokens(b"", {"input": [[1, 2, 3], [4, 5]]}) == 5
+        assert estimate_prompt_tokens(b"x" * 400, {"messages": []}) == 100
+
+
+class TestRateLimitedTransport:
+    async def test_limits_chat_and_embedding_calls(self, rate_limit_settings):
+        """
+        Test that calls through the transport are counted per gateway and model.
+        """
+        rate_limit_settings.LLM_RATE_LIMIT_RPM = 6000
+
+        async with make_client(lambda request: httpx.Response(200, json={})) as client:
+            await client.post(
+                "/chat/completions",
+                json={"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]},
+            )
+            await client.post(
+                "/embeddings", json={"model": "text-embedding-3-small", "input": [[1, 2]]}
+            )
+
+        limits = RateLimiter.get_stats()["limits"]
+        assert limits["gpt-4o@gateway"]["requests"] == 1
+        assert limits["text-embedding-3-small@gateway"]["prompt_tokens"] == 2
+
+    async def test_provider_429_pauses_model(self, rate_limit_settings):
+        """
+        Test that a 429 from the provider holds back further calls for its Retry-After.
+        """
+        rate_limit_settings.LLM_RATE_LIMIT_RPM = 6000
+        responses = [
+            httpx.Response(429, headers={"retry-after-ms": "100"}),
+            httpx.Response(200, json={}),
+        ]
+        body = {"model": "gpt-4o", "messages": []}
+
+        async with make_client(lambda request: responses.pop(0)) as client:
+            await client.post("/chat/completions", json=body)
+            start = time.monotonic()
+            response = await client.post("/chat/completions", json=body)
+
+        assert response.status_code == 200
+        assert time.monotonic() - start >= 0.09
+        assert RateLimiter.get_stats()["limits"]["gpt-4o@gateway"]["provider_429"] == 1
+
+    async def test_disabled_rate_limits_pass_through(self):
+        """
+        Test that without configured limits requests are passed through untracked.
+        """
+        async with make_client(lambda request: httpx.Response(200, json={})) as client:
+            await client.post("/chat/completions", json={"model": "gpt-4o", "messages": []})
+
+        assert RateLimiter.get_stats() == {"enabled": False, "limits": {}}
@@ -0,0 +1,229 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+from app.core.constants import MESSAGE_EVENT
+from app.models.chat import Role
+from app.utils.graph_utils.request_deadline import (
+    CLIENT_DISCONNECTED,
+    DEADLINE_EXCEEDED,
+    RequestCancelledError,
+    RequestDeadline,
+    cancel_on_disconnect,
+    with_deadline,
+)
+from app.workflow.graph import graph_stream
+
+
+class SlowCall:
+    """
+    Stands in for an upstream call and records whether it was cancelled.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.cancelled = False
+
+    async def __call__(self):
+        try:
+            await asyncio.sleep(self.seconds)
+            return "done"
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+class FakeAgentGraph:
+    """
+    Emits one AI message per interval until cancelled.
+    """
+
+    def __init__(self, interval: float, messages: int = 100):
+        self.interval = interval
+        self.messages = messages
+        self.emitted = 0
+        self.closed = False
+
+    async def astream_events(self, input_state, **kwargs):
+        try:
+            for index in range(self.messages):
+                await asyncio.sleep(self.interval)
+                self.emitted += 1
+                yield {
+                    "event": "on_custom_event",
+                    "name": MESSAGE_EVENT,
+                    "data": {"role": Role.AI, "content": f"part {index}"},
+                }
+        finally:
+            self.closed = True
+
+
+async def collect(event_chunks) -> list:
+    return [event_chunk async for event_chunk in event_chunks]
+
+
+class TestRequestDeadline:
+    async def test_run_returns_result_within_deadline(self):
+        """
+        Test that a call finishing before the deadline returns its result.
+        """
+        deadline = RequestDeadline.after(1)
+
+        assert await deadline.run(SlowCall(0.01)()) == "done"
+
+    async def test_run_cancels_call_past_deadline(self):
+        """
+        Test that a call outliving the deadline is cancelled and raises RequestCancelledError.
+        """
+        deadline = RequestDeadline.after(0.05)
+        call = SlowCall(1)
+
+        with pytest.raises(RequestCancelledError, match=DEADLINE_EXCEEDED):
+            await deadline.run(call())
+
+        assert call.cancelled
+
+    async def test_cancel_stops_in_flight_call(self):
+        """
+        Test that cancelling the token cancels a call in flight at once.
+        """
+        deadline = RequestDeadline.after(10)
+        call = SlowCall(10)
+
+        asyncio.get_running_loop().call_later(0.02, deadline.cancel)
+        with pytest.raises(RequestCancelledError, match=CLIENT_DISCONNECTED):
+            await deadline.run(call())
+
+        assert call.cancelled
+
+    async def test_iterate_uses_one_watcher_task(self):
+        """
+        Test that iterating under a deadline runs one watcher task, not tasks per item.
+        """
+        deadline = RequestDeadline.after(10)
+
+        async def items():
+            for index in range(50):
+                await asyncio.sleep(0)
+                yield index
+
+        task_counts = [len(asyncio.all_tasks()) async for _ in deadline.iterate(items())]
+
+        assert set(task_counts) == {len(asyncio.all_tasks()) + 1}
+
+    async def test_iterate_cancels_pending_step(self):
+        """
+        Test that the step pending when the deadline passes is cancelled.
+        """
+        deadline = RequestDeadline.after(0.05)
+        call = SlowCall(1)
+
+        async def items():
+            yield await call()
+
+        with pytest.raises(RequestCancelledError, match=DEADLINE_EXCEEDED):
+            await collect(deadline.iterate(items()))
+
+        assert call.cancelled
+        assert not asyncio.current_task().cancelling()  # type: ignore
+
+    async def test_iterate_leaves_item_handling_alone(self):
+        """
+        Test that a cancel while the consumer handles an item does not interrupt it, and
+        stops the iteration before the next item.
+        """
+        deadline = RequestDeadline.after(10)
+        handled = []
+
+        async def items():
+            for index in range(3):
+                yield index
+
+        with pytest.raises(RequestCancelledError, match=CLIENT_DISCONNECTED):
+            async for item in deadline.iterate(items()):
+                deadline.cancel()
+                await asyncio.sleep(0.01)
+                handled.append(item)
+
+        assert handled == [0]
+
+    async def test_services_read_deadline_from_runnable_config(self):
+        """
+        Test that with_deadline picks up the deadline of the runnable it is called from.
+        """
+        deadline = RequestDeadline.after(10)
+        deadline.cancel()
+
+        async def node(_):
+            return await with_deadline(SlowCall(0)())
+
+        with pytest.raises(RequestCancelledError):
+            await RunnableLambda(node).ainvoke(
+                {}, RunnableConfig(configurable={"deadline": deadline})
+            )
+
+        assert await RunnableLambda(node).ainvoke({}) == "done"
+
+    async def test_disconnect_cancels_deadline(self):
+        """
+        Test that a client disconnect cancels the request's deadline.
+        """
+        deadline = RequestDeadline.after(10)
+
+        async def is_disconnected():
+            return True
+
+        async def event_chunks():
+            await asyncio.sleep(0.05)
+            yield "chunk"
+
+        with patch("app.utils.graph_utils.request_deadline.settings") as mock_settings:
+            mock_settings.REQUEST_DISCONNECT_POLL_SECONDS = 0.01
+            await collect(cancel_on_disconnect(event_chunks(), is_disconnected, deadline))
+
+        assert deadline.is_cancelled()
+        assert deadline.reason == CLIENT_DISCONNECTED
+
+
+class TestGraphCancellation:
+    async def stream(self, fake_graph: FakeAgentGraph, deadline: RequestDeadline) -> list:
+        with patch.object(graph_stream, "agent_graph", fake_graph):
+            return await collect(
+                graph_stream.stream_graph_updates(
+                    messages=[HumanMessage(content="total sales")],
+                    user="user",
+                    trace_id="trace",
+                    chat_id="chat",
+                    dataset_ids=["sales"],
+                    deadline=deadline,
+                )
+            )
+
+    async def test_cancelled_request_stops_graph(self):
+        """
+        Test that a disconnect stops the graph run without a reply.
+        """
+        fake_graph = FakeAgentGraph(interval=0.01)
+        deadline = RequestDeadline.after(10)
+        asyncio.get_running_loop().call_later(0.05, deadline.cancel)
+
+        chunks = await self.stream(fake_graph, deadline)
+
+        assert fake_graph.closed
+        assert fake_graph.emitted < fake_graph.messages
+        assert all(chunk.content.startswith("part") for chunk in chunks)
+
+    async def test_deadline_stops_graph_with_reply(self):
+        """
+        Test that a request past its deadline stops the graph and tells the user.
+        """
+        fake_graph = FakeAgentGraph(interval=0.01)
+
+        chunks = await self.stream(fake_graph, RequestDeadline.after(0.05))
+
+        assert fake_graph.closed
+        assert fake_graph.emitted < fake_graph.messages
+        assert "longer than expected" in chunks[-1].content
@@ -0,0 +1,119 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+from app.utils.model_registry.response_cache import (
+    DiskResponseCache,
+    MemoryResponseCache,
+    ResponseCache,
+    get_response_cache_key,
+    is_response_cache_enabled,
+    with_response_cache,
+)
+
+
+class SampleOutput(BaseModel):
+    dataset: str
+    confidence: float
+
+
+MESSAGES = [SystemMessage(content="system"), HumanMessage(content="which dataset?")]
+
+
+@pytest.fixture(autouse=True)
+def memory_backend():
+    ResponseCache.backend = MemoryResponseCache(max_entries=2)
+    ResponseCache.counters.clear()
+    yield ResponseCache.backend
+    ResponseCache.backend = None
+    ResponseCache.counters.clear()
+
+
+class TestResponseCache:
+    async def test_repeated_prompt_skips_llm(self):
+        """
+        Test that a repeated rendered prompt is answered from the cache without invoking the LLM again.
+        """
+        llm = AsyncMock()
+        llm.ainvoke.return_value = SampleOutput(dataset="gdp", confidence=0.9)
+        cached_llm = with_response_cache(llm, "identify_datasets", "gpt-4o", SampleOutput)
+
+        first = await cached_llm.ainvoke(MESSAGES)
+        second = await cached_llm.ainvoke(MESSAGES)
+
+        assert llm.ainvoke.await_count == 1
+        assert first == second == SampleOutput(dataset="gdp", confidence=0.9)
+        assert ResponseCache.counters["identify_datasets_hits"] == 1
+        assert ResponseCache.counters["identify_datasets_misses"] == 1
+
+    async def test_message_responses_are_cached(self):
+        """
+        Test that plain AI message responses round-trip through the cache.
+        """
+        llm = AsyncMock()
+        llm.ainvoke.return_value = AIMessage(content="valid")
+        cached_llm = with_response_cache(llm, "validate_result", "gpt-4o")
+
+        await cached_llm.ainvoke(MESSAGES)
+        result = await cached_llm.ainvoke(MESSAGES)
+
+        assert llm.ainvoke.await_count == 1
+        assert isinstance(result, AIMessage)
+        assert result.content == "valid"
+
+    def test_cache_key_components(self):
+        """
+        Test that the cache key changes with node, model, prompt and schema.
+        """
+        key = get_response_cache_key("identify_datasets", "gpt-4o", MESSAGES, SampleOutput)
+
+        assert key == get_response_cache_key("identify_datasets", "gpt-4o", MESSAGES, SampleOutput)
+        assert key != get_response_cache_key("validate_result", "gpt-4o", MESSAGES, SampleOutput)
+        assert key != get_response_cache_key(
+            "identify_datasets", "gpt-4o-mini", MESSAGES, SampleOutput
+        )
+        assert key != get_response_cache_key(
+            "identify_datasets", "gpt-4o", MESSAGES[:1], SampleOutput
+        )
+        assert key != get_response_cache_key("identify_datasets", "gpt-4o", MESSAGES)
+
+    async def test_memory_backend_ttl_and_lru(self, memory_backend):
+        """
+        Test that expired entries are dropped and the least recently used entry is evicted.
+        """
+        await memory_backend.set("expired", {"value": 1}, ttl=-1)
+        await memory_backend.set("a", {"value": "a"}, ttl=60)
+        await memory_backend.set("b", {"value": "b"}, ttl=60)
+        await memory_backend.get("a")
+        await memory_backend.set("c", {"value": "c"}, ttl=60)
+
+        assert await memory_backend.get("expired") is None
+        assert await memory_backend.get("a") == {"value": "a"}
+        assert await memory_backend.get("b") is None
+
+    async def test_disk_backend_roundtrip(self, tmp_path):
+        """
+        Test that the disk backend persists entries and honours TTL.
+        """
+        backend = DiskResponseCache(str(tmp_path))
+
+        await backend.set("key", {"value": 1}, ttl=60)
+        await backend.set("old", {"value": 2}, ttl=-1)
+
+        assert await DiskResponseCache(str(tmp_path)).get("key") == {"value": 1}
+        assert await backend.get("old") is None
+        assert await backend.get("missing") is None
+
+    def test_enablement_is_per_node_and_opt_in(self):
+        """
+        Test that caching needs both the global switch and the node's `cache_responses` flag.
+        """
+        with patch("app.utils.model_registry.response_cache.settings") as mock_settings:
+            mock_settings.LLM_RESPONSE_CACHE_ENABLED = False
+            assert is_response_cache_enabled("identify_datasets") is False
+
+            mock_settings.LLM_RESPONSE_CACHE_ENABLED = True
+            assert is_response_cache_enabled("identify_datasets") is True
+            assert is_response_cache_enabled("generate_result") is False
@@ -0,0 +1,44 @@
+from app.core.rolling_window import RollingWindow, RollingWindows
+
+
+class TestRollingWindow:
+    def test_nearest_rank_percentiles(self):
+        """
+        Test that percentiles pick the nearest-rank sample.
+        """
+        window = RollingWindow(10)
+        for sample in (5.0, 1.0, 3.0, 2.0, 4.0):
+            window.append(sample)
+
+        assert window.percentile(0.0) == 1.0
+        assert window.percentile(0.5) == 3.0
+        assert window.percentile(0.95) == 5.0
+
+    def test_only_last_samples_kept(self):
+        """
+        Test that samples older than the window size are dropped.
+        """
+        window = RollingWindow(2)
+        for sample in (100.0, 1.0, 2.0):
+            window.append(sample)
+
+        assert len(window) == 2
+        assert window.percentile(1.0) == 2.0
+
+    def test_empty_window_has_no_percentile(self):
+        """
+        Test that a window without samples reports no percentile.
+        """
+        assert RollingWindow(10).percentile(0.5) is None
+
+    def test_windows_created_per_key(self):
+        """
+        Test that keyed windows are created on first use with the shared size.
+        """
+        windows = RollingWindows(1)
+        windows["a"].append(1.0)
+        windows["a"].append(2.0)
+
+        assert list(windows) == ["a"]
+        assert len(windows["a"]) == 1
+        assert windows["b"].percentile(0.5) is None
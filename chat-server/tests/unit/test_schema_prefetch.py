@@ -0,0 +1,156 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.schema import DatasetSchema
+from app.utils.graph_utils import schema_prefetch
+from app.utils.graph_utils.schema_prefetch import (
+    PrefetchedSchemas,
+    collect_schema_prefetch,
+    prefetch_schemas,
+    query_similarity,
+    start_schema_prefetch,
+)
+
+
+def make_schema(dataset_id: str) -> DatasetSchema:
+    return DatasetSchema(
+        name=f"Dataset {dataset_id}",
+        dataset_name=f"gp_{dataset_id}",
+        dataset_description="",
+        project_id="project",
+        dataset_id=dataset_id,
+        columns=[],
+    )
+
+
+class TestPrefetchedSchemas:
+    def test_similar_query_reuses_search(self):
+        """
+        Test that a lightly rewritten query reuses the prefetched search results.
+        """
+        schemas = [make_schema("sales")]
+        prefetched = PrefetchedSchemas(
+            query="total sales by region in 2023", searched_schemas=schemas
+        )
+
+        assert prefetched.get_searched_schemas("Total sales by region in 2023?") is schemas
+
+    def test_rewritten_query_discards_search(self):
+        """
+        Test that search results are discarded when the enhanced query diverged.
+        """
+        prefetched = PrefetchedSchemas(
+            query="what about 2023", searched_schemas=[make_schema("sales")]
+        )
+
+        assert prefetched.get_searched_schemas("Monthly revenue of hospitals by district") is None
+
+    def test_relevant_schemas_match_dataset_ids(self):
+        """
+        Test that relevant dataset schemas are only reused for the same dataset ids.
+        """
+        schemas = [make_schema("a"), make_schema("b")]
+        prefetched = PrefetchedSchemas(
+            query="q", relevant_dataset_ids=["a", "b"], relevant_dataset_schemas=schemas
+        )
+
+        assert prefetched.get_relevant_dataset_schemas(["b", "a"]) is schemas
+        assert prefetched.get_relevant_dataset_schemas(["a"]) is None
+
+    def test_query_similarity(self):
+        """
+        Test the word overlap used to compare the raw and enhanced queries.
+        """
+        assert query_similarity("a b", "b a") == 1.0
+        assert query_similarity("a b", "c d") == 0.0
+        assert query_similarity("", "a") == 0.0
+
+
+class TestPrefetchSchemas:
+    async def test_single_dataset_prefetches_schema_and_sample_data(self):
+        """
+        Test that a single dataset request prefetches its schema and sample rows.
+        """
+        schema = make_schema("sales")
+        rows = [{"region": "north", "total": 1}]
+
+        with (
+            patch.object(schema_prefetch, "get_schema_from_qdrant", AsyncMock(return_value=schema)),
+            patch.object(
+                schema_prefetch, "execute_sql_with_limit", AsyncMock(return_value=rows)
+            ) as execute_sql,
+            patch.object(schema_prefetch, "search_schemas", AsyncMock()) as search,
+        ):
+            prefetched = await prefetch_schemas("total sales", ["sales"], [], [], {})
+
+        assert prefetched.get_dataset("sales") == (schema, rows)
+        execute_sql.assert_awaited_once_with(query="SELECT * FROM gp_sales LIMIT 50")
+        search.assert_not_awaited()
+
+    async def test_multi_dataset_prefetches_search_and_relevant_schemas(self):
+        """
+        Test that a project request prefetches the semantic search and the chat's datasets.
+        """
+        searched = [make_schema("sales")]
+        relevant = [make_schema("returns")]
+
+        with (
+            patch.object(schema_prefetch, "get_model_provider", MagicMock()),
+            patch.object(schema_prefetch, "search_schemas", AsyncMock(return_value=searched)),
+            patch.object(
+                schema_prefetch, "get_schema_by_dataset_ids", AsyncMock(return_value=relevant)
+            ),
+        ):
+            prefetched = await prefetch_schemas("total sales", None, ["project"], ["returns"], {})
+
+        assert prefetched.get_searched_schemas("total sales") is searched
+        assert prefetched.get_relevant_dataset_schemas(["returns"]) is relevant
+
+    async def test_failed_lookup_leaves_others(self):
+        """
+        Test that a failing search does not lose the lookups that succeeded.
+        """
+        relevant = [make_schema("returns")]
+
+        with (
+            patch.object(schema_prefetch, "get_model_provider", MagicMock()),
+            patch.object(
+                schema_prefetch, "search_schemas", AsyncMock(side_effect=Exception("qdrant down"))
+            ),
+            patch.object(
+                schema_prefetch, "get_schema_by_dataset_ids", AsyncMock(return_value=relevant)
+            ),
+        ):
+            prefetched = await prefetch_schemas("total sales", None, ["project"], ["returns"], {})
+
+        assert prefetched.get_searched_schemas("total sales") is None
+        assert prefetched.get_relevant_dataset_schemas(["returns"]) is relevant
+
+
+class TestCollectSchemaPrefetch:
+    async def test_slow_prefetch_is_dropped(self):
+        """
+        Test that a prefetch outliving the wait budget is cancelled and not used.
+        """
+
+        async def slow_prefetch(*args):
+            await asyncio.sleep(1)
+
+        with (
+            patch.object(schema_prefetch, "prefetch_schemas", slow_prefetch),
+            patch.object(schema_prefetch, "settings") as mock_settings,
+        ):
+            mock_settings.SCHEMA_PREFETCH_ENABLED = True
+            mock_settings.SCHEMA_PREFETCH_WAIT_SECONDS = 0.01
+            task = start_schema_prefetch("total sales", None, [], [], {})
+
+            assert await collect_schema_prefetch(task) is None
+            assert task.cancelled()
+
+    def test_disabled_prefetch(self):
+        """
+        Test that SCHEMA_PREFETCH_ENABLED=False starts no prefetch.
+        """
+        with patch.object(schema_prefetch, "settings") as mock_settings:
+            mock_settings.SCHEMA_PREFETCH_ENABLED = False
+            assert start_schema_prefetch("total sales", None, [], [], {}) is None
@@ -0,0 +1,152 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.models.data import ColumnValueMatching
+from app.models.schema import ColumnSchema, DatasetSchema
+from app.utils.graph_utils import schema_pruning
+from app.utils.graph_utils.schema_pruning import (
+    get_required_columns,
+    is_missing_column_error,
+    prune_columns,
+)
+from app.utils.model_registry.token_counter import (
+    HeuristicTokenizer,
+    TokenCounter,
+)
+from app.workflow.prompts.multi_dataset_prompts.plan_query_prompt import (
+    format_plan_query_input,
+)
+
+
+def make_column(name: str, description: str = "") -> ColumnSchema:
+    return ColumnSchema(
+        column_name=name,
+        column_type="VARCHAR",
+        approx_unique=10,
+        count=100,
+        null_percentage={"value": 0},
+        column_description=description,
+        sample_values=[],
+    )
+
+
+def make_wide_schema() -> DatasetSchema:
+    columns = [make_column("state_code"), make_column("total_sales", "Sales in INR")]
+    columns += [make_column(f"metric_{i}", "Unrelated indicator") for i in range(40)]
+    columns.append(make_column("district_name", "Name of the district"))
+    return DatasetSchema(
+        name="Sales",
+        dataset_name="gp_sales",
+        dataset_description="",
+        project_id="project",
+        dataset_id="sales",
+        columns=columns,
+    )
+
+
+@pytest.fixture(autouse=True)
+def pruning_settings():
+    TokenCounter.set_tokenizer(HeuristicTokenizer())
+    with patch.object(schema_pruning, "settings") as mock_settings:
+        mock_settings.SCHEMA_PRUNING_ENABLED = True
+        mock_settings.SCHEMA_PRUNING_MAX_COLUMNS = 3
+        mock_settings.SCHEMA_PRUNING_TOKEN_BUDGET = 4000
+        yield mock_settings
+    TokenCounter.reset()
+
+
+class TestPruneColumns:
+    def test_keeps_relevant_and_key_columns_in_order(self):
+        """
+        Test that the query's columns and key columns are kept in schema order.
+        """
+        columns = prune_columns(make_wide_schema(), "total sales by district")
+
+        names = [column.column_name for column in columns]
+        assert names[:2] == ["state_code", "total_sales"]
+        assert names[-1] == "district_name"
+        assert len(names) == 4
+
+    def test_required_and_referenced_columns_kept(self):
+        """
+        Test that assumed columns and columns from earlier SQL survive pruning.
+        """
+        columns = prune_columns(
+            make_wide_schema(),
+            "total sales by district",
+            required_columns=["metric_7"],
+            referenced_sql=["SELECT metric_12 FROM gp_sales"],
+        )
+
+        names = {column.column_name for column in columns}
+        assert {"metric_7", "metric_12", "total_sales", "state_code"} <= names
+        assert "metric_1" not in names
+
+    def test_narrow_schema_not_pruned(self, pruning_settings):
+        """
+        Test that tables within the column limit are shown whole.
+        """
+        pruning_settings.SCHEMA_PRUNING_MAX_COLUMNS = 50
+
+        assert prune_columns(make_wide_schema(), "total sales") is None
+
+    def test_token_budget(self, pruning_settings):
+        """
+        Test that ranked columns stop at the token budget.
+        """
+        pruning_settings.SCHEMA_PRUNING_TOKEN_BUDGET = 30
+
+        columns = prune_columns(make_wide_schema(), "total sales by district")
+
+        assert 0 < len(columns) < 4
+
+    def test_required_columns_from_datasets_info(self):
+        """
+        Test that column assumptions and verified column values name required columns.
+        """
+        requirements = ColumnValueMatching()
+        analysis = ColumnValueMatching.DatasetAnalysis(dataset_name="gp_regions")
+        analysis.columns_analyzed.append(
+            ColumnValueMatching.ColumnAnalysis(column_name="region_name")
+        )
+        requirements.datasets["gp_regions"] = analysis
+
+        required = get_required_columns(
+            {
+                "column_assumptions": [
+                    {"dataset": "gp_sales", "columns": [{"name": "district_name"}]}
+                ],
+                "correct_column_requirements": requirements,
+            }
+        )
+
+        assert required == {"gp_sales": {"district_name"}, "gp_regions": {"region_name"}}
+
+
+class TestSchemaExpansion:
+    def test_missing_column_error(self):
+        """
+        Test that missing column errors are told apart from other failures.
+        """
+        assert is_missing_column_error(
+            ['Binder Error: Referenced column "district" not found in FROM clause!']
+        )
+        assert is_missing_column_error([None, "The query uses a column that does not exist"])
+        assert not is_missing_column_error(["Parser Error: syntax error at or near FROM"])
+
+    def test_plan_query_prompt_expands_on_request(self):
+        """
+        Test that plan_query renders the pruned schema unless asked to expand it.
+        """
+        datasets_info = {"schemas": [make_wide_schema()]}
+
+        pruned = format_plan_query_input("total sales", datasets_info)["input"]
+        expanded = format_plan_query_input(
+            "total sales", datasets_info, retry_count=1, expand_schemas=True
+        )["input"]
+
+        assert "of 43 shown" in pruned
+        assert "metric_30" not in pruned
+        assert "COLUMNS (43 total)" in expanded
+        assert "metric_30" in expanded
@@ -0,0 +1,142 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.utils.chat_history.sliding_window import apply_sliding_window
+from app.utils.model_registry import token_counter
+from app.utils.model_registry.token_counter import (
+    HeuristicTokenizer,
+    TokenCounter,
+)
+
+
+class WordTokenizer:
+    name = "words"
+
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return len(text.split())
+
+
+@pytest.fixture(autouse=True)
+def tokenizer_settings():
+    TokenCounter.reset()
+    with patch.object(token_counter, "settings") as mock_settings:
+        mock_settings.TOKENIZER = "heuristic"
+        mock_settings.TOKENIZER_ENCODING = "o200k_base"
+        mock_settings.TOKEN_COUNT_CACHE_SIZE = 100
+        yield mock_settings
+    TokenCounter.reset()
+
+
+class TestTokenCounter:
+    def test_heuristic_counts_non_ascii_finer(self):
+        """
+        Test that non-English text is not undercounted at 4 characters per token.
+        """
+        tokenizer = HeuristicTokenizer()
+
+        assert tokenizer.count("x" * 400) == 100
+        assert tokenizer.count("न" * 400) == 200
+
+    def test_message_counts_cached(self):
+        """
+        Test that a message resent with the next request is not tokenized again.
+        """
+        tokenizer = WordTokenizer()
+        TokenCounter.set_tokenizer(tokenizer)
+
+        first = TokenCounter.count_message(HumanMessage(content="total sales by state"))
+        again = TokenCounter.count_message(HumanMessage(content="total sales by state"))
+
+        assert first == again == 4 + token_counter.MESSAGE_OVERHEAD_TOKENS
+        assert tokenizer.calls == 1
+        assert TokenCounter.get_stats()["hits"] == 1
+
+    def test_cache_keyed_on_content_digest(self):
+        """
+        Test that cached counts are keyed on a fixed-size digest, not the message content.
+        """
+        content = "row " * 10_000
+        TokenCounter.count_message(HumanMessage(content=content))
+        TokenCounter.count_message(AIMessage(content=content))
+
+        keys = list(TokenCounter.message_tokens)
+        assert len(keys) == 2
+        assert all(len(key) == 64 for key in keys)
+
+    def test_cache_bounded(self, tokenizer_settings):
+        """
+        Test that the least recently used counts are evicted past the cache size.
+        """
+        tokenizer_settings.TOKEN_COUNT_CACHE_SIZE = 2
+
+        for i in range(3):
+            TokenCounter.count_message(HumanMessage(content=f"message {i}"))
+
+        assert TokenCounter.get_stats()["cached_messages"] == 2
+
+    def test_tool_calls_counted(self):
+        """
+        Test that tool call arguments of AI messages count towards the message.
+        """
+        TokenCounter.set_tokenizer(WordTokenizer())
+        message = AIMessage(
+            content="",
+            tool_calls=[{"name": "sql", "args": {"query": "SELECT 1"}, "id": "call_1"}],
+        )
+
+        assert TokenCounter.count_message(message) > token_counter.MESSAGE_OVERHEAD_TOKENS
+
+    def test_falls_back_to_heuristic(self, tokenizer_settings):
+        """
+        Test that an encoding that cannot be loaded falls back to character estimates.
+        """
+        tokenizer_settings.TOKENIZER = "tiktoken"
+        tokenizer_settings.TOKENIZER_ENCODING = "no_such_encoding"
+
+        assert TokenCounter.get_tokenizer().name == "heuristic"
+
+    async def test_warm_up_loads_off_event_loop(self):
+        """
+        Test that the startup warm-up loads the tokenizer in a worker thread.
+        """
+        loading_threads = []
+
+        class ThreadTokenizer(HeuristicTokenizer):
+            def __init__(self, encoding_name: str):
+                loading_threads.append(threading.current_thread())
+
+        with patch.object(token_counter, "TiktokenTokenizer", ThreadTokenizer):
+            token_counter.settings.TOKENIZER = "tiktoken"
+            await TokenCounter.warm_up()
+
+        assert loading_threads and loading_threads[0] is not threading.main_thread()
+        assert isinstance(TokenCounter.tokenizer, ThreadTokenizer)
+
+
+class TestSlidingWindow:
+    def test_keeps_most_recent_within_budget(self):
+        """
+        Test that the window keeps the newest messages that fit, in order.
+        """
+        TokenCounter.set_tokenizer(WordTokenizer())
+        history = [HumanMessage(content=f"message number {i}") for i in range(10)]
+
+        window = apply_sliding_window(history, min_messages=2, max_tokens=40)
+
+        assert window == history[-5:]
+
+    def test_minimum_messages_guaranteed(self):
+        """
+        Test that the minimum number of messages is kept even over the budget.
+        """
+        TokenCounter.set_tokenizer(WordTokenizer())
+        history = [HumanMessage(content="word " * 50) for _ in range(5)]
+
+        assert apply_sliding_window(history, min_messages=2, max_tokens=10) == history[-2:]
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Union, cast
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -5,8 +6,18 @@ import pytest
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 
+from app.services.qdrant import schema_reindex
+from app.services.qdrant.qdrant_setup import QdrantSetup
+from app.services.qdrant.schema_reindex import (
+    ReindexCheckpoint,
+    ReindexStatus,
+    SchemaReindexer,
+    load_checkpoint,
+    reindex_schemas,
+)
 from app.services.qdrant.schema_search import search_schemas
 from app.services.qdrant.schema_vectorization import (
+    delete_project_schemas_from_qdrant,
     delete_schema_from_qdrant,
     store_schema_in_qdrant,
 )
@@ -402,3 +413,376 @@ class TestSchemaVectorization:
 
             result = await delete_schema_from_qdrant("ds1", "proj1")
             assert result is False
+
+    @pytest.mark.asyncio
+    async def test_delete_project_schemas_from_qdrant_uses_project_filter(self):
+        """
+        Test that deleting a project's schemas issues a single filtered delete on the project id.
+        """
+        with patch(
+            "app.services.qdrant.schema_vectorization.QdrantSetup"
+        ) as mock_qdrant_setup_class:
+            mock_async_client = Mock()
+            mock_async_client.delete = AsyncMock()
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_async_client)
+
+            result = await delete_project_schemas_from_qdrant("proj1")
+
+            assert result is True
+            mock_async_client.delete.assert_called_once()
+            selector = mock_async_client.delete.call_args.kwargs["points_selector"]
+            condition = selector.filter.must[0]
+            assert condition.key == "metadata.project_id"
+            assert condition.match.value == "proj1"
+
+    @pytest.mark.asyncio
+    async def test_delete_project_schemas_from_qdrant_failure(self):
+        """
+        Test that `delete_project_schemas_from_qdrant` returns False when the delete call fails.
+        """
+        with patch(
+            "app.services.qdrant.schema_vectorization.QdrantSetup"
+        ) as mock_qdrant_setup_class:
+            mock_async_client = Mock()
+            mock_async_client.delete = AsyncMock(side_effect=Exception("Delete error"))
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_async_client)
+
+            assert await delete_project_schemas_from_qdrant("proj1") is False
+
+
+class TestQdrantSetup:
+    @pytest.mark.asyncio
+    async def test_new_collection_created_behind_alias(self):
+        """
+        Test that a missing collection is created as a versioned collection behind the
+        QDRANT_COLLECTION alias, so a reindex can swap it without deleting live data.
+        """
+        client = Mock()
+        client.get_collections = AsyncMock(return_value=Mock(collections=[]))
+        client.get_aliases = AsyncMock(return_value=Mock(aliases=[]))
+        client.create_collection = AsyncMock()
+        client.update_collection_aliases = AsyncMock()
+
+        with (
+            patch.object(QdrantSetup, "async_client", None),
+            patch("app.services.qdrant.qdrant_setup.AsyncQdrantClient", return_value=client),
+            patch("app.services.qdrant.qdrant_setup.settings") as mock_settings,
+        ):
+            mock_settings.QDRANT_COLLECTION = "test_collection"
+            mock_settings.DEFAULT_EMBEDDING_MODEL = "text-embedding-3-large"
+            mock_settings.QDRANT_VECTOR_SIZE = 3
+            await QdrantSetup.get_async_client()
+
+        collection_name = client.create_collection.call_args.kwargs["collection_name"]
+        assert collection_name.startswith("test_collection__text_embedding_3_large__")
+        operation = client.update_collection_aliases.call_args.kwargs["change_aliases_operations"][
+            0
+        ]
+        assert operation.create_alias.alias_name == "test_collection"
+        assert operation.create_alias.collection_name == collection_name
+
+
+class TestSchemaReindex:
+    @pytest.fixture(autouse=True)
+    def reset_writes(self):
+        SchemaReindexer.writes = {}
+        yield
+        SchemaReindexer.writes = {}
+
+    @staticmethod
+    def _point(point_id: str, content: str):
+        return Mock(id=point_id, payload={"page_content": content, "metadata": {}})
+
+    @staticmethod
+    def _alias(collection_name: str):
+        return Mock(alias_name="test_collection", collection_name=collection_name)
+
+    @pytest.fixture
+    def mock_client(self):
+        client = Mock()
+        client.get_aliases = AsyncMock(
+            return_value=Mock(aliases=[self._alias("test_collection__model__1")])
+        )
+        client.collection_exists = AsyncMock(return_value=False)
+        client.create_collection = AsyncMock()
+        client.delete_collection = AsyncMock()
+        client.update_collection_aliases = AsyncMock()
+        client.upsert = AsyncMock()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_reindex_schemas_scrolls_all_pages(self, mock_client, tmp_path):
+        """
+        Test that every scrolled page is re-embedded and upserted, waiting only for the last
+        one, and the checkpoint follows the scroll offset until the collection is exhausted.
+        """
+        mock_client.scroll = AsyncMock(
+            side_effect=[
+                ([self._point("a", "schema a"), self._point("b", "schema b")], "c"),
+                ([self._point("c", "schema c")], None),
+            ]
+        )
+        embeddings = Mock()
+        embeddings.aembed_documents = AsyncMock(
+            side_effect=lambda texts: [[0.1, 0.2] for _ in texts]
+        )
+
+        with (
+            patch("app.services.qdrant.schema_reindex.QdrantSetup") as mock_qdrant_setup_class,
+            patch("app.services.qdrant.schema_reindex.get_model_provider") as mock_provider,
+            patch("app.services.qdrant.schema_reindex.settings") as mock_settings,
+        ):
+            mock_settings.QDRANT_COLLECTION = "test_collection"
+            mock_settings.QDRANT_REINDEX_CHECKPOINT_DIR = str(tmp_path)
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_client)
+            mock_provider.return_value.get_embeddings_model.return_value = embeddings
+
+            checkpoint = ReindexCheckpoint(
+                job_id="job1", project_id="proj1", embedding_model="model"
+            )
+            result = await reindex_schemas(checkpoint, batch_size=2)
+
+            assert result.status == ReindexStatus.COMPLETED
+            assert result.processed == 3
+            assert result.offset is None
+            assert mock_client.upsert.call_count == 2
+            upserts = mock_client.upsert.call_args_list
+            assert [call.kwargs["wait"] for call in upserts] == [False, True]
+            # A project reindex with the collection's own model refreshes it in place.
+            assert upserts[0].kwargs["collection_name"] == "test_collection"
+            mock_client.update_collection_aliases.assert_not_called()
+            scroll_filter = mock_client.scroll.call_args_list[0].kwargs["scroll_filter"]
+            assert scroll_filter.must[0].match.value == "proj1"
+            assert mock_client.scroll.call_args_list[1].kwargs["offset"] == "c"
+
+    @pytest.mark.asyncio
+    async def test_reindex_schemas_resumes_from_checkpoint(self, mock_client, tmp_path):
+        """
+        Test that a failing batch leaves a checkpoint at the last completed offset.
+        """
+        mock_client.scroll = AsyncMock(
+            side_effect=[
+                ([self._point("a", "schema a")], "b"),
+                Exception("Qdrant unavailable"),
+            ]
+        )
+        embeddings = Mock()
+        embeddings.aembed_query = AsyncMock(return_value=[0.1, 0.2])
+        embeddings.aembed_documents = AsyncMock(return_value=[[0.1, 0.2]])
+
+        with (
+            patch("app.services.qdrant.schema_reindex.QdrantSetup") as mock_qdrant_setup_class,
+            patch("app.services.qdrant.schema_reindex.get_model_provider") as mock_provider,
+            patch("app.services.qdrant.schema_reindex.settings") as mock_settings,
+        ):
+            mock_settings.QDRANT_COLLECTION = "test_collection"
+            mock_settings.QDRANT_REINDEX_CHECKPOINT_DIR = str(tmp_path)
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_client)
+            mock_provider.return_value.get_embeddings_model.return_value = embeddings
+
+            checkpoint = ReindexCheckpoint(job_id="job2", project_id=None, embedding_model="m")
+            with pytest.raises(Exception, match="Qdrant unavailable"):
+                await reindex_schemas(checkpoint, batch_size=1)
+
+            saved = load_checkpoint("job2")
+            assert saved is not None
+            assert saved.offset == "b"
+            assert saved.processed == 1
+            assert saved.target_collection == mock_client.upsert.call_args.kwargs["collection_name"]
+
+    @pytest.mark.asyncio
+    async def test_full_reindex_swaps_alias_to_new_collection(self, mock_client, tmp_path):
+        """
+        Test that a full reindex writes into a new collection sized for the model, then points
+        the alias at it and drops the previous collection.
+        """
+        mock_client.scroll = AsyncMock(return_value=([self._point("a", "schema a")], None))
+        embeddings = Mock()
+        embeddings.aembed_query = AsyncMock(return_value=[0.1, 0.2, 0.3])
+        embeddings.aembed_documents = AsyncMock(return_value=[[0.1, 0.2, 0.3]])
+
+        with (
+            patch("app.services.qdrant.schema_reindex.QdrantSetup") as mock_qdrant_setup_class,
+            patch("app.services.qdrant.schema_reindex.get_model_provider") as mock_provider,
+            patch("app.services.qdrant.schema_reindex.settings") as mock_settings,
+        ):
+            mock_settings.QDRANT_COLLECTION = "test_collection"
+            mock_settings.QDRANT_REINDEX_CHECKPOINT_DIR = str(tmp_path)
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_client)
+            mock_provider.return_value.get_embeddings_model.return_value = embeddings
+
+            checkpoint = ReindexCheckpoint(job_id="job3", project_id=None, embedding_model="new")
+            await reindex_schemas(checkpoint)
+
+        target = checkpoint.target_collection
+        assert target is not None and target.startswith("test_collection__new__")
+        embeddings.aembed_query.assert_awaited_once_with(schema_reindex.VECTOR_SIZE_PROBE)
+        create_kwargs = mock_client.create_collection.call_args.kwargs
+        assert create_kwargs["collection_name"] == target
+        assert create_kwargs["vectors_config"].size == 3
+        assert mock_client.scroll.call_args.kwargs["collection_name"] == "test_collection"
+        assert mock_client.upsert.call_args.kwargs["collection_name"] == target
+        operations = mock_client.update_collection_aliases.call_args.kwargs[
+            "change_aliases_operations"
+        ]
+        assert operations[0].delete_alias.alias_name == "test_collection"
+        assert operations[1].create_alias.collection_name == target
+        mock_client.delete_collection.assert_awaited_once_with("test_collection__model__1")
+
+    @pytest.mark.asyncio
+    async def test_project_reindex_rejects_model_switch(self, mock_client, tmp_path):
+        """
+        Test that a project reindex with another model than the collection's fails before any
+        upsert, so the live collection never mixes models.
+        """
+        mock_client.scroll = AsyncMock(return_value=([self._point("a", "schema a")], None))
+
+        with (
+            patch("app.services.qdrant.schema_reindex.QdrantSetup") as mock_qdrant_setup_class,
+            patch("app.services.qdrant.schema_reindex.get_model_provider"),
+            patch("app.services.qdrant.schema_reindex.settings") as mock_settings,
+        ):
+            mock_settings.QDRANT_COLLECTION = "test_collection"
+            mock_settings.QDRANT_REINDEX_CHECKPOINT_DIR = str(tmp_path)
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_client)
+
+            checkpoint = ReindexCheckpoint(job_id="job4", project_id="proj1", embedding_model="new")
+            with pytest.raises(ValueError, match="full reindex"):
+                await reindex_schemas(checkpoint)
+
+        mock_client.upsert.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_collection_without_alias_not_deleted(self, mock_client, tmp_path):
+        """
+        Test that a plain collection created before aliases is refused instead of being
+        deleted to make room for the alias.
+        """
+        mock_client.get_aliases = AsyncMock(return_value=Mock(aliases=[]))
+
+        with (
+            patch("app.services.qdrant.schema_reindex.QdrantSetup") as mock_qdrant_setup_class,
+            patch("app.services.qdrant.schema_reindex.get_model_provider"),
+            patch("app.services.qdrant.schema_reindex.settings") as mock_settings,
+        ):
+            mock_settings.QDRANT_COLLECTION = "test_collection"
+            mock_settings.QDRANT_REINDEX_CHECKPOINT_DIR = str(tmp_path)
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_client)
+
+            checkpoint = ReindexCheckpoint(job_id="job5", project_id=None, embedding_model="new")
+            with pytest.raises(ValueError, match="predates collection aliases"):
+                await reindex_schemas(checkpoint)
+
+        mock_client.delete_collection.assert_not_called()
+        mock_client.update_collection_aliases.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_writes_during_full_reindex_reach_new_collection(self, mock_client, tmp_path):
+        """
+        Test that a schema written while a full reindex runs also goes to the new collection,
+        and the job does not overwrite it with the copy it scrolled before the write.
+        """
+        embeddings = Mock()
+        embeddings.aembed_query = AsyncMock(return_value=[0.1, 0.2])
+        embeddings.aembed_documents = AsyncMock(return_value=[[0.1, 0.2], [0.1, 0.2]])
+        target_stores = []
+
+        async def concurrent_write(texts):
+            target_stores.extend(SchemaReindexer.get_target_collections())
+            with (
+                patch("app.services.qdrant.vector_store.QdrantSetup") as mock_vector_setup,
+                patch("app.services.qdrant.vector_store.get_model_provider"),
+            ):
+                mock_vector_setup.get_vector_store.return_value = AsyncMock()
+                mock_vector_setup.get_document_id.return_value = "a"
+                await add_document_to_vector_store(
+                    Document(page_content="new", metadata={"project_id": "p", "dataset_id": "d"})
+                )
+                collections = [
+                    call.kwargs.get("collection_name")
+                    for call in mock_vector_setup.get_vector_store.call_args_list
+                ]
+            assert collections == [None, *target_stores]
+            return [[0.1, 0.2] for _ in texts]
+
+        embeddings.aembed_documents = AsyncMock(side_effect=concurrent_write)
+        mock_client.scroll = AsyncMock(
+            return_value=([self._point("a", "old a"), self._point("b", "schema b")], None)
+        )
+
+        with (
+            patch("app.services.qdrant.schema_reindex.QdrantSetup") as mock_qdrant_setup_class,
+            patch("app.services.qdrant.schema_reindex.get_model_provider") as mock_provider,
+            patch("app.services.qdrant.schema_reindex.settings") as mock_settings,
+        ):
+            mock_settings.QDRANT_COLLECTION = "test_collection"
+            mock_settings.QDRANT_REINDEX_CHECKPOINT_DIR = str(tmp_path)
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_client)
+            mock_provider.return_value.get_embeddings_model.return_value = embeddings
+
+            checkpoint = ReindexCheckpoint(job_id="job6", project_id=None, embedding_model="new")
+            await reindex_schemas(checkpoint)
+
+        assert target_stores == [checkpoint.target_collection]
+        upserted = mock_client.upsert.call_args.kwargs["points"]
+        assert [point.id for point in upserted] == ["b"]
+        assert SchemaReindexer.get_target_collections() == []
+
+    @pytest.mark.asyncio
+    async def test_resumed_full_reindex_restarts_untracked_copy(self, mock_client, tmp_path):
+        """
+        Test that a full job resumed by a process that did not track its writes rebuilds its
+        collection from the start.
+        """
+        mock_client.scroll = AsyncMock(return_value=([], None))
+        embeddings = Mock()
+        embeddings.aembed_query = AsyncMock(return_value=[0.1, 0.2])
+
+        with (
+            patch("app.services.qdrant.schema_reindex.QdrantSetup") as mock_qdrant_setup_class,
+            patch("app.services.qdrant.schema_reindex.get_model_provider") as mock_provider,
+            patch("app.services.qdrant.schema_reindex.settings") as mock_settings,
+        ):
+            mock_settings.QDRANT_COLLECTION = "test_collection"
+            mock_settings.QDRANT_REINDEX_CHECKPOINT_DIR = str(tmp_path)
+            mock_qdrant_setup_class.get_async_client = AsyncMock(return_value=mock_client)
+            mock_provider.return_value.get_embeddings_model.return_value = embeddings
+
+            checkpoint = ReindexCheckpoint(
+                job_id="job7",
+                project_id=None,
+                embedding_model="new",
+                offset="c",
+                processed=2,
+                target_collection="test_collection__new__1",
+            )
+            await reindex_schemas(checkpoint)
+
+        assert mock_client.delete_collection.await_args_list[0].args == ("test_collection__new__1",)
+        assert mock_client.scroll.call_args.kwargs["offset"] is None
+        assert checkpoint.processed == 0
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_pruned(self, tmp_path):
+        """
+        Test that a finished job leaves memory and its status is read from its checkpoint.
+        """
+
+        async def complete(checkpoint):
+            checkpoint.status = ReindexStatus.COMPLETED
+
+        with (
+            patch.object(schema_reindex, "reindex_schemas", complete),
+            patch.object(schema_reindex, "settings") as mock_settings,
+        ):
+            mock_settings.DEFAULT_EMBEDDING_MODEL = "model"
+            mock_settings.QDRANT_REINDEX_CHECKPOINT_DIR = str(tmp_path)
+            mock_settings.QDRANT_REINDEX_MAX_CONCURRENT_JOBS = 1
+            checkpoint = SchemaReindexer.start()
+            await SchemaReindexer.tasks[checkpoint.job_id]
+            await asyncio.sleep(0)
+
+            assert SchemaReindexer.jobs == {}
+            assert SchemaReindexer.tasks == {}
+            status = SchemaReindexer.get_status(checkpoint.job_id)
+            assert status is not None and status.status == ReindexStatus.COMPLETED
@@ -12,6 +12,7 @@ type AIChatMessage struct {
 }
 
 type AIAgentChatParams struct {
+	ChatID       string
 	ProjectIDs   string
 	DatasetIDs   string
 	Messages     []AIChatMessage
@@ -66,8 +66,9 @@ func (a *aiAgent) Chat(ctx context.Context, params *models.AIAgentChatParams) {
 		})
 	}
 
-	// Add metadata with project and dataset IDs if provided
+	// Add metadata with chat, project and dataset IDs if provided
 	metadata := make(map[string]string)
+	metadata["chat_id"] = params.ChatID
 	metadata["project_ids"] = params.ProjectIDs
 	metadata["dataset_ids"] = params.DatasetIDs
 
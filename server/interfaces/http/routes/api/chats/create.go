@@ -155,6 +155,7 @@ func (h *httpHandler) chatWithAgent(ctx *fiber.Ctx) error {
 	}
 
 	params := &models.AIAgentChatParams{
+		ChatID:       sessionID,
 		ProjectIDs:   projectIDs,
 		DatasetIDs:   datasetIDs,
 		Messages:     body.Messages,